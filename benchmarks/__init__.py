@@ -0,0 +1,6 @@
+"""
+mov2gif のベンチマークスイート
+
+合成動画を生成して変換処理を計測し、結果をJSONに保存・比較する。
+実行方法: python -m benchmarks --output results.json [--baseline baseline.json]
+"""
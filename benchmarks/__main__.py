@@ -0,0 +1,62 @@
+"""
+ベンチマークのコマンドラインエントリーポイント
+"""
+
+import argparse
+import os
+import sys
+
+from benchmarks.runner import CASES, compare, load_results, run_benchmarks, save_results
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(__file__), ".fixtures")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--output", help="計測結果を保存するJSONファイル")
+    parser.add_argument("--baseline", help="比較対象の計測結果のJSONファイル")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="悪化とみなす割合（既定: 0.1 = 10%%）",
+    )
+    parser.add_argument(
+        "--case",
+        action="append",
+        choices=[case.name for case in CASES],
+        help="実行するケース（複数指定可。未指定の場合はすべて）",
+    )
+    parser.add_argument(
+        "--fixtures-dir",
+        default=DEFAULT_FIXTURES_DIR,
+        help="合成動画の保存先（生成済みの場合は再利用する）",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.fixtures_dir, args.case)
+    for name, result in results.items():
+        if "error" in result:
+            print(f"{name:20s} 失敗: {result['error']}")
+            continue
+        print(
+            f"{name:20s} {result['wall_time_s']:8.2f}s "
+            f"{result['frames_per_second']:8.1f}fps "
+            f"{result['peak_rss_mb'] or 0:8.1f}MB "
+            f"(ffmpeg {result['peak_child_rss_mb'] or 0:6.1f}MB) "
+            f"{result['output_bytes']:>10d}B"
+        )
+    if args.output:
+        save_results(args.output, results)
+
+    if args.baseline:
+        regressions = compare(results, load_results(args.baseline), args.threshold)
+        for regression in regressions:
+            print(f"悪化: {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
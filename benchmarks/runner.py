@@ -0,0 +1,298 @@
+"""
+合成動画の変換を計測し、結果の保存とベースラインとの比較を行うモジュール
+"""
+
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import tempfile
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from benchmarks.synthetic import ensure_fixture
+
+try:
+    import resource
+except ImportError:  # Windowsではピークメモリを計測しない
+    resource = None  # type: ignore
+
+
+class BenchmarkCase(NamedTuple):
+    """
+    計測する変換の組み合わせ
+    """
+
+    # 結果のキーに使う名前
+    name: str
+    # 合成動画のシナリオ名
+    scenario: str
+    # MovieConverterに渡す変換オプション
+    options: Dict[str, Any]
+
+
+CASES: List[BenchmarkCase] = [
+    BenchmarkCase("screencast", "screencast", {}),
+    BenchmarkCase("screencast_optimize", "screencast", {"optimize": True}),
+    BenchmarkCase("static", "static", {"optimize": True}),
+    BenchmarkCase("static_no_dedup", "static", {"optimize": True, "dedup": False}),
+    BenchmarkCase("motion", "motion", {}),
+    BenchmarkCase("motion_480", "motion", {"width": 480}),
+    BenchmarkCase("motion_480_bayer", "motion", {"width": 480, "dither": "bayer"}),
+    BenchmarkCase(
+        "motion_480_floyd_steinberg",
+        "motion",
+        {"width": 480, "dither": "floyd_steinberg"},
+    ),
+    BenchmarkCase("long_320", "long", {"width": 320, "optimize": True}),
+    BenchmarkCase("4k_960", "4k", {"max_side": 960}),
+]
+
+# 比較対象の指標と、値が大きいほど悪いかどうか
+METRICS = {
+    "wall_time_s": True,
+    "frames_per_second": False,
+    "peak_rss_mb": True,
+    "peak_child_rss_mb": True,
+    "output_bytes": True,
+}
+
+# 1ケースの計測を打ち切るまでの時間（秒）
+CASE_TIMEOUT = 600.0
+
+
+def run_case(
+    case: BenchmarkCase, fixtures_dir: str, timeout: float = CASE_TIMEOUT
+) -> Dict[str, Any]:
+    """
+    1ケースを新しいプロセスで実行して計測する（ピークメモリを他のケースと分けるため）
+
+    Args:
+        case (BenchmarkCase): 計測するケース
+        fixtures_dir (str): 合成動画の保存先
+        timeout (float, optional): 計測を打ち切るまでの時間（秒）
+
+    Returns:
+        Dict[str, Any]: 計測結果。子プロセスが異常終了した場合や時間切れの場合は失敗として記録する
+    """
+    input_path = ensure_fixture(case.scenario, fixtures_dir)
+    context = multiprocessing.get_context("spawn")
+    result_queue = context.Queue()
+    process = context.Process(
+        target=_measure, args=(input_path, case.options, result_queue)
+    )
+    process.start()
+    return _collect_result(process, result_queue, timeout)
+
+
+def _collect_result(process, result_queue, timeout: float) -> Dict[str, Any]:
+    """
+    子プロセスの計測結果を待つ。結果を入れずに終了した場合（クラッシュ・OOM killerなど）や
+    時間切れの場合は、待ち続けずに失敗の結果を返す
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            result = result_queue.get(timeout=1.0)
+            break
+        except queue.Empty:
+            pass
+        if not process.is_alive():
+            # 終了直前に入れた結果がまだ届いていない場合に備えて、もう一度だけ待つ
+            try:
+                result = result_queue.get(timeout=1.0)
+                break
+            except queue.Empty:
+                process.join()
+                return _failure(
+                    f"計測プロセスが異常終了しました（終了コード {process.exitcode}）"
+                )
+        if time.monotonic() > deadline:
+            process.terminate()
+            process.join()
+            return _failure(f"計測が{timeout:g}秒以内に終わりませんでした")
+    process.join()
+    return result
+
+
+def _failure(error: str) -> Dict[str, Any]:
+    """
+    計測できなかったケースの結果（指標はすべて比較の対象外）
+    """
+    return {
+        "success": False,
+        "error": error,
+        "wall_time_s": None,
+        "frames": 0,
+        "frames_per_second": None,
+        "peak_rss_mb": None,
+        "peak_child_rss_mb": None,
+        "output_bytes": None,
+    }
+
+
+def _measure(input_path: str, options: Dict[str, Any], queue) -> None:
+    """
+    子プロセス内で変換を1回実行し、計測結果をキューに入れる
+    """
+    from PIL import Image
+
+    from mov2gif.movie_converter import MovieConverter
+    from mov2gif.palette_cache import PaletteCache
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = os.path.join(temp_dir, "output.gif")
+        converter = MovieConverter(
+            _NullLogger(),
+            palette_cache=PaletteCache(os.path.join(temp_dir, "palettes")),
+            options=options,
+        )
+
+        start = time.perf_counter()
+        success = converter.convert_to_gif(input_path, output_path)
+        wall_time = time.perf_counter() - start
+
+        frames = 0
+        output_bytes = 0
+        if success:
+            output_bytes = os.path.getsize(output_path)
+            with Image.open(output_path) as gif:
+                frames = gif.n_frames
+
+    peak_rss_mb = None
+    peak_child_rss_mb = None
+    if resource is not None:
+        # Linuxはキロバイト、macOSはバイト単位
+        scale = 1024 * 1024 if platform.system() == "Darwin" else 1024
+        peak_rss_mb = round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1
+        )
+        # 終了したffmpeg（デコーダー）のうち最大のもの。デコード中のフレームの大半はこちらが持つ
+        peak_child_rss_mb = round(
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1
+        )
+
+    queue.put(
+        {
+            "success": success,
+            "wall_time_s": round(wall_time, 3),
+            "frames": frames,
+            "frames_per_second": round(frames / wall_time, 2) if wall_time else 0.0,
+            "peak_rss_mb": peak_rss_mb,
+            "peak_child_rss_mb": peak_child_rss_mb,
+            "output_bytes": output_bytes,
+        }
+    )
+
+
+def run_benchmarks(
+    fixtures_dir: str, names: Optional[List[str]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    ベンチマークを実行する
+
+    Args:
+        fixtures_dir (str): 合成動画の保存先
+        names (List[str], optional): 実行するケース名。未指定の場合はすべて
+
+    Returns:
+        Dict[str, Dict[str, Any]]: {ケース名: 計測結果}
+    """
+    results = {}
+    for case in CASES:
+        if names and case.name not in names:
+            continue
+        results[case.name] = dict(run_case(case, fixtures_dir), options=case.options)
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float,
+) -> List[str]:
+    """
+    計測結果をベースラインと比較し、悪化した指標を列挙する
+
+    Args:
+        results (Dict[str, Dict[str, Any]]): 今回の計測結果
+        baseline (Dict[str, Dict[str, Any]]): ベースラインの計測結果
+        threshold (float): 許容する悪化の割合（0.1なら10%）
+
+    Returns:
+        List[str]: 悪化した指標の説明
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if base.get("success") and not result.get("success"):
+            regressions.append(f"{name}: 変換に失敗しました")
+            continue
+        for metric, higher_is_worse in METRICS.items():
+            current, previous = result.get(metric), base.get(metric)
+            if not current or not previous:
+                continue
+            ratio = current / previous if higher_is_worse else previous / current
+            if ratio > 1.0 + threshold:
+                regressions.append(
+                    f"{name}: {metric} {previous} -> {current} ({(ratio - 1.0) * 100:+.1f}%)"
+                )
+    return regressions
+
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    保存済みの計測結果を読み込む
+
+    Args:
+        path (str): JSONファイルのパス
+
+    Returns:
+        Dict[str, Dict[str, Any]]: {ケース名: 計測結果}
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def save_results(path: str, results: Dict[str, Dict[str, Any]]):
+    """
+    計測結果を実行環境の情報とともにJSONファイルに保存する
+
+    Args:
+        path (str): JSONファイルのパス
+        results (Dict[str, Dict[str, Any]]): {ケース名: 計測結果}
+    """
+    payload = {
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+
+
+class _NullLogger:
+    """
+    計測中のログ出力を抑止するためのロガー
+    """
+
+    def debug(self, message: str):
+        pass
+
+    def info(self, message: str):
+        pass
+
+    def warning(self, message: str):
+        pass
+
+    def error(self, message: str):
+        pass
+
+    def critical(self, message: str):
+        pass
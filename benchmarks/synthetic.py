@@ -0,0 +1,134 @@
+"""
+ベンチマーク用の合成動画をNumPyとimageio-ffmpegで決定的に生成するモジュール
+"""
+
+import os
+from typing import Callable, Dict, Iterator, NamedTuple, Tuple
+
+import imageio_ffmpeg
+import numpy as np
+
+
+class Scenario(NamedTuple):
+    """
+    合成動画の種類と生成パラメーター
+    """
+
+    # 解像度 (幅, 高さ)
+    size: Tuple[int, int]
+    # フレームレート
+    fps: int
+    # 長さ（秒）
+    duration: float
+    # フレーム生成関数 (幅, 高さ, フレーム数) -> フレームのイテレータ
+    generator: Callable[[int, int, int], Iterator[np.ndarray]]
+
+
+def screencast_frames(width: int, height: int, count: int) -> Iterator[np.ndarray]:
+    """
+    ほぼ静止したUI画面上でカーソルが動き、時々テキストが増える画面収録風のフレーム
+    """
+    rng = np.random.default_rng(1)
+    base = np.full((height, width, 3), 236, dtype=np.uint8)
+    base[: height // 18] = (52, 84, 150)
+    base[:, : width // 6] = (222, 226, 232)
+    for y in range(height // 8, height - 20, max(12, height // 36)):
+        length = int(rng.integers(width // 4, width * 3 // 4))
+        base[y : y + 4, width // 5 : width // 5 + length] = (60, 60, 60)
+
+    frame = base.copy()
+    cursor = max(6, width // 120)
+    for i in range(count):
+        # 5秒に1回程度、入力中のテキスト行が伸びる
+        if i % 30 == 0:
+            y = int(rng.integers(height // 8, height - 20))
+            x = int(rng.integers(width // 5, width // 2))
+            frame[y : y + 4, x : x + width // 10] = (30, 30, 30)
+        output = frame.copy()
+        x = int((i * 7) % (width - cursor))
+        y = int(height / 2 + np.sin(i / 15.0) * height / 4)
+        output[y : y + cursor * 2, x : x + cursor] = (250, 40, 40)
+        yield output
+
+
+def static_frames(width: int, height: int, count: int) -> Iterator[np.ndarray]:
+    """
+    ほとんどの時間は完全に静止し、約2秒ごとに画面の一部が切り替わる画面収録風のフレーム
+    """
+    rng = np.random.default_rng(3)
+    frame = np.full((height, width, 3), 244, dtype=np.uint8)
+    frame[: height // 18] = (40, 40, 48)
+    for i in range(count):
+        # 約2秒（60fpsで120フレーム）ごとに、スライドの本文が切り替わる
+        if i % 120 == 0:
+            frame[height // 6 :] = 244
+            for y in range(height // 5, height - 40, max(16, height // 24)):
+                length = int(rng.integers(width // 5, width * 2 // 3))
+                frame[y : y + 6, width // 10 : width // 10 + length] = (70, 70, 80)
+        yield frame.copy()
+
+
+def motion_frames(width: int, height: int, count: int) -> Iterator[np.ndarray]:
+    """
+    画面全体が動くグラデーションとノイズからなる動きの激しいフレーム
+    """
+    rng = np.random.default_rng(2)
+    ys, xs = np.mgrid[0:height, 0:width].astype(np.float32)
+    for i in range(count):
+        phase = i / 10.0
+        frame = np.empty((height, width, 3), dtype=np.uint8)
+        frame[..., 0] = (127 + 127 * np.sin(xs / 97.0 + phase)).astype(np.uint8)
+        frame[..., 1] = (127 + 127 * np.sin(ys / 61.0 - phase * 1.3)).astype(np.uint8)
+        frame[..., 2] = (127 + 127 * np.sin((xs + ys) / 131.0 + phase * 0.7)).astype(
+            np.uint8
+        )
+        noise = rng.integers(0, 24, (height // 4, width // 4, 1), dtype=np.uint8)
+        frame += np.repeat(np.repeat(noise, 4, axis=0), 4, axis=1)[:height, :width]
+        yield frame
+
+
+# シナリオ名と生成パラメーターの対応
+SCENARIOS: Dict[str, Scenario] = {
+    "screencast": Scenario((1280, 720), 30, 10.0, screencast_frames),
+    "motion": Scenario((1280, 720), 30, 5.0, motion_frames),
+    "long": Scenario((640, 360), 30, 120.0, screencast_frames),
+    "static": Scenario((1280, 720), 60, 20.0, static_frames),
+    "4k": Scenario((3840, 2160), 30, 3.0, motion_frames),
+}
+
+
+def ensure_fixture(name: str, fixtures_dir: str) -> str:
+    """
+    シナリオの合成動画を生成する（生成済みの場合はそのまま使う）
+
+    Args:
+        name (str): シナリオ名
+        fixtures_dir (str): 合成動画の保存先
+
+    Returns:
+        str: 合成動画のパス
+    """
+    scenario = SCENARIOS[name]
+    width, height = scenario.size
+    filename = f"{name}_{width}x{height}_{scenario.fps}fps_{scenario.duration:g}s.mp4"
+    path = os.path.join(fixtures_dir, filename)
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(fixtures_dir, exist_ok=True)
+    temp_path = path + ".part.mp4"
+    writer = imageio_ffmpeg.write_frames(
+        temp_path,
+        scenario.size,
+        fps=scenario.fps,
+        codec="libx264",
+        macro_block_size=1,
+        output_params=["-g", str(scenario.fps * 2)],
+    )
+    writer.send(None)
+    count = int(round(scenario.duration * scenario.fps))
+    for frame in scenario.generator(width, height, count):
+        writer.send(frame)
+    writer.close()
+    os.replace(temp_path, path)
+    return path
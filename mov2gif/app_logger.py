@@ -1,16 +1,25 @@
+import atexit
 import logging
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+import multiprocessing
 import os
+import queue
+from typing import Any, Optional
 
 APP_ROOT = os.path.dirname(os.path.dirname(__file__))
 LOG_DIR = os.path.join(APP_ROOT, "logs")
-if not os.path.exists(LOG_DIR):
-    os.makedirs(LOG_DIR)
-
 LOG_PATH = os.path.join(LOG_DIR, "app.log")
 
 
 class AppLogger:
+    """
+    ログを書き出すスレッド（QueueListener）を1つだけ持つロガー
+
+    呼び出し元はレコードをキューに入れるだけで、整形と標準エラー出力・ファイルへの書き込みは
+    メインプロセスのリスナースレッドがまとめて行う。ワーカープロセスはinit_worker_loggingで
+    同じキューにレコードを送るため、ログファイルのローテーションが競合しない
+    """
+
     _instance = None
 
     def __new__(cls, *args, **kwargs):
@@ -22,6 +31,7 @@ class AppLogger:
         if not hasattr(self, "_initialized"):
             self.logger = logging.getLogger("AppLogger")
             self.logger.setLevel(logging.DEBUG)
+            self.queue = _create_queue()
 
             # StreamHandler
             sh = logging.StreamHandler()
@@ -30,8 +40,9 @@ class AppLogger:
                 datefmt="%Y-%m-%d %H:%M:%S",
             )
             sh.setFormatter(sh_formatter)
-            self.logger.addHandler(sh)
 
+            # ログディレクトリはファイルハンドラーを追加するときに作成する
+            os.makedirs(LOG_DIR, exist_ok=True)
             trfh = TimedRotatingFileHandler(
                 LOG_PATH, when="midnight", interval=1, backupCount=7
             )
@@ -39,7 +50,17 @@ class AppLogger:
                 "%(asctime)s - %(levelname)s - %(message)s"
             )
             trfh.setFormatter(trfh_formatter)
-            self.logger.addHandler(trfh)
+
+            self._handlers = (sh, trfh)
+            self._queue_handler = QueueHandler(self.queue)
+            self.logger.addHandler(self._queue_handler)
+            self.listener: Optional[QueueListener] = QueueListener(
+                self.queue, *self._handlers, respect_handler_level=True
+            )
+            self.listener.start()
+            self._pid = os.getpid()
+            self._closed = False
+            atexit.register(self.close)
 
             self._initialized = True
 
@@ -58,6 +79,89 @@ class AppLogger:
     def critical(self, message: str):
         self.logger.critical(message)
 
+    def flush(self):
+        """
+        キューに入っているレコードをすべて書き出すまで待つ
+
+        ワーカープロセスから呼び出した場合は何もしない（レコードはプロセス終了時にキューへ送られる）
+        """
+        if self.listener is None or os.getpid() != self._pid:
+            return
+        # stopは残りのレコードを処理してからスレッドを終了するため、書き出し後に再開する
+        self.listener.stop()
+        self.listener.start()
+
+    def close(self):
+        """
+        残りのレコードを書き出してリスナースレッドを終了する
+
+        終了後のログはハンドラーで直接（呼び出し元のスレッドで）書き出す。終了時に自動で呼び出される
+        """
+        if self.listener is None or os.getpid() != self._pid:
+            return
+        self.listener.stop()
+        self.listener = None
+        self._closed = True
+        self.logger.removeHandler(self._queue_handler)
+        for handler in self._handlers:
+            self.logger.addHandler(handler)
+
+    @classmethod
+    def worker_queue(cls) -> Optional[Any]:
+        """
+        ワーカープロセスからレコードを送るキューを返す（init_worker_loggingの引数にする）
+
+        ワーカープロセス内で呼び出した場合は、そのワーカーが送っている先のキューを返す
+
+        Returns:
+            Optional[Any]: プロセス間で共有できるキュー。AppLoggerが未作成・終了後、または共有できない環境ではNone
+        """
+        instance = cls._instance
+        if (
+            instance is None
+            or instance._closed
+            or isinstance(instance.queue, queue.SimpleQueue)
+        ):
+            return None
+        return instance.queue
+
+
+def init_worker_logging(log_queue: Optional[Any]):
+    """
+    ワーカープロセスのAppLoggerを、メインプロセスのキューにレコードを送るだけの構成にする
+
+    ProcessPoolExecutorのinitializerとして使う。ファイルハンドラーやリスナーは持たないため、
+    ログの書き込みとローテーションはメインプロセスのリスナーだけが行う
+
+    Args:
+        log_queue (Any, optional): AppLogger.worker_queueの戻り値。Noneの場合は何もしない
+    """
+    if log_queue is None:
+        return
+    logger = AppLogger.__new__(AppLogger)
+    logger.logger = logging.getLogger("AppLogger")
+    logger.logger.setLevel(logging.DEBUG)
+    for handler in list(logger.logger.handlers):
+        logger.logger.removeHandler(handler)
+    logger.queue = log_queue
+    logger._queue_handler = QueueHandler(log_queue)
+    logger.logger.addHandler(logger._queue_handler)
+    logger._handlers = ()
+    logger.listener = None
+    logger._pid = os.getpid()
+    logger._closed = False
+    logger._initialized = True
+
+
+def _create_queue() -> Any:
+    """
+    ワーカープロセスとも共有できるキューを作る（セマフォが使えない環境ではプロセス内のキュー）
+    """
+    try:
+        return multiprocessing.Queue(-1)
+    except (ImportError, OSError):
+        return queue.SimpleQueue()
+
 
 # 動作確認用
 if __name__ == "__main__":
@@ -0,0 +1,184 @@
+"""
+一括変換の各ジョブの状態を追記専用のファイルに記録し、中断した一括変換を再開するためのモジュール
+"""
+
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# ジョブの状態
+STATE_STARTED = "started"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+
+
+class BatchJournal:
+    """
+    ジョブの状態の変化（開始・完了・失敗）を1行1件のJSON（JSON Lines）で追記していくクラス
+
+    1件ごとにfsyncするため、途中で異常終了しても完了を記録したジョブは失われない。
+    書きかけの最後の行（異常終了時）は読み込み時に無視する。
+    ファイルの排他制御は行わないため、書き込みは1つのプロセス（一括変換の親プロセス）からのみ行うこと
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        """
+        BatchJournalのコンストラクタ（ファイルを開く）
+
+        Args:
+            path (str): ジャーナルファイルのパス
+            resume (bool, optional): 既存の記録を読み込んで追記する。Falseの場合は記録を空にして始める
+
+        Raises:
+            OSError: ファイルを開けない場合
+        """
+        self.path = path
+        # ジョブごとの最後の記録 {(入力の絶対パス, 出力の絶対パス): 記録}
+        self._records: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        terminated = True
+        if resume:
+            self._records, terminated = _load(path)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._fp = open(path, "a" if resume else "w", encoding="utf-8")
+        if not terminated:
+            # 書きかけの行に続けて追記しないよう、改行で区切る
+            self._fp.write("\n")
+
+    def __enter__(self) -> "BatchJournal":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def completed(self, input_path: str, output_path: str, key: Optional[str]) -> bool:
+        """
+        前回までにジョブが完了しており、やり直す必要がないかどうか
+
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            output_path (str): 出力GIFファイルのパス
+            key (str, optional): 入力内容と変換オプションから求めたキー。Noneの場合は完了済みとみなさない
+
+        Returns:
+            bool: 同じキーで完了を記録しており、出力が記録時のサイズで残っている場合はTrue
+        """
+        record = self._records.get(_job_id(input_path, output_path))
+        if key is None or record is None:
+            return False
+        if record.get("state") != STATE_DONE or record.get("key") != key:
+            return False
+        try:
+            return os.path.getsize(output_path) == record.get("output_size")
+        except OSError:
+            return False
+
+    def interrupted(self) -> List[Tuple[str, str]]:
+        """
+        前回までに開始したまま完了も失敗も記録されていないジョブ（異常終了で失われたジョブ）を返す
+
+        Returns:
+            List[Tuple[str, str]]: (入力動画ファイルのパス, 出力GIFファイルのパス) のリスト
+        """
+        return [
+            (record["input_path"], record["output_path"])
+            for record in self._records.values()
+            if record.get("state") == STATE_STARTED
+        ]
+
+    def start(self, input_path: str, output_path: str, key: Optional[str]):
+        """
+        ジョブの開始を記録する
+
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            output_path (str): 出力GIFファイルのパス
+            key (str, optional): 入力内容と変換オプションから求めたキー
+        """
+        self._append(STATE_STARTED, input_path, output_path, key)
+
+    def finish(
+        self, input_path: str, output_path: str, key: Optional[str], success: bool
+    ):
+        """
+        ジョブの完了（または失敗）を記録する
+
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            output_path (str): 出力GIFファイルのパス
+            key (str, optional): 入力内容と変換オプションから求めたキー
+            success (bool): 変換結果
+        """
+        output_size = None
+        if success:
+            try:
+                output_size = os.path.getsize(output_path)
+            except OSError:
+                success = False
+        self._append(
+            STATE_DONE if success else STATE_FAILED,
+            input_path,
+            output_path,
+            key,
+            output_size,
+        )
+
+    def close(self):
+        """
+        ファイルを閉じる
+        """
+        self._fp.close()
+
+    def _append(
+        self,
+        state: str,
+        input_path: str,
+        output_path: str,
+        key: Optional[str],
+        output_size: Optional[int] = None,
+    ):
+        """
+        1件分の記録を追記し、ディスクへ書き出す
+        """
+        record = {
+            "state": state,
+            "input_path": input_path,
+            "output_path": output_path,
+            "key": key,
+            "output_size": output_size,
+            "time": time.time(),
+        }
+        self._fp.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._fp.flush()
+        os.fsync(self._fp.fileno())
+        self._records[_job_id(input_path, output_path)] = record
+
+
+def _job_id(input_path: str, output_path: str) -> Tuple[str, str]:
+    """
+    作業ディレクトリによらずジョブを識別するキーを求める
+    """
+    return os.path.abspath(input_path), os.path.abspath(output_path)
+
+
+def _load(path: str) -> Tuple[Dict[Tuple[str, str], Dict[str, Any]], bool]:
+    """
+    ジャーナルファイルを読み込み、ジョブごとの最後の記録と、最後の行が改行で終わっているかどうかを返す
+    （ファイルがない場合は空）
+    """
+    records: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return records, True
+    for line in lines:
+        try:
+            record = json.loads(line)
+            job_id = _job_id(record["input_path"], record["output_path"])
+        except (ValueError, KeyError, TypeError):
+            # 異常終了で書きかけになった行
+            continue
+        records[job_id] = record
+    return records, not lines or lines[-1].endswith("\n")
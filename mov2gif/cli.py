@@ -0,0 +1,556 @@
+"""
+ファイル・ディレクトリ・globパターンを指定して動画を一括変換するコマンドラインのエントリーポイント
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from mov2gif.app_logger import AppLogger
+from mov2gif.batch_journal import BatchJournal
+from mov2gif.config_reader import ConfigReader
+from mov2gif.conversion_cache import ConversionCache
+from mov2gif.discovery import (
+    VIDEO_EXTENSIONS,
+    DiscoveredFile,
+    discover,
+    output_path_for,
+)
+from mov2gif.gif_writer import remove_temp_files
+from mov2gif.manifest import ManifestJob, ManifestReader
+from mov2gif.movie_converter import ConversionResult, MovieConverter
+from mov2gif.progress import JsonLinesSink
+from mov2gif.quantizer import DITHER_MODES
+from mov2gif.watcher import FolderWatcher
+from mov2gif.worker_pool import WORKER_MAX_JOBS
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    コマンドライン引数のパーサーを作成する
+
+    Returns:
+        argparse.ArgumentParser: 引数パーサー
+    """
+    parser = argparse.ArgumentParser(
+        prog="mov2gif",
+        description="MOV動画もしくはMP4をGIFに変換します（ダイアログを使用しないヘッドレス実行用）",
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        help="変換する動画ファイル・ディレクトリ・globパターン（例: 'videos/**/*.mov'）",
+    )
+    parser.add_argument(
+        "--manifest",
+        metavar="PATH",
+        help="入力の代わりに、1行1ジョブ（path・output・変換オプション）のマニフェスト（.jsonl, .ndjson, .csv）から読み込んで変換する",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        help="出力先ディレクトリ。入力ディレクトリ（マニフェストの場合はマニフェストのあるディレクトリ）からの相対パスを保って配置する（未指定の場合は入力ファイルと同じ場所）",
+    )
+    parser.add_argument(
+        "--no-recursive",
+        dest="recursive",
+        action="store_false",
+        help="ディレクトリのサブディレクトリを走査しない",
+    )
+    parser.add_argument(
+        "--ext",
+        action="append",
+        dest="extensions",
+        metavar="EXT",
+        help=f"ディレクトリから列挙する拡張子（複数指定可。既定: {' '.join(VIDEO_EXTENSIONS)}）",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1, help="ワーカープロセス数（既定: 1）"
+    )
+    parser.add_argument(
+        "--worker-max-jobs",
+        type=int,
+        default=WORKER_MAX_JOBS,
+        metavar="N",
+        help=f"ワーカープロセス1つあたりN件変換するごとにプロセスを作り直してメモリを解放する（既定: {WORKER_MAX_JOBS}、0は作り直さない）",
+    )
+    parser.add_argument(
+        "--segment-workers",
+        type=int,
+        default=1,
+        help="長い動画を時間区間に分割して並列にエンコードするプロセス数（既定: 1 = 分割しない）",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=_byte_size,
+        help="同時に変換するジョブのメモリ使用量の見積もりの合計の上限（例: 2G, 800M）。超える場合は完了を待ってから次のジョブを始める",
+    )
+    parser.add_argument(
+        "--config",
+        default="",
+        help="変換オプション（CONVERSION_OPTIONS）を読み込む設定ファイル（既定: パッケージ内のconfig.py）",
+    )
+    parser.add_argument("--fps", type=float, help="GIFのフレームレート")
+    parser.add_argument("--width", type=int, help="出力幅（ピクセル）")
+    parser.add_argument("--max-side", type=int, help="出力の長辺の上限（ピクセル）")
+    parser.add_argument(
+        "--start", help="切り出しの開始時刻（秒、または mm:ss・hh:mm:ss）"
+    )
+    parser.add_argument(
+        "--end", help="切り出しの終了時刻（秒、または mm:ss・hh:mm:ss）"
+    )
+    parser.add_argument(
+        "--duration",
+        help="切り出す長さ（秒、または mm:ss・hh:mm:ss）。--endと同時には指定できない",
+    )
+    parser.add_argument(
+        "--max-bytes",
+        type=_byte_size,
+        help="出力ファイルサイズの上限（例: 2M, 500K）。収まるまでfps・解像度・色数を下げる",
+    )
+    parser.add_argument("--colors", type=int, help="パレットの最大色数 (2-256)")
+    parser.add_argument("--quality", type=int, help="品質 (1-100)")
+    parser.add_argument(
+        "--no-dedup",
+        dest="dedup",
+        action="store_const",
+        const=False,
+        help="連続する同一フレームをまとめない",
+    )
+    parser.add_argument(
+        "--dedup-threshold",
+        type=int,
+        help="連続するフレームを同じとみなす画素値の差の上限 (0-255、0は完全一致のみ)",
+    )
+    parser.add_argument(
+        "--dither",
+        choices=DITHER_MODES,
+        help="ディザリングの方式（none: なし, bayer: 組織的ディザ, floyd_steinberg: 誤差拡散）",
+    )
+    parser.add_argument(
+        "--optimize",
+        dest="optimize",
+        action="store_const",
+        const=True,
+        help="前フレームとの差分のみを書き出す",
+    )
+    parser.add_argument(
+        "--no-optimize",
+        dest="optimize",
+        action="store_const",
+        const=False,
+        help="差分エンコードを行わない",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="変換結果キャッシュを使用しない"
+    )
+    parser.add_argument(
+        "--profile-dir", help="段階ごとの所要時間（プロファイル）の保存先"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="指定したディレクトリを監視し、追加・更新された動画を変換し続ける（Ctrl+Cで終了）",
+    )
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=2.0,
+        help="監視時、サイズと更新時刻がこの秒数変わらなければ書き込み完了とみなす（既定: 2.0）",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=1.0,
+        help="監視時に状態を確認する間隔（秒、既定: 1.0）",
+    )
+    parser.add_argument(
+        "--polling",
+        action="store_true",
+        help="inotifyを使用せず、ディレクトリの走査で監視する（ネットワークファイルシステム向け）",
+    )
+    parser.add_argument(
+        "--summary",
+        default="-",
+        help="終了時の結果サマリー（JSON）の出力先。'-'の場合は標準出力（既定）",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="変換せずに、動画のメタデータから所要時間と出力サイズを見積もってサマリーに出力する",
+    )
+    parser.add_argument(
+        "--journal",
+        metavar="PATH",
+        help="各ジョブの状態（開始・完了・失敗）を記録するジャーナルファイル。--resumeを指定しない場合は記録を空にして始める",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="--journalの記録を読み込み、前回完了したジョブ（入力・変換オプション・出力が変わっていないもの）をスキップして再開する",
+    )
+    parser.add_argument(
+        "--progress",
+        metavar="DEST",
+        help="進捗イベントを1行1件のJSON（JSON Lines）で書き出す先（追記）。'-'の場合は標準出力（--summaryにもファイルを指定してください）",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    コマンドラインから動画を一括変換する
+
+    ログは標準エラー出力に、結果サマリーはJSONで標準出力（または--summaryのファイル）に出力する
+
+    Args:
+        argv (List[str], optional): コマンドライン引数。未指定の場合はsys.argv
+
+    Returns:
+        int: 終了コード（0: すべて成功, 1: 失敗あり, 2: 引数が不正または変換対象なし）
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if (args.manifest is None) == (not args.inputs):
+        parser.error("変換する動画か--manifestのどちらか一方を指定してください")
+    if args.manifest is not None and args.watch:
+        parser.error("--manifestと--watchは同時に指定できません")
+    if args.resume and args.journal is None:
+        parser.error("--resumeには--journalを指定してください")
+    if args.progress == "-" and args.summary == "-":
+        # 進捗イベントとサマリーが混ざると、どちらも読み取れなくなる
+        parser.error(
+            "--progress -と--summary -は同時に指定できません（どちらかをファイルに出力してください）"
+        )
+    logger = AppLogger()
+
+    progress = None
+    if args.progress is not None:
+        try:
+            progress = JsonLinesSink(args.progress)
+        except OSError as e:
+            logger.error(f"進捗の出力先を開けません: {str(e)}")
+            return 2
+    journal = None
+    try:
+        if args.journal is not None:
+            try:
+                journal = _open_journal(args.journal, args.resume, logger)
+            except OSError as e:
+                logger.error(f"ジャーナルを開けません: {str(e)}")
+                return 2
+        return _run(args, logger, progress, journal)
+    finally:
+        if journal is not None:
+            journal.close()
+        if progress is not None:
+            progress.close()
+
+
+def _open_journal(path: str, resume: bool, logger: AppLogger) -> BatchJournal:
+    """
+    ジャーナルを開き、再開する場合は前回中断されたジョブの数をログに出力する
+
+    Args:
+        path (str): ジャーナルファイルのパス
+        resume (bool): 前回の記録を読み込んで再開するかどうか
+        logger (AppLogger): ロガー
+
+    Returns:
+        BatchJournal: ジャーナル
+
+    Raises:
+        OSError: ファイルを開けない場合
+    """
+    journal = BatchJournal(path, resume=resume)
+    interrupted = journal.interrupted()
+    if interrupted:
+        logger.warning(
+            f"前回中断されたジョブが{len(interrupted)}件あります（変換し直します）"
+        )
+    # 中断されたジョブが残した書きかけの一時ファイルを片付ける
+    for _, output_path in interrupted:
+        remove_temp_files(output_path)
+    return journal
+
+
+def _run(
+    args: argparse.Namespace,
+    logger: AppLogger,
+    progress: Optional[JsonLinesSink],
+    journal: Optional[BatchJournal] = None,
+) -> int:
+    """
+    引数に従って変換し、終了コードを返す（mainの本体）
+    """
+    config_reader = ConfigReader(logger)
+    options = config_reader.read_options(args.config)
+    options.update(_options_from_args(args))
+    try:
+        converter = MovieConverter(
+            logger,
+            conversion_cache=None if args.no_cache else ConversionCache(),
+            options=options,
+            profile_dir=args.profile_dir,
+            segment_workers=args.segment_workers,
+            memory_budget=args.memory_budget,
+            journal=journal,
+            worker_max_jobs=args.worker_max_jobs or None,
+            file_options=config_reader.read_file_options(args.config),
+            progress=progress,
+        )
+    except ValueError as e:
+        logger.error(f"変換オプションが不正です: {str(e)}")
+        return 2
+
+    extensions = _normalize_extensions(args.extensions or VIDEO_EXTENSIONS)
+    if args.watch:
+        return _watch(args, converter, logger, extensions)
+
+    manifest_reader = ManifestReader(logger)
+    jobs: Iterable[Tuple]
+    if args.manifest is not None:
+        try:
+            manifest_jobs = manifest_reader.read_jobs(args.manifest)
+        except (OSError, ValueError) as e:
+            logger.error(f"マニフェストを開けません: {str(e)}")
+            return 2
+        jobs = _manifest_jobs(manifest_jobs, args.manifest, args.output_dir)
+    else:
+        discovered = discover(
+            args.inputs,
+            extensions=extensions,
+            recursive=args.recursive,
+        )
+        jobs = _jobs(discovered, args.output_dir)
+    if args.dry_run:
+        return _dry_run(args, converter, logger, jobs)
+
+    start = time.perf_counter()
+    results: List[ConversionResult] = []
+    for result in converter.convert_iter(
+        _creating_output_dirs(jobs), max_workers=args.jobs
+    ):
+        results.append(result)
+        if result.success:
+            logger.info(f"✅ 変換成功: {result.input_path} -> {result.output_path}")
+        else:
+            logger.error(f"❌ 変換失敗: {result.input_path}")
+
+    summary = _summary(results, time.perf_counter() - start)
+    # ログはリスナースレッドが書き出すため、サマリーより前に出し切っておく
+    logger.flush()
+    _write_summary(args.summary, summary)
+
+    if not results and manifest_reader.errors == 0:
+        logger.warning("変換対象ファイルが見つかりませんでした")
+        return 2
+    logger.info(f"変換完了: {summary['succeeded']}/{summary['total']} 成功")
+    if manifest_reader.errors:
+        logger.error(
+            f"マニフェストの不正な{manifest_reader.errors}行を読み飛ばしました"
+        )
+    return 0 if summary["failed"] == 0 and manifest_reader.errors == 0 else 1
+
+
+def _watch(
+    args: argparse.Namespace,
+    converter: MovieConverter,
+    logger: AppLogger,
+    extensions: Tuple[str, ...],
+) -> int:
+    """
+    ディレクトリを監視し、追加・更新された動画ファイルを変換し続ける
+
+    SIGINT・SIGTERMを受け取ると新しいジョブの受け付けをやめ、変換中のファイルを終えてから終了する
+
+    Returns:
+        int: 終了コード（0: 正常終了, 2: 監視対象がディレクトリでない）
+    """
+    if len(args.inputs) != 1 or not os.path.isdir(args.inputs[0]):
+        logger.error("--watchには監視するディレクトリを1つだけ指定してください")
+        return 2
+
+    watcher = FolderWatcher(
+        args.inputs[0],
+        output_dir=args.output_dir,
+        extensions=extensions,
+        recursive=args.recursive,
+        settle_time=args.settle,
+        poll_interval=args.poll_interval,
+        use_inotify=not args.polling,
+    )
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        # シグナルハンドラー内ではログを出力せず（ロックの競合を避けるため）、終了要求だけを記録する
+        stop.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    logger.info(f"監視を開始します: {args.inputs[0]}")
+    for result in converter.convert_iter(watcher.jobs(stop), max_workers=args.jobs):
+        if result.success:
+            logger.info(f"✅ 変換成功: {result.input_path} -> {result.output_path}")
+        else:
+            logger.error(f"❌ 変換失敗: {result.input_path}")
+    logger.info("監視を終了しました（変換中だったファイルは完了済み）")
+    return 0
+
+
+def _dry_run(
+    args: argparse.Namespace,
+    converter: MovieConverter,
+    logger: AppLogger,
+    jobs: Iterable[Tuple],
+) -> int:
+    """
+    変換せずに一括変換の所要時間と出力サイズを見積もり、サマリーに出力する
+
+    Returns:
+        int: 終了コード（0: 見積もり完了, 2: 変換対象なし）
+    """
+    jobs = list(jobs)
+    plan = converter.plan(jobs, max_workers=args.jobs)
+    for job in plan.jobs:
+        if job.error is not None:
+            logger.warning(f"見積もれませんでした: {job.input_path}: {job.error}")
+    summary = {"dry_run": True}
+    summary.update(plan.to_dict())
+    logger.flush()
+    _write_summary(args.summary, summary)
+
+    if not jobs:
+        logger.warning("変換対象ファイルが見つかりませんでした")
+        return 2
+    logger.info(
+        f"見積もり: {len(jobs)}ファイル, {plan.seconds:.1f}秒（{plan.workers}プロセス）, "
+        f"出力 約{plan.bytes / 1e6:.1f}MB"
+    )
+    return 0
+
+
+def _options_from_args(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    コマンドラインで指定された変換オプションを取り出す（未指定の項目は含めない）
+    """
+    options = {
+        "fps": args.fps,
+        "width": args.width,
+        "max_side": args.max_side,
+        "start": args.start,
+        "end": args.end,
+        "duration": args.duration,
+        "max_bytes": args.max_bytes,
+        "colors": args.colors,
+        "quality": args.quality,
+        "optimize": args.optimize,
+        "dedup": args.dedup,
+        "dedup_threshold": args.dedup_threshold,
+        "dither": args.dither,
+    }
+    return {name: value for name, value in options.items() if value is not None}
+
+
+def _byte_size(value: str) -> int:
+    """
+    バイト数を表す文字列（K, M, Gの接尾辞は1000倍単位）を整数に変換する
+    """
+    units = {"K": 10**3, "M": 10**6, "G": 10**9}
+    text = value.strip().upper().rstrip("B")
+    scale = 1
+    if text[-1:] in units:
+        scale = units[text[-1]]
+        text = text[:-1]
+    try:
+        size = int(float(text) * scale)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"バイト数として解釈できません: {value}")
+    if size <= 0:
+        raise argparse.ArgumentTypeError(f"正のバイト数を指定してください: {value}")
+    return size
+
+
+def _normalize_extensions(extensions: Iterable[str]) -> Tuple[str, ...]:
+    """
+    拡張子を「.」始まりにそろえる（mov, .MOVのどちらの指定も受け付ける）
+    """
+    return tuple(
+        extension if extension.startswith(".") else f".{extension}"
+        for extension in extensions
+    )
+
+
+def _jobs(
+    discovered: Iterable[DiscoveredFile], output_dir: Optional[str]
+) -> Iterator[Tuple[str, str]]:
+    """
+    列挙した動画ファイルを (入力パス, 出力パス) の組に変換する
+    """
+    for item in discovered:
+        yield item.path, output_path_for(item, output_dir)
+
+
+def _manifest_jobs(
+    manifest_jobs: Iterable[ManifestJob], manifest_path: str, output_dir: Optional[str]
+) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """
+    マニフェストのジョブを (入力パス, 出力パス, 変換オプション) の組に変換する
+
+    出力パスが未指定のジョブは、マニフェストのあるディレクトリを基準にディレクトリから列挙した場合と同じ場所に出力する
+    """
+    root = os.path.dirname(os.path.abspath(manifest_path))
+    for job in manifest_jobs:
+        output_path = job.output_path
+        if output_path is None:
+            output_path = output_path_for(
+                DiscoveredFile(job.input_path, root), output_dir
+            )
+        yield job.input_path, output_path, job.options
+
+
+def _creating_output_dirs(jobs: Iterable[Tuple]) -> Iterator[Tuple]:
+    """
+    ジョブをそのまま返しつつ、出力先のディレクトリを必要になった時点で作成する
+    """
+    for job in jobs:
+        os.makedirs(os.path.dirname(job[1]) or os.curdir, exist_ok=True)
+        yield job
+
+
+def _summary(results: List[ConversionResult], elapsed: float) -> Dict[str, Any]:
+    """
+    変換結果を機械可読なサマリーにまとめる
+    """
+    succeeded = sum(1 for result in results if result.success)
+    return {
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "cached": sum(1 for result in results if result.cached),
+        "resumed": sum(1 for result in results if result.resumed),
+        "elapsed_s": round(elapsed, 3),
+        "results": [result._asdict() for result in results],
+    }
+
+
+def _write_summary(destination: str, summary: Dict[str, Any]):
+    """
+    サマリーをJSONで出力する
+    """
+    if destination == "-":
+        json.dump(summary, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+        return
+    with open(destination, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,11 +4,36 @@
 MOV_FILE_PATHS = [
     # ここに変換したい動画ファイルのパスを記載してください[MP4, MOV]
     # 例: "/Users/username/Movies/example.mov",
+    # ファイルごとに変換オプションを指定する場合は辞書で記載（CONVERSION_OPTIONSに重ねる）
+    # 例: {"path": "/Users/username/Movies/meeting.mov", "start": "12:30", "duration": 5},
 ]
 
+# 大量のファイルを変換する場合のマニフェストファイルのパス（.jsonl, .ndjson, .csv）
+# 1行に1ジョブ（path・output・変換オプション）を記載する。指定した場合はMOV_FILE_PATHSの代わりに使用
+# 例: MANIFEST = "/Users/username/Movies/jobs.jsonl"
+MANIFEST = None
+
 # 変換オプション
 CONVERSION_OPTIONS = {
     "fps": 15,  # GIFのフレームレート
-    "optimize": True,  # GIF最適化
-    "quality": 80,  # 品質 (1-100)
+    "optimize": True,  # GIF最適化（前フレームとの差分のみを書き出す）
+    "quality": 80,  # 品質 (1-100)。パレットの色数に反映
+    "colors": 256,  # パレットの最大色数 (2-256)
+    "width": None,  # 出力幅（ピクセル）。Noneの場合は元の幅
+    "max_side": None,  # 出力の長辺の上限（ピクセル）。Noneの場合は制限なし
+    "start": 0,  # 切り出しの開始時刻（秒、または"mm:ss"・"hh:mm:ss"）
+    "end": None,  # 切り出しの終了時刻。Noneの場合は最後まで
+    "duration": None,  # 切り出す長さ（秒）。endと同時には指定できない
+    "max_bytes": None,  # 出力ファイルサイズの上限（バイト）。Noneの場合は制限なし
+    "dedup": True,  # 連続する同一フレームをまとめ、表示時間を合計する
+    "dedup_threshold": 0,  # 同じとみなす画素値の差の上限 (0-255)。0の場合は完全一致のみ
+    "dither": "none",  # ディザリングの方式（none, bayer, floyd_steinberg）
 }
+
+# 段階ごとの所要時間（プロファイル）の保存先ディレクトリ
+# Noneの場合は計測しない。指定するとファイルごとのJSONと一括変換のサマリー（batch_summary.json）を保存
+PROFILE_DIR = None
+
+# 一括変換の各ジョブの状態を記録するジャーナルファイルのパス
+# Noneの場合は記録しない。指定すると、前回完了したファイル（入力・変換オプション・出力が変わっていないもの）をスキップして再開する
+BATCH_JOURNAL = None
@@ -4,14 +4,23 @@
 
 import os
 import importlib.util
-from typing import List
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Tuple
 
 from mov2gif.app_logger import AppLogger
+from mov2gif.conversion_options import resolve_options
+
+# 設定ファイルを識別するキー（絶対パス, (更新時刻, サイズ)）。ファイルがない場合は更新時刻・サイズがNone
+_ConfigKey = Tuple[str, Optional[Tuple[int, int]]]
 
 
 class ConfigReader:
     """
     config.pyファイルから設定を読み込むクラス
+
+    設定ファイルはパスごとに1回だけ実行し、各read_*メソッドで読み込んだモジュールを共有する。
+    そのため、設定ファイルの副作用やMOV_FILE_PATHSの検証エラーのログは1回しか起きない
+    （ファイルが書き換えられた場合は実行し直す）
     """
 
     def __init__(self, logger: AppLogger):
@@ -19,28 +28,229 @@ class ConfigReader:
         ConfigReaderのコンストラクタ
         """
         self.default_config_path = os.path.join(
-            os.path.dirname(os.path.dirname(__file__)), "config", "config.py"
+            os.path.dirname(__file__), "config", "config.py"
         )
         self.logger = logger
+        # 読み込んだ設定ファイル {_resolve_pathのキー: モジュール（読み込めなかった場合はNone）}
+        self._modules: Dict[_ConfigKey, Optional[ModuleType]] = {}
+        # 検証済みのMOV_FILE_PATHSの要素 {_resolve_pathのキー: 要素の組のリスト}
+        self._entries: Dict[_ConfigKey, List[Tuple[str, Dict[str, Any]]]] = {}
 
     def read_config(self, config_path: str = "") -> List[str]:
         """
         設定ファイルから動画ファイルのパスリストを読み込む
 
+        MOV_FILE_PATHSの要素はパスの文字列か、"path"とそのファイルだけに適用する変換オプションを持つ辞書
+
         Args:
             config_path (str, optional): 設定ファイルのパス。デフォルトはNone (デフォルトの場所を使用)
 
         Returns:
             List[str]: 動画ファイルパスのリスト。エラー時や設定がない場合は空リストを返す
         """
+        return [path for path, _ in self._read_entries(config_path)]
+
+    def read_file_options(self, config_path: str = "") -> Dict[str, Dict[str, Any]]:
+        """
+        設定ファイルのMOV_FILE_PATHSから、ファイルごとの変換オプションを読み込む
+
+        Args:
+            config_path (str, optional): 設定ファイルのパス。デフォルトはNone (デフォルトの場所を使用)
+
+        Returns:
+            Dict[str, Dict[str, Any]]: {ファイルパス: CONVERSION_OPTIONSに重ねる変換オプション}。辞書で指定した要素のみ
+        """
+        return {
+            path: options
+            for path, options in self._read_entries(config_path)
+            if options
+        }
+
+    def _read_entries(self, config_path: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        MOV_FILE_PATHSの要素を (パス, ファイルごとの変換オプション) の組にして読み込む
+
+        Args:
+            config_path (str): 設定ファイルのパス。空の場合はデフォルトの場所を使用
+
+        Returns:
+            List[Tuple[str, Dict[str, Any]]]: 要素の組のリスト。不正な要素はエラーログを出して除く
+        """
+        key = self._resolve_path(config_path)
+        if key not in self._entries:
+            self._entries[key] = self._validate_entries(self._load_module(config_path))
+        return self._entries[key]
+
+    def _validate_entries(
+        self, config_module: Optional[ModuleType]
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        _read_entriesの本体。読み込んだモジュールのMOV_FILE_PATHSを検証する
+        """
+        if config_module is None:
+            return []
+
+        # MOV_FILE_PATHSキーが存在するか確認
+        if not hasattr(config_module, "MOV_FILE_PATHS"):
+            self.logger.warning("設定ファイルにMOV_FILE_PATHSが定義されていません")
+            return []
+
+        # パスのリストを取得
+        file_paths = getattr(config_module, "MOV_FILE_PATHS")
+
+        # リストであることを確認
+        if not isinstance(file_paths, list):
+            self.logger.error("MOV_FILE_PATHSはリスト形式である必要があります")
+            return []
+
+        entries = []
+        for entry in file_paths:
+            if isinstance(entry, str):
+                entries.append((entry, {}))
+                continue
+            if not isinstance(entry, dict) or not isinstance(entry.get("path"), str):
+                self.logger.error(
+                    f"MOV_FILE_PATHSの要素はパスか、pathを含む辞書である必要があります: {entry}"
+                )
+                continue
+            options = {name: value for name, value in entry.items() if name != "path"}
+            try:
+                resolve_options(options)
+            except ValueError as e:
+                self.logger.error(
+                    f"変換オプションが不正です: {entry['path']}: {str(e)}"
+                )
+                continue
+            entries.append((entry["path"], options))
+        return entries
+
+    def read_options(self, config_path: str = "") -> Dict[str, Any]:
+        """
+        設定ファイルから変換オプション（CONVERSION_OPTIONS）を読み込む
+
+        Args:
+            config_path (str, optional): 設定ファイルのパス。デフォルトはNone (デフォルトの場所を使用)
+
+        Returns:
+            Dict[str, Any]: 変換オプションの辞書。エラー時や設定がない場合は空の辞書を返す（既定値で変換される）
+        """
+        config_module = self._load_module(config_path)
+        if config_module is None or not hasattr(config_module, "CONVERSION_OPTIONS"):
+            return {}
+
+        options = getattr(config_module, "CONVERSION_OPTIONS")
+
+        # 辞書であることを確認
+        if not isinstance(options, dict):
+            self.logger.error("CONVERSION_OPTIONSは辞書形式である必要があります")
+            return {}
+
+        try:
+            resolve_options(options)
+        except ValueError as e:
+            self.logger.error(f"CONVERSION_OPTIONSが不正です: {str(e)}")
+            return {}
+
+        return options
+
+    def read_profile_dir(self, config_path: str = "") -> Optional[str]:
+        """
+        設定ファイルからプロファイルの保存先（PROFILE_DIR）を読み込む
+
+        Args:
+            config_path (str, optional): 設定ファイルのパス。デフォルトはNone (デフォルトの場所を使用)
+
+        Returns:
+            Optional[str]: プロファイルの保存先。エラー時や設定がない場合はNone（計測しない）
+        """
+        return self._read_path_setting("PROFILE_DIR", config_path)
+
+    def read_journal_path(self, config_path: str = "") -> Optional[str]:
+        """
+        設定ファイルから一括変換のジャーナルファイルのパス（BATCH_JOURNAL）を読み込む
+
+        Args:
+            config_path (str, optional): 設定ファイルのパス。デフォルトはNone (デフォルトの場所を使用)
+
+        Returns:
+            Optional[str]: ジャーナルファイルのパス。エラー時や設定がない場合はNone（記録しない）
+        """
+        return self._read_path_setting("BATCH_JOURNAL", config_path)
+
+    def read_manifest_path(self, config_path: str = "") -> Optional[str]:
+        """
+        設定ファイルからマニフェストファイルのパス（MANIFEST）を読み込む
+
+        Args:
+            config_path (str, optional): 設定ファイルのパス。デフォルトはNone (デフォルトの場所を使用)
+
+        Returns:
+            Optional[str]: マニフェストファイルのパス。エラー時や設定がない場合はNone（MOV_FILE_PATHSを使用）
+        """
+        return self._read_path_setting("MANIFEST", config_path)
+
+    def _read_path_setting(self, name: str, config_path: str) -> Optional[str]:
+        """
+        設定ファイルからパスを表す文字列の設定を読み込む
+
+        Args:
+            name (str): 設定の名前
+            config_path (str): 設定ファイルのパス。空の場合はデフォルトの場所を使用
+
+        Returns:
+            Optional[str]: 設定の値。エラー時や設定がない場合はNone
+        """
+        config_module = self._load_module(config_path)
+        value = getattr(config_module, name, None)
+        if value is None:
+            return None
+
+        # 文字列であることを確認
+        if not isinstance(value, str):
+            self.logger.error(f"{name}は文字列である必要があります")
+            return None
+
+        return value
+
+    def _resolve_path(self, config_path: str) -> _ConfigKey:
+        """
+        読み込んだ結果を共有するためのキーとして、設定ファイルの絶対パスと更新時刻・サイズを求める
+
+        同じインスタンスで設定ファイルを書き換えて読み直した場合は、別のキーになるため実行し直す
+        """
         # パスが指定されていない場合はデフォルトパスを使用
         if config_path is None or config_path == "":
             config_path = self.default_config_path
+        path = os.path.realpath(config_path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return path, None
+        return path, (stat.st_mtime_ns, stat.st_size)
+
+    def _load_module(self, config_path: str) -> Optional[ModuleType]:
+        """
+        設定ファイルをPythonモジュールとして読み込む（同じパスは2回目以降は実行せずに前回の結果を返す）
+
+        Args:
+            config_path (str): 設定ファイルのパス。空の場合はデフォルトの場所を使用
+
+        Returns:
+            Optional[ModuleType]: 読み込んだモジュール。エラー時はNone
+        """
+        key = self._resolve_path(config_path)
+        if key not in self._modules:
+            self._modules[key] = self._exec_module(config_path or key[0])
+        return self._modules[key]
 
+    def _exec_module(self, config_path: str) -> Optional[ModuleType]:
+        """
+        _load_moduleの本体。設定ファイルを実行してモジュールにする
+        """
         # 設定ファイルが存在するか確認
         if not os.path.exists(config_path):
             self.logger.warning(f"設定ファイルが見つかりません: {config_path}")
-            return []
+            return None
 
         try:
             # 動的にPythonモジュールを読み込む
@@ -49,28 +259,14 @@ class ConfigReader:
                 self.logger.error(
                     f"設定ファイルの読み込みに失敗しました: {config_path}"
                 )
-                return []
+                return None
 
             config_module = importlib.util.module_from_spec(spec)
             spec.loader.exec_module(config_module)
-
-            # MOV_FILE_PATHSキーが存在するか確認
-            if not hasattr(config_module, "MOV_FILE_PATHS"):
-                self.logger.warning("設定ファイルにMOV_FILE_PATHSが定義されていません")
-                return []
-
-            # パスのリストを取得
-            file_paths = getattr(config_module, "MOV_FILE_PATHS")
-
-            # リストであることを確認
-            if not isinstance(file_paths, list):
-                self.logger.error("MOV_FILE_PATHSはリスト形式である必要があります")
-                return []
-
-            return file_paths
+            return config_module
 
         except Exception as e:
             self.logger.error(
                 f"設定ファイルの読み込み中にエラーが発生しました: {str(e)}"
             )
-            return []
+            return None
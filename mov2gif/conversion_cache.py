@@ -0,0 +1,199 @@
+"""
+変換済みGIFを入力内容と変換オプションをキーに保存し、再変換を省略するためのモジュール
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+from mov2gif.palette_cache import default_cache_dir
+
+# キャッシュに保持するGIFの合計サイズの既定上限（バイト）
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+_INDEX_VERSION = 1
+
+
+class ConversionCache:
+    """
+    変換結果のGIFをコンテンツアドレス（キャッシュキー）で管理するクラス
+
+    キャッシュの状態はindex.jsonに記録し、合計サイズが上限を超えた場合は
+    最後に使われた時刻が古いものから削除する（LRU）。
+    インデックスは一時ファイル経由で置き換えるが、プロセス間の排他制御は行わないため、
+    読み書きは1つのプロセス（一括変換の親プロセス）からのみ行うこと
+    """
+
+    def __init__(
+        self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        """
+        ConversionCacheのコンストラクタ
+
+        Args:
+            cache_dir (str, optional): GIFとインデックスの保存先。未指定の場合はデフォルトのキャッシュディレクトリ配下
+            max_bytes (int, optional): 保持するGIFの合計サイズの上限（バイト）
+        """
+        self.cache_dir = cache_dir or os.path.join(default_cache_dir(), "gifs")
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(self.cache_dir, "index.json")
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def restore(self, key: str, output_path: str) -> bool:
+        """
+        キャッシュ済みのGIFを出力先に復元する
+
+        出力先に記録時と同じGIFが残っている場合はそのまま再利用し、
+        そうでない場合はキャッシュからコピーする
+
+        Args:
+            key (str): キャッシュキー
+            output_path (str): 出力GIFファイルのパス
+
+        Returns:
+            bool: キャッシュから復元できた場合はTrue、キャッシュがない場合はFalse
+        """
+        entries = self._load_entries()
+        entry = entries.get(key)
+        if entry is None:
+            return False
+
+        artifact = self._artifact_path(key)
+        if not os.path.exists(artifact):
+            del entries[key]
+            self._save_entries()
+            return False
+
+        if not self._is_same_output(entry, output_path):
+            _copy_atomic(artifact, output_path)
+            entry.update(_output_stat(output_path))
+
+        entry["last_used"] = time.time()
+        self._save_entries()
+        return True
+
+    def store(self, key: str, output_path: str):
+        """
+        変換結果のGIFをキャッシュに保存し、上限を超えた分を古いものから削除する
+
+        Args:
+            key (str): キャッシュキー
+            output_path (str): 変換結果のGIFファイルのパス
+        """
+        size = os.path.getsize(output_path)
+        if size > self.max_bytes:
+            return
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        _copy_atomic(output_path, self._artifact_path(key))
+
+        entries = self._load_entries()
+        entries[key] = {"size": size, "last_used": time.time()}
+        entries[key].update(_output_stat(output_path))
+        self._evict(keep=key)
+        self._save_entries()
+
+    def total_bytes(self) -> int:
+        """
+        キャッシュに保持しているGIFの合計サイズを返す
+
+        Returns:
+            int: 合計サイズ（バイト）
+        """
+        return sum(entry["size"] for entry in self._load_entries().values())
+
+    def _evict(self, keep: str):
+        """
+        合計サイズが上限以下になるまで、最終使用時刻の古いエントリから削除する
+        """
+        entries = self._load_entries()
+        total = self.total_bytes()
+        for key in sorted(entries, key=lambda k: entries[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= entries.pop(key)["size"]
+            try:
+                os.remove(self._artifact_path(key))
+            except OSError:
+                pass
+
+    def _is_same_output(self, entry: Dict[str, Any], output_path: str) -> bool:
+        """
+        出力先のファイルが記録時から変更されていないかを確認する
+        """
+        try:
+            return _output_stat(output_path) == {
+                "output_path": entry.get("output_path"),
+                "output_size": entry.get("output_size"),
+                "output_mtime_ns": entry.get("output_mtime_ns"),
+            }
+        except OSError:
+            return False
+
+    def _load_entries(self) -> Dict[str, Dict[str, Any]]:
+        """
+        インデックスを読み込む（読み込み済みの場合はメモリ上の内容を返す）
+        """
+        if self._entries is None:
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+                if index.get("version") != _INDEX_VERSION:
+                    raise ValueError("unsupported index version")
+                self._entries = dict(index["entries"])
+            except (OSError, ValueError, KeyError, TypeError):
+                self._entries = {}
+        return self._entries
+
+    def _save_entries(self):
+        """
+        インデックスを一時ファイル経由で書き出す
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": _INDEX_VERSION, "entries": self._load_entries()}, f
+                )
+            os.replace(temp_path, self.index_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _artifact_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.gif")
+
+
+def _output_stat(path: str) -> Dict[str, Any]:
+    """
+    出力ファイルの同一性判定に使うパス・サイズ・更新時刻を返す
+    """
+    stat = os.stat(path)
+    return {
+        "output_path": os.path.abspath(path),
+        "output_size": stat.st_size,
+        "output_mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def _copy_atomic(source: str, destination: str):
+    """
+    一時ファイルにコピー（権限も複製）してから置き換えることで、途中までのファイルが残らないようにする
+    """
+    directory = os.path.dirname(os.path.abspath(destination))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.copy(source, temp_path)
+        os.replace(temp_path, destination)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
@@ -0,0 +1,176 @@
+"""
+変換オプションの既定値と検証・解釈を行うためのモジュール
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+from mov2gif.quantizer import DITHER_MODES
+
+# 変換オプションの既定値（config.pyのCONVERSION_OPTIONSで上書きできる）
+DEFAULT_CONVERSION_OPTIONS: Dict[str, Any] = {
+    "fps": 15,  # GIFのフレームレート（入力より高くはしない）
+    "optimize": False,  # 前フレームとの差分のみを書き出す（画面収録向け）
+    "quality": 100,  # 品質 (1-100)。パレットの色数に反映する
+    "colors": 256,  # パレットの最大色数 (2-256)
+    "width": None,  # 出力幅（ピクセル）。高さは縦横比を保って決める
+    "max_side": None,  # 出力の長辺の上限（ピクセル）
+    "start": 0,  # 切り出しの開始時刻（秒、または"mm:ss"・"hh:mm:ss"）
+    "end": None,  # 切り出しの終了時刻。Noneの場合は最後まで
+    "duration": None,  # 切り出す長さ（秒）。endと同時には指定できない
+    "max_bytes": None,  # 出力ファイルサイズの上限（バイト）。指定するとfps・解像度・色数を下げて収める
+    "dedup": True,  # 直前と同じフレームを取り除き、表示時間を前のフレームに加算する
+    "dedup_threshold": 0,  # 同じとみなす画素値の差の上限 (0-255)。0の場合は完全一致のみ
+    "dither": "none",  # ディザリングの方式（none, bayer, floyd_steinberg）
+}
+
+
+def resolve_options(options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    既定値に指定されたオプションを重ね、値を検証する
+
+    Args:
+        options (Dict[str, Any], optional): 上書きするオプション
+
+    Returns:
+        Dict[str, Any]: 既定値を含むすべてのオプション
+
+    Raises:
+        ValueError: 未知のオプション名、または範囲外の値が指定された場合
+    """
+    resolved = dict(DEFAULT_CONVERSION_OPTIONS)
+    for name, value in (options or {}).items():
+        if name not in DEFAULT_CONVERSION_OPTIONS:
+            raise ValueError(f"未知の変換オプションです: {name}")
+        resolved[name] = value
+
+    if not _is_number(resolved["fps"]) or resolved["fps"] <= 0:
+        raise ValueError(f"fpsは正の数である必要があります: {resolved['fps']}")
+    if not _is_int(resolved["quality"]) or not 1 <= resolved["quality"] <= 100:
+        raise ValueError(
+            f"qualityは1-100の整数である必要があります: {resolved['quality']}"
+        )
+    if not _is_int(resolved["colors"]) or not 2 <= resolved["colors"] <= 256:
+        raise ValueError(
+            f"colorsは2-256の整数である必要があります: {resolved['colors']}"
+        )
+    for name in ("width", "max_side", "max_bytes"):
+        value = resolved[name]
+        if value is not None and (not _is_int(value) or value <= 0):
+            raise ValueError(f"{name}は正の整数である必要があります: {value}")
+    threshold = resolved["dedup_threshold"]
+    if not _is_int(threshold) or not 0 <= threshold <= 255:
+        raise ValueError(
+            f"dedup_thresholdは0-255の整数である必要があります: {threshold}"
+        )
+    if resolved["dither"] not in DITHER_MODES:
+        raise ValueError(
+            f"ditherは{', '.join(DITHER_MODES)}のいずれかである必要があります: {resolved['dither']}"
+        )
+    for name in ("start", "end", "duration"):
+        if resolved[name] is not None:
+            resolved[name] = parse_time(resolved[name])
+    if resolved["start"] is None or resolved["start"] < 0:
+        raise ValueError(f"startは0以上である必要があります: {resolved['start']}")
+    if resolved["end"] is not None and resolved["duration"] is not None:
+        raise ValueError("endとdurationは同時に指定できません")
+    if resolved["end"] is not None and resolved["end"] <= resolved["start"]:
+        raise ValueError(f"endはstartより後である必要があります: {resolved['end']}")
+    if resolved["duration"] is not None and resolved["duration"] <= 0:
+        raise ValueError(
+            f"durationは正の数である必要があります: {resolved['duration']}"
+        )
+    resolved["optimize"] = bool(resolved["optimize"])
+    resolved["dedup"] = bool(resolved["dedup"])
+    return resolved
+
+
+def parse_time(value: Any) -> float:
+    """
+    秒数、または"ss"・"mm:ss"・"hh:mm:ss"形式の文字列を秒数に変換する
+
+    Args:
+        value (Any): 秒数（数値）または時刻の文字列
+
+    Returns:
+        float: 秒数
+
+    Raises:
+        ValueError: 時刻として解釈できない場合
+    """
+    if _is_number(value):
+        return float(value)
+    if not isinstance(value, str) or not 1 <= len(value.split(":")) <= 3:
+        raise ValueError(f"時刻として解釈できません: {value}")
+    seconds = 0.0
+    for part in value.strip().split(":"):
+        try:
+            number = float(part)
+        except ValueError:
+            raise ValueError(f"時刻として解釈できません: {value}")
+        if number < 0:
+            raise ValueError(f"時刻として解釈できません: {value}")
+        seconds = seconds * 60 + number
+    return seconds
+
+
+def clip_bounds(options: Dict[str, Any]) -> Tuple[float, Optional[float]]:
+    """
+    start・end・durationから切り出す区間を求める
+
+    Args:
+        options (Dict[str, Any]): resolve_optionsで検証済みのオプション
+
+    Returns:
+        Tuple[float, Optional[float]]: (開始時刻, 終了時刻)（秒）。終了時刻がNoneの場合は最後まで
+    """
+    start = options["start"]
+    if options["end"] is not None:
+        return start, options["end"]
+    if options["duration"] is not None:
+        return start, start + options["duration"]
+    return start, None
+
+
+def palette_colors(options: Dict[str, Any]) -> int:
+    """
+    colorsとqualityから実際に使用するパレットの色数を求める
+
+    Args:
+        options (Dict[str, Any]): resolve_optionsで検証済みのオプション
+
+    Returns:
+        int: パレットの色数 (2-256)
+    """
+    return max(2, int(round(options["colors"] * options["quality"] / 100)))
+
+
+def output_size(
+    source_size: Tuple[int, int], options: Dict[str, Any]
+) -> Tuple[int, int]:
+    """
+    入力の解像度とwidth・max_sideから出力の解像度を求める（拡大はしない）
+
+    Args:
+        source_size (Tuple[int, int]): 入力の解像度 (幅, 高さ)
+        options (Dict[str, Any]): resolve_optionsで検証済みのオプション
+
+    Returns:
+        Tuple[int, int]: 出力の解像度 (幅, 高さ)
+    """
+    width, height = source_size
+    scale = 1.0
+    if options["width"] is not None:
+        scale = min(scale, options["width"] / width)
+    if options["max_side"] is not None:
+        scale = min(scale, options["max_side"] / max(width, height))
+    if scale >= 1.0:
+        return width, height
+    return max(1, int(round(width * scale))), max(1, int(round(height * scale)))
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
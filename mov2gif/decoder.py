@@ -0,0 +1,301 @@
+"""
+ffmpegで動画をデコードし、RGBフレームを逐次取り出すためのモジュール
+"""
+
+import subprocess
+import threading
+from collections import deque
+from typing import IO, Deque, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from imageio_ffmpeg import get_ffmpeg_exe
+
+from mov2gif.media_probe import probe_media
+
+# サンプル間隔がこの秒数以上ならシークで、未満なら1回の連続デコードでサンプリングする
+SEEK_SAMPLE_INTERVAL = 10.0
+
+# ffmpegの標準エラー出力のうち、エラーメッセージとして残す末尾の行数
+STDERR_TAIL_LINES = 50
+
+
+class VideoInfo(NamedTuple):
+    """
+    動画ファイルのメタデータ
+    """
+
+    # 表示上の解像度 (幅, 高さ)。回転メタデータを反映済み
+    size: Tuple[int, int]
+    # フレームレート
+    fps: float
+    # 長さ（秒）
+    duration: float
+
+
+def probe_video(input_path: str) -> VideoInfo:
+    """
+    動画ファイルの解像度・フレームレート・長さを取得する
+
+    MOV/MP4はmoovアトムを直接解析し、それ以外はffmpegで取得する（結果はプロセス内にキャッシュする）
+
+    Args:
+        input_path (str): 入力動画ファイルのパス
+
+    Returns:
+        VideoInfo: 動画ファイルのメタデータ
+
+    Raises:
+        IOError: 動画ストリームが見つからない、または読み込めない場合
+    """
+    info = probe_media(input_path)
+    return VideoInfo(info.size, info.fps, info.duration)
+
+
+class FrameDecoder:
+    """
+    ffmpegのサブプロセスでデコードしたRGBフレームをパイプから逐次読み込むクラス
+
+    フレームレートの変換と縮小はffmpegのフィルター（fps, scale）で行い、
+    音声はデコードしないため、Pythonへ渡るのは出力解像度・出力フレームレート分の画素のみ
+    """
+
+    def __init__(
+        self,
+        input_path: str,
+        size: Tuple[int, int],
+        fps: float,
+        start: float = 0.0,
+        max_frames: Optional[int] = None,
+        duration: Optional[float] = None,
+    ):
+        """
+        FrameDecoderのコンストラクタ
+
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            size (Tuple[int, int]): 出力フレームの解像度 (幅, 高さ)
+            fps (float): 出力フレームレート
+            start (float, optional): デコードを開始する時刻（秒）。入力側でシークする
+            max_frames (int, optional): 出力する最大フレーム数。未指定の場合は最後まで
+            duration (float, optional): startからデコードする長さ（秒）。未指定の場合は最後まで
+        """
+        self.input_path = input_path
+        self.size = (int(size[0]), int(size[1]))
+        self.fps = fps
+        self.start = start
+        self.max_frames = max_frames
+        self.duration = duration
+        self._process: Optional[subprocess.Popen] = None
+        # 標準エラー出力を読み続けるスレッドと、読み込んだ末尾の行
+        self._stderr_thread: Optional[threading.Thread] = None
+        self._stderr_tail: Deque[bytes] = deque(maxlen=STDERR_TAIL_LINES)
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        return self.frames()
+
+    def __enter__(self) -> "FrameDecoder":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def command(self) -> List[str]:
+        """
+        デコードに使うffmpegのコマンドラインを返す
+
+        Returns:
+            List[str]: コマンドライン引数のリスト
+        """
+        width, height = self.size
+        command = [get_ffmpeg_exe(), "-nostdin", "-loglevel", "error"]
+        if self.start > 0:
+            # -iの前に指定して入力側でシークする（直前のキーフレームからのデコードで済む）
+            command += ["-ss", f"{self.start:.6f}"]
+        if self.duration is not None:
+            # 入力側で読み込む長さを制限し、区間の後ろはデコードしない
+            command += ["-t", f"{max(0.0, self.duration):.6f}"]
+        command += [
+            "-i",
+            self.input_path,
+            "-an",
+            "-sn",
+            "-vf",
+            f"fps={self.fps},scale={width}:{height}:flags=area",
+        ]
+        if self.max_frames is not None:
+            command += ["-frames:v", str(self.max_frames)]
+        return command + ["-f", "rawvideo", "-pix_fmt", "rgb24", "-"]
+
+    def frames(self) -> Iterator[np.ndarray]:
+        """
+        フレームを先頭から順に返すジェネレータ
+
+        Yields:
+            np.ndarray: RGBフレーム (高さ, 幅, 3) uint8
+
+        Raises:
+            IOError: ffmpegがエラー終了した場合
+        """
+        width, height = self.size
+        frame_bytes = width * height * 3
+        self._process = subprocess.Popen(
+            self.command(),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=frame_bytes,
+            # 端末からのCtrl+Cで変換途中に止まらないよう別のセッションで起動する（中断時はcloseで終了させる）
+            start_new_session=True,
+        )
+        # 警告が続いてもパイプが詰まってフレームの読み込みが止まらないよう、標準エラー出力は別のスレッドで読み続ける
+        assert self._process.stderr is not None
+        self._stderr_tail.clear()
+        self._stderr_thread = threading.Thread(
+            target=_drain, args=(self._process.stderr, self._stderr_tail), daemon=True
+        )
+        self._stderr_thread.start()
+        try:
+            assert self._process.stdout is not None
+            while True:
+                frame = np.empty((height, width, 3), dtype=np.uint8)
+                read = self._process.stdout.readinto(memoryview(frame).cast("B"))
+                if read != frame_bytes:
+                    break
+                yield frame
+            self._check_exit()
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        ffmpegのサブプロセスを終了する
+        """
+        process = self._process
+        if process is None:
+            return
+        self._process = None
+        if process.poll() is None:
+            process.kill()
+        self._wait(process)
+
+    def _check_exit(self):
+        """
+        ffmpegの終了コードを確認し、異常終了していればエラーにする
+        """
+        assert self._process is not None
+        self._wait(self._process)
+        if self._process.returncode != 0:
+            message = b"".join(self._stderr_tail).decode("utf8", errors="replace")
+            raise IOError(f"ffmpegでのデコードに失敗しました: {message.strip()}")
+
+    def _wait(self, process: subprocess.Popen):
+        """
+        ffmpegの終了と、標準エラー出力を最後まで読み終えるのを待つ
+        """
+        if process.stdout is not None:
+            process.stdout.close()
+        process.wait()
+        if self._stderr_thread is not None:
+            self._stderr_thread.join()
+            self._stderr_thread = None
+
+
+def _drain(stream: IO[bytes], tail: Deque[bytes]):
+    """
+    パイプを終端まで読み、末尾の行だけをtailに残す（FrameDecoderの標準エラー出力用のスレッドで実行する）
+    """
+    with stream:
+        for line in stream:
+            tail.append(line)
+
+
+def decode_frame_at(
+    input_path: str, time: float, size: Tuple[int, int]
+) -> Optional[np.ndarray]:
+    """
+    指定時刻の1フレームだけをシークしてデコードする
+
+    Args:
+        input_path (str): 入力動画ファイルのパス
+        time (float): 取り出す時刻（秒）
+        size (Tuple[int, int]): 出力フレームの解像度 (幅, 高さ)
+
+    Returns:
+        Optional[np.ndarray]: RGBフレーム (高さ, 幅, 3) uint8。時刻が範囲外の場合はNone
+    """
+    width, height = size
+    command = [
+        get_ffmpeg_exe(),
+        "-nostdin",
+        "-loglevel",
+        "error",
+        "-ss",
+        f"{max(0.0, time):.3f}",
+        "-i",
+        input_path,
+        "-an",
+        "-sn",
+        "-frames:v",
+        "1",
+        "-vf",
+        f"scale={width}:{height}:flags=area",
+        "-f",
+        "rawvideo",
+        "-pix_fmt",
+        "rgb24",
+        "-",
+    ]
+    result = subprocess.run(
+        command,
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        check=False,
+        start_new_session=True,
+    )
+    if result.returncode != 0 or len(result.stdout) < width * height * 3:
+        return None
+    data = np.frombuffer(result.stdout, dtype=np.uint8, count=width * height * 3)
+    return data.reshape(height, width, 3)
+
+
+def sample_frames(
+    input_path: str,
+    duration: float,
+    count: int,
+    size: Tuple[int, int],
+    start: float = 0.0,
+) -> Iterator[np.ndarray]:
+    """
+    動画（またはstartからdurationの区間）から等間隔にフレームを取り出す
+
+    シークはキーフレームからのデコードを伴うため、サンプル間隔が短い場合は
+    fpsフィルターで間引きながら1回で連続デコードした方が速い
+
+    Args:
+        input_path (str): 入力動画ファイルのパス
+        duration (float): 動画（区間）の長さ（秒）
+        count (int): 取り出すフレーム数
+        size (Tuple[int, int]): 出力フレームの解像度 (幅, 高さ)
+        start (float, optional): 区間の開始時刻（秒）
+
+    Yields:
+        np.ndarray: RGBフレーム (高さ, 幅, 3) uint8
+    """
+    if duration <= 0:
+        frame = decode_frame_at(input_path, start, size)
+        if frame is not None:
+            yield frame
+        return
+
+    if duration / count >= SEEK_SAMPLE_INTERVAL:
+        for i in range(count):
+            time = start + duration * (i + 0.5) / count
+            frame = decode_frame_at(input_path, time, size)
+            if frame is not None:
+                yield frame
+        return
+
+    with FrameDecoder(
+        input_path, size, count / duration, start=start, duration=duration
+    ) as decoder:
+        yield from decoder
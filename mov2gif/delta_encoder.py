@@ -0,0 +1,72 @@
+"""
+前フレームとの差分領域だけを書き出すフレーム間差分エンコードのモジュール
+"""
+
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# GIF89aのdisposal method: 描画結果を残したまま次フレームを重ねる
+DISPOSAL_NONE = 1
+
+
+class DeltaFrame(NamedTuple):
+    """
+    差分エンコード後の1フレーム
+    """
+
+    # 書き出すインデックス配列 (高さ, 幅) uint8
+    indices: np.ndarray
+    # 論理画面上の描画位置 (x, y)
+    offset: Tuple[int, int]
+    # 透過色のパレットインデックス（全面フレームの場合はNone）
+    transparency: Optional[int]
+
+
+class DeltaEncoder:
+    """
+    各フレームを前フレームと比較し、変化した矩形領域のみに切り詰めるクラス
+
+    矩形内で変化していない画素は透過色に置き換えるため、前フレームの描画結果が
+    そのまま見える。出力フレームはすべてdisposal=1（破棄しない）で重ねる前提
+    """
+
+    def __init__(self, transparent_index: int):
+        """
+        DeltaEncoderのコンストラクタ
+
+        Args:
+            transparent_index (int): 透過色として予約するパレットインデックス（通常の色には使われないこと）
+        """
+        self.transparent_index = transparent_index
+        self._previous: Optional[np.ndarray] = None
+
+    def encode(self, indices: np.ndarray) -> DeltaFrame:
+        """
+        1フレームを差分エンコードする
+
+        Args:
+            indices (np.ndarray): 全面のインデックス配列 (高さ, 幅) uint8
+
+        Returns:
+            DeltaFrame: 書き出すフレーム
+        """
+        previous = self._previous
+        self._previous = indices
+        if previous is None or previous.shape != indices.shape:
+            return DeltaFrame(indices, (0, 0), None)
+
+        changed = indices != previous
+        rows = np.flatnonzero(changed.any(axis=1))
+        if len(rows) == 0:
+            # 変化がない場合も表示時間を保つため、1画素の透過フレームを出力する
+            pixel = np.full((1, 1), self.transparent_index, dtype=np.uint8)
+            return DeltaFrame(pixel, (0, 0), self.transparent_index)
+
+        cols = np.flatnonzero(changed[rows[0] : rows[-1] + 1].any(axis=0))
+        top, bottom = int(rows[0]), int(rows[-1]) + 1
+        left, right = int(cols[0]), int(cols[-1]) + 1
+
+        cropped = indices[top:bottom, left:right].copy()
+        cropped[~changed[top:bottom, left:right]] = self.transparent_index
+        return DeltaFrame(cropped, (left, top), self.transparent_index)
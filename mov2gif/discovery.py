@@ -0,0 +1,174 @@
+"""
+ファイル・ディレクトリ・globパターンから変換対象の動画ファイルを逐次列挙するためのモジュール
+"""
+
+import glob
+import os
+from typing import Iterable, Iterator, NamedTuple, Optional, Set, Tuple
+
+# 変換対象とする動画ファイルの拡張子（大文字小文字は区別しない）
+VIDEO_EXTENSIONS: Tuple[str, ...] = (".mov", ".mp4")
+
+_GLOB_CHARS = "*?["
+
+
+class DiscoveredFile(NamedTuple):
+    """
+    列挙した動画ファイル
+    """
+
+    # 動画ファイルのパス
+    path: str
+    # 出力先をミラーリングするときの基準ディレクトリ（pathはこの配下にある）
+    root: str
+
+
+def discover(
+    inputs: Iterable[str],
+    extensions: Iterable[str] = VIDEO_EXTENSIONS,
+    recursive: bool = True,
+) -> Iterator[DiscoveredFile]:
+    """
+    入力に指定されたファイル・ディレクトリ・globパターンから動画ファイルを列挙する
+
+    ディレクトリは走査しながら見つかった順に返すため、巨大なディレクトリツリーでも
+    走査の完了を待たずに変換を始められる。同じファイルは1回だけ返す
+
+    Args:
+        inputs (Iterable[str]): ファイル・ディレクトリ・globパターンのパス
+        extensions (Iterable[str], optional): ディレクトリとglobから列挙する拡張子。明示したファイルには適用しない
+        recursive (bool, optional): サブディレクトリも走査するかどうか
+
+    Yields:
+        DiscoveredFile: 動画ファイルのパスと基準ディレクトリ
+    """
+    suffixes = tuple(extension.lower() for extension in extensions)
+    seen: Set[str] = set()
+
+    for item in inputs:
+        if is_glob_pattern(item):
+            root: Optional[str] = glob_root(item)
+            matches: Iterable[str] = glob.iglob(item, recursive=True)
+        else:
+            root = None
+            matches = [item]
+
+        for match in matches:
+            if os.path.isdir(match):
+                files: Iterable[str] = walk_files(match, suffixes, recursive)
+                base = root or match
+            elif root is not None and not match.lower().endswith(suffixes):
+                continue
+            else:
+                # 明示したファイルは拡張子を問わず対象にする（存在しない場合は変換時にエラーとする）
+                files = [match]
+                base = root or os.path.dirname(match) or os.curdir
+
+            for path in files:
+                key = os.path.abspath(path)
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield DiscoveredFile(path, base)
+
+
+def is_glob_pattern(path: str) -> bool:
+    """
+    パスにglobの特殊文字が含まれているかどうか
+
+    Args:
+        path (str): パス
+
+    Returns:
+        bool: globパターンの場合はTrue
+    """
+    return any(char in path for char in _GLOB_CHARS)
+
+
+def glob_root(pattern: str) -> str:
+    """
+    globパターンのうち特殊文字を含まない先頭のディレクトリ部分を返す
+
+    Args:
+        pattern (str): globパターン（例: videos/**/*.mov）
+
+    Returns:
+        str: 基準ディレクトリ（例: videos）
+    """
+    parts = []
+    head = pattern
+    while head:
+        head, tail = os.path.split(head)
+        if not tail:
+            # ルートディレクトリに到達した
+            parts.append(head)
+            break
+        parts.append(tail)
+    parts.reverse()
+
+    fixed = []
+    for part in parts[:-1]:
+        if is_glob_pattern(part):
+            break
+        fixed.append(part)
+    return os.path.join(*fixed) if fixed else os.curdir
+
+
+def output_path_for(
+    discovered: DiscoveredFile, output_dir: Optional[str] = None
+) -> str:
+    """
+    出力GIFファイルのパスを求める
+
+    Args:
+        discovered (DiscoveredFile): 列挙した動画ファイル
+        output_dir (str, optional): 出力先ディレクトリ。指定した場合は基準ディレクトリからの相対パスを保って配置する
+
+    Returns:
+        str: 出力GIFファイルのパス（未指定の場合は入力ファイルと同じ場所）
+    """
+    if output_dir is None:
+        return os.path.splitext(discovered.path)[0] + ".gif"
+    relative = os.path.relpath(discovered.path, discovered.root)
+    if relative.startswith(os.pardir):
+        relative = os.path.basename(discovered.path)
+    return os.path.join(output_dir, os.path.splitext(relative)[0] + ".gif")
+
+
+def walk_files(
+    directory: str, suffixes: Tuple[str, ...], recursive: bool = True
+) -> Iterator[str]:
+    """
+    os.scandirでディレクトリを深さ優先に走査し、拡張子が一致するファイルを返す
+
+    各ディレクトリ内は名前順に返す。シンボリックリンクのディレクトリはたどらない
+
+    Args:
+        directory (str): 走査するディレクトリ
+        suffixes (Tuple[str, ...]): 小文字の拡張子（例: (".mov", ".mp4")）
+        recursive (bool, optional): サブディレクトリも走査するかどうか
+
+    Yields:
+        str: ファイルのパス
+    """
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name)
+        except OSError:
+            # 読み込めないディレクトリは飛ばす
+            continue
+
+        subdirectories = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.path)
+                elif entry.is_file() and entry.name.lower().endswith(suffixes):
+                    yield entry.path
+            except OSError:
+                continue
+        if recursive:
+            stack.extend(reversed(subdirectories))
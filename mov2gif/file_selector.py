@@ -2,9 +2,6 @@
 ファイル選択ダイアログを表示するためのモジュール
 """
 
-import tkinter as tk
-from tkinter import filedialog
-
 from mov2gif.app_logger import AppLogger
 
 
@@ -27,6 +24,10 @@ class FileSelector:
             str: 選択されたファイルのパス（キャンセル時は空文字列）
         """
         try:
+            # tkinterはダイアログを表示するときだけ読み込む（ヘッドレス環境では不要なため）
+            import tkinter as tk
+            from tkinter import filedialog
+
             # tkinterのルートウィンドウを作成し非表示に
             root = tk.Tk()
             root.withdraw()
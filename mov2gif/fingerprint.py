@@ -0,0 +1,61 @@
+"""
+入力ファイルの内容を高速に識別するフィンガープリントを計算するためのモジュール
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict
+
+# ハッシュ対象としてサンプリングするブロックのサイズと個数
+_BLOCK_SIZE = 64 * 1024
+_BLOCK_COUNT = 3
+
+
+def file_fingerprint(path: str) -> str:
+    """
+    ファイルサイズ・更新時刻・先頭/中央/末尾ブロックのハッシュからフィンガープリントを求める
+
+    ファイル全体を読まないため、巨大な動画ファイルでも一定時間で計算できる
+
+    Args:
+        path (str): 対象ファイルのパス
+
+    Returns:
+        str: 16進数文字列のフィンガープリント
+
+    Raises:
+        OSError: ファイルが存在しない、または読み込めない場合
+    """
+    stat = os.stat(path)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+
+    with open(path, "rb") as f:
+        if stat.st_size <= _BLOCK_SIZE * _BLOCK_COUNT:
+            digest.update(f.read())
+        else:
+            last = stat.st_size - _BLOCK_SIZE
+            for i in range(_BLOCK_COUNT):
+                f.seek(last * i // (_BLOCK_COUNT - 1))
+                digest.update(f.read(_BLOCK_SIZE))
+
+    return digest.hexdigest()
+
+
+def options_key(fingerprint: str, options: Dict[str, Any]) -> str:
+    """
+    フィンガープリントと変換オプションを組み合わせたキャッシュキーを求める
+
+    Args:
+        fingerprint (str): 入力ファイルのフィンガープリント
+        options (Dict[str, Any]): 結果に影響する変換オプション
+
+    Returns:
+        str: 16進数文字列のキャッシュキー
+    """
+    payload = json.dumps(options, sort_keys=True, default=str)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(fingerprint.encode())
+    digest.update(payload.encode())
+    return digest.hexdigest()
@@ -0,0 +1,82 @@
+"""
+連続する同一・ほぼ同一のフレームを1フレームにまとめるためのモジュール
+"""
+
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+import numpy as np
+
+
+class MergedFrame(NamedTuple):
+    """
+    連続する重複をまとめたフレーム
+    """
+
+    # 表示するRGBフレーム (高さ, 幅, 3) uint8
+    frame: np.ndarray
+    # まとめたフレーム数（自身を含む）。表示時間はこの倍数になる
+    count: int
+
+
+def merge_duplicates(
+    frames: Iterable[np.ndarray],
+    threshold: int = 0,
+    max_count: Optional[int] = None,
+) -> Iterator[MergedFrame]:
+    """
+    直前に残したフレームと同じ（またはほぼ同じ）フレームを取り除き、その数を残したフレームに加算する
+
+    比較は最後に残したフレームに対して行うため、少しずつ変化する場合でも
+    表示内容のずれはthresholdを超えない
+
+    Args:
+        frames (Iterable[np.ndarray]): RGBフレームのイテラブル
+        threshold (int, optional): 同じとみなす画素値の差の上限（全画素・全チャンネルの最大値）。0の場合は完全一致のみ
+        max_count (int, optional): 1フレームにまとめる最大数（GIFの表示時間の上限を超えないようにする）
+
+    Yields:
+        MergedFrame: 残したフレームとまとめたフレーム数
+    """
+    kept: Optional[np.ndarray] = None
+    count = 0
+    for frame in frames:
+        if (
+            kept is not None
+            and (max_count is None or count < max_count)
+            and is_duplicate(frame, kept, threshold)
+        ):
+            count += 1
+            continue
+        if kept is not None:
+            yield MergedFrame(kept, count)
+        kept = frame
+        count = 1
+    if kept is not None:
+        yield MergedFrame(kept, count)
+
+
+def is_duplicate(frame: np.ndarray, other: np.ndarray, threshold: int = 0) -> bool:
+    """
+    2つのフレームが同じとみなせるかどうか
+
+    画素値の差の最大値で判定するため、圧縮ノイズのような全体の小さな揺れは無視し、
+    マウスカーソルの移動のような小さな領域の大きな変化は見逃さない
+
+    Args:
+        frame (np.ndarray): RGBフレーム (高さ, 幅, 3) uint8
+        other (np.ndarray): 比較するRGBフレーム
+        threshold (int, optional): 同じとみなす画素値の差の上限。0の場合は完全一致のみ
+
+    Returns:
+        bool: 同じとみなせる場合はTrue
+    """
+    if frame.shape != other.shape:
+        return False
+    if np.array_equal(frame, other):
+        return True
+    if threshold <= 0:
+        return False
+    # uint8のまま差の絶対値を求める（int16への変換を避ける）
+    difference = np.maximum(frame, other)
+    difference -= np.minimum(frame, other)
+    return int(difference.max()) <= threshold
@@ -0,0 +1,156 @@
+"""
+デコード・減色・書き出しの各段をつなぐフレームパイプラインのモジュール
+"""
+
+import queue
+import threading
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+# 生産者スレッドの終了を表す番兵
+_END = object()
+
+
+def iter_buffered(items: Iterable[T], buffer_size: int) -> Iterator[T]:
+    """
+    別スレッドで要素を生成し、固定長のバッファ経由で逐次受け取る
+
+    デコード（ffmpegパイプの読み込み）と減色・書き出しを並行させつつ、
+    先読みするフレーム数をbuffer_size個に制限してメモリ使用量を一定に保つ
+
+    Args:
+        items (Iterable[T]): 要素を生成するイテラブル（フレームのジェネレータなど）
+        buffer_size (int): バッファに保持する最大要素数
+
+    Yields:
+        T: 生成された要素
+
+    Raises:
+        Exception: 生産者側で発生した例外をそのまま再送出する
+    """
+    buffer: "queue.Queue" = queue.Queue(maxsize=max(1, buffer_size))
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        # 消費者が中断した場合に生産者がブロックし続けないよう、停止フラグを確認しながら待つ
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put(item):
+                    return
+            put(_END)
+        except BaseException as e:
+            put(_ProducerError(e))
+
+    producer = threading.Thread(target=produce, name="frame-producer", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END:
+                break
+            if isinstance(item, _ProducerError):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+def fan_out(
+    items: Iterable[Sequence[Optional[T]]],
+    consumers: List[Callable[[Iterator[T]], None]],
+    buffer_size: int,
+) -> List[Optional[BaseException]]:
+    """
+    呼び出し元のスレッドで要素を生成し、消費者ごとのスレッドへ固定長のバッファ経由で振り分ける
+
+    1回のデコードから複数の出力を作るときに、出力ごとの減色・書き出しを並行させる。
+    ある消費者が失敗しても他の消費者には要素を渡し続け、失敗した消費者の分は読み捨てる
+
+    Args:
+        items (Iterable[Sequence[Optional[T]]]): consumersと同じ順に各消費者へ渡す要素を並べたもの。Noneの要素は渡さない
+        consumers (List[Callable[[Iterator[T]], None]]): 要素のイテレーターを受け取って処理する関数
+        buffer_size (int): 消費者ごとのバッファに保持する最大要素数
+
+    Returns:
+        List[Optional[BaseException]]: consumersと同じ順の、各消費者で発生した例外（成功した場合はNone）
+
+    Raises:
+        Exception: 生産者側で発生した例外（すべての消費者に同じ例外を送出させて終了を待ってから再送出する）
+    """
+    buffers: List["queue.Queue"] = [
+        queue.Queue(maxsize=max(1, buffer_size)) for _ in consumers
+    ]
+    finished = [threading.Event() for _ in consumers]
+    errors: List[Optional[BaseException]] = [None] * len(consumers)
+
+    def receive(index: int) -> Iterator[T]:
+        while True:
+            item = buffers[index].get()
+            if item is _END:
+                return
+            if isinstance(item, _ProducerError):
+                raise item.error
+            yield item
+
+    def consume(index: int):
+        try:
+            consumers[index](receive(index))
+        except BaseException as e:
+            errors[index] = e
+        finally:
+            finished[index].set()
+
+    def put(index: int, item):
+        # 終了した消費者のバッファが満杯のままブロックしないよう、終了フラグを確認しながら待つ
+        while not finished[index].is_set():
+            try:
+                buffers[index].put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    threads = [
+        threading.Thread(
+            target=consume, args=(index,), name=f"frame-consumer-{index}", daemon=True
+        )
+        for index in range(len(consumers))
+    ]
+    for thread in threads:
+        thread.start()
+    end = _END
+    try:
+        for item in items:
+            if all(event.is_set() for event in finished):
+                break
+            for index, value in enumerate(item):
+                if value is not None:
+                    put(index, value)
+    except BaseException as e:
+        end = _ProducerError(e)
+        raise
+    finally:
+        for index in range(len(consumers)):
+            put(index, end)
+        for thread in threads:
+            thread.join()
+    return errors
+
+
+class _ProducerError:
+    """
+    生産者スレッドで発生した例外を消費者側へ受け渡すためのラッパー
+    """
+
+    def __init__(self, error: BaseException):
+        self.error = error
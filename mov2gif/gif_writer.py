@@ -0,0 +1,305 @@
+"""
+インデックスカラーのフレームを逐次GIFファイルに書き出すためのモジュール
+"""
+
+import glob
+import os
+import shutil
+import struct
+import uuid
+from typing import BinaryIO, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from mov2gif.profiler import NULL_PROFILER, NullProfiler
+
+# 1フレームに設定できる表示時間の上限（ミリ秒）。GIF89aの遅延時間は16ビットのセンチ秒
+MAX_DELAY_MS = 0xFFFF * 10
+
+
+class GifWriter:
+    """
+    GIF89a形式のファイルをフレーム単位でストリーム書き出しするクラス
+
+    フレームを受け取るたびにLZW圧縮してファイルへ書き込むため、
+    メモリ使用量はフレーム数に依存しない。
+    atomicの場合は同じディレクトリの一時ファイルに書き出し、閉じるときに出力先へ置き換えるため、
+    途中で異常終了しても書きかけのGIFが出力先に残らない
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        size: Tuple[int, int],
+        loop: int = 0,
+        global_palette: Optional[np.ndarray] = None,
+        profiler: NullProfiler = NULL_PROFILER,
+        frames_only: bool = False,
+        start_ms: float = 0.0,
+        atomic: bool = True,
+        reserved_colors: int = 0,
+    ):
+        """
+        GifWriterのコンストラクタ
+
+        Args:
+            output_path (str): 出力GIFファイルのパス
+            size (Tuple[int, int]): 論理画面サイズ (幅, 高さ)
+            loop (int, optional): ループ回数。0の場合は無限ループ
+            global_palette (np.ndarray, optional): グローバルカラーテーブル (N, 3) uint8
+            profiler (NullProfiler, optional): LZW圧縮（lzw）と書き込み（write）の所要時間を計測するプロファイラー
+            frames_only (bool, optional): ヘッダーとトレーラーを書かず、フレームのブロックのみを書き出す（分割エンコード用）
+            start_ms (float, optional): 最初のフレームの表示開始時刻（ミリ秒）。分割エンコードで丸め誤差の繰り越しを揃えるために使用
+            atomic (bool, optional): 一時ファイルに書き出してから出力先へ置き換える（os.devnullなどに書き出す場合はFalse）
+            reserved_colors (int, optional): パレットの後ろに予約するインデックスの数（差分エンコードの透過色など）。カラーテーブルはこの分も含む大きさにする
+        """
+        self.output_path = output_path
+        self.size = (int(size[0]), int(size[1]))
+        self.loop = loop
+        self.global_palette = global_palette
+        self.profiler = profiler
+        self.frames_only = frames_only
+        self.atomic = atomic
+        self.reserved_colors = reserved_colors
+        self.frame_count = 0
+        self.bytes_written = 0
+        self._fp: Optional[BinaryIO] = None
+        self._temp_path: Optional[str] = None
+        # センチ秒への丸め誤差を次フレームへ繰り越すための累積値
+        self._elapsed_ms = start_ms
+        self._elapsed_cs = int(round(start_ms / 10.0))
+
+    def __enter__(self) -> "GifWriter":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def open(self):
+        """
+        出力ファイル（atomicの場合は一時ファイル）を開き、ヘッダーを書き込む
+        """
+        if self.atomic:
+            self._temp_path = _temp_path(self.output_path, uuid.uuid4().hex[:8])
+            self._fp = open(self._temp_path, "xb")
+        else:
+            self._fp = open(self.output_path, "wb")
+        if self.frames_only:
+            return
+        width, height = self.size
+
+        flags = 0
+        if self.global_palette is not None:
+            size_bits = _color_table_size_bits(
+                len(self.global_palette) + self.reserved_colors
+            )
+            flags = 0x80 | (size_bits << 4) | size_bits
+
+        self._write(b"GIF89a")
+        self._write(struct.pack("<HHBBB", width, height, flags, 0, 0))
+        if self.global_palette is not None:
+            self._write(_color_table_bytes(self.global_palette, self.reserved_colors))
+
+        # NETSCAPE2.0拡張（ループ回数）
+        self._write(b"!\xff\x0bNETSCAPE2.0" + struct.pack("<BBHB", 3, 1, self.loop, 0))
+
+    def write_frame(
+        self,
+        indices: np.ndarray,
+        palette: Optional[np.ndarray] = None,
+        duration_ms: float = 0.0,
+        offset: Tuple[int, int] = (0, 0),
+        transparency: Optional[int] = None,
+        disposal: int = 0,
+    ):
+        """
+        1フレームを書き込む
+
+        Args:
+            indices (np.ndarray): パレットインデックスの2次元配列 (高さ, 幅) uint8
+            palette (np.ndarray, optional): ローカルカラーテーブル (N, 3) uint8。未指定の場合はグローバルカラーテーブルを使用
+            duration_ms (float, optional): フレームの表示時間（ミリ秒）
+            offset (Tuple[int, int], optional): 論理画面上の描画位置 (x, y)
+            transparency (int, optional): 透過色として扱うパレットインデックス
+            disposal (int, optional): フレームの破棄方法（GIF89aのdisposal method）
+        """
+        if self._fp is None:
+            raise RuntimeError("GifWriterが開かれていません")
+        if palette is None and self.global_palette is None:
+            raise ValueError("カラーテーブルが指定されていません")
+
+        height, width = indices.shape
+
+        # グラフィック制御拡張（表示時間・透過色・破棄方法）
+        packed = (disposal & 0x07) << 2
+        if transparency is not None:
+            packed |= 0x01
+        self._write(
+            b"!\xf9\x04"
+            + struct.pack(
+                "<BHBB", packed, self._delay_cs(duration_ms), transparency or 0, 0
+            )
+        )
+
+        # イメージ記述子
+        flags = 0
+        if palette is not None:
+            flags = 0x80 | _color_table_size_bits(len(palette) + self.reserved_colors)
+        self._write(
+            b"," + struct.pack("<HHHHB", offset[0], offset[1], width, height, flags)
+        )
+        if palette is not None:
+            self._write(_color_table_bytes(palette, self.reserved_colors))
+
+        # LZW最小コードサイズとイメージデータ
+        with self.profiler.span("lzw"):
+            data = encode_lzw(indices)
+        self._write(b"\x08")
+        self._write(data)
+        self.frame_count += 1
+        self.profiler.count("frames")
+        self.profiler.count("lzw_bytes", len(data))
+
+    def append_frames(self, path: str, frame_count: int):
+        """
+        frames_onlyで書き出したフレームのブロックをそのまま追加する
+
+        Args:
+            path (str): フレームのブロックのみを書き出したファイルのパス
+            frame_count (int): ファイルに含まれるフレーム数
+        """
+        if self._fp is None:
+            raise RuntimeError("GifWriterが開かれていません")
+        with open(path, "rb") as source:
+            with self.profiler.span("write"):
+                shutil.copyfileobj(source, self._fp, 1024 * 1024)
+            self.bytes_written += source.tell()
+        self.frame_count += frame_count
+
+    def close(self):
+        """
+        トレーラーを書き込んでファイルを閉じる（atomicの場合は一時ファイルを出力先へ置き換える）
+        """
+        if self._fp is None:
+            return
+        if not self.frames_only:
+            self._write(b";")
+        with self.profiler.span("write"):
+            if self._temp_path is not None:
+                # 置き換えた後に電源断などで中身が失われないよう、先にディスクへ書き出す
+                self._fp.flush()
+                os.fsync(self._fp.fileno())
+            self._fp.close()
+        self._fp = None
+        if self._temp_path is not None:
+            os.replace(self._temp_path, self.output_path)
+            self._temp_path = None
+
+    def abort(self):
+        """
+        書き出しを中止してファイルを閉じる（atomicの場合は一時ファイルを削除し、出力先は変更しない）
+        """
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+        if self._temp_path is not None:
+            try:
+                os.remove(self._temp_path)
+            except OSError:
+                pass
+            self._temp_path = None
+
+    def _write(self, data: bytes):
+        assert self._fp is not None
+        with self.profiler.span("write"):
+            self._fp.write(data)
+        self.bytes_written += len(data)
+
+    def _delay_cs(self, duration_ms: float) -> int:
+        """
+        表示時間をセンチ秒に変換する（丸め誤差は累積して後続フレームで補正）
+        """
+        self._elapsed_ms += duration_ms
+        target_cs = int(round(self._elapsed_ms / 10.0))
+        delay = max(0, min(0xFFFF, target_cs - self._elapsed_cs))
+        self._elapsed_cs += delay
+        return delay
+
+
+def remove_temp_files(output_path: str) -> int:
+    """
+    異常終了したプロセスが残した、出力先への書きかけの一時ファイルを削除する
+
+    書き出し中のGifWriterの一時ファイルも削除されるため、同じ出力先に書き出しているプロセスがないときに呼び出すこと
+
+    Args:
+        output_path (str): 出力GIFファイルのパス
+
+    Returns:
+        int: 削除したファイル数
+    """
+    removed = 0
+    for path in glob.glob(_temp_path(glob.escape(output_path), "*")):
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        removed += 1
+    return removed
+
+
+def _temp_path(output_path: str, token: str) -> str:
+    """
+    出力先と同じディレクトリに置く一時ファイルのパスを求める（同じファイルシステム内でos.replaceできるように）
+    """
+    directory, name = os.path.split(output_path)
+    return os.path.join(directory, f".{name}.{token}.tmp")
+
+
+def encode_lzw(indices: np.ndarray) -> bytes:
+    """
+    インデックス配列をGIFのLZW圧縮済みサブブロック列に変換する
+
+    PillowのGIFエンコーダー（C実装）を直接利用する
+
+    Args:
+        indices (np.ndarray): パレットインデックスの2次元配列 (高さ, 幅) uint8
+
+    Returns:
+        bytes: ブロック終端子を含むサブブロック列
+    """
+    height, width = indices.shape
+    data = np.ascontiguousarray(indices, dtype=np.uint8)
+    image = Image.frombuffer("P", (width, height), data, "raw", "P", 0, 1)
+    return image.tobytes("gif", "P") + b"\x00"
+
+
+def _color_table_size_bits(color_count: int) -> int:
+    """
+    カラーテーブルの要素数からGIFのサイズフィールド値を求める
+
+    Raises:
+        ValueError: 要素数がGIFのカラーテーブルの上限（256）を超える場合
+    """
+    if color_count > 256:
+        raise ValueError(f"カラーテーブルは256色までです: {color_count}")
+    bits = 0
+    while (2 << bits) < color_count:
+        bits += 1
+    return bits
+
+
+def _color_table_bytes(palette: np.ndarray, reserved_colors: int = 0) -> bytes:
+    """
+    パレットと予約分のインデックスを収める2のべき乗の長さに0埋めしたカラーテーブルのバイト列に変換する
+    """
+    palette = np.asarray(palette, dtype=np.uint8).reshape(-1, 3)
+    table_size = 2 << _color_table_size_bits(len(palette) + reserved_colors)
+    table = np.zeros((table_size, 3), dtype=np.uint8)
+    table[: len(palette)] = palette[:table_size]
+    return table.tobytes()
@@ -4,17 +4,22 @@
 """
 
 import os
+from typing import Optional
 
 from mov2gif.app_logger import AppLogger
+from mov2gif.batch_journal import BatchJournal
 from mov2gif.config_reader import ConfigReader
+from mov2gif.conversion_cache import ConversionCache
 from mov2gif.file_selector import FileSelector
+from mov2gif.gif_writer import remove_temp_files
+from mov2gif.manifest import ManifestReader
 from mov2gif.movie_converter import MovieConverter
 
 
 def main():
     """アプリケーションのメイン処理を実行する
 
-    1. 設定ファイルから動画パスを読み込み
+    1. 設定ファイルから動画パス（またはマニフェスト）を読み込み
     2. パスがない場合はファイル選択ダイアログを表示
     3. 動画をGIFに変換
     4. 結果を表示
@@ -24,12 +29,24 @@ def main():
 
     config_reader = ConfigReader(logger)
     file_selector = FileSelector(logger)
-    movie_converter = MovieConverter(logger)
+    journal = _open_journal(config_reader.read_journal_path(), logger)
+    movie_converter = MovieConverter(
+        logger,
+        conversion_cache=ConversionCache(),
+        options=config_reader.read_options(),
+        profile_dir=config_reader.read_profile_dir(),
+        file_options=config_reader.read_file_options(),
+        journal=journal,
+    )
 
     # 設定ファイルから動画パスのリストを取得
-    file_paths = config_reader.read_config()
+    manifest_path = config_reader.read_manifest_path()
+    file_paths = [] if manifest_path is not None else config_reader.read_config()
 
-    if file_paths:
+    if manifest_path is not None:
+        # マニフェストが設定されている場合は1行ずつ読み込みながら変換
+        _convert_manifest(manifest_path, movie_converter, logger)
+    elif file_paths:
         # パスが設定されている場合は一括変換
         logger.info(
             f"設定ファイルから{len(file_paths)}個のファイルパスを読み込みました"
@@ -63,6 +80,73 @@ def main():
             logger.info("ファイル選択がキャンセルされました")
         logger.info("変換処理を完了しました")
 
+    # 完了・失敗は1件ごとにディスクへ書き出し済みのため、閉じるだけでよい
+    if journal is not None:
+        journal.close()
+
+
+def _convert_manifest(
+    manifest_path: str, movie_converter: MovieConverter, logger: AppLogger
+):
+    """
+    マニフェストのジョブを読み込んだ順に変換し、結果をログに出力する
+
+    Args:
+        manifest_path (str): マニフェストファイルのパス
+        movie_converter (MovieConverter): 変換に使用するインスタンス
+        logger (AppLogger): ロガー
+    """
+    manifest_reader = ManifestReader(logger)
+    try:
+        jobs = manifest_reader.read_jobs(manifest_path)
+    except (OSError, ValueError) as e:
+        logger.error(f"マニフェストを開けません: {str(e)}")
+        return
+
+    logger.info(f"マニフェストから変換します: {manifest_path}")
+    total = succeeded = 0
+    for result in movie_converter.convert_iter(jobs):
+        total += 1
+        if result.success:
+            succeeded += 1
+            logger.info(f"✅ 変換成功: {result.input_path} -> {result.output_path}")
+        else:
+            logger.error(f"❌ 変換失敗: {result.input_path}")
+    logger.info(f"変換完了: {succeeded}/{total} 成功")
+    if manifest_reader.errors:
+        logger.error(
+            f"マニフェストの不正な{manifest_reader.errors}行を読み飛ばしました"
+        )
+
+
+def _open_journal(path: Optional[str], logger: AppLogger) -> Optional[BatchJournal]:
+    """
+    設定されたジャーナルを前回の記録から再開する形で開く（未設定や開けない場合はNone）
+
+    Args:
+        path (str, optional): ジャーナルファイルのパス
+        logger (AppLogger): ロガー
+
+    Returns:
+        Optional[BatchJournal]: ジャーナル
+    """
+    if path is None:
+        return None
+    try:
+        journal = BatchJournal(path, resume=True)
+    except OSError as e:
+        logger.error(f"ジャーナルを開けません: {str(e)}")
+        return None
+    interrupted = journal.interrupted()
+    if interrupted:
+        logger.warning(
+            f"前回中断されたジョブが{len(interrupted)}件あります（変換し直します）"
+        )
+    # 中断されたジョブが残した書きかけの一時ファイルを片付ける
+    for _, output_path in interrupted:
+        remove_temp_files(output_path)
+    return journal
+
 
 if __name__ == "__main__":
     main()
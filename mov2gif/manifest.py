@@ -0,0 +1,195 @@
+"""
+1行に1ジョブ（入力・出力・変換オプション）を記載したマニフェストファイルを逐次読み込むためのモジュール
+
+config.pyのMOV_FILE_PATHSと異なり、ファイルを実行せず、全件をメモリに読み込むこともない。
+数万件のジョブ一覧でも、読み込んだ行から順にMovieConverter.convert_iterへ渡して変換を始められる
+"""
+
+import csv
+import json
+import os
+from typing import IO, Any, Callable, Dict, Iterator, NamedTuple, Optional, Tuple
+
+from mov2gif.app_logger import AppLogger
+from mov2gif.conversion_options import resolve_options
+
+
+def _boolean(value: str) -> bool:
+    """
+    CSVのセルの文字列を真偽値に変換する
+    """
+    text = value.strip().lower()
+    if text in ("true", "yes", "1"):
+        return True
+    if text in ("false", "no", "0"):
+        return False
+    raise ValueError(f"真偽値として解釈できません: {value}")
+
+
+# マニフェストの各行の (行番号, 辞書) のイテレーター
+_Rows = Iterator[Tuple[int, Optional[Dict[str, Any]]]]
+
+# CSVのセル（文字列）を変換オプションの型に変換する関数（ここにない項目は文字列のまま渡す）
+_CSV_TYPES: Dict[str, Callable[[str], Any]] = {
+    "fps": float,
+    "quality": int,
+    "colors": int,
+    "width": int,
+    "max_side": int,
+    "max_bytes": int,
+    "dedup_threshold": int,
+    "optimize": _boolean,
+    "dedup": _boolean,
+}
+
+
+class ManifestJob(NamedTuple):
+    """
+    マニフェストの1行分のジョブ（そのままMovieConverter.convert_iterに渡せる）
+    """
+
+    input_path: str
+    # 未指定の場合はNone（入力ファイルと同じ場所に同名で保存）
+    output_path: Optional[str]
+    # CONVERSION_OPTIONSに重ねる変換オプション（検証済み）
+    options: Dict[str, Any]
+
+
+class ManifestReader:
+    """
+    JSON Lines（.jsonl, .ndjson）またはCSV（.csv）のマニフェストからジョブを読み込むクラス
+
+    各行は"path"（必須）、"output"（省略可）と変換オプションを持つ。
+    相対パスはマニフェストファイルのあるディレクトリを基準とする
+    """
+
+    def __init__(self, logger: AppLogger):
+        """
+        ManifestReaderのコンストラクタ
+
+        Args:
+            logger (AppLogger): ロガー
+        """
+        self.logger = logger
+        # 読み飛ばした不正な行の数
+        self.errors = 0
+
+    def read_jobs(self, manifest_path: str) -> Iterator[ManifestJob]:
+        """
+        マニフェストのジョブを1行ずつ読み込んで検証し、返す
+
+        ファイルを開くところまではこの呼び出しで行い、各行は読み進めたときに検証する。
+        不正な行は行番号付きのエラーログを出して読み飛ばす
+
+        Args:
+            manifest_path (str): マニフェストファイルのパス
+
+        Returns:
+            Iterator[ManifestJob]: ジョブのイテレーター
+
+        Raises:
+            ValueError: 対応していない拡張子の場合
+            OSError: ファイルを開けない場合
+        """
+        extension = os.path.splitext(manifest_path)[1].lower()
+        if extension not in _FORMATS:
+            raise ValueError(
+                f"マニフェストの拡張子は{', '.join(_FORMATS)}のいずれかである必要があります: {manifest_path}"
+            )
+        rows = _FORMATS[extension]
+        base_dir = os.path.dirname(os.path.abspath(manifest_path))
+        f = open(manifest_path, encoding="utf-8", newline="")
+        return self._jobs(f, rows, base_dir, manifest_path)
+
+    def _jobs(
+        self,
+        f: IO[str],
+        rows: Callable[[IO[str]], _Rows],
+        base_dir: str,
+        manifest_path: str,
+    ) -> Iterator[ManifestJob]:
+        """
+        read_jobsの本体（読み終えるか、途中で閉じられたときにファイルを閉じる）
+        """
+        with f:
+            for line_number, row in rows(f):
+                try:
+                    yield _job(row, base_dir)
+                except ValueError as e:
+                    self.errors += 1
+                    self.logger.error(
+                        f"マニフェストの{line_number}行目が不正です: {manifest_path}: {str(e)}"
+                    )
+
+
+def _json_rows(f: IO[str]) -> _Rows:
+    """
+    JSON Linesの各行を (行番号, 辞書) の組にする（空行は飛ばす）。JSONのオブジェクトでない行はNoneとする
+    """
+    for line_number, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_number, row if isinstance(row, dict) else None
+
+
+def _csv_rows(f: IO[str]) -> _Rows:
+    """
+    CSV（1行目は列名）の各行を (行番号, 辞書) の組にする。空のセルは未指定とし、変換オプションの型に変換する
+
+    型に変換できないセルは元の文字列のまま残し、検証でエラーにする
+    """
+    reader = csv.DictReader(f)
+    for row in reader:
+        entry: Dict[str, Any] = {}
+        for name, value in row.items():
+            if name is None or value is None or not value.strip():
+                continue
+            name = name.strip()
+            try:
+                entry[name] = _CSV_TYPES.get(name, str)(value.strip())
+            except ValueError:
+                entry[name] = value
+        yield reader.line_num, entry
+
+
+# 拡張子ごとの行の読み込み方
+_FORMATS: Dict[str, Callable[[IO[str]], _Rows]] = {
+    ".jsonl": _json_rows,
+    ".ndjson": _json_rows,
+    ".csv": _csv_rows,
+}
+
+
+def _job(row: Optional[Dict[str, Any]], base_dir: str) -> ManifestJob:
+    """
+    1行分の辞書を検証してジョブにする
+
+    Raises:
+        ValueError: pathがない、または変換オプションが不正な場合
+    """
+    if row is None:
+        raise ValueError("JSONのオブジェクトとして解釈できません")
+    input_path = row.get("path")
+    if not isinstance(input_path, str) or not input_path:
+        raise ValueError("pathを指定してください")
+    output_path = row.get("output")
+    if output_path is not None and not isinstance(output_path, str):
+        raise ValueError(f"outputは文字列である必要があります: {output_path}")
+
+    options = {
+        name: value for name, value in row.items() if name not in ("path", "output")
+    }
+    resolve_options(options)
+    return ManifestJob(
+        os.path.normpath(os.path.join(base_dir, input_path)),
+        (
+            None
+            if output_path is None
+            else os.path.normpath(os.path.join(base_dir, output_path))
+        ),
+        options,
+    )
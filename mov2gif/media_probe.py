@@ -0,0 +1,311 @@
+"""
+動画ファイルのメタデータ（解像度・フレームレート・長さ・コーデック）を軽量に取得するためのモジュール
+
+MOV/MP4はコンテナのmoovアトムだけを読んで解析するため、ffmpegを起動せずに数ミリ秒で済む。
+それ以外の形式や解析できないファイルはffmpegで取得する。結果はファイルのサイズと更新時刻が
+変わるまでプロセス内にキャッシュする
+"""
+
+import os
+import struct
+import threading
+from collections import OrderedDict
+from typing import BinaryIO, Dict, Iterator, NamedTuple, Optional, Tuple
+
+# moovアトムとして読み込む最大サイズ（これを超える場合はffmpegで取得する）
+MAX_MOOV_BYTES = 64 * 1024 * 1024
+
+# プロセス内にキャッシュする最大件数
+PROBE_CACHE_SIZE = 4096
+
+# ファイルの先頭に置かれるアトムの種類（これ以外で始まる場合はMOV/MP4ではないとみなす）
+_TOP_LEVEL_ATOMS = {b"ftyp", b"moov", b"mdat", b"wide", b"free", b"skip", b"pnot"}
+
+# サンプル記述（stsd）の形式からffmpegのコーデック名への対応
+_CODEC_NAMES = {
+    "avc1": "h264",
+    "avc3": "h264",
+    "hvc1": "hevc",
+    "hev1": "hevc",
+    "av01": "av1",
+    "vp09": "vp9",
+    "mp4v": "mpeg4",
+    "jpeg": "mjpeg",
+    "apch": "prores",
+    "apcn": "prores",
+    "apcs": "prores",
+    "apco": "prores",
+    "ap4h": "prores",
+}
+
+
+class MediaInfo(NamedTuple):
+    """
+    動画ファイルのメタデータ
+    """
+
+    # 解像度 (幅, 高さ)。回転して表示する動画は回転後の解像度
+    size: Tuple[int, int]
+    # フレームレート
+    fps: float
+    # 動画ストリームの長さ（秒）
+    duration: float
+    # コーデック名（ffmpegの名前。不明な場合は空文字列）
+    codec: str = ""
+    # フレーム数（不明な場合はNone）
+    frame_count: Optional[int] = None
+
+
+class _Box(NamedTuple):
+    # アトムの種類
+    kind: bytes
+    # 内容の開始位置と終了位置
+    start: int
+    end: int
+
+
+_cache: "OrderedDict[Tuple[str, int, int], MediaInfo]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def probe_media(path: str) -> MediaInfo:
+    """
+    動画ファイルのメタデータを取得する（同じファイルの2回目以降はキャッシュから返す）
+
+    Args:
+        path (str): 動画ファイルのパス
+
+    Returns:
+        MediaInfo: 動画ファイルのメタデータ
+
+    Raises:
+        IOError: ファイルが読み込めない、または動画ストリームが見つからない場合
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    info = parse_mp4(path)
+    if info is None:
+        info = _probe_with_ffmpeg(path)
+
+    with _cache_lock:
+        _cache[key] = info
+        while len(_cache) > PROBE_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return info
+
+
+def clear_probe_cache():
+    """
+    プロセス内のキャッシュを空にする
+    """
+    with _cache_lock:
+        _cache.clear()
+
+
+def parse_mp4(path: str) -> Optional[MediaInfo]:
+    """
+    MOV/MP4のmoovアトムを解析して、最初の動画トラックのメタデータを取得する
+
+    Args:
+        path (str): 動画ファイルのパス
+
+    Returns:
+        Optional[MediaInfo]: メタデータ。MOV/MP4でない、フラグメント化されている、動画トラックがないなど、
+        解析できない場合はNone
+
+    Raises:
+        OSError: ファイルが読み込めない場合
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        moov = _read_moov(f, size)
+    if moov is None:
+        return None
+    try:
+        return _parse_moov(moov)
+    except (struct.error, ValueError, ZeroDivisionError):
+        # 壊れたアトムはffmpegに任せる
+        return None
+
+
+def _read_moov(f: BinaryIO, file_size: int) -> Optional[bytes]:
+    """
+    ファイルの先頭からアトムを辿り、moovアトムの内容を読み込む（mdatなどは読み飛ばす）
+    """
+    offset = 0
+    first = True
+    while offset + 8 <= file_size:
+        f.seek(offset)
+        header = f.read(16)
+        if len(header) < 8:
+            return None
+        box_size, kind = struct.unpack(">I4s", header[:8])
+        header_size = 8
+        if box_size == 1:
+            if len(header) < 16:
+                return None
+            box_size = struct.unpack(">Q", header[8:16])[0]
+            header_size = 16
+        elif box_size == 0:
+            box_size = file_size - offset
+        if first and kind not in _TOP_LEVEL_ATOMS:
+            return None
+        first = False
+        if box_size < header_size:
+            return None
+        if kind == b"moov":
+            content_size = box_size - header_size
+            if content_size > MAX_MOOV_BYTES or offset + box_size > file_size:
+                return None
+            f.seek(offset + header_size)
+            return f.read(content_size)
+        offset += box_size
+    return None
+
+
+def _iter_boxes(
+    data: bytes, start: int = 0, end: Optional[int] = None
+) -> Iterator[_Box]:
+    """
+    data[start:end]に並ぶ子アトムを列挙する
+    """
+    if end is None:
+        end = len(data)
+    offset = start
+    while offset + 8 <= end:
+        box_size, kind = struct.unpack_from(">I4s", data, offset)
+        header_size = 8
+        if box_size == 1:
+            box_size = struct.unpack_from(">Q", data, offset + 8)[0]
+            header_size = 16
+        elif box_size == 0:
+            box_size = end - offset
+        if box_size < header_size or offset + box_size > end:
+            raise ValueError("アトムのサイズが不正です")
+        yield _Box(kind, offset + header_size, offset + box_size)
+        offset += box_size
+
+
+def _children(data: bytes, box: _Box) -> Dict[bytes, _Box]:
+    """
+    子アトムを種類ごとに返す（同じ種類が複数ある場合は最初のもの）
+    """
+    children: Dict[bytes, _Box] = {}
+    for child in _iter_boxes(data, box.start, box.end):
+        children.setdefault(child.kind, child)
+    return children
+
+
+def _parse_moov(data: bytes) -> Optional[MediaInfo]:
+    """
+    moovアトムの内容から最初の動画トラックのメタデータを求める
+    """
+    boxes = list(_iter_boxes(data))
+    if any(box.kind == b"mvex" for box in boxes):
+        # フラグメント化されたファイルはサンプルの情報がmoofにあるため、ffmpegに任せる
+        return None
+    for box in boxes:
+        if box.kind == b"trak":
+            info = _parse_video_trak(data, box)
+            if info is not None:
+                return info
+    return None
+
+
+def _parse_video_trak(data: bytes, trak: _Box) -> Optional[MediaInfo]:
+    """
+    動画トラック（hdlrがvide）であればメタデータを求める
+    """
+    trak_children = _children(data, trak)
+    mdia = trak_children.get(b"mdia")
+    tkhd = trak_children.get(b"tkhd")
+    if mdia is None or tkhd is None:
+        return None
+    mdia_children = _children(data, mdia)
+    hdlr = mdia_children.get(b"hdlr")
+    mdhd = mdia_children.get(b"mdhd")
+    minf = mdia_children.get(b"minf")
+    if hdlr is None or mdhd is None or minf is None:
+        return None
+    if data[hdlr.start + 8 : hdlr.start + 12] != b"vide":
+        return None
+    stbl = _children(data, minf).get(b"stbl")
+    if stbl is None:
+        return None
+    stbl_children = _children(data, stbl)
+    stsd = stbl_children.get(b"stsd")
+    stts = stbl_children.get(b"stts")
+    if stsd is None or stts is None:
+        return None
+
+    # mdhd: 時間の単位と長さ
+    version = data[mdhd.start]
+    if version == 1:
+        timescale, media_duration = struct.unpack_from(">IQ", data, mdhd.start + 20)
+    else:
+        timescale, media_duration = struct.unpack_from(">II", data, mdhd.start + 12)
+
+    # stts: フレーム数とフレームの表示時間の合計
+    entry_count = struct.unpack_from(">I", data, stts.start + 4)[0]
+    frame_count = 0
+    sample_duration = 0
+    for index in range(entry_count):
+        count, delta = struct.unpack_from(">II", data, stts.start + 8 + index * 8)
+        frame_count += count
+        sample_duration += count * delta
+    if frame_count == 0 or timescale == 0:
+        return None
+    if media_duration == 0 or media_duration == 0xFFFFFFFF:
+        media_duration = sample_duration
+
+    # stsd: 最初のサンプル記述の形式と符号化された解像度
+    entry_start = stsd.start + 8
+    fourcc = data[entry_start + 4 : entry_start + 8].decode("latin-1")
+    width, height = struct.unpack_from(">HH", data, entry_start + 32)
+    if width == 0 or height == 0:
+        return None
+
+    # tkhd: 変換行列が90度・270度の回転であれば縦横を入れ替える（ffmpegはデコード時に回転させる）
+    matrix_offset = tkhd.start + (52 if data[tkhd.start] == 1 else 40)
+    a, b, _, c, d = struct.unpack_from(">5i", data, matrix_offset)
+    if a == 0 and d == 0 and b != 0 and c != 0:
+        width, height = height, width
+
+    duration = media_duration / timescale
+    return MediaInfo(
+        (int(width), int(height)),
+        frame_count / (sample_duration / timescale) if sample_duration else 0.0,
+        duration,
+        _CODEC_NAMES.get(fourcc, fourcc.strip()),
+        frame_count,
+    )
+
+
+def _probe_with_ffmpeg(path: str) -> MediaInfo:
+    """
+    ffmpegでメタデータを取得する（MOV/MP4以外の形式や、moovアトムを解析できないファイル向け）
+    """
+    # moviepyは読み込みに時間がかかるため、実際に必要になったときに読み込む
+    from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+    infos = ffmpeg_parse_infos(path)
+    if not infos.get("video_found"):
+        raise IOError(f"動画ストリームが見つかりません: {path}")
+
+    width, height = infos["video_size"]
+    # ffmpegはデコード時に自動で回転させるため、90度/270度回転の場合は縦横を入れ替える
+    if int(infos.get("video_rotation", 0) or 0) % 180 == 90:
+        width, height = height, width
+    frame_count = infos.get("video_n_frames")
+    return MediaInfo(
+        (int(width), int(height)),
+        float(infos.get("video_fps") or 0.0),
+        float(infos.get("video_duration") or infos.get("duration") or 0.0),
+        str(infos.get("video_codec_name") or ""),
+        int(frame_count) if frame_count else None,
+    )
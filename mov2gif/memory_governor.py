@@ -0,0 +1,105 @@
+"""
+同時に変換するジョブのメモリ使用量を見積もり、上限（メモリ予算）を超えないようにジョブの開始を調整するためのモジュール
+
+見積もりはメタデータ（入力の解像度）と変換オプション・先読みフレーム数だけから求め、動画はデコードしない
+"""
+
+from typing import Any, Dict, Tuple
+
+from mov2gif.conversion_options import output_size
+
+# 1ジョブあたりのメモリ使用量の係数。1CPUの環境で360p〜4Kの動画を変換したときの
+# ピークRSS（変換するPythonプロセスとffmpegの子プロセス）の実測から求めた
+# 解像度によらない分（Pythonプロセスとffmpegの起動直後の分）
+WORKING_SET_BASE_BYTES = 96 * 1024 * 1024
+# ffmpegのデコーダーが保持する参照フレームなど（入力の1画素あたり）
+WORKING_SET_BYTES_PER_SOURCE_PIXEL = 74
+# 減色・差分エンコードの作業用配列（出力の1画素あたり）
+WORKING_SET_BYTES_PER_OUTPUT_PIXEL = 56
+# 先読みしたRGBフレーム（出力の1画素・1フレームあたり）
+FRAME_BYTES_PER_PIXEL = 3
+
+# 1ジョブだけでメモリ予算を超える場合の先読みフレーム数（デコードと減色を並行させる最小限）
+LOW_MEMORY_FRAME_BUFFER = 1
+
+
+def estimate_working_set(
+    source_size: Tuple[int, int],
+    options: Dict[str, Any],
+    frame_buffer: int,
+    processes: int = 1,
+) -> int:
+    """
+    1ジョブの変換で使用するメモリ量（ピーク時のRSSの合計）を見積もる
+
+    Args:
+        source_size (Tuple[int, int]): 入力の解像度 (幅, 高さ)
+        options (Dict[str, Any]): resolve_optionsで検証済みのオプション
+        frame_buffer (int): デコード済みフレームを先読みしておく最大数
+        processes (int, optional): 同時にデコード・エンコードするプロセス数（分割エンコードの区間数）
+
+    Returns:
+        int: メモリ使用量の見積もり（バイト）
+    """
+    width, height = output_size(source_size, options)
+    source_pixels = source_size[0] * source_size[1]
+    output_pixels = width * height
+    per_process = (
+        WORKING_SET_BASE_BYTES
+        + WORKING_SET_BYTES_PER_SOURCE_PIXEL * source_pixels
+        + (WORKING_SET_BYTES_PER_OUTPUT_PIXEL + FRAME_BYTES_PER_PIXEL * frame_buffer)
+        * output_pixels
+    )
+    return per_process * max(1, processes)
+
+
+class MemoryGovernor:
+    """
+    実行中のジョブのメモリ使用量の見積もりを合計し、メモリ予算に収まる間だけ新しいジョブを開始させる
+
+    実行中のジョブがない場合は、予算を超えるジョブでも単独で開始させる（いつまでも開始できなくならないように）
+    """
+
+    def __init__(self, budget: int):
+        """
+        MemoryGovernorのコンストラクタ
+
+        Args:
+            budget (int): メモリ予算（バイト）
+        """
+        self.budget = budget
+        # 実行中のジョブ数と、そのメモリ使用量の見積もりの合計
+        self.jobs = 0
+        self.in_use = 0
+
+    def admits(self, cost: int) -> bool:
+        """
+        メモリ使用量の見積もりがcostのジョブを今開始できるかどうか
+
+        Args:
+            cost (int): メモリ使用量の見積もり（バイト）
+
+        Returns:
+            bool: 実行中のジョブがない、または合計が予算に収まる場合はTrue
+        """
+        return self.jobs == 0 or self.in_use + cost <= self.budget
+
+    def acquire(self, cost: int):
+        """
+        ジョブの開始を記録する
+
+        Args:
+            cost (int): メモリ使用量の見積もり（バイト）
+        """
+        self.jobs += 1
+        self.in_use += cost
+
+    def release(self, cost: int):
+        """
+        ジョブの完了を記録する
+
+        Args:
+            cost (int): acquireに渡したメモリ使用量の見積もり（バイト）
+        """
+        self.jobs -= 1
+        self.in_use -= cost
@@ -2,11 +2,268 @@
 MOV形式の動画をGIF形式に変換するためのモジュール
 """
 
+import json
+import math
+import os
+import signal
+import tempfile
+from contextlib import contextmanager
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, List, Optional
-from moviepy import VideoFileClip
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+import numpy as np
+from imageio_ffmpeg import get_ffmpeg_exe
 
-from mov2gif.app_logger import AppLogger
+from mov2gif import __version__
+from mov2gif.app_logger import AppLogger, init_worker_logging
+from mov2gif.batch_journal import BatchJournal
+from mov2gif.conversion_cache import ConversionCache
+from mov2gif.conversion_options import (
+    clip_bounds,
+    output_size,
+    palette_colors,
+    resolve_options,
+)
+from mov2gif.decoder import FrameDecoder, VideoInfo, probe_video, sample_frames
+from mov2gif.delta_encoder import DISPOSAL_NONE, DeltaEncoder
+from mov2gif.fingerprint import file_fingerprint, options_key
+from mov2gif.frame_dedup import MergedFrame, merge_duplicates
+from mov2gif.frame_pipeline import fan_out, iter_buffered
+from mov2gif.gif_writer import MAX_DELAY_MS, GifWriter
+from mov2gif.media_probe import probe_media
+from mov2gif.memory_governor import (
+    LOW_MEMORY_FRAME_BUFFER,
+    MemoryGovernor,
+    estimate_working_set,
+)
+from mov2gif.palette_cache import PaletteCache
+from mov2gif.planner import (
+    BatchPlan,
+    JobEstimate,
+    clip_duration,
+    estimate_job,
+    plan_batch,
+)
+from mov2gif.progress import (
+    NULL_PROGRESS,
+    PROGRESS_INTERVAL,
+    BatchProgress,
+    FileProgress,
+    NullProgress,
+    ProgressCallback,
+    ProgressRelay,
+    init_worker_progress,
+    serialized,
+    worker_callback,
+    worker_interval,
+)
+from mov2gif.profiler import (
+    NULL_PROFILER,
+    NullProfiler,
+    StageProfiler,
+    profile_path,
+    summarize,
+    write_json,
+)
+from mov2gif.quantizer import (
+    PaletteMapper,
+    bin_centers,
+    build_palette,
+    color_histogram,
+)
+from mov2gif.renditions import Rendition, resample_renditions
+from mov2gif.segments import Segment, plan_segments
+from mov2gif.size_target import (
+    SIZE_TARGET_MARGIN,
+    SizeCandidate,
+    find_fitting,
+    resample_burst,
+    sample_bursts,
+    size_ladder,
+)
+from mov2gif.worker_pool import WORKER_MAX_JOBS, RecyclingPool
+
+# デコード済みフレームを先読みしておく最大数（メモリ使用量の上限を決める）
+FRAME_BUFFER_SIZE = 8
+
+# パレット生成時にサンプリングするフレーム数と1フレームあたりの画素数
+PALETTE_SAMPLE_FRAMES = 16
+PALETTE_SAMPLE_PIXELS = 64 * 1024
+
+
+def _process_pool(
+    max_workers: int,
+    progress_queue: Optional[Any] = None,
+    progress_interval: float = PROGRESS_INTERVAL,
+) -> ProcessPoolExecutor:
+    """
+    ワーカープロセスのログをメインプロセスのAppLoggerのキューに送るプロセスプールを作る
+
+    Args:
+        max_workers (int): ワーカープロセス数
+        progress_queue (Any, optional): 進捗イベントの送り先（ProgressRelay.queue）。Noneの場合は通知しない
+        progress_interval (float, optional): ワーカーでのfile_progressイベントの通知間隔（秒）
+
+    Returns:
+        ProcessPoolExecutor: プロセスプール
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(AppLogger.worker_queue(), progress_queue, progress_interval),
+    )
+
+
+def _init_worker(
+    log_queue: Optional[Any], progress_queue: Optional[Any], progress_interval: float
+):
+    """
+    ワーカープロセスのログと進捗イベントの送り先を設定し、ジョブをまたいで使う状態を準備する（ProcessPoolExecutorのinitializer）
+
+    Ctrl+C（SIGINT）は端末からプロセスグループ全体に届くため、ワーカーでは無視する。
+    中断はメインプロセスが扱い、実行中のジョブは最後まで変換させる
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    init_worker_logging(log_queue)
+    init_worker_progress(progress_queue, progress_interval)
+    # ffmpegの実行ファイルの探索と、減色の参照テーブルを作るための配列の準備を最初のジョブの前に済ませる
+    get_ffmpeg_exe()
+    bin_centers()
+
+
+def _convert_in_worker(
+    input_path: str,
+    options: Dict[str, Any],
+    palette_cache_dir: str,
+    profile_dir: Optional[str] = None,
+    profile_stage: Optional[str] = None,
+    output_path: Optional[str] = None,
+    frame_buffer: int = FRAME_BUFFER_SIZE,
+    segment_workers: int = 1,
+) -> bool:
+    """
+    ワーカープロセス内で単一の動画ファイルをGIFに変換する
+
+    ProcessPoolExecutorから呼び出すため、モジュールレベルの関数として定義する
+
+    Args:
+        input_path (str): 入力動画ファイルのパス
+        options (Dict[str, Any]): 変換オプション
+        palette_cache_dir (str): パレットキャッシュの保存先
+        profile_dir (str, optional): プロファイルの保存先。未指定の場合は計測しない
+        profile_stage (str, optional): cProfileで内訳も記録する段階名
+        output_path (str, optional): 出力GIFファイルのパス。未指定の場合は入力ファイルと同じ場所に同名で保存
+        frame_buffer (int, optional): デコード済みフレームを先読みしておく最大数
+        segment_workers (int, optional): 1つの動画を時間区間に分割して並列にエンコードするプロセス数
+
+    Returns:
+        bool: 変換成功時はTrue、失敗時はFalse
+    """
+    converter = MovieConverter(
+        AppLogger(),
+        palette_cache=PaletteCache(palette_cache_dir),
+        options=options,
+        profile_dir=profile_dir,
+        profile_stage=profile_stage,
+        progress=worker_callback(),
+        progress_interval=worker_interval(),
+        frame_buffer=frame_buffer,
+        segment_workers=segment_workers,
+    )
+    return converter.convert_to_gif(input_path, output_path)
+
+
+def _encode_segment_in_worker(
+    input_path: str,
+    segment_path: str,
+    size: Tuple[int, int],
+    fps: float,
+    palette: np.ndarray,
+    segment: Segment,
+    options: Dict[str, Any],
+    frame_buffer: int = FRAME_BUFFER_SIZE,
+) -> Tuple[int, int]:
+    """
+    ワーカープロセス内で動画の1区間をデコード・減色・LZW圧縮し、フレームのブロックのみを書き出す
+
+    Args:
+        input_path (str): 入力動画ファイルのパス
+        segment_path (str): フレームのブロックの出力先
+        size (Tuple[int, int]): 出力の解像度 (幅, 高さ)
+        fps (float): 出力フレームレート
+        palette (np.ndarray): 動画全体で共通のパレット (N, 3) uint8
+        segment (Segment): エンコードする区間
+        options (Dict[str, Any]): 変換オプション
+        frame_buffer (int, optional): デコード済みフレームを先読みしておく最大数
+
+    Returns:
+        Tuple[int, int]: (書き出したフレーム数, デコードしたフレーム数)
+    """
+    converter = MovieConverter(AppLogger(), options=options)
+    # 進捗のデコード速度はメインプロセスで集計するため、デコードしたフレーム数を数えて返す
+    frames_decoded = 0
+
+    def counted(frames: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+        nonlocal frames_decoded
+        for frame in frames:
+            frames_decoded += 1
+            yield frame
+
+    duration_ms = 1000.0 / fps
+    with converter._open_decoder(
+        input_path, size, fps, segment.start_frame, segment.frame_count
+    ) as decoder:
+        with GifWriter(
+            segment_path,
+            size,
+            global_palette=palette,
+            frames_only=True,
+            start_ms=segment.start_frame * duration_ms,
+            atomic=False,
+            reserved_colors=converter._reserved_colors(),
+        ) as writer:
+            converter._encode_frames(
+                iter_buffered(counted(decoder), frame_buffer),
+                palette,
+                writer,
+                duration_ms,
+            )
+    return writer.frame_count, frames_decoded
+
+
+class ConversionResult(NamedTuple):
+    """
+    1ファイル分の変換結果
+    """
+
+    # 入力動画ファイルのパス
+    input_path: str
+    # 出力GIFファイルのパス
+    output_path: str
+    # 変換に成功したかどうか
+    success: bool
+    # 変換キャッシュから復元したかどうか
+    cached: bool = False
+    # ジャーナルに完了が記録されていたため、変換せずにスキップしたかどうか
+    resumed: bool = False
 
 
 class MovieConverter:
@@ -14,11 +271,67 @@ class MovieConverter:
     動画ファイルをGIFに変換するクラス
     """
 
-    def __init__(self, logger: AppLogger):
+    def __init__(
+        self,
+        logger: AppLogger,
+        max_workers: int = 1,
+        palette_cache: Optional[PaletteCache] = None,
+        conversion_cache: Optional[ConversionCache] = None,
+        options: Optional[Dict[str, Any]] = None,
+        profile_dir: Optional[str] = None,
+        profile_stage: Optional[str] = None,
+        segment_workers: int = 1,
+        file_options: Optional[Dict[str, Dict[str, Any]]] = None,
+        progress: Optional[ProgressCallback] = None,
+        progress_interval: float = PROGRESS_INTERVAL,
+        memory_budget: Optional[int] = None,
+        frame_buffer: int = FRAME_BUFFER_SIZE,
+        journal: Optional[BatchJournal] = None,
+        worker_max_jobs: Optional[int] = WORKER_MAX_JOBS,
+    ):
         """
         MovieConverterのコンストラクタ
+
+        Args:
+            logger (AppLogger): ロガー
+            max_workers (int, optional): 一括変換時のワーカープロセス数。1以下の場合は逐次変換
+            palette_cache (PaletteCache, optional): パレットキャッシュ。未指定の場合はデフォルトの保存先を使用
+            conversion_cache (ConversionCache, optional): 一括変換で使用する変換結果キャッシュ。未指定の場合はキャッシュしない
+            options (Dict[str, Any], optional): 変換オプション（fps, optimize, quality, colors, width, max_side）。未指定の項目は既定値
+            profile_dir (str, optional): 段階ごとの所要時間（プロファイル）の保存先。未指定の場合は計測しない
+            profile_stage (str, optional): cProfileで関数単位の内訳も記録する段階名（open, palette, decode, quantize, delta, lzw, write）
+            segment_workers (int, optional): 1つの動画を時間区間に分割して並列にエンコードするプロセス数。1以下の場合は分割しない
+            file_options (Dict[str, Dict[str, Any]], optional): {入力パス: optionsに重ねる変換オプション}。切り出し区間などをファイルごとに指定する
+            progress (ProgressCallback, optional): 進捗イベント（file_start, file_progress, file_done, batch_progress, batch_done）を受け取るコールバック。未指定の場合は通知しない
+            progress_interval (float, optional): file_progress・batch_progressイベントを通知する最短の間隔（秒）
+            memory_budget (int, optional): 同時に変換するジョブ（分割エンコードの区間を含む）のメモリ使用量の見積もりの合計の上限（バイト）。未指定の場合は制限しない
+            frame_buffer (int, optional): デコード済みフレームを先読みしておく最大数
+            journal (BatchJournal, optional): 一括変換の各ジョブの状態を記録するジャーナル。完了が記録されているジョブは変換しない。未指定の場合は記録しない
+            worker_max_jobs (int, optional): ワーカープロセス1つあたりに実行させるジョブ数の目安。超えたらプールを作り直してメモリを解放する。Noneの場合は作り直さない
+
+        Raises:
+            ValueError: 変換オプションが不正な場合
         """
         self.logger = logger
+        self.max_workers = max_workers
+        self.palette_cache = palette_cache or PaletteCache()
+        self.conversion_cache = conversion_cache
+        self.options = resolve_options(options)
+        self.profile_dir = profile_dir
+        self.profile_stage = profile_stage
+        self.segment_workers = segment_workers
+        self.file_options = {
+            os.path.abspath(path): self._merge_options(overrides)
+            for path, overrides in (file_options or {}).items()
+        }
+        # 変換スレッドとワーカーの進捗を中継するスレッドの両方から呼び出すため、呼び出しを直列化する
+        self.progress = serialized(progress) if progress is not None else None
+        self.progress_interval = progress_interval
+        self.memory_budget = memory_budget
+        self.frame_buffer = frame_buffer
+        self.journal = journal
+        self.worker_max_jobs = worker_max_jobs
+        self._relay: Optional[ProgressRelay] = None
 
     def convert_to_gif(
         self, input_path: str, output_path: Optional[str] = None
@@ -33,38 +346,957 @@ class MovieConverter:
         Returns:
             bool: 変換成功時はTrue、失敗時はFalse
         """
-        try:
-            # 出力パスが指定されていない場合はデフォルトパスを使用
-            if output_path is None:
-                output_path = str(Path(input_path).with_suffix(".gif"))
+        # 出力パスが指定されていない場合はデフォルトパスを使用
+        if output_path is None:
+            output_path = str(Path(input_path).with_suffix(".gif"))
+        options = self._options_for(input_path)
+        if options is not self.options:
+            return self._derive(options).convert_to_gif(input_path, output_path)
+        if self.options["max_bytes"] is not None:
+            return self._convert_to_size(input_path, output_path)
 
+        profiler = (
+            StageProfiler(self.profile_stage) if self.profile_dir else NULL_PROFILER
+        )
+        progress = self._file_progress(input_path, output_path)
+        success = False
+        try:
             self.logger.info(f"変換開始: {input_path} -> {output_path}")
 
-            # MoviePyを使用して変換
-            clip = VideoFileClip(input_path)
+            with profiler.span("open"):
+                info = self._clip_info(probe_video(input_path))
+            size = output_size(info.size, self.options)
+            fps = self._output_fps(info)
+            progress.start(int(math.floor(info.duration * fps)))
+            with profiler.span("palette"):
+                palette = self._global_palette(input_path, info)
 
-            # GIFに変換（低品質オプションでファイルサイズを削減）
-            clip.write_gif(
+            segment_workers, frame_buffer = self._memory_limits(input_path, info.size)
+            segments = plan_segments(info.duration, fps, segment_workers)
+            with GifWriter(
                 output_path,
-                fps=15,  # フレームレートを15fpsに設定
+                size,
+                global_palette=palette,
+                profiler=profiler,
+                reserved_colors=self._reserved_colors(),
+            ) as writer:
+                if len(segments) > 1:
+                    with profiler.span("segments"):
+                        self._encode_segments(
+                            input_path,
+                            writer,
+                            size,
+                            fps,
+                            palette,
+                            segments,
+                            progress,
+                            frame_buffer,
+                        )
+                else:
+                    # 縮小とフレームレート変換はffmpeg側で行い、出力サイズのフレームを逐次減色して書き出す
+                    with self._open_decoder(input_path, size, fps) as decoder:
+                        frames = progress.iter_decoded(
+                            profiler.iter_span("decode", decoder)
+                        )
+                        self._encode_frames(
+                            iter_buffered(frames, frame_buffer),
+                            palette,
+                            writer,
+                            1000.0 / fps,
+                            profiler,
+                            progress,
+                        )
+
+            self.logger.info(f"変換完了: {output_path}")
+            success = True
+            progress.finish(True, writer.bytes_written)
+
+        except Exception as e:
+            self.logger.error(f"変換中にエラーが発生しました: {str(e)}")
+            progress.finish(False)
+
+        if isinstance(profiler, StageProfiler):
+            self._write_profile(profiler, input_path, output_path, success)
+        return success
+
+    def convert_renditions(
+        self, input_path: str, renditions: Iterable[Rendition]
+    ) -> List[ConversionResult]:
+        """
+        1つの動画を1回だけデコードし、解像度・フレームレート・色数の異なる複数のGIF（レンディション）に変換する
+
+        デコードは最も大きいレンディションの解像度と最も高いフレームレートで1回だけ行い、
+        レンディションごとに間引き・縮小したフレームを別々のスレッドで減色して書き出す。
+        パレット生成用の標本フレームのデコードと色ヒストグラムも全レンディションで共有する。
+        max_bytesを指定したレンディションは設定を選び直しながら変換するため、共有せずに個別に変換する
+
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            renditions (Iterable[Rendition]): 出力するレンディション
+
+        Returns:
+            List[ConversionResult]: renditionsと同じ順の変換結果
+
+        Raises:
+            ValueError: レンディションの変換オプションが不正な場合、または切り出し区間がレンディションごとに異なる場合
+        """
+        options = self._options_for(input_path)
+        if options is not self.options:
+            return self._derive(options).convert_renditions(input_path, renditions)
+
+        renditions = list(renditions)
+        branches = [
+            self._derive(self._merge_options(rendition.options or {}))
+            for rendition in renditions
+        ]
+        for branch in branches:
+            if clip_bounds(branch.options) != clip_bounds(self.options):
+                raise ValueError(
+                    "切り出し区間（start, end, duration）はレンディションごとに変えられません"
+                )
+
+        success = [False] * len(renditions)
+        shared = [
+            index
+            for index, branch in enumerate(branches)
+            if branch.options["max_bytes"] is None
+        ]
+        if shared:
+            results = self._convert_shared(
+                input_path,
+                [branches[index] for index in shared],
+                [renditions[index].output_path for index in shared],
             )
+            for index, result in zip(shared, results):
+                success[index] = result
+        for index, branch in enumerate(branches):
+            if branch.options["max_bytes"] is not None:
+                success[index] = branch.convert_to_gif(
+                    input_path, renditions[index].output_path
+                )
+        return [
+            ConversionResult(input_path, rendition.output_path, result)
+            for rendition, result in zip(renditions, success)
+        ]
 
-            # クリップを閉じる（リソース解放）
-            clip.close()
+    def _convert_shared(
+        self,
+        input_path: str,
+        branches: List["MovieConverter"],
+        output_paths: List[str],
+    ) -> List[bool]:
+        """
+        convert_renditionsの本体。1回のデコードからbranchesそれぞれの変換オプションで書き出す
 
-            self.logger.info(f"変換完了: {output_path}")
-            return True
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            branches (List[MovieConverter]): レンディションごとの変換オプションを持つインスタンス
+            output_paths (List[str]): branchesと同じ順の出力GIFファイルのパス
+
+        Returns:
+            List[bool]: branchesと同じ順の変換結果
+        """
+        progresses = [self._file_progress(input_path, path) for path in output_paths]
+        try:
+            self.logger.info(f"変換開始: {input_path} -> {', '.join(output_paths)}")
+
+            info = self._clip_info(probe_video(input_path))
+            sizes = [output_size(info.size, branch.options) for branch in branches]
+            rates = [branch._output_fps(info) for branch in branches]
+            for progress, fps in zip(progresses, rates):
+                progress.start(int(math.floor(info.duration * fps)))
+            palettes = self._rendition_palettes(input_path, info, branches)
+
+            # 他のレンディションはすべてこの解像度・フレームレートから間引き・縮小して作れる
+            decode_size = max(sizes, key=lambda size: size[0] * size[1])
+            decode_fps = max(rates)
+            _, frame_buffer = self._memory_limits(input_path, info.size)
+            encoders = [
+                branch._rendition_encoder(path, size, fps, palette, progress)
+                for branch, path, size, fps, palette, progress in zip(
+                    branches, output_paths, sizes, rates, palettes, progresses
+                )
+            ]
+            with self._open_decoder(input_path, decode_size, decode_fps) as decoder:
+                frames = resample_renditions(
+                    decoder,
+                    [(size, decode_fps / fps) for size, fps in zip(sizes, rates)],
+                )
+                errors = fan_out(frames, encoders, frame_buffer)
 
         except Exception as e:
             self.logger.error(f"変換中にエラーが発生しました: {str(e)}")
+            for progress in progresses:
+                progress.finish(False)
+            return [False] * len(branches)
+
+        for path, error, progress in zip(output_paths, errors, progresses):
+            if error is not None:
+                self.logger.error(f"変換中にエラーが発生しました: {path}: {str(error)}")
+                progress.finish(False)
+        return [error is None for error in errors]
+
+    def _rendition_encoder(
+        self,
+        output_path: str,
+        size: Tuple[int, int],
+        fps: float,
+        palette: np.ndarray,
+        progress: NullProgress,
+    ) -> Callable[[Iterator[np.ndarray]], None]:
+        """
+        振り分けられたフレームをoptionsで減色して1つのGIFに書き出す関数を作る（fan_outの消費者スレッドで呼び出される）
+        """
+
+        def encode(frames: Iterator[np.ndarray]):
+            with GifWriter(
+                output_path,
+                size,
+                global_palette=palette,
+                reserved_colors=self._reserved_colors(),
+            ) as writer:
+                self._encode_frames(
+                    frames, palette, writer, 1000.0 / fps, progress=progress
+                )
+            self.logger.info(f"変換完了: {output_path}")
+            progress.finish(True, writer.bytes_written)
+
+        return encode
+
+    def _convert_to_size(self, input_path: str, output_path: str) -> bool:
+        """
+        出力がmax_bytes以下になる設定を標本フレームからの推定で選んでから変換する
+
+        全体の変換は、推定で収まる設定が決まってから1回だけ行う。実際のサイズが上限を超えた場合は、
+        推定と実際の比で推定値を補正して設定を選び直し、1回だけ変換し直す。
+        内側の変換のfile_doneイベントは保留し、結果が決まってから1回だけ通知する。
+        最も小さい設定でも上限を超えた場合は、出力したGIFを削除して失敗として扱う
+
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            output_path (str): 出力GIFファイルのパス
+
+        Returns:
+            bool: 上限以下のGIFを出力できた場合はTrue
+        """
+        max_bytes = self.options["max_bytes"]
+        try:
+            info = self._clip_info(probe_video(input_path))
+            fps = self._output_fps(info)
+            ladder = size_ladder(fps, palette_colors(self.options))
+            bursts = self._sample_bursts(input_path, info, fps)
+            estimates: Dict[SizeCandidate, int] = {}
+            # 候補の色数ごとのパレットは、1回だけ作る色ヒストグラムから生成する
+            histograms: Dict[str, np.ndarray] = {}
+
+            def estimate(candidate: SizeCandidate) -> int:
+                if candidate not in estimates:
+                    estimates[candidate] = self._estimate_size(
+                        input_path, info, candidate, bursts, fps, histograms
+                    )
+                return estimates[candidate]
+
+            index = find_fitting(ladder, estimate, max_bytes * SIZE_TARGET_MARGIN)
+        except Exception as e:
+            self.logger.error(f"出力サイズの推定中にエラーが発生しました: {str(e)}")
+            self._file_progress(input_path, output_path).finish(False)
             return False
 
-    def batch_convert(self, file_paths: List[str]) -> Dict[str, bool]:
+        # 変換し直す場合に完了を2回通知しないよう、file_doneイベントは最後の1回分だけ保留する
+        held: List[Dict[str, Any]] = []
+
+        def hold_done(event: Dict[str, Any]):
+            if event["event"] == "file_done":
+                held[:] = [event]
+            else:
+                self.progress(event)
+
+        def release(success: bool):
+            if held:
+                self.progress(dict(held[0], success=success))
+
+        for attempt in range(2):
+            candidate = ladder[index]
+            self.logger.info(
+                f"{max_bytes}バイト以下に収める設定: 幅の縮小率{candidate.scale:g}, "
+                f"{candidate.fps:g}fps, {candidate.colors}色（推定 {estimate(candidate)}バイト）"
+            )
+            converter = self._derive(candidate.options(self.options, info.size))
+            if self.progress is not None:
+                converter.progress = hold_done
+            if not converter.convert_to_gif(input_path, output_path):
+                release(False)
+                return False
+
+            actual = os.path.getsize(output_path)
+            if actual <= max_bytes:
+                release(True)
+                return True
+            if attempt == 1 or index == len(ladder) - 1:
+                break
+
+            # 推定が外れた割合で残りの候補の推定値を補正して選び直す
+            ratio = actual / max(1, estimate(candidate))
+            self.logger.warning(
+                f"出力が{actual}バイトで上限を超えたため、設定を下げて変換し直します"
+            )
+            rest = ladder[index + 1 :]
+            index += 1 + find_fitting(
+                rest,
+                lambda c: estimate(c) * ratio,
+                max_bytes * SIZE_TARGET_MARGIN,
+            )
+
+        self.logger.error(
+            f"{max_bytes}バイト以下に収まりませんでした（{actual}バイト）: {output_path}"
+        )
+        # 失敗として扱うため、上限を超えたGIFは残さない
+        os.remove(output_path)
+        release(False)
+        return False
+
+    def _sample_bursts(
+        self, input_path: str, info: VideoInfo, fps: float
+    ) -> List[List[np.ndarray]]:
+        """
+        サイズ推定用に、動画全体から等間隔に連続するフレームを元の設定の解像度でデコードする
+
+        デコードはこの1回だけ行い、各候補の推定ではこのフレームを間引き・縮小して使う
+
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            info (VideoInfo): 入力動画のメタデータ
+            fps (float): 元の設定の出力フレームレート
+
+        Returns:
+            List[List[np.ndarray]]: 区間ごとの連続するRGBフレーム
+        """
+        size = output_size(info.size, self.options)
+        total_frames = max(1, int(math.floor(info.duration * fps)))
+        bursts = []
+        for burst in sample_bursts(total_frames):
+            with self._open_decoder(
+                input_path, size, fps, burst.start_frame, burst.frame_count
+            ) as decoder:
+                frames = list(decoder)
+            if frames:
+                bursts.append(frames)
+        return bursts
+
+    def _estimate_size(
+        self,
+        input_path: str,
+        info: VideoInfo,
+        candidate: SizeCandidate,
+        bursts: List[List[np.ndarray]],
+        fps: float,
+        histograms: Optional[Dict[str, np.ndarray]] = None,
+    ) -> int:
+        """
+        標本の連続フレームだけを候補の設定で実際にエンコードし、出力サイズを推定する
+
+        各区間の先頭フレーム（全面）と2フレーム目以降（差分・重複除去が効く）のバイト数を分けて集計し、
+        先頭フレーム1枚と、残りのフレーム数×2フレーム目以降の平均を足して推定する
+
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            info (VideoInfo): 入力動画のメタデータ
+            candidate (SizeCandidate): 推定する設定
+            bursts (List[List[np.ndarray]]): _sample_burstsでデコードした標本
+            fps (float): 標本の出力フレームレート
+            histograms (Dict[str, np.ndarray], optional): 候補の間で共有するパレット生成用の色ヒストグラム
+
+        Returns:
+            int: 推定した出力サイズ（バイト）
+        """
+        converter = self._derive(candidate.options(self.options, info.size))
+        size = output_size(info.size, converter.options)
+        candidate_fps = converter._output_fps(info)
+        palette = self._rendition_palettes(input_path, info, [converter], histograms)[0]
+        total_frames = max(1, int(math.floor(info.duration * candidate_fps)))
+
+        # ヘッダー・カラーテーブル・トレーラーのサイズ
+        with GifWriter(
+            os.devnull,
+            size,
+            global_palette=palette,
+            atomic=False,
+            reserved_colors=converter._reserved_colors(),
+        ) as writer:
+            pass
+        fixed_bytes = writer.bytes_written
+
+        first_bytes = []
+        rest_bytes = 0
+        rest_frames = 0
+        for burst in bursts:
+            frames = resample_burst(burst, fps / candidate_fps, size)
+            first = converter._encoded_bytes(frames[:1], palette, size, candidate_fps)
+            whole = converter._encoded_bytes(frames, palette, size, candidate_fps)
+            first_bytes.append(first)
+            rest_bytes += whole - first
+            rest_frames += len(frames) - 1
+
+        if not first_bytes:
+            return fixed_bytes
+        estimated = fixed_bytes + sum(first_bytes) / len(first_bytes)
+        if rest_frames > 0:
+            estimated += rest_bytes / rest_frames * (total_frames - 1)
+        return int(round(estimated))
+
+    def _encoded_bytes(
+        self,
+        frames: List[np.ndarray],
+        palette: np.ndarray,
+        size: Tuple[int, int],
+        fps: float,
+    ) -> int:
+        """
+        フレームを書き出した場合のフレーム部分のバイト数を求める（ファイルには保存しない）
+        """
+        with GifWriter(
+            os.devnull,
+            size,
+            global_palette=palette,
+            frames_only=True,
+            atomic=False,
+            reserved_colors=self._reserved_colors(),
+        ) as writer:
+            self._encode_frames(iter(frames), palette, writer, 1000.0 / fps)
+        return writer.bytes_written
+
+    def _merge_options(self, overrides: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        ファイルごとの変換オプションをoptionsに重ねる
+
+        切り出し区間の終わりはendとdurationのどちらか一方で指定するため、
+        ファイルごとにどちらかを指定した場合はoptionsの両方を置き換える
+
+        Args:
+            overrides (Dict[str, Any]): ファイルごとの変換オプション
+
+        Returns:
+            Dict[str, Any]: 検証済みの変換オプション
+
+        Raises:
+            ValueError: 変換オプションが不正な場合
+        """
+        options = dict(self.options)
+        if "end" in overrides or "duration" in overrides:
+            options.update(end=None, duration=None)
+        options.update(overrides)
+        return resolve_options(options)
+
+    def _options_for(self, input_path: str) -> Dict[str, Any]:
+        """
+        入力ファイルに適用する変換オプションを返す（ファイルごとの指定がなければoptions）
+        """
+        if not self.file_options:
+            return self.options
+        return self.file_options.get(os.path.abspath(input_path), self.options)
+
+    def _job_options(self, job: Tuple) -> Dict[str, Any]:
+        """
+        convert_iterのジョブに適用する変換オプションを返す（ジョブごとの指定がなければ_options_forの値）
+
+        Raises:
+            ValueError: ジョブごとの変換オプションが不正な場合
+        """
+        if len(job) > 2 and job[2]:
+            return self._merge_options(job[2])
+        return self._options_for(job[0])
+
+    def _derive(self, options: Dict[str, Any]) -> "MovieConverter":
+        """
+        キャッシュ・プロファイル・分割エンコード・メモリ予算の設定を引き継ぎ、変換オプションだけを差し替えたインスタンスを作る
+        """
+        return MovieConverter(
+            self.logger,
+            palette_cache=self.palette_cache,
+            options=options,
+            profile_dir=self.profile_dir,
+            profile_stage=self.profile_stage,
+            segment_workers=self.segment_workers,
+            progress=self.progress,
+            progress_interval=self.progress_interval,
+            memory_budget=self.memory_budget,
+            frame_buffer=self.frame_buffer,
+            worker_max_jobs=self.worker_max_jobs,
+        )
+
+    def _file_progress(self, input_path: str, output_path: str) -> NullProgress:
+        """
+        1ファイル分の進捗を通知するトラッカーを作る（コールバックが未指定の場合は何もしないもの）
+        """
+        if self.progress is None:
+            return NULL_PROGRESS
+        return FileProgress(
+            self.progress, input_path, output_path, self.progress_interval
+        )
+
+    @contextmanager
+    def _relaying(self) -> Iterator[None]:
+        """
+        ワーカープロセスの進捗イベントを中継するスレッドを動かす（コールバックが未指定の場合は何もしない）
+
+        この間に_worker_poolで作ったプールのワーカーは、進捗イベントをメインプロセスへ送る
+        """
+        if self.progress is None or self._relay is not None:
+            yield
+            return
+        with ProgressRelay(self.progress) as relay:
+            self._relay = relay
+            try:
+                yield
+            finally:
+                self._relay = None
+
+    def _worker_pool(self, max_workers: int) -> RecyclingPool:
+        """
+        ファイル単位で変換するワーカーのプロセスプールを作る（中継中は進捗イベントも送らせる）
+
+        ワーカーはworker_max_jobs件ずつジョブをまたいで使い回し、超えたらプールを作り直す
+        """
+        progress_queue = self._relay.queue if self._relay is not None else None
+        return RecyclingPool(
+            lambda: _process_pool(max_workers, progress_queue, self.progress_interval),
+            max_workers,
+            self.worker_max_jobs,
+        )
+
+    def _memory_limits(
+        self,
+        input_path: str,
+        source_size: Tuple[int, int],
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[int, int]:
+        """
+        メモリ予算に収まる分割エンコードのプロセス数と、先読みフレーム数を求める
+
+        区間ごとのプロセスはそれぞれデコーダーと作業用配列を持つため、予算に収まる数まで減らす
+
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            source_size (Tuple[int, int]): 入力の解像度 (幅, 高さ)
+            options (Dict[str, Any], optional): 変換オプション。未指定の場合はoptionsの設定値
+
+        Returns:
+            Tuple[int, int]: (分割エンコードのプロセス数, 先読みフレーム数)
+        """
+        if self.memory_budget is None:
+            return self.segment_workers, self.frame_buffer
+        if options is None:
+            options = self.options
+        cost = estimate_working_set(source_size, options, self.frame_buffer)
+        workers = max(1, min(self.segment_workers, self.memory_budget // cost))
+        if workers < self.segment_workers:
+            self.logger.info(
+                f"メモリ予算に収めるため、分割エンコードのプロセス数を{workers}にします: {input_path}"
+            )
+        return workers, self._frame_buffer_within_budget(input_path, cost)
+
+    def _job_memory(
+        self, input_path: str, options: Optional[Dict[str, Any]] = None
+    ) -> Tuple[int, int, int]:
+        """
+        ワーカーで変換するジョブのメモリ使用量の見積もりと、先読みフレーム数・分割エンコードのプロセス数を求める
+
+        分割エンコードする場合は区間ごとのプロセスがそれぞれメモリを使うため、区間数分を見積もりに含める
+
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            options (Dict[str, Any], optional): 変換オプション。未指定の場合は_options_forの値
+
+        Returns:
+            Tuple[int, int, int]: (メモリ使用量の見積もり（バイト）, 先読みフレーム数, 分割エンコードのプロセス数)。
+            メタデータを読み込めないファイルは見積もりを0とする（エラーは変換時に報告する）
+        """
+        if options is None:
+            options = self._options_for(input_path)
+        try:
+            info = probe_media(input_path)
+            duration = clip_duration(info.duration, options)
+        except Exception:
+            return 0, self.frame_buffer, self.segment_workers
+        workers, frame_buffer = self._memory_limits(input_path, info.size, options)
+        fps = float(options["fps"])
+        if info.fps > 0:
+            fps = min(fps, info.fps)
+        processes = len(plan_segments(duration, fps, workers))
+        cost = estimate_working_set(
+            info.size, options, self.frame_buffer, processes=processes
+        )
+        return cost, frame_buffer, workers
+
+    def _frame_buffer_within_budget(self, input_path: str, cost: int) -> int:
+        """
+        1ジョブだけでメモリ予算を超える場合は、先読みを最小限に減らす（そのジョブは単独で実行される）
+        """
+        assert self.memory_budget is not None
+        if cost <= self.memory_budget:
+            return self.frame_buffer
+        self.logger.warning(
+            f"メモリ使用量の見積もり（{cost / 1e6:.0f}MB）がメモリ予算"
+            f"（{self.memory_budget / 1e6:.0f}MB）を超えるため、先読みを減らして単独で変換します: {input_path}"
+        )
+        return min(self.frame_buffer, LOW_MEMORY_FRAME_BUFFER)
+
+    def _write_profile(
+        self,
+        profiler: StageProfiler,
+        input_path: str,
+        output_path: str,
+        success: bool,
+    ):
+        """
+        1ファイル分のプロファイルをJSONで保存する（cProfileの結果は.profで保存する）
+
+        Args:
+            profiler (StageProfiler): 計測済みのプロファイラー
+            input_path (str): 入力動画ファイルのパス
+            output_path (str): 出力GIFファイルのパス
+            success (bool): 変換結果
+        """
+        assert self.profile_dir is not None
+        path = profile_path(self.profile_dir, input_path)
+        profile: Dict[str, Any] = {
+            "input": input_path,
+            "output": output_path,
+            "success": success,
+            "options": self.options,
+        }
+        profile.update(profiler.report())
+        try:
+            write_json(path, profile)
+            if profiler.cprofile is not None:
+                profiler.cprofile.dump_stats(
+                    path[: -len(".json")] + f".{self.profile_stage}.prof"
+                )
+        except OSError as e:
+            self.logger.warning(f"プロファイルの保存に失敗しました: {str(e)}")
+            return
+        self.logger.debug(f"プロファイルを保存しました: {path}")
+
+    def _encode_segments(
+        self,
+        input_path: str,
+        writer: GifWriter,
+        size: Tuple[int, int],
+        fps: float,
+        palette: np.ndarray,
+        segments: List[Segment],
+        progress: NullProgress = NULL_PROGRESS,
+        frame_buffer: Optional[int] = None,
+    ):
+        """
+        区間ごとに別プロセスでエンコードし、フレームのブロックを区間順に連結する
+
+        全区間で同じグローバルパレットを使うため、ブロックを連結するだけで1つのGIFになる。
+        差分エンコード時は各区間の先頭フレームが全体フレームになる
+
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            writer (GifWriter): 書き出し先（ヘッダー書き込み済み）
+            size (Tuple[int, int]): 出力の解像度 (幅, 高さ)
+            fps (float): 出力フレームレート
+            palette (np.ndarray): 動画全体で共通のパレット (N, 3) uint8
+            segments (List[Segment]): エンコードする区間
+            progress (NullProgress, optional): 区間を連結するごとに進捗を通知するトラッカー
+            frame_buffer (int, optional): 区間ごとのプロセスで先読みするフレーム数。未指定の場合はframe_bufferの設定値
+        """
+        if frame_buffer is None:
+            frame_buffer = self.frame_buffer
+        self.logger.info(
+            f"{len(segments)}個の区間に分割して並列にエンコードします: {input_path}"
+        )
+        with tempfile.TemporaryDirectory(prefix="mov2gif-segments-") as temp_dir:
+            with _process_pool(len(segments)) as executor:
+                futures = []
+                for segment in segments:
+                    segment_path = os.path.join(temp_dir, f"{segment.index}.part")
+                    future = executor.submit(
+                        _encode_segment_in_worker,
+                        input_path,
+                        segment_path,
+                        size,
+                        fps,
+                        palette,
+                        segment,
+                        self.options,
+                        frame_buffer,
+                    )
+                    futures.append((segment_path, future))
+
+                # 完了した順ではなく区間の順に連結する（先頭の区間から順に書き出せる）
+                for segment, (segment_path, future) in zip(segments, futures):
+                    frames_written, frames_decoded = future.result()
+                    writer.append_frames(segment_path, frames_written)
+                    os.remove(segment_path)
+                    progress.add_decoded(frames_decoded)
+                    frame_count = segment.frame_count
+                    if frame_count is None:
+                        frame_count = max(
+                            0, progress.frames_total - segment.start_frame
+                        )
+                    progress.advance(frame_count, writer.bytes_written)
+
+    def _clip_info(self, info: VideoInfo) -> VideoInfo:
+        """
+        start・end・durationで切り出す区間の長さをメタデータに反映する
+
+        Args:
+            info (VideoInfo): 入力動画のメタデータ
+
+        Returns:
+            VideoInfo: 長さを切り出す区間の長さにしたメタデータ
+
+        Raises:
+            ValueError: 開始時刻が動画の長さ以降の場合
+        """
+        start, end = clip_bounds(self.options)
+        if start == 0 and end is None:
+            return info
+        duration = clip_duration(info.duration, self.options)
+        self.logger.info(
+            f"{start:g}秒から{start + duration:g}秒までを切り出して変換します"
+        )
+        return info._replace(duration=duration)
+
+    def _open_decoder(
+        self,
+        input_path: str,
+        size: Tuple[int, int],
+        fps: float,
+        start_frame: int = 0,
+        max_frames: Optional[int] = None,
+    ) -> FrameDecoder:
+        """
+        切り出す区間のstart_frame番目の出力フレームからデコードするFrameDecoderを作る
+
+        開始位置へは入力側でシークするため、直前のキーフレームからのデコードで済み、
+        区間の終わり以降はデコードしない
+
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            size (Tuple[int, int]): 出力の解像度 (幅, 高さ)
+            fps (float): 出力フレームレート
+            start_frame (int, optional): 切り出す区間の先頭からの出力フレーム番号
+            max_frames (int, optional): 出力する最大フレーム数。未指定の場合は区間の最後まで
+
+        Returns:
+            FrameDecoder: デコーダー
+        """
+        clip_start, clip_end = clip_bounds(self.options)
+        start = clip_start + start_frame / fps
+        kwargs: Dict[str, Any] = {}
+        if start > 0:
+            kwargs["start"] = start
+        if max_frames is not None:
+            kwargs["max_frames"] = max_frames
+        if clip_end is not None:
+            kwargs["duration"] = clip_end - start
+        return FrameDecoder(input_path, size, fps, **kwargs)
+
+    def _output_fps(self, info: VideoInfo) -> float:
+        """
+        出力フレームレートを求める（入力のフレームレートより高くはしない）
+
+        Args:
+            info (VideoInfo): 入力動画のメタデータ
+
+        Returns:
+            float: 出力フレームレート
+        """
+        fps = float(self.options["fps"])
+        if info.fps > 0:
+            fps = min(fps, info.fps)
+        return fps
+
+    def _reserved_colors(self) -> int:
+        """
+        GifWriterのカラーテーブルにパレットの後ろに予約するインデックスの数（差分エンコードの透過色の分）
+        """
+        return 1 if self.options["optimize"] else 0
+
+    def _encode_frames(
+        self,
+        frames: Iterable[np.ndarray],
+        palette: np.ndarray,
+        writer: GifWriter,
+        duration_ms: float,
+        profiler: NullProfiler = NULL_PROFILER,
+        progress: NullProgress = NULL_PROGRESS,
+    ):
+        """
+        RGBフレームを減色し、必要に応じて差分エンコードしながら書き出す
+
+        dedupが有効な場合は、直前と同じフレームを書き出さずに前のフレームの表示時間へ加算する
+
+        Args:
+            frames (Iterable[np.ndarray]): RGBフレームのイテラブル
+            palette (np.ndarray): グローバルパレット (N, 3) uint8
+            writer (GifWriter): 書き出し先
+            duration_ms (float): 1フレームの表示時間（ミリ秒）
+            profiler (NullProfiler, optional): 減色（quantize）と差分エンコード（delta）の所要時間を計測するプロファイラー
+            progress (NullProgress, optional): 書き出したフレーム数を通知するトラッカー
+        """
+        mapper = PaletteMapper(palette, self.options["dither"])
+        delta = DeltaEncoder(len(palette)) if self.options["optimize"] else None
+
+        if self.options["dedup"]:
+            # 表示時間の丸めの繰り越し分の余裕を残して、GIFの遅延時間の上限を超えない数までまとめる
+            merged: Iterable[MergedFrame] = merge_duplicates(
+                frames,
+                self.options["dedup_threshold"],
+                max_count=max(1, int((MAX_DELAY_MS - 10) // duration_ms)),
+            )
+        else:
+            merged = (MergedFrame(frame, 1) for frame in frames)
+
+        for frame, count in merged:
+            profiler.count("duplicate_frames", count - 1)
+            with profiler.span("quantize"):
+                indices = mapper.map(frame)
+            if delta is None:
+                writer.write_frame(indices, duration_ms=duration_ms * count)
+                progress.advance(count, writer.bytes_written)
+                continue
+
+            with profiler.span("delta"):
+                encoded = delta.encode(indices)
+            profiler.count("delta_pixels", encoded.indices.size)
+            writer.write_frame(
+                encoded.indices,
+                duration_ms=duration_ms * count,
+                offset=encoded.offset,
+                transparency=encoded.transparency,
+                disposal=DISPOSAL_NONE,
+            )
+            progress.advance(count, writer.bytes_written)
+
+    def _global_palette(self, input_path: str, info: VideoInfo) -> np.ndarray:
+        """
+        クリップ全体で共通のパレットを取得する（キャッシュがあれば再利用）
+
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            info (VideoInfo): 入力動画のメタデータ
+
+        Returns:
+            np.ndarray: パレット (N, 3) uint8
+        """
+        key, colors = self._palette_key(file_fingerprint(input_path))
+        palette = self.palette_cache.load(key)
+        if palette is not None:
+            self.logger.debug(f"キャッシュ済みのパレットを使用します: {input_path}")
+            return palette
+
+        samples = self._sample_frames(input_path, info)
+        palette = build_palette(color_histogram(samples), colors)
+        self._store_palette(key, palette)
+        return palette
+
+    def _rendition_palettes(
+        self,
+        input_path: str,
+        info: VideoInfo,
+        branches: List["MovieConverter"],
+        histograms: Optional[Dict[str, np.ndarray]] = None,
+    ) -> List[np.ndarray]:
+        """
+        レンディションごとのパレットを取得する（キャッシュがあれば再利用）
+
+        キャッシュにないパレットは、1回だけデコードした標本フレームの色ヒストグラムから色数ごとに生成する
+
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            info (VideoInfo): 入力動画のメタデータ
+            branches (List[MovieConverter]): レンディションごとの変換オプションを持つインスタンス
+            histograms (Dict[str, np.ndarray], optional): 呼び出しをまたいで色ヒストグラムを共有する場合の保存先 {フィンガープリント: ヒストグラム}
+
+        Returns:
+            List[np.ndarray]: branchesと同じ順のパレット (N, 3) uint8
+        """
+        if histograms is None:
+            histograms = {}
+        fingerprint = file_fingerprint(input_path)
+        palettes = []
+        for branch in branches:
+            key, colors = branch._palette_key(fingerprint)
+            palette = self.palette_cache.load(key)
+            if palette is None:
+                if fingerprint not in histograms:
+                    histograms[fingerprint] = color_histogram(
+                        self._sample_frames(input_path, info)
+                    )
+                palette = build_palette(histograms[fingerprint], colors)
+                self._store_palette(key, palette)
+            palettes.append(palette)
+        return palettes
+
+    def _palette_key(self, fingerprint: str) -> Tuple[str, int]:
+        """
+        パレットキャッシュのキーとパレットの色数を求める
+
+        Args:
+            fingerprint (str): 入力動画ファイルのフィンガープリント
+
+        Returns:
+            Tuple[str, int]: (キャッシュのキー, 色数)
+        """
+        # 差分エンコード時は透過色用にパレットの1色分を空けておく
+        colors = palette_colors(self.options)
+        if self.options["optimize"]:
+            colors = min(colors, 255)
+
+        key = options_key(
+            fingerprint,
+            {
+                "colors": colors,
+                "sample_frames": PALETTE_SAMPLE_FRAMES,
+                "sample_pixels": PALETTE_SAMPLE_PIXELS,
+                "clip": clip_bounds(self.options),
+            },
+        )
+        return key, colors
+
+    def _store_palette(self, key: str, palette: np.ndarray):
+        """
+        パレットをキャッシュに保存する（失敗しても変換は続ける）
+        """
+        try:
+            self.palette_cache.store(key, palette)
+        except OSError as e:
+            self.logger.warning(f"パレットキャッシュの保存に失敗しました: {str(e)}")
+
+    def _sample_frames(self, input_path: str, info: VideoInfo) -> Iterable[np.ndarray]:
+        """
+        パレット生成用に、動画全体から等間隔にフレームを縮小デコードする
+
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            info (VideoInfo): 入力動画のメタデータ
+
+        Returns:
+            Iterable[np.ndarray]: 縮小したRGBフレーム
+        """
+        width, height = info.size
+        scale = min(1.0, math.sqrt(PALETTE_SAMPLE_PIXELS / (width * height)))
+        size = (max(1, int(width * scale)), max(1, int(height * scale)))
+        start, _ = clip_bounds(self.options)
+        return sample_frames(
+            input_path, info.duration, PALETTE_SAMPLE_FRAMES, size, start=start
+        )
+
+    def batch_convert(
+        self, file_paths: List[str], max_workers: Optional[int] = None
+    ) -> Dict[str, bool]:
         """
         複数の動画ファイルを一括でGIFに変換する
 
         Args:
             file_paths (List[str]): 変換対象の動画ファイルパスのリスト
+            max_workers (int, optional): ワーカープロセス数。未指定の場合はコンストラクタの値を使用
 
         Returns:
             Dict[str, bool]: 変換結果の辞書 {ファイルパス: 成功/失敗}
@@ -77,13 +1309,726 @@ class MovieConverter:
 
         self.logger.info(f"{len(file_paths)}個のファイルの変換を開始します")
 
-        # 各ファイルを順番に変換
-        for path in file_paths:
-            result = self.convert_to_gif(path)
-            results[path] = result
+        if max_workers is None:
+            max_workers = self.max_workers
+        batch = None
+        if self.progress is not None:
+            batch = BatchProgress(
+                self.progress, len(set(file_paths)), self.progress_interval
+            )
+
+        # 前回の一括変換で完了済みのファイルはスキップし、
+        # 入力と変換オプションが前回から変わっていないファイルはキャッシュから復元する
+        cache_keys = self._cache_keys(file_paths)
+        restored = 0
+        for path in dict.fromkeys(file_paths):
+            output_path = str(Path(path).with_suffix(".gif"))
+            key = cache_keys.get(path)
+            if self._skip_completed(path, output_path, key):
+                results[path] = True
+            elif (
+                self.conversion_cache is not None
+                and key is not None
+                and self._restore_from_cache(path, key)
+            ):
+                self._record_finish(path, output_path, key, True)
+                results[path] = True
+                restored += 1
+            else:
+                continue
+            if batch is not None:
+                batch.file_done(path, output_path, True, cached=True)
+        pending = [path for path in dict.fromkeys(file_paths) if path not in results]
+
+        if max_workers > 1 and len(pending) > 1:
+            # プロセスプールで並列に変換
+            with self._relaying():
+                results.update(
+                    self._parallel_convert(pending, max_workers, batch, cache_keys)
+                )
+        else:
+            # 各ファイルを順番に変換
+            for path in pending:
+                output_path = str(Path(path).with_suffix(".gif"))
+                self._record_start(path, output_path, cache_keys.get(path))
+                result = self.convert_to_gif(path)
+                self._record_finish(path, output_path, cache_keys.get(path), result)
+                results[path] = result
+                if batch is not None:
+                    batch.file_done(path, output_path, result)
+        if batch is not None:
+            batch.finish()
+
+        if self.conversion_cache is not None:
+            for path in pending:
+                if results[path] and path in cache_keys:
+                    self._store_in_cache(path, cache_keys[path])
+            self.logger.info(f"キャッシュ: ヒット {restored}件 / ミス {len(pending)}件")
+
+        if self.profile_dir is not None:
+            self._write_batch_summary(pending)
+
+        # 結果は入力順に並べ直す
+        results = {path: results[path] for path in file_paths}
 
         # 結果サマリーを作成
         success_count = sum(1 for result in results.values() if result)
         self.logger.info(f"変換完了: {success_count}/{len(file_paths)} 成功")
 
         return results
+
+    def convert_iter(
+        self,
+        jobs: Iterable[Optional[Tuple]],
+        max_workers: Optional[int] = None,
+    ) -> Iterator[ConversionResult]:
+        """
+        (入力パス, 出力パス) の組を逐次受け取って変換し、完了したものから結果を返す
+
+        (入力パス, 出力パス, 変換オプション) の組（ManifestJobなど）の場合は、
+        そのジョブだけに適用する変換オプションをoptionsに重ねる（file_optionsより優先）
+
+        jobsは必要な分だけ読み進める（並列変換時も未完了のジョブはワーカー数の2倍まで）ため、
+        ファイルの列挙が終わる前に変換を始められる。memory_budgetを指定した場合は、
+        未完了のジョブのメモリ使用量の見積もりの合計が予算に収まるまで次のジョブの投入を待つ。
+        jobsがNoneを返した場合は新しいジョブなしとして、完了済みの結果だけを待たずに回収する
+        （フォルダー監視のように次のジョブの到着を待つ間も結果を返すため）。
+        batch_convertと異なり、処理コスト順の並べ替えは行わない
+
+        Args:
+            jobs (Iterable[Optional[Tuple]]): (入力パス, 出力パス[, 変換オプション]) のイテラブル。出力パスがNoneの場合は入力ファイルと同じ場所に同名で保存
+            max_workers (int, optional): ワーカープロセス数。未指定の場合はコンストラクタの値を使用
+
+        Yields:
+            ConversionResult: 完了した順の変換結果
+        """
+        if self.progress is None:
+            yield from self._convert_jobs(jobs, max_workers)
+            return
+
+        # ジョブを逐次受け取るため、全ファイル数と残り時間は通知しない
+        batch = BatchProgress(self.progress, interval=self.progress_interval)
+        with self._relaying():
+            for result in self._convert_jobs(jobs, max_workers):
+                batch.file_done(
+                    result.input_path,
+                    result.output_path,
+                    result.success,
+                    cached=result.cached or result.resumed,
+                )
+                yield result
+        batch.finish()
+
+    def _convert_jobs(
+        self,
+        jobs: Iterable[Optional[Tuple]],
+        max_workers: Optional[int],
+    ) -> Iterator[ConversionResult]:
+        """
+        convert_iterの本体（進捗イベントの集計を除く）
+        """
+        if max_workers is None:
+            max_workers = self.max_workers
+
+        converted: List[str] = []
+        # 未完了のジョブ {Future: (出力パス, キャッシュキー, 投入先のプール, メモリ使用量の見積もり, ワーカーの引数)}
+        in_flight: Dict[
+            Future, Tuple[str, Optional[str], ProcessPoolExecutor, int, Tuple]
+        ] = {}
+        executor = None
+        governor = None
+        if max_workers > 1:
+            executor = self._worker_pool(max_workers)
+            if self.memory_budget is not None:
+                governor = MemoryGovernor(self.memory_budget)
+
+        def collect(limit: int, block: bool = True) -> Iterator[ConversionResult]:
+            # 未完了のジョブがlimit個以下になるまで結果を回収する（block=Falseの場合は完了済みの分だけ）
+            while len(in_flight) > limit:
+                done, _ = wait(
+                    list(in_flight),
+                    timeout=None if block else 0,
+                    return_when=FIRST_COMPLETED,
+                )
+                if not done:
+                    return
+                for future in done:
+                    output_path, key, pool, cost, args = in_flight.pop(future)
+                    input_path = args[0]
+                    try:
+                        success = future.result()
+                    except BrokenProcessPool:
+                        # 壊れたプールは再利用できないため作り直し、巻き込まれたファイルは同じ引数で隔離して再実行する
+                        assert executor is not None
+                        executor.replace(pool)
+                        self._record_start(input_path, output_path, key)
+                        success = self._convert_isolated(args)
+                    except Exception as e:
+                        self.logger.error(
+                            f"ワーカーでエラーが発生しました: {input_path}: {str(e)}"
+                        )
+                        success = False
+                    if governor is not None:
+                        governor.release(cost)
+                    yield self._finish_job(input_path, output_path, key, success)
+
+        try:
+            for job in jobs:
+                if job is None:
+                    yield from collect(0, block=False)
+                    continue
+
+                input_path, output_path = job[0], job[1]
+                if output_path is None:
+                    output_path = str(Path(input_path).with_suffix(".gif"))
+                try:
+                    options = self._job_options(job)
+                except ValueError as e:
+                    self.logger.error(
+                        f"変換オプションが不正です: {input_path}: {str(e)}"
+                    )
+                    yield ConversionResult(input_path, output_path, False)
+                    continue
+
+                # 前回完了済みであればスキップし、入力と変換オプションが前回から変わっていなければキャッシュから復元する
+                key = self._job_key(input_path, options)
+                if self._skip_completed(input_path, output_path, key):
+                    yield ConversionResult(input_path, output_path, True, resumed=True)
+                    continue
+                if (
+                    self.conversion_cache is not None
+                    and key is not None
+                    and self._restore_from_cache(input_path, key, output_path)
+                ):
+                    self._record_finish(input_path, output_path, key, True)
+                    yield ConversionResult(input_path, output_path, True, cached=True)
+                    continue
+
+                self._record_start(input_path, output_path, key)
+                if self.profile_dir is not None:
+                    converted.append(input_path)
+                if executor is None:
+                    converter = self
+                    if options is not self._options_for(input_path):
+                        converter = self._derive(options)
+                    success = converter.convert_to_gif(input_path, output_path)
+                    yield self._finish_job(input_path, output_path, key, success)
+                    continue
+
+                cost, frame_buffer, segment_workers = (
+                    0,
+                    self.frame_buffer,
+                    self.segment_workers,
+                )
+                if governor is not None:
+                    cost, frame_buffer, segment_workers = self._job_memory(
+                        input_path, options
+                    )
+                    # メモリ予算に収まるまで、未完了のジョブの完了を待つ
+                    while not governor.admits(cost):
+                        yield from collect(len(in_flight) - 1)
+                    governor.acquire(cost)
+                args = (
+                    input_path,
+                    options,
+                    self.palette_cache.cache_dir,
+                    self.profile_dir,
+                    self.profile_stage,
+                    output_path,
+                    frame_buffer,
+                    segment_workers,
+                )
+                future = self._submit_job(executor, *args)
+                in_flight[future] = (output_path, key, executor.executor, cost, args)
+                yield from collect(max_workers * 2 - 1)
+
+            yield from collect(0)
+        finally:
+            if executor is not None:
+                # 中断された場合は、まだ始まっていないジョブを取り消し、実行中のジョブの完了を待つ
+                executor.shutdown(cancel_futures=True)
+
+        if self.profile_dir is not None:
+            self._write_batch_summary(converted)
+
+    def _finish_job(
+        self, input_path: str, output_path: str, key: Optional[str], success: bool
+    ) -> ConversionResult:
+        """
+        変換が完了したジョブの結果をキャッシュに保存してジャーナルに記録し、変換結果を返す
+
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            output_path (str): 出力GIFファイルのパス
+            key (str, optional): キャッシュキー。Noneの場合はキャッシュしない
+            success (bool): 変換結果
+
+        Returns:
+            ConversionResult: 変換結果
+        """
+        if success and key is not None and self.conversion_cache is not None:
+            self._store_in_cache(input_path, key, output_path)
+        self._record_finish(input_path, output_path, key, success)
+        return ConversionResult(input_path, output_path, success)
+
+    def _write_batch_summary(self, file_paths: List[str]):
+        """
+        変換したファイルのプロファイルを集計し、一括変換のサマリーを保存する
+
+        ワーカープロセスが保存したファイルごとのプロファイルを読み込んで集計する
+
+        Args:
+            file_paths (List[str]): 変換した動画ファイルパスのリスト
+        """
+        assert self.profile_dir is not None
+        profiles = []
+        for path in file_paths:
+            try:
+                with open(profile_path(self.profile_dir, path), encoding="utf-8") as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                # 異常終了したワーカーのファイルはプロファイルが残らない
+                continue
+
+        summary_path = os.path.join(self.profile_dir, "batch_summary.json")
+        try:
+            write_json(summary_path, summarize(profiles))
+        except OSError as e:
+            self.logger.warning(f"プロファイルの保存に失敗しました: {str(e)}")
+            return
+        self.logger.info(f"プロファイルのサマリーを保存しました: {summary_path}")
+
+    def conversion_options(
+        self,
+        input_path: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        変換結果に影響するオプションを返す（変換キャッシュのキーに使用）
+
+        Args:
+            input_path (str, optional): 入力動画ファイルのパス。指定した場合はファイルごとの変換オプションを反映する
+            options (Dict[str, Any], optional): ジョブに適用する変換オプション。指定した場合はinput_pathより優先する
+
+        Returns:
+            Dict[str, Any]: 変換オプションの辞書
+        """
+        if options is None:
+            options = (
+                self.options if input_path is None else self._options_for(input_path)
+            )
+        options = dict(options)
+        options.update(
+            {
+                "version": __version__,
+                "palette_sample_frames": PALETTE_SAMPLE_FRAMES,
+                "palette_sample_pixels": PALETTE_SAMPLE_PIXELS,
+            }
+        )
+        return options
+
+    def _cache_keys(self, file_paths: List[str]) -> Dict[str, str]:
+        """
+        各入力ファイルの変換キャッシュキーを求める
+
+        Args:
+            file_paths (List[str]): 動画ファイルパスのリスト
+
+        Returns:
+            Dict[str, str]: {ファイルパス: キャッシュキー}。キャッシュ・ジャーナルとも使わない場合や読み込めないファイルは含まない
+        """
+        keys: Dict[str, str] = {}
+        if self.conversion_cache is None and self.journal is None:
+            return keys
+
+        for path in dict.fromkeys(file_paths):
+            key = self._cache_key(path, self.conversion_options(path))
+            if key is not None:
+                keys[path] = key
+        return keys
+
+    def _cache_key(self, input_path: str, options: Dict[str, Any]) -> Optional[str]:
+        """
+        入力ファイルの変換キャッシュキーを求める
+
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            options (Dict[str, Any]): conversion_optionsの戻り値
+
+        Returns:
+            Optional[str]: キャッシュキー。読み込めないファイルの場合はNone
+        """
+        try:
+            return options_key(file_fingerprint(input_path), options)
+        except OSError:
+            # 読み込めないファイルは通常どおり変換を試みさせ、エラーはそちらで報告する
+            return None
+
+    def _job_key(
+        self, input_path: str, options: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        変換キャッシュとジャーナルで使うキーを求める（どちらも使わない場合や読み込めないファイルはNone）
+        """
+        if self.conversion_cache is None and self.journal is None:
+            return None
+        return self._cache_key(input_path, self.conversion_options(input_path, options))
+
+    def _skip_completed(
+        self, input_path: str, output_path: str, key: Optional[str]
+    ) -> bool:
+        """
+        ジャーナルに完了が記録されており、変換し直す必要のないジョブかどうか
+
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            output_path (str): 出力GIFファイルのパス
+            key (str, optional): キャッシュキー
+
+        Returns:
+            bool: スキップする場合はTrue
+        """
+        if self.journal is None or not self.journal.completed(
+            input_path, output_path, key
+        ):
+            return False
+        self.logger.info(f"前回の変換で完了済みのためスキップします: {input_path}")
+        return True
+
+    def _record_start(self, input_path: str, output_path: str, key: Optional[str]):
+        """
+        ジャーナルにジョブの開始を記録する（ジャーナルを使わない場合は何もしない）
+        """
+        if self.journal is None:
+            return
+        try:
+            self.journal.start(input_path, output_path, key)
+        except OSError as e:
+            self.logger.warning(f"ジャーナルへの記録に失敗しました: {str(e)}")
+
+    def _record_finish(
+        self, input_path: str, output_path: str, key: Optional[str], success: bool
+    ):
+        """
+        ジャーナルにジョブの完了（または失敗）を記録する（ジャーナルを使わない場合は何もしない）
+        """
+        if self.journal is None:
+            return
+        try:
+            self.journal.finish(input_path, output_path, key, success)
+        except OSError as e:
+            self.logger.warning(f"ジャーナルへの記録に失敗しました: {str(e)}")
+
+    def _restore_from_cache(
+        self, input_path: str, key: str, output_path: Optional[str] = None
+    ) -> bool:
+        """
+        変換キャッシュから出力GIFを復元する
+
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            key (str): キャッシュキー
+            output_path (str, optional): 出力GIFファイルのパス。未指定の場合は入力ファイルと同じ場所
+
+        Returns:
+            bool: 復元できた場合はTrue
+        """
+        assert self.conversion_cache is not None
+        if output_path is None:
+            output_path = str(Path(input_path).with_suffix(".gif"))
+        try:
+            restored = self.conversion_cache.restore(key, output_path)
+        except OSError as e:
+            self.logger.warning(f"キャッシュからの復元に失敗しました: {str(e)}")
+            return False
+        if restored:
+            self.logger.info(f"キャッシュを使用しました: {input_path} -> {output_path}")
+        return restored
+
+    def _store_in_cache(
+        self, input_path: str, key: str, output_path: Optional[str] = None
+    ):
+        """
+        変換結果のGIFを変換キャッシュに保存する
+
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            key (str): キャッシュキー
+            output_path (str, optional): 出力GIFファイルのパス。未指定の場合は入力ファイルと同じ場所
+        """
+        assert self.conversion_cache is not None
+        if output_path is None:
+            output_path = str(Path(input_path).with_suffix(".gif"))
+        try:
+            self.conversion_cache.store(key, output_path)
+        except OSError as e:
+            self.logger.warning(f"キャッシュへの保存に失敗しました: {str(e)}")
+
+    def _parallel_convert(
+        self,
+        file_paths: List[str],
+        max_workers: int,
+        batch: Optional[BatchProgress] = None,
+        keys: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, bool]:
+        """
+        プロセスプールを使用して複数の動画ファイルを並列に変換する
+
+        処理時間の長いファイルから順に投入し、完了したものから結果をログに出力する。
+        未完了のファイルがワーカー数の2倍に達した場合は、完了を待ってから次のファイルを投入する。
+        memory_budgetを指定した場合は、未完了のファイルのメモリ使用量の見積もりの合計が
+        予算に収まるまで次のファイルの投入を待つ。
+        ワーカープロセスが異常終了してプールが壊れた場合は、プールを作り直して残りのファイルの投入を続け、
+        壊れたプールで失敗したファイルだけを1ファイルずつ独立したプロセスで再実行する
+
+        Args:
+            file_paths (List[str]): 変換対象の動画ファイルパスのリスト
+            max_workers (int): ワーカープロセス数
+            batch (BatchProgress, optional): 完了したファイルを集計して進捗を通知するトラッカー
+            keys (Dict[str, str], optional): ジャーナルに記録するキャッシュキー {ファイルパス: キャッシュキー}
+
+        Returns:
+            Dict[str, bool]: 変換結果の辞書 {ファイルパス: 成功/失敗}
+        """
+        results: Dict[str, bool] = {}
+        keys = keys or {}
+        # 壊れたプールで失敗したファイルの、投入したときのワーカーの引数
+        crashed: List[Tuple] = []
+        ordered = self._order_by_cost(file_paths)
+
+        self.logger.info(f"{max_workers}個のワーカープロセスで並列変換します")
+        governor = None
+        if self.memory_budget is not None:
+            governor = MemoryGovernor(self.memory_budget)
+
+        # 未完了のファイル {Future: (メモリ使用量の見積もり, 投入先のプール, ワーカーの引数)}
+        in_flight: Dict[Future, Tuple[int, ProcessPoolExecutor, Tuple]] = {}
+
+        def finish(future: Future):
+            cost, pool, args = in_flight.pop(future)
+            path = args[0]
+            if governor is not None:
+                governor.release(cost)
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                # 壊れたプールは再利用できないため作り直し、巻き込まれたファイルは後で隔離して再実行する
+                executor.replace(pool)
+                crashed.append(args)
+                return
+            except Exception as e:
+                self.logger.error(f"ワーカーでエラーが発生しました: {path}: {str(e)}")
+                result = False
+            results[path] = result
+            self._record_finish(
+                path, str(Path(path).with_suffix(".gif")), keys.get(path), result
+            )
+            self._log_result(path, result, len(results), len(ordered), batch)
+
+        with self._worker_pool(max_workers) as executor:
+            for path in ordered:
+                # 結果を順次ログに出せるよう、待機中のジョブはワーカー数程度にとどめる
+                while len(in_flight) >= max_workers * 2:
+                    done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        finish(future)
+                cost, frame_buffer, segment_workers = (
+                    0,
+                    self.frame_buffer,
+                    self.segment_workers,
+                )
+                if governor is not None:
+                    cost, frame_buffer, segment_workers = self._job_memory(path)
+                    # メモリ予算に収まるまで、未完了のファイルの完了を待つ
+                    while not governor.admits(cost):
+                        done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                        for future in done:
+                            finish(future)
+                args = (
+                    path,
+                    self._options_for(path),
+                    self.palette_cache.cache_dir,
+                    self.profile_dir,
+                    self.profile_stage,
+                    None,
+                    frame_buffer,
+                    segment_workers,
+                )
+                future = self._submit_job(executor, *args)
+                if governor is not None:
+                    governor.acquire(cost)
+                self._record_start(
+                    path, str(Path(path).with_suffix(".gif")), keys.get(path)
+                )
+                assert executor.executor is not None
+                in_flight[future] = (cost, executor.executor, args)
+            for future in as_completed(list(in_flight)):
+                finish(future)
+
+        if crashed:
+            self.logger.warning(
+                f"ワーカープロセスが異常終了したため、{len(crashed)}個のファイルを個別に再実行します"
+            )
+            # 再実行は投入したときと同じ引数で1ファイル1プロセスに隔離し、スレッドから並列に駆動する
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {}
+                for args in crashed:
+                    path = args[0]
+                    self._record_start(
+                        path, str(Path(path).with_suffix(".gif")), keys.get(path)
+                    )
+                    futures[executor.submit(self._convert_isolated, args)] = path
+                for future in as_completed(futures):
+                    path = futures[future]
+                    results[path] = future.result()
+                    self._record_finish(
+                        path,
+                        str(Path(path).with_suffix(".gif")),
+                        keys.get(path),
+                        results[path],
+                    )
+                    self._log_result(
+                        path, results[path], len(results), len(ordered), batch
+                    )
+
+        return results
+
+    def _submit_job(self, executor: RecyclingPool, *args: Any) -> Future:
+        """
+        ワーカーでの変換をプールに投入する（プールが壊れていれば作り直してから投入する）
+
+        前に投入したジョブでワーカーが異常終了した場合、その結果を回収する前にプールが壊れていることがある
+
+        Args:
+            executor (RecyclingPool): 投入先のプール
+            *args (Any): _convert_in_workerの引数
+
+        Returns:
+            Future: 変換結果
+        """
+        try:
+            return executor.submit(_convert_in_worker, *args)
+        except BrokenProcessPool:
+            assert executor.executor is not None
+            executor.replace(executor.executor)
+            return executor.submit(_convert_in_worker, *args)
+
+    def _convert_isolated(self, args: Tuple) -> bool:
+        """
+        専用のワーカープロセスで単一の動画ファイルを変換する
+
+        Args:
+            args (Tuple): _convert_in_workerの引数（プールに投入したときと同じもの）
+
+        Returns:
+            bool: 変換成功時はTrue、失敗時またはプロセス異常終了時はFalse
+        """
+        input_path = args[0]
+        try:
+            with self._worker_pool(1) as executor:
+                return executor.submit(_convert_in_worker, *args).result()
+        except BrokenProcessPool:
+            self.logger.error(f"ワーカープロセスが異常終了しました: {input_path}")
+            return False
+        except Exception as e:
+            self.logger.error(f"ワーカーでエラーが発生しました: {input_path}: {str(e)}")
+            return False
+
+    def estimate(
+        self,
+        input_path: str,
+        output_path: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> JobEstimate:
+        """
+        動画をデコードせずに、メタデータから1ファイル分の処理量（フレーム数・所要時間・出力サイズ）を見積もる
+
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            output_path (str, optional): 出力GIFファイルのパス。未指定の場合は入力ファイルと同じ場所に同名で保存
+            options (Dict[str, Any], optional): このファイルだけに適用する変換オプション（optionsに重ねる）
+
+        Returns:
+            JobEstimate: 見積もり。読み込めないファイルなどはerrorに理由を入れ、処理量は0とする
+        """
+        if output_path is None:
+            output_path = str(Path(input_path).with_suffix(".gif"))
+        try:
+            info = probe_media(input_path)
+            return estimate_job(
+                input_path,
+                output_path,
+                info,
+                os.path.getsize(input_path),
+                self._job_options((input_path, output_path, options)),
+                self.segment_workers,
+            )
+        except Exception as e:
+            return JobEstimate(input_path, output_path, error=str(e))
+
+    def plan(
+        self,
+        jobs: Iterable[Tuple],
+        max_workers: Optional[int] = None,
+    ) -> BatchPlan:
+        """
+        一括変換全体の所要時間と出力サイズを見積もる（変換は行わない）
+
+        Args:
+            jobs (Iterable[Tuple]): (入力パス, 出力パス[, 変換オプション]) のイテラブル。出力パスがNoneの場合は入力ファイルと同じ場所
+            max_workers (int, optional): ワーカープロセス数。未指定の場合はコンストラクタの値を使用
+
+        Returns:
+            BatchPlan: 見積もり
+        """
+        if max_workers is None:
+            max_workers = self.max_workers
+        estimates = [self.estimate(*job) for job in jobs]
+        return plan_batch(estimates, max_workers, os.cpu_count())
+
+    def _order_by_cost(self, file_paths: List[str]) -> List[str]:
+        """
+        処理コストの大きい順（所要時間の見積もりの降順）にファイルパスを並べ替える
+
+        見積もれないファイルは最後に、ファイルサイズの降順で並べる
+
+        Args:
+            file_paths (List[str]): 動画ファイルパスのリスト
+
+        Returns:
+            List[str]: 並べ替え後のファイルパスのリスト（重複は除去）
+        """
+
+        def cost(path: str) -> Tuple[float, int]:
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                size = 0
+            return self.estimate(path).seconds, size
+
+        return sorted(dict.fromkeys(file_paths), key=cost, reverse=True)
+
+    def _log_result(
+        self,
+        path: str,
+        result: bool,
+        done: int,
+        total: int,
+        batch: Optional[BatchProgress] = None,
+    ):
+        """
+        1ファイル分の変換結果をログに出力する
+
+        Args:
+            path (str): 動画ファイルのパス
+            result (bool): 変換結果
+            done (int): 完了したファイル数
+            total (int): 全ファイル数
+            batch (BatchProgress, optional): 完了したファイルを集計して進捗を通知するトラッカー
+        """
+        if batch is not None:
+            batch.file_done(path, str(Path(path).with_suffix(".gif")), result)
+        if result:
+            self.logger.info(f"[{done}/{total}] 変換成功: {path}")
+        else:
+            self.logger.error(f"[{done}/{total}] 変換失敗: {path}")
@@ -0,0 +1,77 @@
+"""
+クリップごとに生成したグローバルパレットをディスクにキャッシュするためのモジュール
+"""
+
+import os
+import tempfile
+from typing import Optional
+
+import numpy as np
+
+
+def default_cache_dir() -> str:
+    """
+    mov2gifが使用するキャッシュディレクトリのルートを返す
+
+    Returns:
+        str: $XDG_CACHE_HOME/mov2gif（未設定の場合は~/.cache/mov2gif）
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "mov2gif")
+
+
+class PaletteCache:
+    """
+    キャッシュキー（入力フィンガープリント＋変換オプション）ごとにパレットを保存するクラス
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        PaletteCacheのコンストラクタ
+
+        Args:
+            cache_dir (str, optional): パレットの保存先。未指定の場合はデフォルトのキャッシュディレクトリ配下
+        """
+        self.cache_dir = cache_dir or os.path.join(default_cache_dir(), "palettes")
+
+    def load(self, key: str) -> Optional[np.ndarray]:
+        """
+        キャッシュからパレットを読み込む
+
+        Args:
+            key (str): キャッシュキー
+
+        Returns:
+            Optional[np.ndarray]: パレット (N, 3) uint8。キャッシュがない、または壊れている場合はNone
+        """
+        try:
+            palette = np.load(self._path(key), allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+        if palette.dtype != np.uint8 or palette.ndim != 2 or palette.shape[1] != 3:
+            return None
+        return palette
+
+    def store(self, key: str, palette: np.ndarray):
+        """
+        パレットをキャッシュに保存する（一時ファイル経由で置き換えるため途中状態は残らない）
+
+        Args:
+            key (str): キャッシュキー
+            palette (np.ndarray): パレット (N, 3) uint8
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.asarray(palette, dtype=np.uint8), allow_pickle=False)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.npy")
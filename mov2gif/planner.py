@@ -0,0 +1,238 @@
+"""
+変換前に各ジョブの処理量（出力フレーム数・所要時間・出力サイズ）を見積もり、一括変換の計画を立てるためのモジュール
+
+見積もりはメタデータ（media_probe）とファイルサイズだけから求め、動画はデコードしない
+"""
+
+import heapq
+import math
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from mov2gif.conversion_options import clip_bounds, output_size, palette_colors
+from mov2gif.media_probe import MediaInfo
+from mov2gif.segments import plan_segments
+
+# 所要時間の係数（秒）。benchmarks/.fixturesの4本を既定・縮小・低fps・差分エンコードで変換した実測から求めた
+# 出力の画素数（フレーム数×解像度、100万画素あたり）
+COST_SECONDS_PER_OUTPUT_MPIXEL = 0.0109
+# 入力の画素数（切り出す区間のフレーム数×解像度、100万画素あたり）
+COST_SECONDS_PER_SOURCE_MPIXEL = 0.00065
+# 切り出す区間の入力ファイルのバイト数（1MBあたり。動きの多い動画ほど大きく、重複除去が効きにくい）
+COST_SECONDS_PER_SOURCE_MB = 0.19
+# 1ファイルあたりの固定の所要時間（パレット用のサンプリングなど）
+COST_SECONDS_PER_FILE = 0.40
+# max_bytes指定時の所要時間の倍率（標本でのサイズ推定と変換し直しの分）
+COST_SIZE_SEARCH_FACTOR = 2.4
+
+# 出力サイズの係数。出力1画素あたりのバイト数を、入力1画素あたりのバイト数の累乗に比例するとみなす
+SIZE_BYTES_PER_PIXEL = 3.47
+SIZE_SOURCE_EXPONENT = 0.71
+# optimize（差分エンコード）を有効にした場合の出力サイズの倍率
+SIZE_OPTIMIZE_FACTOR = 0.22
+
+
+class JobEstimate(NamedTuple):
+    """
+    1ジョブ分の見積もり
+    """
+
+    # 入力動画ファイルのパス
+    input_path: str
+    # 出力GIFファイルのパス
+    output_path: str
+    # 出力フレーム数（重複除去の前）
+    frames: int = 0
+    # 所要時間の見積もり（秒、1プロセスで変換した場合）
+    seconds: float = 0.0
+    # 出力サイズの見積もり（バイト）
+    bytes: int = 0
+    # 入力動画のメタデータ
+    info: Optional[MediaInfo] = None
+    # 見積もれなかった理由（メタデータを読み込めないなど）。見積もれた場合はNone
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSONに書き出せる辞書に変換する
+        """
+        return {
+            "input_path": self.input_path,
+            "output_path": self.output_path,
+            "frames": self.frames,
+            "seconds": round(self.seconds, 3),
+            "bytes": self.bytes,
+            "codec": self.info.codec if self.info is not None else None,
+            "error": self.error,
+        }
+
+
+class BatchPlan(NamedTuple):
+    """
+    一括変換全体の見積もり
+    """
+
+    # ジョブごとの見積もり（所要時間の長い順）
+    jobs: List[JobEstimate]
+    # ワーカープロセス数
+    workers: int
+    # 全体の所要時間の見積もり（秒、長いジョブから空いたワーカーに割り当てた場合）
+    seconds: float
+    # 全ジョブの所要時間の合計（秒）
+    cpu_seconds: float
+    # 出力サイズの合計の見積もり（バイト）
+    bytes: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSONに書き出せる辞書に変換する
+        """
+        return {
+            "total": len(self.jobs),
+            "workers": self.workers,
+            "frames": sum(job.frames for job in self.jobs),
+            "estimated_seconds": round(self.seconds, 3),
+            "estimated_cpu_seconds": round(self.cpu_seconds, 3),
+            "estimated_bytes": self.bytes,
+            "errors": sum(1 for job in self.jobs if job.error is not None),
+            "jobs": [job.to_dict() for job in self.jobs],
+        }
+
+
+def clip_duration(duration: float, options: Dict[str, Any]) -> float:
+    """
+    start・end・durationで切り出す区間の長さを求める
+
+    Args:
+        duration (float): 動画の長さ（秒）
+        options (Dict[str, Any]): resolve_optionsで検証済みのオプション
+
+    Returns:
+        float: 切り出す区間の長さ（秒）
+
+    Raises:
+        ValueError: 開始時刻が動画の長さ以降の場合
+    """
+    start, end = clip_bounds(options)
+    if duration > 0 and start >= duration:
+        raise ValueError(
+            f"開始時刻（{start:g}秒）が動画の長さ（{duration:g}秒）以降です"
+        )
+    if end is None or (duration > 0 and end > duration):
+        end = duration
+    return max(0.0, end - start)
+
+
+def estimate_job(
+    input_path: str,
+    output_path: str,
+    info: MediaInfo,
+    file_size: int,
+    options: Dict[str, Any],
+    segment_workers: int = 1,
+) -> JobEstimate:
+    """
+    メタデータと変換オプションから1ジョブ分の処理量を見積もる
+
+    Args:
+        input_path (str): 入力動画ファイルのパス
+        output_path (str): 出力GIFファイルのパス
+        info (MediaInfo): 入力動画のメタデータ
+        file_size (int): 入力ファイルのバイト数
+        options (Dict[str, Any]): resolve_optionsで検証済みのオプション
+        segment_workers (int, optional): 1つの動画を分割してエンコードするプロセス数
+
+    Returns:
+        JobEstimate: 見積もり
+
+    Raises:
+        ValueError: 開始時刻が動画の長さ以降の場合
+    """
+    duration = clip_duration(info.duration, options)
+    fps = float(options["fps"])
+    if info.fps > 0:
+        fps = min(fps, info.fps)
+    width, height = output_size(info.size, options)
+    frames = int(math.floor(duration * fps))
+
+    source_pixels = info.size[0] * info.size[1] * duration * info.fps
+    output_pixels = width * height * frames
+    # 切り出す区間に相当する分だけ、入力ファイルのバイト数を按分する
+    source_bytes = file_size * duration / info.duration if info.duration > 0 else 0.0
+
+    seconds = (
+        COST_SECONDS_PER_OUTPUT_MPIXEL * output_pixels / 1e6
+        + COST_SECONDS_PER_SOURCE_MPIXEL * source_pixels / 1e6
+        + COST_SECONDS_PER_SOURCE_MB * source_bytes / 1e6
+    )
+    segments = len(plan_segments(duration, fps, segment_workers))
+    seconds = COST_SECONDS_PER_FILE + seconds / segments
+
+    estimated_bytes = 0.0
+    if source_pixels > 0 and source_bytes > 0:
+        # LZWの符号長は色数のビット数に比例するため、256色（8ビット）に対する割合を掛ける
+        bits = max(2, math.ceil(math.log2(palette_colors(options))))
+        estimated_bytes = (
+            SIZE_BYTES_PER_PIXEL
+            * (source_bytes / source_pixels) ** SIZE_SOURCE_EXPONENT
+            * output_pixels
+            * bits
+            / 8
+        )
+        if options["optimize"]:
+            estimated_bytes *= SIZE_OPTIMIZE_FACTOR
+    if options["max_bytes"] is not None:
+        seconds *= COST_SIZE_SEARCH_FACTOR
+        estimated_bytes = min(estimated_bytes, options["max_bytes"])
+
+    return JobEstimate(
+        input_path,
+        output_path,
+        frames,
+        seconds,
+        int(round(estimated_bytes)),
+        info,
+    )
+
+
+def plan_batch(
+    estimates: Iterable[JobEstimate],
+    workers: int = 1,
+    cpu_count: Optional[int] = None,
+) -> BatchPlan:
+    """
+    ジョブを所要時間の長い順に、最も早く空くワーカーへ割り当てた場合の全体の所要時間を求める
+
+    Args:
+        estimates (Iterable[JobEstimate]): ジョブごとの見積もり
+        workers (int, optional): ワーカープロセス数
+        cpu_count (int, optional): CPUコア数。ワーカーがこれより多くても同時に進むのはコア数分とみなす
+
+    Returns:
+        BatchPlan: 一括変換全体の見積もり
+    """
+    jobs = order_by_cost(estimates)
+    workers = max(1, workers)
+    parallel = min(workers, cpu_count) if cpu_count else workers
+    loads = [0.0] * min(parallel, max(1, len(jobs)))
+    for job in jobs:
+        heapq.heapreplace(loads, loads[0] + job.seconds)
+    return BatchPlan(
+        jobs,
+        workers,
+        max(loads),
+        sum(job.seconds for job in jobs),
+        sum(job.bytes for job in jobs),
+    )
+
+
+def order_by_cost(estimates: Iterable[JobEstimate]) -> List[JobEstimate]:
+    """
+    所要時間の見積もりの長い順に並べ替える（長いジョブを先に投入すると、最後に1つだけ残る時間が短くなる）
+
+    Args:
+        estimates (Iterable[JobEstimate]): ジョブごとの見積もり
+
+    Returns:
+        List[JobEstimate]: 並べ替えた見積もり（見積もれなかったジョブは最後）
+    """
+    return sorted(estimates, key=lambda job: job.seconds, reverse=True)
@@ -0,0 +1,259 @@
+"""
+変換処理の段階（コンテナの読み込み・デコード・減色・LZW圧縮・書き込み）ごとの所要時間を計測するためのモジュール
+"""
+
+import cProfile
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# 計測を無効にしている場合に返す、何もしないコンテキストマネージャー
+_NULL_SPAN = nullcontext()
+
+
+class NullProfiler:
+    """
+    計測を行わないプロファイラー（既定）
+
+    変換処理からは常にプロファイラーを呼び出すため、無効時のオーバーヘッドが
+    メソッド呼び出し1回分で済むように何もしない実装を用意する
+    """
+
+    enabled = False
+
+    def span(self, name: str):
+        """
+        段階の計測区間を返す（何もしない）
+
+        Args:
+            name (str): 段階名
+        """
+        return _NULL_SPAN
+
+    def iter_span(self, name: str, items: Iterable[T]) -> Iterable[T]:
+        """
+        イテラブルの各要素の取り出しを計測する（何もせずそのまま返す）
+
+        Args:
+            name (str): 段階名
+            items (Iterable[T]): 計測対象のイテラブル
+
+        Returns:
+            Iterable[T]: itemsそのもの
+        """
+        return items
+
+    def count(self, name: str, value: int = 1):
+        """
+        カウンターを加算する（何もしない）
+
+        Args:
+            name (str): カウンター名
+            value (int, optional): 加算する値
+        """
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class StageProfiler(NullProfiler):
+    """
+    名前付きの計測区間ごとに呼び出し回数・合計時間・最大時間を集計するクラス
+
+    デコードは別スレッドで行うため、集計はロックで保護する
+    """
+
+    enabled = True
+
+    def __init__(self, cprofile_stage: Optional[str] = None):
+        """
+        StageProfilerのコンストラクタ
+
+        Args:
+            cprofile_stage (str, optional): cProfileで関数単位の内訳も記録する段階名
+        """
+        self.cprofile_stage = cprofile_stage
+        self.cprofile: Optional[cProfile.Profile] = None
+        self._stages: Dict[str, List[float]] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """
+        段階の計測区間を返す
+
+        Args:
+            name (str): 段階名
+        """
+        profile = self._start_cprofile(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+            self._record(name, elapsed)
+
+    def iter_span(self, name: str, items: Iterable[T]) -> Iterator[T]:
+        """
+        イテラブルの各要素の取り出し（next）にかかった時間を段階として計測する
+
+        Args:
+            name (str): 段階名
+            items (Iterable[T]): 計測対象のイテラブル
+
+        Yields:
+            T: itemsの各要素
+        """
+        iterator = iter(items)
+        while True:
+            with self.span(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def count(self, name: str, value: int = 1):
+        """
+        カウンターを加算する
+
+        Args:
+            name (str): カウンター名
+            value (int, optional): 加算する値
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def report(self) -> Dict[str, Any]:
+        """
+        集計結果を返す
+
+        Returns:
+            Dict[str, Any]: 経過時間（wall_time_s）、段階ごとの集計（stages）、カウンター（counters）
+        """
+        with self._lock:
+            stages = {
+                name: _stage_report(calls, total, longest)
+                for name, (calls, total, longest) in self._stages.items()
+            }
+            counters = dict(self._counters)
+        return {
+            "wall_time_s": round(time.perf_counter() - self._started, 6),
+            "stages": stages,
+            "counters": counters,
+        }
+
+    def _start_cprofile(self, name: str) -> Optional[cProfile.Profile]:
+        """
+        対象の段階であればcProfileによる計測を開始する
+        """
+        if name != self.cprofile_stage:
+            return None
+        if self.cprofile is None:
+            self.cprofile = cProfile.Profile()
+        self.cprofile.enable()
+        return self.cprofile
+
+    def _record(self, name: str, elapsed: float):
+        with self._lock:
+            stage = self._stages.get(name)
+            if stage is None:
+                self._stages[name] = [1, elapsed, elapsed]
+            else:
+                stage[0] += 1
+                stage[1] += elapsed
+                stage[2] = max(stage[2], elapsed)
+
+
+def profile_path(profile_dir: str, input_path: str) -> str:
+    """
+    入力ファイルごとのプロファイル（JSON）の保存先を返す
+
+    別のディレクトリにある同名のファイルと衝突しないよう、絶対パスのハッシュを付ける
+
+    Args:
+        profile_dir (str): プロファイルの保存先ディレクトリ
+        input_path (str): 入力動画ファイルのパス
+
+    Returns:
+        str: プロファイルのパス
+    """
+    digest = hashlib.blake2b(
+        os.path.abspath(input_path).encode("utf8"), digest_size=4
+    ).hexdigest()
+    return os.path.join(profile_dir, f"{Path(input_path).stem}-{digest}.profile.json")
+
+
+def write_json(path: str, data: Dict[str, Any]):
+    """
+    プロファイルをJSONファイルに書き出す
+
+    Args:
+        path (str): 出力先のパス
+        data (Dict[str, Any]): 書き出す内容
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def summarize(profiles: List[Dict[str, Any]], slowest: int = 5) -> Dict[str, Any]:
+    """
+    複数ファイルのプロファイルを一括変換全体のサマリーに集計する
+
+    Args:
+        profiles (List[Dict[str, Any]]): ファイルごとのプロファイル
+        slowest (int, optional): 処理時間の長いファイルとして列挙する件数
+
+    Returns:
+        Dict[str, Any]: 段階ごとの合計時間と割合、カウンターの合計、処理時間の長いファイル
+    """
+    stages: Dict[str, List[float]] = {}
+    counters: Dict[str, int] = {}
+    for profile in profiles:
+        for name, stage in profile.get("stages", {}).items():
+            total = stages.setdefault(name, [0, 0.0, 0.0])
+            total[0] += stage["calls"]
+            total[1] += stage["total_s"]
+            total[2] = max(total[2], stage["max_ms"] / 1000.0)
+        for name, value in profile.get("counters", {}).items():
+            counters[name] = counters.get(name, 0) + value
+
+    wall_time = sum(profile.get("wall_time_s", 0.0) for profile in profiles)
+    stage_reports = {}
+    for name, (calls, total, longest) in stages.items():
+        stage_reports[name] = _stage_report(int(calls), total, longest)
+        stage_reports[name]["share"] = round(total / wall_time, 4) if wall_time else 0.0
+
+    ranked = sorted(profiles, key=lambda p: p.get("wall_time_s", 0.0), reverse=True)
+    return {
+        "files": len(profiles),
+        "succeeded": sum(1 for profile in profiles if profile.get("success")),
+        "wall_time_s": round(wall_time, 6),
+        "stages": stage_reports,
+        "counters": counters,
+        "slowest": [
+            {"input": profile.get("input"), "wall_time_s": profile.get("wall_time_s")}
+            for profile in ranked[:slowest]
+        ],
+    }
+
+
+def _stage_report(calls: int, total: float, longest: float) -> Dict[str, Any]:
+    return {
+        "calls": calls,
+        "total_s": round(total, 6),
+        "mean_ms": round(total / calls * 1000.0, 3) if calls else 0.0,
+        "max_ms": round(longest * 1000.0, 3),
+    }
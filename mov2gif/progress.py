@@ -0,0 +1,452 @@
+"""
+変換の進捗（処理済みフレーム数・速度・残り時間・キャッシュの利用状況）をイベントとして通知するためのモジュール
+"""
+
+import json
+import multiprocessing
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# 進捗イベントを受け取るコールバック
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+# 変換中の進捗イベント（file_progress・batch_progress）を通知する最短の間隔（秒）
+PROGRESS_INTERVAL = 0.5
+
+# ワーカープロセスで進捗イベントを送るキューと通知間隔（init_worker_progressで設定）
+_worker_queue: Optional[Any] = None
+_worker_interval = PROGRESS_INTERVAL
+
+
+class NullProgress:
+    """
+    進捗を通知しない（既定）
+
+    変換処理からは常に呼び出すため、無効時のオーバーヘッドがメソッド呼び出し1回分で済むように何もしない実装を用意する
+    """
+
+    enabled = False
+    frames_total = 0
+
+    def start(self, frames_total: int):
+        """
+        変換の開始を通知する（何もしない）
+
+        Args:
+            frames_total (int): 出力フレーム数の見込み
+        """
+
+    def iter_decoded(self, frames: Iterable[T]) -> Iterable[T]:
+        """
+        デコードしたフレームを数える（何もせずそのまま返す）
+
+        Args:
+            frames (Iterable[T]): デコーダーが返すフレーム
+
+        Returns:
+            Iterable[T]: framesそのもの
+        """
+        return frames
+
+    def add_decoded(self, frames: int):
+        """
+        別のプロセスでデコードしたフレーム数を加算する（何もしない）
+
+        Args:
+            frames (int): デコードしたフレーム数
+        """
+
+    def advance(self, frames: int, bytes_written: int):
+        """
+        書き出したフレーム数を加算する（何もしない）
+
+        Args:
+            frames (int): 書き出した元の動画のフレーム数（重複としてまとめたフレームを含む）
+            bytes_written (int): これまでに書き出したバイト数
+        """
+
+    def finish(self, success: bool, bytes_written: int = 0):
+        """
+        変換の完了を通知する（何もしない）
+
+        Args:
+            success (bool): 変換に成功したかどうか
+            bytes_written (int, optional): 出力したバイト数
+        """
+
+
+NULL_PROGRESS = NullProgress()
+
+
+class FileProgress(NullProgress):
+    """
+    1ファイルの変換の進捗を、間隔を空けてfile_progressイベントとして通知するクラス
+
+    advanceはフレームごとに呼び出されるため、前回の通知から間隔が経っているかの確認だけを行う
+    """
+
+    enabled = True
+
+    def __init__(
+        self,
+        callback: ProgressCallback,
+        input_path: str,
+        output_path: str,
+        interval: float = PROGRESS_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        FileProgressのコンストラクタ
+
+        Args:
+            callback (ProgressCallback): イベントを受け取るコールバック
+            input_path (str): 入力動画ファイルのパス
+            output_path (str): 出力GIFファイルのパス
+            interval (float, optional): file_progressイベントを通知する最短の間隔（秒）
+            clock (Callable[[], float], optional): 経過時間の計測に使う時計
+        """
+        self.callback = callback
+        self.input_path = input_path
+        self.output_path = output_path
+        self.frames_total = 0
+        self.interval = interval
+        self.clock = clock
+        self.frames_done = 0
+        self.frames_decoded = 0
+        self.bytes_written = 0
+        self.started = clock()
+        self._next_report = self.started + interval
+
+    def start(self, frames_total: int):
+        """
+        file_startイベントを通知する（動画のメタデータを読み込んだ後に呼び出す）
+
+        Args:
+            frames_total (int): 出力フレーム数の見込み（メタデータの長さから求めた値）
+        """
+        self.frames_total = frames_total
+        self._emit("file_start")
+
+    def iter_decoded(self, frames: Iterable[T]) -> Iterator[T]:
+        """
+        デコードしたフレームを数えながらそのまま返す（デコード用のスレッドで呼び出される）
+
+        Args:
+            frames (Iterable[T]): デコーダーが返すフレーム
+
+        Yields:
+            T: framesの要素
+        """
+        for frame in frames:
+            self.frames_decoded += 1
+            yield frame
+
+    def add_decoded(self, frames: int):
+        """
+        別のプロセスでデコードしたフレーム数を加算する（分割エンコードで区間を連結するときに呼び出される）
+
+        Args:
+            frames (int): デコードしたフレーム数
+        """
+        self.frames_decoded += frames
+
+    def advance(self, frames: int, bytes_written: int):
+        """
+        書き出したフレーム数を加算し、前回の通知から間隔が経っていればfile_progressを通知する
+
+        Args:
+            frames (int): 書き出した元の動画のフレーム数（重複としてまとめたフレームを含む）
+            bytes_written (int): これまでに書き出したバイト数
+        """
+        self.frames_done += frames
+        self.bytes_written = bytes_written
+        now = self.clock()
+        if now >= self._next_report:
+            self._next_report = now + self.interval
+            self._emit("file_progress", now)
+
+    def finish(self, success: bool, bytes_written: int = 0):
+        """
+        file_doneイベントを通知する
+
+        Args:
+            success (bool): 変換に成功したかどうか
+            bytes_written (int, optional): 出力したバイト数
+        """
+        if bytes_written:
+            self.bytes_written = bytes_written
+        self._emit("file_done", success=success, cached=False)
+
+    def _emit(self, event: str, now: Optional[float] = None, **fields: Any):
+        """
+        現在の進捗をイベントとして通知する
+        """
+        if now is None:
+            now = self.clock()
+        elapsed = now - self.started
+        encode_fps = self.frames_done / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if encode_fps > 0 and self.frames_total > 0:
+            eta = max(0.0, (self.frames_total - self.frames_done) / encode_fps)
+        self.callback(
+            progress_event(
+                event,
+                input_path=self.input_path,
+                output_path=self.output_path,
+                frames_done=self.frames_done,
+                frames_total=self.frames_total,
+                decode_fps=self.frames_decoded / elapsed if elapsed > 0 else 0.0,
+                encode_fps=encode_fps,
+                bytes_written=self.bytes_written,
+                elapsed=elapsed,
+                eta=eta,
+                **fields,
+            )
+        )
+
+
+class BatchProgress:
+    """
+    一括変換全体の進捗を、ファイルの完了ごと（間隔を空けて）にbatch_progressイベントとして通知するクラス
+    """
+
+    def __init__(
+        self,
+        callback: ProgressCallback,
+        files_total: Optional[int] = None,
+        interval: float = PROGRESS_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        BatchProgressのコンストラクタ
+
+        Args:
+            callback (ProgressCallback): イベントを受け取るコールバック
+            files_total (int, optional): 全ファイル数。ファイルを逐次列挙する場合はNone
+            interval (float, optional): batch_progressイベントを通知する最短の間隔（秒）
+            clock (Callable[[], float], optional): 経過時間の計測に使う時計
+        """
+        self.callback = callback
+        self.files_total = files_total
+        self.interval = interval
+        self.clock = clock
+        self.files_done = 0
+        self.succeeded = 0
+        self.cached = 0
+        self.started = clock()
+        self._last_report: Optional[float] = None
+
+    def file_done(
+        self, input_path: str, output_path: str, success: bool, cached: bool = False
+    ):
+        """
+        1ファイルの完了を集計する
+
+        キャッシュから復元したファイルは変換を行わないため、ここでfile_doneイベントも通知する
+
+        Args:
+            input_path (str): 入力動画ファイルのパス
+            output_path (str): 出力GIFファイルのパス
+            success (bool): 変換に成功したかどうか
+            cached (bool, optional): キャッシュから復元したかどうか
+        """
+        self.files_done += 1
+        self.succeeded += int(success)
+        self.cached += int(cached)
+        if cached:
+            self.callback(
+                progress_event(
+                    "file_done",
+                    input_path=input_path,
+                    output_path=output_path,
+                    success=success,
+                    cached=True,
+                )
+            )
+
+        now = self.clock()
+        if self._last_report is None or now - self._last_report >= self.interval:
+            self._last_report = now
+            self.callback(self._event("batch_progress", now))
+
+    def finish(self):
+        """
+        batch_doneイベントを通知する
+        """
+        self.callback(self._event("batch_done", self.clock()))
+
+    def _event(self, event: str, now: float) -> Dict[str, Any]:
+        elapsed = now - self.started
+        eta = None
+        if self.files_total is not None and self.files_done > 0:
+            eta = elapsed / self.files_done * max(0, self.files_total - self.files_done)
+        return progress_event(
+            event,
+            files_done=self.files_done,
+            files_total=self.files_total,
+            succeeded=self.succeeded,
+            failed=self.files_done - self.succeeded,
+            cached=self.cached,
+            files_per_second=self.files_done / elapsed if elapsed > 0 else 0.0,
+            elapsed=elapsed,
+            eta=eta,
+        )
+
+
+class ProgressRelay:
+    """
+    ワーカープロセスの進捗イベントをキューで受け取り、メインプロセスのコールバックへ渡すクラス
+
+    コールバックは受け取り用のスレッドから呼び出される
+    """
+
+    def __init__(self, callback: ProgressCallback):
+        """
+        ProgressRelayのコンストラクタ
+
+        Args:
+            callback (ProgressCallback): イベントを受け取るコールバック
+        """
+        self.callback = callback
+        self.queue = multiprocessing.Queue(-1)
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "ProgressRelay":
+        self._thread = threading.Thread(
+            target=self._run, name="mov2gif-progress", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # 終了の合図を送り、それまでに届いたイベントをすべて渡してから終わる
+        self.queue.put(None)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.queue.close()
+
+    def _run(self):
+        while True:
+            event = self.queue.get()
+            if event is None:
+                return
+            try:
+                self.callback(event)
+            except Exception:
+                # コールバックの例外で中継を止めない
+                continue
+
+
+class JsonLinesSink:
+    """
+    進捗イベントを1行1件のJSON（JSON Lines）としてファイルまたは標準出力に書き出すコールバック
+    """
+
+    def __init__(self, destination: str = "-"):
+        """
+        JsonLinesSinkのコンストラクタ
+
+        Args:
+            destination (str, optional): 出力先のファイルパス（追記）。'-'の場合は標準出力
+        """
+        self.destination = destination
+        if destination == "-":
+            self._file = sys.stdout
+        else:
+            self._file = open(destination, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Dict[str, Any]):
+        line = json.dumps(event, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            # 外部のプロセスが逐次読めるよう、イベントごとに書き出す（イベントは間隔を空けて届く）
+            self._file.flush()
+
+    def __enter__(self) -> "JsonLinesSink":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        出力先のファイルを閉じる（標準出力は閉じない）
+        """
+        if self._file is not sys.stdout and not self._file.closed:
+            self._file.close()
+
+
+def progress_event(event: str, **fields: Any) -> Dict[str, Any]:
+    """
+    進捗イベントを作る
+
+    Args:
+        event (str): イベントの種類（file_start, file_progress, file_done, batch_progress, batch_done）
+        **fields: イベントの内容
+
+    Returns:
+        Dict[str, Any]: eventと発生時刻（time、UNIX時間）を含むイベント
+    """
+    return {"event": event, "time": time.time(), **fields}
+
+
+def serialized(callback: ProgressCallback) -> ProgressCallback:
+    """
+    コールバックの呼び出しをロックで1つずつに制限する（変換スレッドと中継スレッドの両方から呼び出されるため）
+
+    Args:
+        callback (ProgressCallback): イベントを受け取るコールバック
+
+    Returns:
+        ProgressCallback: 呼び出しを直列化したコールバック
+    """
+    if getattr(callback, "serialized", False):
+        return callback
+    lock = threading.Lock()
+
+    def call(event: Dict[str, Any]):
+        with lock:
+            callback(event)
+
+    call.serialized = True  # type: ignore[attr-defined]
+    return call
+
+
+def init_worker_progress(
+    progress_queue: Optional[Any], interval: float = PROGRESS_INTERVAL
+):
+    """
+    ワーカープロセスの進捗イベントの送り先を設定する（ProcessPoolExecutorのinitializerから呼び出す）
+
+    Args:
+        progress_queue (Any, optional): ProgressRelay.queue。Noneの場合は通知しない
+        interval (float, optional): file_progressイベントを通知する最短の間隔（秒）
+    """
+    global _worker_queue, _worker_interval
+    _worker_queue = progress_queue
+    _worker_interval = interval
+
+
+def worker_callback() -> Optional[ProgressCallback]:
+    """
+    ワーカープロセスで進捗イベントをメインプロセスへ送るコールバックを返す
+
+    Returns:
+        Optional[ProgressCallback]: コールバック。送り先が設定されていない場合はNone
+    """
+    if _worker_queue is None:
+        return None
+    return _worker_queue.put
+
+
+def worker_interval() -> float:
+    """
+    ワーカープロセスでのfile_progressイベントの通知間隔を返す
+    """
+    return _worker_interval
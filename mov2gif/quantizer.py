@@ -0,0 +1,301 @@
+"""
+フルカラーのフレームをGIF用のインデックスカラーに減色するためのモジュール
+"""
+
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# 色ヒストグラムと参照テーブルの1チャンネルあたりのビット数
+_HIST_BITS = 5
+_HIST_SHIFT = 8 - _HIST_BITS
+_HIST_SIZE = 1 << (_HIST_BITS * 3)
+
+# 参照テーブル構築時に一度に距離計算するビン数
+_LUT_CHUNK = 4096
+
+# ディザリングの方式（none: なし, bayer: 8x8のBayer行列による組織的ディザ, floyd_steinberg: 誤差拡散）
+DITHER_MODES = ("none", "bayer", "floyd_steinberg")
+
+# 組織的ディザのしきい値行列の大きさ
+_BAYER_SIZE = 8
+
+
+def color_histogram(frames: Iterable[np.ndarray]) -> np.ndarray:
+    """
+    複数フレームの色ヒストグラム（1チャンネル5ビット）を計算する
+
+    Args:
+        frames (Iterable[np.ndarray]): RGBフレーム (高さ, 幅, 3) uint8 のイテラブル
+
+    Returns:
+        np.ndarray: (32768, 4) float64。各ビンの [画素数, R合計, G合計, B合計]
+    """
+    hist = np.zeros((_HIST_SIZE, 4), dtype=np.float64)
+    for frame in frames:
+        pixels = np.asarray(frame, dtype=np.uint8)[..., :3].reshape(-1, 3)
+        bins = _bin_index(pixels)
+        hist[:, 0] += np.bincount(bins, minlength=_HIST_SIZE)
+        for channel in range(3):
+            hist[:, channel + 1] += np.bincount(
+                bins, weights=pixels[:, channel], minlength=_HIST_SIZE
+            )
+    return hist
+
+
+def build_palette(hist: np.ndarray, colors: int = 256) -> np.ndarray:
+    """
+    色ヒストグラムからメディアンカット法でパレットを生成する
+
+    Args:
+        hist (np.ndarray): color_histogramで求めたヒストグラム
+        colors (int, optional): パレットの最大色数 (2-256)
+
+    Returns:
+        np.ndarray: パレット (N, 3) uint8 (N <= colors)
+    """
+    used = np.nonzero(hist[:, 0])[0]
+    if len(used) == 0:
+        return np.zeros((1, 3), dtype=np.uint8)
+
+    counts = hist[used, 0]
+    means = hist[used, 1:] / counts[:, None]
+
+    boxes: List[np.ndarray] = [np.arange(len(used))]
+    scores: List[float] = [_box_score(means, counts)]
+    while len(boxes) < colors:
+        # 色範囲×画素数が最大のボックスを分割対象にする
+        target = int(np.argmax(scores))
+        if scores[target] <= 0:
+            break
+        box = boxes.pop(target)
+        scores.pop(target)
+        for half in _split_box(box, means[box], counts[box]):
+            boxes.append(half)
+            scores.append(_box_score(means[half], counts[half]))
+
+    palette = np.empty((len(boxes), 3), dtype=np.float64)
+    for i, box in enumerate(boxes):
+        palette[i] = np.average(means[box], axis=0, weights=counts[box])
+    return np.clip(np.rint(palette), 0, 255).astype(np.uint8)
+
+
+class PaletteMapper:
+    """
+    固定パレットへの最近傍色の割り当てを参照テーブルで高速に行うクラス
+
+    ディザリングの方式ごとの特徴:
+
+    - none: 最も速く、平坦な領域が同じインデックスの連続になるためLZW圧縮・差分エンコードが最も効く。
+      グラデーションには縞（バンディング）が出る
+    - bayer: 画素位置だけで決まるしきい値を加えてから割り当てるため、全体をNumPyで一括処理でき、
+      変化のない領域は前フレームと同じ結果になる（差分エンコードと相性がよい）。
+      模様が規則的なためLZW圧縮後のサイズの増加は誤差拡散より小さい
+    - floyd_steinberg: 誤差拡散で最も滑らかなグラデーションになるが、最も遅い。
+      わずかな変化が広い範囲の結果を変えるため、差分エンコード・LZW圧縮の効率は最も悪い
+    """
+
+    def __init__(self, palette: np.ndarray, dither: str = "none"):
+        """
+        PaletteMapperのコンストラクタ
+
+        Args:
+            palette (np.ndarray): パレット (N, 3) uint8
+            dither (str, optional): ディザリングの方式（none, bayer, floyd_steinberg）
+
+        Raises:
+            ValueError: 未知のディザリングの方式が指定された場合
+        """
+        if dither not in DITHER_MODES:
+            raise ValueError(f"未知のディザリングの方式です: {dither}")
+        self.palette = np.asarray(palette, dtype=np.uint8).reshape(-1, 3)
+        self.dither = dither
+        self.lut = self._build_lut(self.palette)
+        # 組織的ディザのしきい値（フレームサイズごとに作り直す）
+        self._offsets: Optional[np.ndarray] = None
+        # パレット色を含むビン（このビンに入る色にはディザリングをかけない）
+        self._palette_bins = np.zeros(_HIST_SIZE, dtype=bool)
+        self._palette_bins[_bin_index(self.palette)] = True
+
+    def map(self, frame: np.ndarray) -> np.ndarray:
+        """
+        RGBフレームをパレットインデックスに変換する
+
+        Args:
+            frame (np.ndarray): RGBフレーム (高さ, 幅, 3) uint8
+
+        Returns:
+            np.ndarray: インデックス配列 (高さ, 幅) uint8
+        """
+        pixels = np.asarray(frame, dtype=np.uint8)[..., :3]
+        if self.dither == "bayer":
+            return self._map_ordered(pixels)
+        if self.dither == "floyd_steinberg":
+            return self._map_diffused(pixels)
+        return self.lut[_bin_index(pixels)]
+
+    def _map_ordered(self, pixels: np.ndarray) -> np.ndarray:
+        """
+        Bayer行列のしきい値を加えてから参照テーブルで割り当てる
+
+        パレット色と同じビンに入る色（平坦なUIの背景など）はしきい値を加えずに割り当て、
+        LZW圧縮の効きにくい模様が平坦な領域に出ないようにする
+        """
+        bins = _bin_index(pixels)
+        dithered = pixels.astype(np.int16)
+        dithered += self._bayer_offsets(pixels.shape[:2])
+        np.clip(dithered, 0, 255, out=dithered)
+        ordered = self.lut[_bin_index(dithered.astype(np.uint8))]
+        return np.where(self._palette_bins[bins], self.lut[bins], ordered)
+
+    def _bayer_offsets(self, shape: Tuple[int, int]) -> np.ndarray:
+        """
+        フレーム全体に敷き詰めたBayer行列のしきい値 (高さ, 幅, 1) int16 を返す
+
+        振れ幅はパレットの色の間隔（最も近い色とのチャンネルごとの差の最大値の中央値）とする
+        """
+        if self._offsets is not None and self._offsets.shape[:2] == shape:
+            return self._offsets
+        height, width = shape
+        spacing = _palette_spacing(self.palette)
+        matrix = (_bayer_matrix(_BAYER_SIZE) + 0.5) / (_BAYER_SIZE**2) - 0.5
+        tiles = (-(-height // _BAYER_SIZE), -(-width // _BAYER_SIZE))
+        offsets = np.rint(np.tile(matrix * spacing, tiles)[:height, :width])
+        self._offsets = offsets.astype(np.int16)[..., None]
+        return self._offsets
+
+    def _map_diffused(self, pixels: np.ndarray) -> np.ndarray:
+        """
+        Floyd–Steinbergの誤差拡散で割り当てる
+
+        画素 (y, x) は左の画素と1行上の3画素の誤差を受け取るため、各行を1行上より2画素遅らせて
+        進めれば、全行の1画素ずつを同時に処理できる。行yを2y列ずらした作業領域では、同時に処理する
+        画素と誤差の配分先がそれぞれ1列の連続した範囲になるため、幅 + 2×高さ 回の列単位の
+        NumPy演算で1フレームを処理できる
+        """
+        height, width = pixels.shape[:2]
+        palette = self.palette.astype(np.float32)
+        # 行yを2y+1列ずらして配置した作業領域（誤差の配分先のための余白として右に2列・下に1行）
+        skewed_width = width + 2 * height + 2
+        work = np.zeros((height + 1, skewed_width, 3), dtype=np.float32)
+        skewed = np.zeros((height, skewed_width), dtype=np.uint8)
+        flat = np.zeros((height, skewed_width), dtype=bool)
+        palette_bins = self._palette_bins[_bin_index(pixels)]
+        for y in range(height):
+            work[y, 2 * y + 1 : 2 * y + 1 + width] = pixels[y]
+            flat[y, 2 * y + 1 : 2 * y + 1 + width] = palette_bins[y]
+
+        for step in range(width + 2 * (height - 1)):
+            # この段で処理する行の範囲（元の列 = step - 2 × 行 が 0 以上 幅未満）
+            first = max(0, (step - width) // 2 + 1)
+            last = min(height - 1, step // 2) + 1
+            column = step + 1
+
+            values = np.clip(work[first:last, column], 0, 255)
+            chosen = self.lut[_bin_index(values.astype(np.uint8))]
+            skewed[first:last, column] = chosen
+            error = values - palette[chosen]
+            # パレット色と同じビンに入る色は誤差を広げない（平坦な領域に模様を出さないため）
+            error[flat[first:last, column]] = 0
+            work[first:last, column + 1] += error * (7 / 16)
+            work[first + 1 : last + 1, column + 1] += error * (3 / 16)
+            work[first + 1 : last + 1, column + 2] += error * (5 / 16)
+            work[first + 1 : last + 1, column + 3] += error * (1 / 16)
+
+        indices = np.empty((height, width), dtype=np.uint8)
+        for y in range(height):
+            indices[y] = skewed[y, 2 * y + 1 : 2 * y + 1 + width]
+        return indices
+
+    @staticmethod
+    def _build_lut(palette: np.ndarray) -> np.ndarray:
+        """
+        全ヒストグラムビンの中心色から最も近いパレット色のインデックス表を作る
+        """
+        centers = bin_centers()
+        colors = palette.astype(np.float32)
+
+        # |c - p|^2 = |c|^2 - 2c・p + |p|^2 のうち、argminに影響しない|c|^2を省いて行列積で計算する
+        lut = np.empty(_HIST_SIZE, dtype=np.uint8)
+        color_norms = (colors**2).sum(axis=1)
+        for start in range(0, _HIST_SIZE, _LUT_CHUNK):
+            chunk = centers[start : start + _LUT_CHUNK]
+            dist = color_norms[None, :] - 2.0 * (chunk @ colors.T)
+            lut[start : start + _LUT_CHUNK] = np.argmin(dist, axis=1)
+        return lut
+
+
+@lru_cache(maxsize=None)
+def bin_centers() -> np.ndarray:
+    """
+    全ヒストグラムビンの中心色を返す（プロセス内で1回だけ作り、以降は同じ配列を返す）
+
+    Returns:
+        np.ndarray: (32768, 3) float32。書き換え不可
+    """
+    levels = (np.arange(1 << _HIST_BITS) << _HIST_SHIFT) + (1 << _HIST_SHIFT >> 1)
+    r, g, b = np.meshgrid(levels, levels, levels, indexing="ij")
+    centers = np.stack([r.ravel(), g.ravel(), b.ravel()], axis=1).astype(np.float32)
+    centers.flags.writeable = False
+    return centers
+
+
+def _palette_spacing(palette: np.ndarray) -> float:
+    """
+    パレットの色の間隔の目安を求める（各色と最も近い色とのチャンネルごとの差の最大値の中央値）
+    """
+    if len(palette) < 2:
+        return 0.0
+    colors = palette.astype(np.int16)
+    distances = np.abs(colors[:, None, :] - colors[None, :, :]).max(axis=2)
+    np.fill_diagonal(distances, np.iinfo(np.int16).max)
+    return float(np.median(distances.min(axis=1)))
+
+
+def _bayer_matrix(size: int) -> np.ndarray:
+    """
+    size×sizeのBayer行列（0〜size^2-1の値）を作る（sizeは2のべき乗）
+    """
+    matrix = np.zeros((1, 1), dtype=np.float64)
+    while matrix.shape[0] < size:
+        matrix = np.block(
+            [[4 * matrix, 4 * matrix + 2], [4 * matrix + 3, 4 * matrix + 1]]
+        )
+    return matrix
+
+
+def _bin_index(pixels: np.ndarray) -> np.ndarray:
+    """
+    RGB値をヒストグラム/参照テーブルのビン番号に変換する
+    """
+    quantized = (pixels >> _HIST_SHIFT).astype(np.intp)
+    return (
+        (quantized[..., 0] << (_HIST_BITS * 2))
+        | (quantized[..., 1] << _HIST_BITS)
+        | quantized[..., 2]
+    )
+
+
+def _box_score(means: np.ndarray, counts: np.ndarray) -> float:
+    """
+    ボックスの分割優先度（最大チャンネル幅×画素数）を求める
+    """
+    if len(means) < 2:
+        return 0.0
+    spread = float((means.max(axis=0) - means.min(axis=0)).max())
+    return spread * float(counts.sum())
+
+
+def _split_box(
+    box: np.ndarray, means: np.ndarray, counts: np.ndarray
+) -> List[np.ndarray]:
+    """
+    ボックスを最も幅の広いチャンネルの加重中央値で2分割する
+    """
+    channel = int(np.argmax(means.max(axis=0) - means.min(axis=0)))
+    order = np.argsort(means[:, channel], kind="stable")
+    cumulative = np.cumsum(counts[order])
+    split = int(np.searchsorted(cumulative, cumulative[-1] / 2.0))
+    split = min(max(split, 1), len(order) - 1)
+    return [box[order[:split]], box[order[split:]]]
@@ -0,0 +1,57 @@
+"""
+1回のデコードから解像度・フレームレート・色数の異なる複数のGIF（レンディション）を作るためのモジュール
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+
+class Rendition(NamedTuple):
+    """
+    1つの動画から作る出力GIFの1つ分
+    """
+
+    # 出力GIFファイルのパス
+    output_path: str
+    # 変換オプションに重ねるレンディションごとの変換オプション（width, fps, colorsなど）
+    options: Optional[Dict[str, Any]] = None
+
+
+def resample_renditions(
+    frames: Iterable[np.ndarray], branches: List[Tuple[Tuple[int, int], float]]
+) -> Iterator[List[Optional[np.ndarray]]]:
+    """
+    最大の解像度・フレームレートでデコードしたフレームを、レンディションごとに間引き・縮小して振り分ける
+
+    間引きはsize_target.resample_burstと同じく、step間隔の位置に最も近いフレームを選ぶ。
+    縮小はffmpegのscaleフィルター（flags=area）と同じ面積平均で行い、解像度の大きい順に
+    1つ前に縮小したフレームから縮小するため、小さいレンディションほど少ない画素から作れる
+
+    Args:
+        frames (Iterable[np.ndarray]): デコードしたRGBフレーム
+        branches (List[Tuple[Tuple[int, int], float]]): レンディションごとの (解像度 (幅, 高さ), デコードのフレームレート / 出力のフレームレート（1以上）)
+
+    Yields:
+        List[Optional[np.ndarray]]: branchesと同じ順のフレーム。そのレンディションが使わないフレームはNone
+    """
+    # 縮小元にできるよう、解像度の大きい順に処理する
+    order = sorted(
+        range(len(branches)),
+        key=lambda i: branches[i][0][0] * branches[i][0][1],
+        reverse=True,
+    )
+    positions = [0.0] * len(branches)
+    for index, frame in enumerate(frames):
+        resampled: List[Optional[np.ndarray]] = [None] * len(branches)
+        source = frame
+        for branch in order:
+            if int(round(positions[branch])) != index:
+                continue
+            positions[branch] += branches[branch][1]
+            size = branches[branch][0]
+            if (source.shape[1], source.shape[0]) != tuple(size):
+                source = np.asarray(Image.fromarray(source).resize(size, Image.BOX))
+            resampled[branch] = source
+        yield resampled
@@ -0,0 +1,68 @@
+"""
+長い動画を時間区間に分割して並列にエンコードするための区間割りを行うモジュール
+"""
+
+import math
+from typing import List, NamedTuple, Optional
+
+# 1区間の最短の長さ（秒）。区間ごとのプロセス起動とシークのコストに見合わない短い動画は分割しない
+MIN_SEGMENT_SECONDS = 10.0
+
+
+class Segment(NamedTuple):
+    """
+    エンコードする区間（出力フレーム番号の範囲）
+    """
+
+    # 区間の番号（連結する順序）
+    index: int
+    # 区間の最初の出力フレーム番号
+    start_frame: int
+    # 区間のフレーム数。Noneの場合は動画の最後まで
+    frame_count: Optional[int]
+
+    def start_time(self, fps: float) -> float:
+        """
+        区間の開始時刻（秒）を返す
+
+        Args:
+            fps (float): 出力フレームレート
+
+        Returns:
+            float: 開始時刻
+        """
+        return self.start_frame / fps
+
+
+def plan_segments(
+    duration: float,
+    fps: float,
+    workers: int,
+    min_seconds: float = MIN_SEGMENT_SECONDS,
+) -> List[Segment]:
+    """
+    動画を出力フレームの境界でほぼ等しい長さの区間に分割する
+
+    最後の区間は長さを指定せず最後までデコードするため、メタデータの長さが
+    実際と多少ずれていてもフレームが欠けることはない
+
+    Args:
+        duration (float): 動画の長さ（秒）
+        fps (float): 出力フレームレート
+        workers (int): 並列にエンコードするプロセス数（区間数の上限）
+        min_seconds (float, optional): 1区間の最短の長さ（秒）
+
+    Returns:
+        List[Segment]: 区間のリスト（分割しない場合は動画全体の1区間）
+    """
+    count = max(1, min(workers, int(duration // min_seconds)))
+    if count == 1:
+        return [Segment(0, 0, None)]
+
+    total_frames = int(math.floor(duration * fps))
+    bounds = [int(round(total_frames * i / count)) for i in range(count + 1)]
+    segments = [
+        Segment(i, bounds[i], bounds[i + 1] - bounds[i]) for i in range(count - 1)
+    ]
+    segments.append(Segment(count - 1, bounds[count - 1], None))
+    return segments
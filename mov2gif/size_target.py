@@ -0,0 +1,187 @@
+"""
+出力GIFを目標サイズに収めるための設定の候補と、標本フレームからのサイズ推定に使う区間を求めるモジュール
+"""
+
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+
+import numpy as np
+from PIL import Image
+
+from mov2gif.conversion_options import output_size
+from mov2gif.segments import Segment
+
+# サイズ推定に使う区間の数（動画全体を等分した各区間の中央から取り出す）
+SIZE_SAMPLE_STRATA = 6
+# サイズ推定に使う1区間あたりの連続フレーム数（差分エンコード・重複除去の効果を反映するため連続させる）
+SIZE_SAMPLE_FRAMES = 6
+# 推定の誤差を見込んで、推定サイズをこの割合以下に収める
+SIZE_TARGET_MARGIN = 0.95
+
+# 目標サイズに収まるまで1段ずつ下げる設定の順序 (項目, 値)
+# scaleは元の出力サイズに対する縮小率、fpsは元のフレームレートに対する倍率、colorsは色数の上限
+_LADDER_STEPS: Tuple[Tuple[str, float], ...] = (
+    ("colors", 128),
+    ("scale", 0.9),
+    ("scale", 0.8),
+    ("fps", 0.8),
+    ("scale", 0.7),
+    ("colors", 64),
+    ("scale", 0.6),
+    ("fps", 2 / 3),
+    ("scale", 0.5),
+    ("scale", 0.4),
+    ("fps", 0.5),
+    ("colors", 32),
+    ("scale", 0.33),
+    ("scale", 0.25),
+    ("scale", 0.2),
+    ("colors", 16),
+)
+
+
+class SizeCandidate(NamedTuple):
+    """
+    目標サイズに収めるための設定の候補
+    """
+
+    # 元の出力サイズに対する縮小率
+    scale: float
+    # 出力フレームレート
+    fps: float
+    # パレットの色数
+    colors: int
+
+    def options(
+        self, base_options: Dict[str, Any], source_size: Tuple[int, int]
+    ) -> Dict[str, Any]:
+        """
+        この候補で変換するための変換オプションを返す
+
+        Args:
+            base_options (Dict[str, Any]): 元の変換オプション（resolve_optionsで検証済み）
+            source_size (Tuple[int, int]): 入力の解像度 (幅, 高さ)
+
+        Returns:
+            Dict[str, Any]: 変換オプション（max_bytesは含めない）
+        """
+        width, _ = output_size(source_size, base_options)
+        options = dict(base_options)
+        options.update(
+            fps=self.fps,
+            width=max(1, int(round(width * self.scale))),
+            max_side=None,
+            colors=self.colors,
+            quality=100,
+            max_bytes=None,
+        )
+        return options
+
+
+def size_ladder(fps: float, colors: int) -> List[SizeCandidate]:
+    """
+    元の設定から1段ずつ縮小率・フレームレート・色数を下げた候補を、出力が大きい順に並べる
+
+    Args:
+        fps (float): 元の出力フレームレート
+        colors (int): 元のパレットの色数
+
+    Returns:
+        List[SizeCandidate]: 候補のリスト（先頭は元の設定）
+    """
+    current = SizeCandidate(1.0, fps, colors)
+    ladder = [current]
+    for name, value in _LADDER_STEPS:
+        if name == "scale":
+            candidate = current._replace(scale=value)
+        elif name == "fps":
+            candidate = current._replace(fps=round(fps * value, 3))
+        else:
+            candidate = current._replace(colors=min(current.colors, int(value)))
+        if candidate != current:
+            ladder.append(candidate)
+            current = candidate
+    return ladder
+
+
+def find_fitting(
+    ladder: List[SizeCandidate],
+    estimate: Callable[[SizeCandidate], float],
+    max_bytes: float,
+) -> int:
+    """
+    推定サイズがmax_bytes以下になる最初（最も品質の高い）の候補を二分探索で求める
+
+    候補は出力が大きい順に並んでいるため、推定はlog2(候補数)回程度で済む
+
+    Args:
+        ladder (List[SizeCandidate]): size_ladderで求めた候補
+        estimate (Callable[[SizeCandidate], float]): 候補の出力サイズ（バイト）を推定する関数
+        max_bytes (float): 目標サイズ（バイト）
+
+    Returns:
+        int: 候補の位置。どの候補も収まらない場合は最後の候補の位置
+    """
+    low, high = 0, len(ladder) - 1
+    while low < high:
+        middle = (low + high) // 2
+        if estimate(ladder[middle]) <= max_bytes:
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def sample_bursts(
+    total_frames: int,
+    strata: int = SIZE_SAMPLE_STRATA,
+    burst: int = SIZE_SAMPLE_FRAMES,
+) -> List[Segment]:
+    """
+    動画全体をstrata個に等分し、各区間の中央から連続するburstフレームを取り出す区間を求める
+
+    Args:
+        total_frames (int): 出力フレーム数
+        strata (int, optional): 区間の数
+        burst (int, optional): 1区間あたりのフレーム数
+
+    Returns:
+        List[Segment]: 取り出す区間。動画が短い場合は全体の1区間
+    """
+    if total_frames <= strata * burst:
+        return [Segment(0, 0, None)]
+    segments = []
+    for index in range(strata):
+        center = (index + 0.5) * total_frames / strata
+        start = min(max(0, int(center - burst / 2)), total_frames - burst)
+        segments.append(Segment(index, start, burst))
+    return segments
+
+
+def resample_burst(
+    frames: List[np.ndarray], step: float, size: Tuple[int, int]
+) -> List[np.ndarray]:
+    """
+    元の設定でデコードした連続フレームを、候補のフレームレートと解像度に合わせて間引き・縮小する
+
+    候補ごとにデコードし直す代わりに使う。縮小はffmpegのscaleフィルター（flags=area）と同じ面積平均で行う
+
+    Args:
+        frames (List[np.ndarray]): 元の設定でデコードした連続するRGBフレーム
+        step (float): 元のフレームレート / 候補のフレームレート（1以上）
+        size (Tuple[int, int]): 候補の解像度 (幅, 高さ)
+
+    Returns:
+        List[np.ndarray]: 候補の設定に合わせたRGBフレーム
+    """
+    indices = []
+    position = 0.0
+    while int(round(position)) < len(frames):
+        indices.append(int(round(position)))
+        position += step
+    resampled = []
+    for index in indices:
+        frame = frames[index]
+        if (frame.shape[1], frame.shape[0]) != tuple(size):
+            frame = np.asarray(Image.fromarray(frame).resize(size, Image.BOX))
+        resampled.append(frame)
+    return resampled
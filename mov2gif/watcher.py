@@ -0,0 +1,410 @@
+"""
+ディレクトリを監視し、追加・更新された動画ファイルを書き込みの完了を待ってから変換対象として返すためのモジュール
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from mov2gif.discovery import (
+    VIDEO_EXTENSIONS,
+    DiscoveredFile,
+    output_path_for,
+    walk_files,
+)
+
+# inotifyのイベントマスク（linux/inotify.h）
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+# ファイルの状態（サイズ, 更新時刻）
+FileState = Tuple[int, int]
+
+# 変換済みのファイルの記録から、削除されたファイルの分を取り除く間隔（秒）
+DONE_PRUNE_INTERVAL = 60.0
+
+
+class InotifyBackend:
+    """
+    Linuxのinotifyで変更のあったファイルを通知するバックエンド
+
+    ctypesでlibcを直接呼び出すため、追加の依存パッケージは不要
+    """
+
+    def __init__(
+        self, directory: str, suffixes: Tuple[str, ...], recursive: bool = True
+    ):
+        """
+        InotifyBackendのコンストラクタ
+
+        Args:
+            directory (str): 監視するディレクトリ
+            suffixes (Tuple[str, ...]): 通知する拡張子（小文字）
+            recursive (bool, optional): サブディレクトリも監視するかどうか
+
+        Raises:
+            OSError: inotifyを使用できない場合
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotifyはLinuxでのみ使用できます")
+        self.suffixes = suffixes
+        self.recursive = recursive
+        self._libc = ctypes.CDLL(
+            ctypes.util.find_library("c") or "libc.so.6", use_errno=True
+        )
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotifyの初期化に失敗しました: {os.strerror(errno)}")
+        self._directories: Dict[int, str] = {}
+        self._add_tree(directory)
+
+    def changes(self, timeout: float) -> Tuple[List[str], bool]:
+        """
+        変更のあったパスを待ち受ける
+
+        Args:
+            timeout (float): 待ち受ける最大時間（秒）
+
+        Returns:
+            Tuple[List[str], bool]: (変更のあったファイルのパス, 全体の再走査が必要かどうか)
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return [], False
+
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return [], False
+
+        paths: List[str] = []
+        rescan = False
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & _IN_Q_OVERFLOW:
+                # 通知があふれた場合は取りこぼした変更を拾うため全体を再走査する
+                rescan = True
+                continue
+            if mask & _IN_IGNORED:
+                self._directories.pop(wd, None)
+                continue
+            directory = self._directories.get(wd)
+            if directory is None or not name:
+                continue
+
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & _IN_ISDIR:
+                if self.recursive and mask & (_IN_CREATE | _IN_MOVED_TO):
+                    # 新しいディレクトリは監視に加え、監視開始前に置かれたファイルも拾う
+                    self._add_tree(path)
+                    paths.extend(walk_files(path, self.suffixes))
+                continue
+            paths.append(path)
+        return paths, rescan
+
+    def close(self):
+        """
+        inotifyのファイル記述子を閉じる
+        """
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _add_tree(self, directory: str):
+        """
+        ディレクトリ（recursiveの場合は配下のディレクトリも）を監視対象に加える
+        """
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(current), _WATCH_MASK
+            )
+            if wd < 0:
+                continue
+            self._directories[wd] = current
+            if not self.recursive:
+                continue
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+            except OSError:
+                continue
+
+
+class PollingBackend:
+    """
+    一定間隔でディレクトリを走査し、前回からサイズか更新時刻が変わったファイルを通知するバックエンド
+
+    inotifyを使用できない環境（Linux以外、ネットワークファイルシステムなど）向け
+    """
+
+    def __init__(
+        self, directory: str, suffixes: Tuple[str, ...], recursive: bool = True
+    ):
+        """
+        PollingBackendのコンストラクタ
+
+        Args:
+            directory (str): 監視するディレクトリ
+            suffixes (Tuple[str, ...]): 通知する拡張子（小文字）
+            recursive (bool, optional): サブディレクトリも監視するかどうか
+        """
+        self.directory = directory
+        self.suffixes = suffixes
+        self.recursive = recursive
+        self._snapshot = self._scan()
+
+    def changes(self, timeout: float) -> Tuple[List[str], bool]:
+        """
+        timeout秒待ってから走査し、変更のあったパスを返す
+
+        Args:
+            timeout (float): 走査間隔（秒）
+
+        Returns:
+            Tuple[List[str], bool]: (変更のあったファイルのパス, 全体の再走査が必要かどうか)
+        """
+        time.sleep(timeout)
+        snapshot = self._scan()
+        changed = [
+            path
+            for path, state in snapshot.items()
+            if self._snapshot.get(path) != state
+        ]
+        self._snapshot = snapshot
+        return changed, False
+
+    def close(self):
+        """
+        何もしない（inotifyバックエンドとインターフェースをそろえるため）
+        """
+
+    def _scan(self) -> Dict[str, FileState]:
+        states = {}
+        for path in walk_files(self.directory, self.suffixes, self.recursive):
+            state = _file_state(path)
+            if state is not None:
+                states[path] = state
+        return states
+
+
+class FolderWatcher:
+    """
+    ディレクトリに追加・更新された動画ファイルを、書き込みが終わった（一定時間サイズと更新時刻が
+    変わらなくなった）時点で変換ジョブとして返すクラス
+
+    変換済みのファイルは状態（サイズ, 更新時刻）を記録し、変わらない限り再度変換しない。
+    記録は削除されたファイルの分を定期的に取り除き、監視を続けても増え続けないようにする
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        output_dir: Optional[str] = None,
+        extensions: Iterable[str] = VIDEO_EXTENSIONS,
+        recursive: bool = True,
+        settle_time: float = 2.0,
+        poll_interval: float = 1.0,
+        use_inotify: bool = True,
+    ):
+        """
+        FolderWatcherのコンストラクタ
+
+        Args:
+            directory (str): 監視するディレクトリ
+            output_dir (str, optional): 出力先ディレクトリ。未指定の場合は入力ファイルと同じ場所
+            extensions (Iterable[str], optional): 変換対象の拡張子（大文字小文字は区別しない）
+            recursive (bool, optional): サブディレクトリも監視するかどうか
+            settle_time (float, optional): サイズと更新時刻がこの秒数変わらなければ書き込み完了とみなす
+            poll_interval (float, optional): 状態を確認する間隔（秒）
+            use_inotify (bool, optional): inotifyを使用するかどうか。使用できない場合は走査による監視にフォールバックする
+        """
+        self.directory = directory
+        self.output_dir = output_dir
+        self.suffixes = tuple(extension.lower() for extension in extensions)
+        self.recursive = recursive
+        self.settle_time = settle_time
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        # 書き込み完了待ちのファイル {パス: (最後に確認した状態, 状態が変わった時刻)}
+        self._pending: Dict[str, Tuple[FileState, float]] = {}
+        # 変換ジョブとして返したファイルの状態
+        self._done: Dict[str, FileState] = {}
+        # 次に削除されたファイルの記録を取り除く時刻（time.monotonic）
+        self._next_prune = 0.0
+
+    def jobs(
+        self, stop: Optional[threading.Event] = None
+    ) -> Iterator[Optional[Tuple[str, str]]]:
+        """
+        変換ジョブを返し続けるジェネレータ（MovieConverter.convert_iterに渡す）
+
+        起動時に既存のファイルのうち出力GIFがない、または古いものを変換対象に加え、
+        以降は変更の通知を待つ。変換対象がない間は一定間隔でNoneを返す
+
+        Args:
+            stop (threading.Event, optional): セットされたら監視を終了する
+
+        Yields:
+            Optional[Tuple[str, str]]: (入力パス, 出力パス)。変換対象がない場合はNone
+        """
+        backend = self._open_backend()
+        try:
+            self._initial_scan()
+            while stop is None or not stop.is_set():
+                paths, rescan = backend.changes(self.poll_interval)
+                if rescan:
+                    paths = list(
+                        walk_files(self.directory, self.suffixes, self.recursive)
+                    )
+                for path in paths:
+                    self.notify(path)
+
+                ready = self.ready()
+                for path in ready:
+                    yield path, self.output_path(path)
+                if not ready:
+                    yield None
+                self.prune()
+        finally:
+            backend.close()
+
+    def notify(self, path: str, now: Optional[float] = None):
+        """
+        ファイルの追加・更新を受け付け、書き込み完了待ちに加える
+
+        Args:
+            path (str): ファイルのパス
+            now (float, optional): 現在時刻（time.monotonic）。テスト用
+        """
+        if not path.lower().endswith(self.suffixes):
+            return
+        state = _file_state(path)
+        if state is None or self._done.get(path) == state:
+            return
+        if path not in self._pending:
+            self._pending[path] = (state, time.monotonic() if now is None else now)
+
+    def ready(self, now: Optional[float] = None) -> List[str]:
+        """
+        書き込みが完了したファイルを返す
+
+        Args:
+            now (float, optional): 現在時刻（time.monotonic）。テスト用
+
+        Returns:
+            List[str]: 変換できる状態になったファイルのパス
+        """
+        if now is None:
+            now = time.monotonic()
+        ready = []
+        for path, (state, since) in list(self._pending.items()):
+            current = _file_state(path)
+            if current is None:
+                # 削除された、または一時ファイルからリネームされた
+                del self._pending[path]
+            elif current != state:
+                # まだ書き込み中
+                self._pending[path] = (current, now)
+            elif now - since >= self.settle_time:
+                del self._pending[path]
+                self._done[path] = current
+                ready.append(path)
+        return ready
+
+    def prune(self, now: Optional[float] = None):
+        """
+        変換済みのファイルの記録から、削除されたファイルの分を取り除く
+
+        記録の数だけファイルの状態を確認するため、前回からDONE_PRUNE_INTERVAL秒以上経った場合だけ行う
+
+        Args:
+            now (float, optional): 現在時刻（time.monotonic）。テスト用
+        """
+        if now is None:
+            now = time.monotonic()
+        if now < self._next_prune:
+            return
+        self._next_prune = now + DONE_PRUNE_INTERVAL
+        for path in list(self._done):
+            if _file_state(path) is None:
+                del self._done[path]
+
+    def output_path(self, path: str) -> str:
+        """
+        入力ファイルに対応する出力GIFファイルのパスを返す（出力先ディレクトリは必要に応じて作成）
+
+        Args:
+            path (str): 入力動画ファイルのパス
+
+        Returns:
+            str: 出力GIFファイルのパス
+        """
+        output_path = output_path_for(
+            DiscoveredFile(path, self.directory), self.output_dir
+        )
+        if self.output_dir is not None:
+            os.makedirs(os.path.dirname(output_path) or os.curdir, exist_ok=True)
+        return output_path
+
+    def _initial_scan(self):
+        """
+        既存のファイルのうち、出力GIFが入力より新しいものは変換済みとして記録し、それ以外を変換対象に加える
+        """
+        for path in walk_files(self.directory, self.suffixes, self.recursive):
+            state = _file_state(path)
+            output_state = _file_state(
+                output_path_for(DiscoveredFile(path, self.directory), self.output_dir)
+            )
+            if state is not None and output_state is not None:
+                if output_state[1] >= state[1]:
+                    self._done[path] = state
+                    continue
+            self.notify(path)
+
+    def _open_backend(self):
+        """
+        inotifyバックエンドを開く（使用できない場合は走査によるバックエンド）
+        """
+        if self.use_inotify:
+            try:
+                return InotifyBackend(self.directory, self.suffixes, self.recursive)
+            except (OSError, AttributeError):
+                # Linux以外やlibcにinotifyがない環境
+                pass
+        return PollingBackend(self.directory, self.suffixes, self.recursive)
+
+
+def _file_state(path: str) -> Optional[FileState]:
+    """
+    ファイルのサイズと更新時刻を返す（存在しない場合はNone）
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
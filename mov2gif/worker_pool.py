@@ -0,0 +1,117 @@
+"""
+ワーカープロセスを使い回しつつ、一定数のジョブごとに作り直すプロセスプールのモジュール
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, List, Optional
+
+# ワーカープロセス1つあたりに実行させるジョブ数の目安の既定値（超えたらプールを作り直す）
+WORKER_MAX_JOBS = 100
+
+
+class RecyclingPool:
+    """
+    ProcessPoolExecutorを包み、投入したジョブ数が「ワーカー数×max_jobs」に達するたびに新しいプールへ切り替えるクラス
+
+    ワーカープロセスは切り替えまでの間ジョブをまたいで生き続けるため、インタープリターの起動・
+    モジュールのインポート・プロセス内のキャッシュの準備はプールごとに1回で済む。
+    切り替えは前のプールに投入済みのジョブがすべて終わり、ワーカーが終了するのを待ってから行うため、
+    同時に動くワーカープロセスがmax_workersを超えることはなく、ワーカーのメモリ（断片化や
+    ライブラリ内のキャッシュ）が際限なく増えることもない。
+
+    Python 3.11以降のmax_tasks_per_childはforkで起動するプールでは使えず、
+    ログ・進捗のキュー（forkのコンテキストで作成）をspawn・forkserverのワーカーには渡せないため、プール単位で作り直す
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], ProcessPoolExecutor],
+        max_workers: int,
+        max_jobs: Optional[int] = WORKER_MAX_JOBS,
+    ):
+        """
+        RecyclingPoolのコンストラクタ（最初のプールはジョブの投入時に作る）
+
+        Args:
+            factory (Callable[[], ProcessPoolExecutor]): ワーカー数max_workersのプールを作る関数
+            max_workers (int): ワーカープロセス数
+            max_jobs (int, optional): ワーカー1つあたりのジョブ数の目安。Noneの場合は作り直さない
+        """
+        self.factory = factory
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self.executor: Optional[ProcessPoolExecutor] = None
+        # 切り替えのために終了を待っているプール（待つ間に中断された場合もshutdownで終了させる）
+        self._retired: List[ProcessPoolExecutor] = []
+        # 現在のプールに投入したジョブ数
+        self.submitted = 0
+
+    def __enter__(self) -> "RecyclingPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """
+        ジョブを現在のプールに投入する（上限に達していれば、前のプールのジョブが終わるのを待って新しいプールへ切り替える）
+
+        Args:
+            fn (Callable[..., Any]): ワーカーで実行する関数（モジュールレベルの関数）
+            *args (Any): fnの引数
+
+        Returns:
+            Future: ジョブの結果
+
+        Raises:
+            BrokenProcessPool: 現在のプールが壊れている場合
+        """
+        if self.max_jobs is not None and (
+            self.submitted >= self.max_workers * self.max_jobs
+        ):
+            self.recycle()
+        if self.executor is None:
+            self.executor = self.factory()
+        self.submitted += 1
+        return self.executor.submit(fn, *args)
+
+    def recycle(self):
+        """
+        現在のプールを新しいジョブの受け付けから外し、投入済みのジョブが終わるのを待つ（次の投入で新しいプールを作る）
+        """
+        if self.executor is not None:
+            self._retired.append(self.executor)
+        self.executor = None
+        self.submitted = 0
+        while self._retired:
+            self._retired[0].shutdown(wait=True)
+            self._retired.pop(0)
+
+    def replace(self, broken: ProcessPoolExecutor):
+        """
+        壊れたプール（BrokenProcessPool）を捨てる。現在のプールであれば、次の投入で新しいプールを作る
+
+        Args:
+            broken (ProcessPoolExecutor): ジョブがBrokenProcessPoolで失敗したときのプール
+        """
+        broken.shutdown(wait=False)
+        if broken is self.executor:
+            self.executor = None
+            self.submitted = 0
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False):
+        """
+        切り替え待ちのプールを含め、すべてのプールを終了する
+
+        Args:
+            wait (bool, optional): ワーカープロセスの終了を待つかどうか
+            cancel_futures (bool, optional): まだ開始していないジョブを取り消すかどうか
+        """
+        executors = list(self._retired)
+        if self.executor is not None:
+            executors.append(self.executor)
+        self._retired = []
+        self.executor = None
+        self.submitted = 0
+        for executor in executors:
+            executor.shutdown(wait=wait, cancel_futures=cancel_futures)
@@ -3,6 +3,9 @@ from setuptools import setup, find_packages
 setup(
     name="mov2gif",  # パッケージ名
     version="0.1",  # バージョン番号（公開しない場合は削除可能）
-    packages=find_packages(exclude=["tests"]),
+    packages=find_packages(exclude=["tests", "benchmarks"]),
     test_suite="tests",  # テストスイートの指定
+    entry_points={
+        "console_scripts": ["mov2gif=mov2gif.cli:main"],  # ヘッドレス実行用のコマンド
+    },
 )
@@ -0,0 +1,77 @@
+"""
+app_logger モジュールのテスト
+"""
+
+import logging
+import os
+import unittest
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from logging.handlers import QueueHandler
+
+from mov2gif.app_logger import LOG_PATH, AppLogger, init_worker_logging
+
+
+def _log_in_worker(message: str):
+    """ワーカープロセスでログを出力し、ロガーのハンドラーの種類を返す"""
+    AppLogger().info(message)
+    return [
+        type(handler).__name__ for handler in logging.getLogger("AppLogger").handlers
+    ]
+
+
+def _read_log() -> str:
+    with open(LOG_PATH, encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+class TestAppLogger(unittest.TestCase):
+    """AppLoggerクラスのテスト"""
+
+    def test_records_are_written_by_listener(self):
+        """正常系: 呼び出し元はキューに入れるだけで、flushで書き出しを待てる"""
+        logger = AppLogger()
+        message = f"listener-{uuid.uuid4()}"
+
+        # テスト対象メソッド呼び出し
+        logger.info(message)
+        logger.flush()
+
+        # 検証
+        self.assertIs(AppLogger(), logger)
+        self.assertEqual(
+            [type(handler) for handler in logger.logger.handlers], [QueueHandler]
+        )
+        self.assertIn(message, _read_log())
+
+    def test_worker_process_logs_through_queue(self):
+        """正常系: ワーカープロセスのログはメインプロセスのリスナーが書き出す"""
+        logger = AppLogger()
+        message = f"worker-{uuid.uuid4()}"
+
+        # テスト対象メソッド呼び出し
+        with ProcessPoolExecutor(
+            max_workers=1,
+            initializer=init_worker_logging,
+            initargs=(AppLogger.worker_queue(),),
+        ) as executor:
+            handlers = executor.submit(_log_in_worker, message).result()
+        logger.flush()
+
+        # 検証 - ワーカーはファイルハンドラーを持たないこと
+        self.assertEqual(handlers, ["QueueHandler"])
+        self.assertIn(message, _read_log())
+
+    def test_init_worker_logging_without_queue(self):
+        """正常系: キューがない場合はワーカーのロガーを変更しない"""
+        logger = AppLogger()
+        handlers = list(logger.logger.handlers)
+
+        init_worker_logging(None)
+
+        self.assertEqual(logger.logger.handlers, handlers)
+        self.assertTrue(os.path.exists(LOG_PATH))
+
+
+if __name__ == "__main__":
+    unittest.main()
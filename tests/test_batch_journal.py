@@ -0,0 +1,116 @@
+"""
+batch_journal モジュールのテスト
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from mov2gif.batch_journal import BatchJournal
+
+
+class TestBatchJournal(unittest.TestCase):
+    """BatchJournalクラスのテスト"""
+
+    def setUp(self):
+        """テスト実行前の準備"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.journal_path = str(self.root / "state" / "journal.jsonl")
+        self.input_path = str(self.root / "a.mov")
+        self.output_path = str(self.root / "a.gif")
+
+    def tearDown(self):
+        """テスト実行後のクリーンアップ"""
+        self.temp_dir.cleanup()
+
+    def test_resume_completed(self):
+        """正常系: 完了を記録したジョブは、同じキーで出力が残っている間だけ完了済みとみなす"""
+        with BatchJournal(self.journal_path) as journal:
+            journal.start(self.input_path, self.output_path, "key")
+            Path(self.output_path).write_bytes(b"GIF89a")
+            journal.finish(self.input_path, self.output_path, "key", True)
+
+        # テスト対象メソッド呼び出し
+        with BatchJournal(self.journal_path, resume=True) as journal:
+            self.assertTrue(journal.completed(self.input_path, self.output_path, "key"))
+            # 入力・変換オプションが変わった場合と、キーを求められない場合
+            self.assertFalse(
+                journal.completed(self.input_path, self.output_path, "other")
+            )
+            self.assertFalse(journal.completed(self.input_path, self.output_path, None))
+            # 出力先が異なる場合
+            self.assertFalse(
+                journal.completed(self.input_path, str(self.root / "b.gif"), "key")
+            )
+            # 出力が書き換えられた場合
+            Path(self.output_path).write_bytes(b"GIF89a;")
+            self.assertFalse(
+                journal.completed(self.input_path, self.output_path, "key")
+            )
+            self.assertEqual(journal.interrupted(), [])
+
+    def test_interrupted_and_failed(self):
+        """正常系: 開始したまま終わっていないジョブを返し、失敗したジョブは完了済みとしない"""
+        failed_path = str(self.root / "b.mov")
+        with BatchJournal(self.journal_path) as journal:
+            journal.start(self.input_path, self.output_path, "key")
+            journal.start(failed_path, self.output_path + ".b", "key")
+            journal.finish(failed_path, self.output_path + ".b", "key", False)
+
+        with BatchJournal(self.journal_path, resume=True) as journal:
+            self.assertEqual(
+                journal.interrupted(), [(self.input_path, self.output_path)]
+            )
+            self.assertFalse(
+                journal.completed(failed_path, self.output_path + ".b", "key")
+            )
+
+    def test_torn_last_line(self):
+        """正常系: 異常終了で書きかけになった最後の行は無視し、その後の追記は読み込める"""
+        with BatchJournal(self.journal_path) as journal:
+            journal.start(self.input_path, self.output_path, "key")
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write('{"state": "done", "input_pa')
+
+        with BatchJournal(self.journal_path, resume=True) as journal:
+            self.assertEqual(
+                journal.interrupted(), [(self.input_path, self.output_path)]
+            )
+            Path(self.output_path).write_bytes(b"GIF89a")
+            journal.finish(self.input_path, self.output_path, "key", True)
+
+        with BatchJournal(self.journal_path, resume=True) as journal:
+            self.assertTrue(journal.completed(self.input_path, self.output_path, "key"))
+
+    def test_without_resume_starts_empty(self):
+        """正常系: 再開しない場合は前回の記録を空にする"""
+        Path(self.output_path).write_bytes(b"GIF89a")
+        with BatchJournal(self.journal_path) as journal:
+            journal.finish(self.input_path, self.output_path, "key", True)
+
+        with BatchJournal(self.journal_path) as journal:
+            self.assertFalse(
+                journal.completed(self.input_path, self.output_path, "key")
+            )
+        self.assertEqual(Path(self.journal_path).read_text(encoding="utf-8"), "")
+
+    def test_record_format(self):
+        """正常系: 1行1件のJSONで出力サイズとともに記録する"""
+        Path(self.output_path).write_bytes(b"GIF89a")
+        with BatchJournal(self.journal_path) as journal:
+            journal.finish(self.input_path, self.output_path, "key", True)
+            # 成功しても出力がなければ失敗として記録する
+            journal.finish(self.input_path, str(self.root / "missing.gif"), "key", True)
+
+        lines = Path(self.journal_path).read_text(encoding="utf-8").splitlines()
+        records = [json.loads(line) for line in lines]
+        self.assertEqual(records[0]["state"], "done")
+        self.assertEqual(records[0]["output_size"], 6)
+        self.assertEqual(records[1]["state"], "failed")
+        self.assertIsNone(records[1]["output_size"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import multiprocessing
+import os
+import time
+
+from benchmarks.runner import _collect_result, compare, load_results, save_results
+
+
+def _put_result(result_queue):
+    result_queue.put(_result())
+
+
+def _crash(result_queue):
+    os._exit(3)
+
+
+def _hang(result_queue):
+    time.sleep(60)
+
+
+def _start(target):
+    context = multiprocessing.get_context("fork")
+    result_queue = context.Queue()
+    process = context.Process(target=target, args=(result_queue,))
+    process.start()
+    return process, result_queue
+
+
+def _result(**overrides):
+    result = {
+        "success": True,
+        "wall_time_s": 2.0,
+        "frames": 60,
+        "frames_per_second": 30.0,
+        "peak_rss_mb": 100.0,
+        "output_bytes": 1000,
+    }
+    result.update(overrides)
+    return result
+
+
+class TestCompare:
+    def test_within_threshold(self):
+        baseline = {"case": _result()}
+        results = {"case": _result(wall_time_s=2.1, frames_per_second=28.6)}
+        assert compare(results, baseline, 0.1) == []
+
+    def test_detects_regressions(self):
+        baseline = {"case": _result()}
+        results = {
+            "case": _result(wall_time_s=3.0, frames_per_second=20.0, output_bytes=1200)
+        }
+        regressions = compare(results, baseline, 0.1)
+        assert len(regressions) == 3
+        assert any("wall_time_s" in r for r in regressions)
+        assert any("frames_per_second" in r for r in regressions)
+        assert any("output_bytes" in r for r in regressions)
+
+    def test_improvements_are_not_regressions(self):
+        baseline = {"case": _result()}
+        results = {"case": _result(wall_time_s=1.0, frames_per_second=60.0)}
+        assert compare(results, baseline, 0.1) == []
+
+    def test_failure_is_regression(self):
+        baseline = {"case": _result()}
+        results = {"case": _result(success=False, output_bytes=0)}
+        assert len(compare(results, baseline, 0.1)) == 1
+
+    def test_skips_unknown_case_and_missing_metric(self):
+        baseline = {"case": _result(peak_rss_mb=None)}
+        results = {"case": _result(peak_rss_mb=500.0), "new": _result()}
+        assert compare(results, baseline, 0.1) == []
+
+
+class TestCollectResult:
+    def test_returns_result(self):
+        process, result_queue = _start(_put_result)
+        assert _collect_result(process, result_queue, 10.0) == _result()
+
+    def test_crashed_child_is_failure(self):
+        process, result_queue = _start(_crash)
+        result = _collect_result(process, result_queue, 10.0)
+        assert result["success"] is False
+        assert "終了コード 3" in result["error"]
+
+    def test_timeout_is_failure(self):
+        process, result_queue = _start(_hang)
+        result = _collect_result(process, result_queue, 0.5)
+        assert result["success"] is False
+        assert not process.is_alive()
+        assert compare({"case": result}, {"case": _result()}, 0.1) == [
+            "case: 変換に失敗しました"
+        ]
+
+
+def test_save_and_load_results(tmp_path):
+    path = str(tmp_path / "results.json")
+    results = {"case": _result()}
+    save_results(path, results)
+    assert load_results(path) == results
@@ -0,0 +1,300 @@
+"""
+cli モジュールのテスト
+"""
+
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock, patch
+
+from mov2gif.app_logger import AppLogger
+from mov2gif.cli import main
+from mov2gif.movie_converter import ConversionResult
+from mov2gif.planner import JobEstimate, plan_batch
+from mov2gif.progress import JsonLinesSink
+
+
+def _fake_convert_iter(jobs, max_workers=None):
+    """入力ファイル名にfailを含む場合は失敗として扱う"""
+    for input_path, output_path in jobs:
+        yield ConversionResult(input_path, output_path, "fail" not in input_path)
+
+
+class TestCli(unittest.TestCase):
+    """cliモジュールのテスト"""
+
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        (self.root / "in" / "sub").mkdir(parents=True)
+        (self.root / "in" / "a.mov").write_bytes(b"")
+        (self.root / "in" / "sub" / "b.mp4").write_bytes(b"")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @patch("mov2gif.cli.AppLogger")
+    @patch("mov2gif.cli.MovieConverter")
+    def test_mirrors_output_dir(self, mock_converter_cls, mock_logger_cls):
+        """正常系: ディレクトリ構造を保って出力し、サマリーをJSONで出力する"""
+        mock_logger_cls.return_value = MagicMock(spec=AppLogger)
+        mock_converter_cls.return_value.convert_iter.side_effect = _fake_convert_iter
+        summary_path = self.root / "summary.json"
+
+        # テスト対象メソッド呼び出し
+        code = main(
+            [
+                str(self.root / "in"),
+                "-o",
+                str(self.root / "out"),
+                "--width",
+                "320",
+                "--no-cache",
+                "--segment-workers",
+                "4",
+                "--memory-budget",
+                "1.5G",
+                "--worker-max-jobs",
+                "0",
+                "--max-bytes",
+                "2.5M",
+                "--start",
+                "1:30",
+                "--duration",
+                "4",
+                "--summary",
+                str(summary_path),
+                "--progress",
+                str(self.root / "progress.jsonl"),
+            ]
+        )
+
+        # 検証
+        self.assertEqual(code, 0)
+        self.assertTrue((self.root / "out" / "sub").is_dir())
+        summary = json.loads(summary_path.read_text(encoding="utf-8"))
+        self.assertEqual(summary["total"], 2)
+        self.assertEqual(summary["succeeded"], 2)
+        self.assertEqual(
+            [result["output_path"] for result in summary["results"]],
+            [
+                str(self.root / "out" / "a.gif"),
+                str(self.root / "out" / "sub" / "b.gif"),
+            ],
+        )
+        kwargs = mock_converter_cls.call_args.kwargs
+        self.assertEqual(kwargs["options"]["width"], 320)
+        self.assertEqual(kwargs["options"]["max_bytes"], 2500000)
+        self.assertEqual(kwargs["options"]["start"], "1:30")
+        self.assertEqual(kwargs["options"]["duration"], "4")
+        self.assertIsNone(kwargs["conversion_cache"])
+        self.assertEqual(kwargs["segment_workers"], 4)
+        self.assertEqual(kwargs["memory_budget"], 1500000000)
+        self.assertIsNone(kwargs["worker_max_jobs"])
+        self.assertIsInstance(kwargs["progress"], JsonLinesSink)
+        self.assertTrue((self.root / "progress.jsonl").exists())
+
+    @patch("mov2gif.cli.AppLogger")
+    @patch("mov2gif.cli.MovieConverter")
+    def test_failure_exit_code(self, mock_converter_cls, mock_logger_cls):
+        """異常系: 変換に失敗したファイルがある場合は終了コード1"""
+        mock_logger_cls.return_value = MagicMock(spec=AppLogger)
+        mock_converter_cls.return_value.convert_iter.side_effect = _fake_convert_iter
+        (self.root / "in" / "fail.mov").write_bytes(b"")
+
+        code = main([str(self.root / "in"), "--summary", str(self.root / "s.json")])
+
+        self.assertEqual(code, 1)
+
+    @patch("mov2gif.cli.AppLogger")
+    @patch("mov2gif.cli.MovieConverter")
+    def test_dry_run(self, mock_converter_cls, mock_logger_cls):
+        """正常系: --dry-runでは変換せずに見積もりをサマリーに出力する"""
+        mock_logger_cls.return_value = MagicMock(spec=AppLogger)
+        mock_converter = mock_converter_cls.return_value
+        mock_converter.plan.side_effect = lambda jobs, max_workers: plan_batch(
+            [
+                JobEstimate(path, output, frames=10, seconds=1.0)
+                for path, output in jobs
+            ],
+            max_workers,
+        )
+        summary_path = self.root / "summary.json"
+
+        code = main(
+            [
+                str(self.root / "in"),
+                "-o",
+                str(self.root / "out"),
+                "-j",
+                "2",
+                "--dry-run",
+                "--summary",
+                str(summary_path),
+            ]
+        )
+
+        # 検証 - 出力先のディレクトリも作成しないこと
+        self.assertEqual(code, 0)
+        mock_converter.convert_iter.assert_not_called()
+        self.assertFalse((self.root / "out").exists())
+        summary = json.loads(summary_path.read_text(encoding="utf-8"))
+        self.assertTrue(summary["dry_run"])
+        self.assertEqual(summary["total"], 2)
+        self.assertEqual(summary["frames"], 20)
+        self.assertEqual(summary["estimated_seconds"], 1.0)
+        self.assertEqual(
+            sorted(job["output_path"] for job in summary["jobs"]),
+            [
+                str(self.root / "out" / "a.gif"),
+                str(self.root / "out" / "sub" / "b.gif"),
+            ],
+        )
+
+    @patch("mov2gif.cli.AppLogger")
+    @patch("mov2gif.cli.MovieConverter")
+    def test_resume(self, mock_converter_cls, mock_logger_cls):
+        """正常系: --resumeでは前回の記録を読み込んだジャーナルを渡し、スキップした数をサマリーに出力する"""
+        mock_logger = MagicMock(spec=AppLogger)
+        mock_logger_cls.return_value = mock_logger
+        journal_path = self.root / "journal.jsonl"
+        output_path = str(self.root / "out.gif")
+        journal_path.write_text(
+            json.dumps(
+                {"state": "started", "input_path": "a.mov", "output_path": output_path}
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+        # 中断されたジョブの書きかけの一時ファイル
+        partial = self.root / ".out.gif.0123abcd.tmp"
+        partial.write_bytes(b"GIF89a")
+
+        def resumed_convert_iter(jobs, max_workers=None):
+            for input_path, output_path in jobs:
+                yield ConversionResult(input_path, output_path, True, resumed=True)
+
+        mock_converter_cls.return_value.convert_iter.side_effect = resumed_convert_iter
+        summary_path = self.root / "summary.json"
+
+        # テスト対象メソッド呼び出し
+        code = main(
+            [str(self.root / "in"), "--journal", str(journal_path), "--resume"]
+            + ["--summary", str(summary_path)]
+        )
+
+        # 検証
+        self.assertEqual(code, 0)
+        journal = mock_converter_cls.call_args.kwargs["journal"]
+        self.assertEqual(journal.interrupted(), [("a.mov", output_path)])
+        self.assertFalse(partial.exists())
+        mock_logger.warning.assert_any_call(
+            "前回中断されたジョブが1件あります（変換し直します）"
+        )
+        summary = json.loads(summary_path.read_text(encoding="utf-8"))
+        self.assertEqual(summary["resumed"], 2)
+
+    def test_progress_and_summary_both_stdout(self):
+        """異常系: 進捗イベントとサマリーをどちらも標準出力に出すことはできない"""
+        with self.assertRaises(SystemExit) as context, patch("sys.stderr"):
+            main([str(self.root / "in"), "--progress", "-"])
+
+        self.assertEqual(context.exception.code, 2)
+
+    def test_resume_requires_journal(self):
+        """異常系: --journalなしの--resumeは引数エラー"""
+        with self.assertRaises(SystemExit) as context, patch("sys.stderr"):
+            main([str(self.root / "in"), "--resume"])
+
+        self.assertEqual(context.exception.code, 2)
+
+    @patch("mov2gif.cli.AppLogger")
+    @patch("mov2gif.cli.MovieConverter")
+    def test_manifest(self, mock_converter_cls, mock_logger_cls):
+        """正常系: --manifestのジョブをジョブごとの変換オプション付きで渡し、不正な行があれば終了コード1"""
+        mock_logger = MagicMock(spec=AppLogger)
+        mock_logger_cls.return_value = mock_logger
+        manifest_path = self.root / "in" / "jobs.jsonl"
+        manifest_path.write_text(
+            json.dumps({"path": "a.mov", "fps": 10})
+            + "\n"
+            + json.dumps({"path": "sub/b.mp4", "output": "../b.gif"})
+            + "\n"
+            + json.dumps({"path": "c.mov", "colors": 1})
+            + "\n",
+            encoding="utf-8",
+        )
+        received = []
+
+        def manifest_convert_iter(jobs, max_workers=None):
+            for job in jobs:
+                received.append(job)
+                yield ConversionResult(job[0], job[1], True)
+
+        mock_converter_cls.return_value.convert_iter.side_effect = manifest_convert_iter
+
+        # テスト対象メソッド呼び出し
+        code = main(
+            ["--manifest", str(manifest_path), "-o", str(self.root / "out")]
+            + ["--summary", str(self.root / "s.json")]
+        )
+
+        # 検証 - 出力先が未指定の行はマニフェストのディレクトリからの相対パスを保つこと
+        self.assertEqual(code, 1)
+        self.assertEqual(
+            received,
+            [
+                (
+                    str(self.root / "in" / "a.mov"),
+                    str(self.root / "out" / "a.gif"),
+                    {"fps": 10},
+                ),
+                (
+                    str(self.root / "in" / "sub" / "b.mp4"),
+                    str(self.root / "b.gif"),
+                    {},
+                ),
+            ],
+        )
+        mock_logger.error.assert_any_call("マニフェストの不正な1行を読み飛ばしました")
+
+    def test_manifest_excludes_inputs(self):
+        """異常系: 入力と--manifestはどちらか一方だけを指定する"""
+        for argv in ([], [str(self.root / "in"), "--manifest", "jobs.csv"]):
+            with self.assertRaises(SystemExit) as context, patch("sys.stderr"):
+                main(argv)
+            self.assertEqual(context.exception.code, 2)
+
+    @patch("mov2gif.cli.AppLogger")
+    def test_no_inputs(self, mock_logger_cls):
+        """異常系: 変換対象が見つからない場合は終了コード2"""
+        mock_logger = MagicMock(spec=AppLogger)
+        mock_logger_cls.return_value = mock_logger
+
+        code = main(
+            [str(self.root / "in" / "*.webm"), "--summary", str(self.root / "s.json")]
+        )
+
+        self.assertEqual(code, 2)
+        mock_logger.warning.assert_any_call("変換対象ファイルが見つかりませんでした")
+
+    @patch("mov2gif.cli.AppLogger")
+    def test_invalid_options(self, mock_logger_cls):
+        """異常系: 不正な変換オプションは終了コード2"""
+        mock_logger_cls.return_value = MagicMock(spec=AppLogger)
+
+        self.assertEqual(main([str(self.root / "in"), "--colors", "1"]), 2)
+
+    @patch("mov2gif.cli.AppLogger")
+    def test_watch_requires_directory(self, mock_logger_cls):
+        """異常系: --watchにディレクトリ以外を指定した場合は終了コード2"""
+        mock_logger_cls.return_value = MagicMock(spec=AppLogger)
+
+        code = main(["--watch", str(self.root / "in" / "a.mov")])
+
+        self.assertEqual(code, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
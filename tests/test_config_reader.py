@@ -92,6 +92,149 @@ class TestConfigReader(unittest.TestCase):
         # ロガーが呼び出されたことを確認
         self.mock_logger.warning.assert_called_once()
 
+    def test_read_config_file_options(self):
+        """正常系: 辞書で指定した要素からパスとファイルごとの変換オプションを読み込む"""
+        test_config_path = Path(self.temp_dir.name) / "config.py"
+        with open(test_config_path, "w") as f:
+            f.write("MOV_FILE_PATHS = [\n")
+            f.write('    "/path/to/movie1.mov",\n')
+            f.write(
+                '    {"path": "/path/to/movie2.mov", "start": "1:00", "duration": 5},\n'
+            )
+            f.write('    {"path": "/path/to/movie3.mov", "fps": -1},\n')
+            f.write('    {"start": 10},\n')
+            f.write("]\n")
+
+        # テスト対象メソッド呼び出し
+        file_paths = self.config_reader.read_config(str(test_config_path))
+        file_options = self.config_reader.read_file_options(str(test_config_path))
+
+        # 検証 - 不正な要素はエラーログを出して除く（2つのメソッドで読んでもログは1回ずつ）
+        self.assertEqual(file_paths, ["/path/to/movie1.mov", "/path/to/movie2.mov"])
+        self.assertEqual(
+            file_options, {"/path/to/movie2.mov": {"start": "1:00", "duration": 5}}
+        )
+        self.assertEqual(self.mock_logger.error.call_count, 2)
+
+    def test_read_options_normal(self):
+        """正常系: CONVERSION_OPTIONSを読み込めることを確認"""
+        test_config_path = Path(self.temp_dir.name) / "config.py"
+        with open(test_config_path, "w") as f:
+            f.write('CONVERSION_OPTIONS = {"fps": 10, "width": 480}\n')
+
+        # テスト対象メソッド呼び出し
+        options = self.config_reader.read_options(str(test_config_path))
+
+        # 検証
+        self.assertEqual(options, {"fps": 10, "width": 480})
+
+    def test_read_options_not_defined(self):
+        """正常系: CONVERSION_OPTIONSが定義されていない場合は空の辞書"""
+        test_config_path = Path(self.temp_dir.name) / "config.py"
+        with open(test_config_path, "w") as f:
+            f.write("MOV_FILE_PATHS = []\n")
+
+        # テスト対象メソッド呼び出し
+        options = self.config_reader.read_options(str(test_config_path))
+
+        # 検証
+        self.assertEqual(options, {})
+
+    def test_read_options_invalid(self):
+        """異常系: 不正なCONVERSION_OPTIONSはエラーログを出して空の辞書"""
+        test_config_path = Path(self.temp_dir.name) / "config.py"
+        with open(test_config_path, "w") as f:
+            f.write('CONVERSION_OPTIONS = {"fps": -1}\n')
+
+        # テスト対象メソッド呼び出し
+        options = self.config_reader.read_options(str(test_config_path))
+
+        # 検証
+        self.assertEqual(options, {})
+        self.mock_logger.error.assert_called_once()
+
+    def test_read_profile_dir(self):
+        """正常系: PROFILE_DIRを読み込み、未定義や不正な値の場合はNone"""
+        test_config_path = Path(self.temp_dir.name) / "config.py"
+        with open(test_config_path, "w") as f:
+            f.write('PROFILE_DIR = "/tmp/profiles"\n')
+        self.assertEqual(
+            self.config_reader.read_profile_dir(str(test_config_path)), "/tmp/profiles"
+        )
+
+        with open(test_config_path, "w") as f:
+            f.write("PROFILE_DIR = 1\n")
+        self.assertIsNone(self.config_reader.read_profile_dir(str(test_config_path)))
+        self.mock_logger.error.assert_called_once()
+
+        # デフォルトの設定ファイルでは計測しない
+        self.assertIsNone(self.config_reader.read_profile_dir())
+
+    def test_read_journal_path(self):
+        """正常系: BATCH_JOURNALを読み込み、未定義や不正な値の場合はNone"""
+        test_config_path = Path(self.temp_dir.name) / "config.py"
+        with open(test_config_path, "w") as f:
+            f.write('BATCH_JOURNAL = "/tmp/journal.jsonl"\n')
+        self.assertEqual(
+            self.config_reader.read_journal_path(str(test_config_path)),
+            "/tmp/journal.jsonl",
+        )
+
+        with open(test_config_path, "w") as f:
+            f.write("BATCH_JOURNAL = True\n")
+        self.assertIsNone(self.config_reader.read_journal_path(str(test_config_path)))
+        self.mock_logger.error.assert_called_once_with(
+            "BATCH_JOURNALは文字列である必要があります"
+        )
+
+        # デフォルトの設定ファイルでは記録しない
+        self.assertIsNone(self.config_reader.read_journal_path())
+
+    def test_read_manifest_path(self):
+        """正常系: MANIFESTを読み込み、デフォルトの設定ファイルでは未設定（MOV_FILE_PATHSを使用）"""
+        test_config_path = Path(self.temp_dir.name) / "config.py"
+        with open(test_config_path, "w") as f:
+            f.write('MANIFEST = "/tmp/jobs.jsonl"\n')
+        self.assertEqual(
+            self.config_reader.read_manifest_path(str(test_config_path)),
+            "/tmp/jobs.jsonl",
+        )
+        self.assertIsNone(self.config_reader.read_manifest_path())
+
+    def test_config_executed_once(self):
+        """正常系: 複数の設定を読み込んでも設定ファイルは1回だけ実行し、書き換えた場合は実行し直す"""
+        test_config_path = Path(self.temp_dir.name) / "config.py"
+        log_path = Path(self.temp_dir.name) / "executed.log"
+        with open(test_config_path, "w") as f:
+            f.write(f"with open({str(log_path)!r}, 'a') as log:\n")
+            f.write("    log.write('x')\n")
+            f.write('MOV_FILE_PATHS = ["/path/to/movie1.mov"]\n')
+            f.write('CONVERSION_OPTIONS = {"fps": 10}\n')
+
+        # テスト対象メソッド呼び出し
+        config_path = str(test_config_path)
+        self.config_reader.read_config(config_path)
+        self.config_reader.read_file_options(config_path)
+        self.config_reader.read_options(config_path)
+        self.config_reader.read_profile_dir(config_path)
+        self.config_reader.read_journal_path(config_path)
+        self.config_reader.read_manifest_path(config_path)
+
+        # 検証
+        self.assertEqual(log_path.read_text(), "x")
+
+        with open(test_config_path, "a") as f:
+            f.write('MANIFEST = "/tmp/jobs.jsonl"\n')
+        self.assertEqual(
+            self.config_reader.read_manifest_path(config_path), "/tmp/jobs.jsonl"
+        )
+        self.assertEqual(log_path.read_text(), "xx")
+
+    def test_default_config_path(self):
+        """正常系: デフォルトの設定ファイルはパッケージ内のconfig/config.py"""
+        self.assertTrue(os.path.exists(self.config_reader.default_config_path))
+        self.assertEqual(self.config_reader.read_options()["fps"], 15)
+
 
 if __name__ == "__main__":
     unittest.main()
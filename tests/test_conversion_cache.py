@@ -0,0 +1,85 @@
+"""
+conversion_cache モジュールのテスト
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from mov2gif.conversion_cache import ConversionCache
+
+
+class TestConversionCache(unittest.TestCase):
+    """ConversionCacheクラスのテスト"""
+
+    def setUp(self):
+        """テスト実行前の準備"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+        self.cache = ConversionCache(self.cache_dir, max_bytes=250)
+        self.output_path = Path(self.temp_dir.name) / "movie.gif"
+        self.output_path.write_bytes(b"G" * 100)
+
+    def tearDown(self):
+        """テスト実行後のクリーンアップ"""
+        self.temp_dir.cleanup()
+
+    def test_restore_missing(self):
+        """正常系: 未登録のキーは復元できない"""
+        self.assertFalse(self.cache.restore("missing", str(self.output_path)))
+
+    def test_restore_reuses_existing_output(self):
+        """正常系: 出力先が記録時のままなら再利用する"""
+        self.cache.store("key", str(self.output_path))
+        mtime = os.stat(self.output_path).st_mtime_ns
+
+        # 検証
+        self.assertTrue(self.cache.restore("key", str(self.output_path)))
+        self.assertEqual(os.stat(self.output_path).st_mtime_ns, mtime)
+
+    def test_restore_copies_deleted_output(self):
+        """正常系: 出力先が削除されていればキャッシュからコピーする"""
+        self.cache.store("key", str(self.output_path))
+        self.output_path.unlink()
+
+        # 検証
+        self.assertTrue(self.cache.restore("key", str(self.output_path)))
+        self.assertEqual(self.output_path.read_bytes(), b"G" * 100)
+
+    def test_index_is_persisted(self):
+        """正常系: インデックスが別インスタンスから読み込める"""
+        self.cache.store("key", str(self.output_path))
+        self.output_path.unlink()
+
+        # 検証
+        reloaded = ConversionCache(self.cache_dir, max_bytes=250)
+        self.assertTrue(reloaded.restore("key", str(self.output_path)))
+        self.assertEqual(reloaded.total_bytes(), 100)
+
+    def test_lru_eviction(self):
+        """正常系: 上限を超えると最終使用時刻の古いものから削除される"""
+        self.cache.store("first", str(self.output_path))
+        self.cache.store("second", str(self.output_path))
+        # firstを使用してsecondを最も古い状態にする
+        self.cache.restore("first", str(self.output_path))
+        self.cache.store("third", str(self.output_path))
+
+        # 検証
+        self.assertEqual(self.cache.total_bytes(), 200)
+        self.assertFalse(self.cache.restore("second", str(self.output_path)))
+        self.assertTrue(self.cache.restore("first", str(self.output_path)))
+        self.assertTrue(self.cache.restore("third", str(self.output_path)))
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, "second.gif")))
+
+    def test_oversized_output_is_not_stored(self):
+        """正常系: 上限を超えるサイズのGIFは保存しない"""
+        self.output_path.write_bytes(b"G" * 300)
+        self.cache.store("key", str(self.output_path))
+
+        # 検証
+        self.assertEqual(self.cache.total_bytes(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+conversion_options モジュールのテスト
+"""
+
+import unittest
+
+from mov2gif.conversion_options import (
+    DEFAULT_CONVERSION_OPTIONS,
+    clip_bounds,
+    output_size,
+    palette_colors,
+    parse_time,
+    resolve_options,
+)
+
+
+class TestConversionOptions(unittest.TestCase):
+    """resolve_options・parse_time・clip_bounds・palette_colors・output_size関数のテスト"""
+
+    def test_resolve_defaults(self):
+        """正常系: 未指定の場合は既定値"""
+        self.assertEqual(resolve_options(), DEFAULT_CONVERSION_OPTIONS)
+        self.assertEqual(resolve_options({"fps": 10})["fps"], 10)
+
+    def test_resolve_invalid(self):
+        """異常系: 未知のオプションや範囲外の値はValueError"""
+        for options in (
+            {"unknown": 1},
+            {"fps": 0},
+            {"quality": 101},
+            {"colors": 1},
+            {"width": -1},
+            {"max_side": 1.5},
+            {"max_bytes": 0},
+            {"dedup_threshold": 256},
+            {"dedup_threshold": 0.5},
+            {"dither": "random"},
+            {"start": -1},
+            {"start": "1:xx"},
+            {"start": 10, "end": 5},
+            {"end": 10, "duration": 5},
+            {"duration": 0},
+        ):
+            with self.subTest(options=options):
+                with self.assertRaises(ValueError):
+                    resolve_options(options)
+
+    def test_parse_time(self):
+        """正常系: 秒数と"mm:ss"・"hh:mm:ss"形式を秒数にする"""
+        self.assertEqual(parse_time(5), 5.0)
+        self.assertEqual(parse_time("2.5"), 2.5)
+        self.assertEqual(parse_time("1:02.5"), 62.5)
+        self.assertEqual(parse_time("1:00:10"), 3610.0)
+        with self.assertRaises(ValueError):
+            parse_time("1:2:3:4")
+
+    def test_clip_bounds(self):
+        """正常系: end・durationから切り出す区間の終了時刻を求める"""
+        self.assertEqual(clip_bounds(resolve_options()), (0.0, None))
+        self.assertEqual(
+            clip_bounds(resolve_options({"start": "0:30", "end": 40})), (30.0, 40.0)
+        )
+        self.assertEqual(
+            clip_bounds(resolve_options({"start": 30, "duration": 5})), (30.0, 35.0)
+        )
+
+    def test_palette_colors(self):
+        """正常系: qualityに応じて色数が減る"""
+        self.assertEqual(palette_colors(resolve_options()), 256)
+        self.assertEqual(palette_colors(resolve_options({"quality": 50})), 128)
+        self.assertEqual(
+            palette_colors(resolve_options({"colors": 2, "quality": 1})), 2
+        )
+
+    def test_output_size(self):
+        """正常系: width・max_sideで縦横比を保って縮小し、拡大はしない"""
+        self.assertEqual(output_size((1920, 1080), resolve_options()), (1920, 1080))
+        self.assertEqual(
+            output_size((1920, 1080), resolve_options({"width": 480})), (480, 270)
+        )
+        self.assertEqual(
+            output_size((1080, 1920), resolve_options({"max_side": 480})), (270, 480)
+        )
+        self.assertEqual(
+            output_size((320, 240), resolve_options({"width": 640})), (320, 240)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+"""
+decoder モジュールのテスト
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import imageio_ffmpeg
+import numpy as np
+
+from mov2gif.decoder import FrameDecoder, decode_frame_at, probe_video, sample_frames
+
+
+def write_test_video(path: str, size=(64, 48), fps=30, frame_count=30):
+    """フレームごとに明るさが変わるテスト用の動画を書き出す"""
+    width, height = size
+    writer = imageio_ffmpeg.write_frames(
+        path, size, fps=fps, macro_block_size=1, output_params=["-g", "10"]
+    )
+    writer.send(None)
+    for i in range(frame_count):
+        writer.send(np.full((height, width, 3), (i * 8) % 256, dtype=np.uint8))
+    writer.close()
+
+
+class TestDecoder(unittest.TestCase):
+    """probe_video・FrameDecoder・decode_frame_atのテスト"""
+
+    @classmethod
+    def setUpClass(cls):
+        """テスト用の動画を作成"""
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.video_path = str(Path(cls.temp_dir.name) / "test.mp4")
+        write_test_video(cls.video_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        """テスト実行後のクリーンアップ"""
+        cls.temp_dir.cleanup()
+
+    def test_probe_video(self):
+        """正常系: 解像度・フレームレート・長さを取得できる"""
+        info = probe_video(self.video_path)
+
+        # 検証
+        self.assertEqual(info.size, (64, 48))
+        self.assertAlmostEqual(info.fps, 30.0)
+        self.assertAlmostEqual(info.duration, 1.0, places=1)
+
+    def test_probe_video_invalid_file(self):
+        """異常系: 動画ではないファイルはエラー"""
+        path = Path(self.temp_dir.name) / "invalid.mov"
+        path.write_bytes(b"dummy content")
+
+        with self.assertRaises(Exception):
+            probe_video(str(path))
+
+    def test_decode_with_scale_and_fps(self):
+        """正常系: ffmpeg側で縮小・フレームレート変換したフレームが得られる"""
+        with FrameDecoder(self.video_path, (32, 24), 10) as decoder:
+            frames = list(decoder)
+
+        # 検証 - 1秒・10fpsで10フレーム、32x24
+        self.assertEqual(len(frames), 10)
+        self.assertEqual(frames[0].shape, (24, 32, 3))
+        self.assertEqual(frames[0].dtype, np.uint8)
+        self.assertIn("-an", FrameDecoder(self.video_path, (32, 24), 10).command())
+
+    def test_decode_segment(self):
+        """正常系: 開始時刻と最大フレーム数を指定して区間のみをデコードできる"""
+        decoder = FrameDecoder(self.video_path, (32, 24), 10, start=0.5, max_frames=3)
+        frames = list(decoder)
+
+        # 検証 - 0.5秒からの3フレーム。入力側でシークしていること
+        self.assertEqual(len(frames), 3)
+        command = decoder.command()
+        self.assertLess(command.index("-ss"), command.index("-i"))
+        self.assertEqual(command[command.index("-frames:v") + 1], "3")
+        self.assertAlmostEqual(float(frames[0].mean()), 120, delta=12)
+
+    def test_decode_duration(self):
+        """正常系: 開始時刻からの長さを指定すると、その後ろはデコードしない"""
+        decoder = FrameDecoder(self.video_path, (32, 24), 10, start=0.2, duration=0.5)
+        frames = list(decoder)
+
+        # 検証 - 0.2秒から0.5秒分の5フレーム。読み込む長さは入力側で制限すること
+        self.assertEqual(len(frames), 5)
+        command = decoder.command()
+        self.assertLess(command.index("-t"), command.index("-i"))
+        self.assertAlmostEqual(float(frames[0].mean()), 48, delta=12)
+
+    def test_decode_early_close(self):
+        """正常系: 途中で読み込みをやめてもffmpegが終了する"""
+        decoder = FrameDecoder(self.video_path, (32, 24), 30)
+        frames = decoder.frames()
+        next(frames)
+        frames.close()
+
+        # 検証
+        self.assertIsNone(decoder._process)
+
+    def test_decode_in_own_session(self):
+        """正常系: ffmpegは端末からのCtrl+Cが届かないよう別のセッションで動く"""
+        decoder = FrameDecoder(self.video_path, (32, 24), 30)
+        frames = decoder.frames()
+        next(frames)
+
+        # 検証
+        self.assertNotEqual(os.getsid(decoder._process.pid), os.getsid(0))
+        frames.close()
+
+    def test_decode_invalid_file(self):
+        """異常系: デコードできないファイルはIOError"""
+        path = Path(self.temp_dir.name) / "broken.mp4"
+        path.write_bytes(b"dummy content")
+
+        with self.assertRaises(IOError):
+            list(FrameDecoder(str(path), (32, 24), 10))
+
+    def test_decode_with_noisy_stderr(self):
+        """正常系: ffmpegが標準エラー出力に大量に書き出してもフレームの読み込みが止まらない"""
+        script = (
+            "import sys; sys.stderr.write('warning\\n' * 200000); sys.stderr.flush(); "
+            "sys.stdout.buffer.write(bytes(4 * 3 * 3)); sys.exit(int(sys.argv[1]))"
+        )
+        frames = []
+        errors = []
+
+        def decode(exit_code):
+            decoder = FrameDecoder(self.video_path, (2, 2), 10)
+            with patch.object(
+                decoder,
+                "command",
+                return_value=[sys.executable, "-c", script, str(exit_code)],
+            ):
+                try:
+                    frames.extend(decoder)
+                except IOError as e:
+                    errors.append(str(e))
+
+        # テスト対象メソッド呼び出し（止まった場合に検出できるよう、別スレッドで待つ）
+        for exit_code in (0, 1):
+            thread = threading.Thread(target=decode, args=(exit_code,), daemon=True)
+            thread.start()
+            thread.join(timeout=10)
+            self.assertFalse(thread.is_alive())
+
+        # 検証 - 異常終了した場合は標準エラー出力の末尾をメッセージに含めること
+        self.assertEqual(len(frames), 6)
+        self.assertEqual(len(errors), 1)
+        self.assertTrue(errors[0].endswith("warning"))
+
+    def test_decode_frame_at(self):
+        """正常系: 指定時刻のフレームをシークして取り出せる"""
+        frame = decode_frame_at(self.video_path, 0.5, (16, 12))
+
+        # 検証 - 15フレーム目付近の明るさ
+        self.assertEqual(frame.shape, (12, 16, 3))
+        self.assertAlmostEqual(float(frame.mean()), 120, delta=12)
+
+    def test_decode_frame_at_out_of_range(self):
+        """正常系: 範囲外の時刻はNone"""
+        self.assertIsNone(decode_frame_at(self.video_path, 10.0, (16, 12)))
+
+    def test_sample_frames(self):
+        """正常系: 動画全体から指定数のフレームを取り出せる"""
+        frames = list(sample_frames(self.video_path, 1.0, 4, (16, 12)))
+
+        # 検証 - 明るさが単調に増えていること（先頭から順に等間隔）
+        self.assertEqual(len(frames), 4)
+        means = [float(f.mean()) for f in frames]
+        self.assertEqual(means, sorted(means))
+
+    def test_sample_frames_in_clip(self):
+        """正常系: 開始時刻を指定すると、その区間の中からフレームを取り出す"""
+        frames = list(sample_frames(self.video_path, 0.4, 2, (16, 12), start=0.5))
+
+        # 検証 - 0.5秒（明るさ120）以降のフレームのみ
+        self.assertEqual(len(frames), 2)
+        self.assertTrue(all(float(f.mean()) >= 108 for f in frames))
+
+    @patch("mov2gif.decoder.SEEK_SAMPLE_INTERVAL", 0.1)
+    def test_sample_frames_by_seek(self):
+        """正常系: サンプル間隔が長い場合はシークで取り出す"""
+        frames = list(sample_frames(self.video_path, 1.0, 4, (16, 12)))
+
+        # 検証
+        self.assertEqual(len(frames), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
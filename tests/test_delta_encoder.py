@@ -0,0 +1,94 @@
+"""
+delta_encoder モジュールのテスト
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+from mov2gif.delta_encoder import DISPOSAL_NONE, DeltaEncoder
+from mov2gif.gif_writer import GifWriter
+
+
+class TestDeltaEncoder(unittest.TestCase):
+    """DeltaEncoderクラスのテスト"""
+
+    def setUp(self):
+        """テスト実行前の準備"""
+        self.encoder = DeltaEncoder(transparent_index=255)
+        self.first = np.zeros((20, 30), dtype=np.uint8)
+
+    def test_first_frame_is_full(self):
+        """正常系: 最初のフレームは全面・透過なしで出力される"""
+        encoded = self.encoder.encode(self.first)
+
+        # 検証
+        self.assertEqual(encoded.offset, (0, 0))
+        self.assertIsNone(encoded.transparency)
+        np.testing.assert_array_equal(encoded.indices, self.first)
+
+    def test_changed_region_is_cropped(self):
+        """正常系: 変化した画素の外接矩形に切り詰められ、矩形内の未変化画素は透過になる"""
+        second = self.first.copy()
+        second[5, 10] = 1
+        second[8, 12] = 2
+
+        self.encoder.encode(self.first)
+        encoded = self.encoder.encode(second)
+
+        # 検証
+        self.assertEqual(encoded.offset, (10, 5))
+        self.assertEqual(encoded.indices.shape, (4, 3))
+        self.assertEqual(encoded.transparency, 255)
+        self.assertEqual(encoded.indices[0, 0], 1)
+        self.assertEqual(encoded.indices[3, 2], 2)
+        self.assertEqual(encoded.indices[1, 1], 255)
+
+    def test_unchanged_frame(self):
+        """正常系: 変化がない場合は1画素の透過フレームになる"""
+        self.encoder.encode(self.first)
+        encoded = self.encoder.encode(self.first.copy())
+
+        # 検証
+        self.assertEqual(encoded.indices.shape, (1, 1))
+        self.assertEqual(encoded.indices[0, 0], encoded.transparency)
+
+    def test_output_is_visually_identical(self):
+        """正常系: 差分エンコードしたGIFを再生すると元のフレームと一致する"""
+        rng = np.random.default_rng(0)
+        palette = rng.integers(0, 256, (255, 3), dtype=np.uint8)
+        frames = [rng.integers(0, 255, (20, 30), dtype=np.uint8)]
+        for i in range(5):
+            frame = frames[-1].copy()
+            frame[i : i + 3, i * 2 : i * 2 + 4] = rng.integers(0, 255, (3, 4))
+            frames.append(frame)
+        frames.append(frames[-1].copy())
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = str(Path(temp_dir) / "delta.gif")
+            with GifWriter(output_path, (30, 20), global_palette=palette) as writer:
+                for frame in frames:
+                    encoded = self.encoder.encode(frame)
+                    writer.write_frame(
+                        encoded.indices,
+                        duration_ms=100,
+                        offset=encoded.offset,
+                        transparency=encoded.transparency,
+                        disposal=DISPOSAL_NONE,
+                    )
+
+            # 検証
+            with Image.open(output_path) as gif:
+                decoded = [
+                    np.asarray(f.convert("RGB")) for f in ImageSequence.Iterator(gif)
+                ]
+        self.assertEqual(len(decoded), len(frames))
+        for frame, rgb in zip(frames, decoded):
+            np.testing.assert_array_equal(rgb, palette[frame])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+
+from mov2gif.discovery import (
+    DiscoveredFile,
+    discover,
+    glob_root,
+    is_glob_pattern,
+    output_path_for,
+)
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"")
+    return str(path)
+
+
+class TestDiscover:
+    def test_directory_recursive(self, tmp_path):
+        a = _touch(tmp_path / "a.mov")
+        b = _touch(tmp_path / "sub" / "b.MP4")
+        _touch(tmp_path / "sub" / "notes.txt")
+        c = _touch(tmp_path / "sub" / "deeper" / "c.mp4")
+
+        found = list(discover([str(tmp_path)]))
+
+        assert found == [
+            DiscoveredFile(a, str(tmp_path)),
+            DiscoveredFile(b, str(tmp_path)),
+            DiscoveredFile(c, str(tmp_path)),
+        ]
+
+    def test_directory_not_recursive(self, tmp_path):
+        a = _touch(tmp_path / "a.mov")
+        _touch(tmp_path / "sub" / "b.mov")
+
+        assert [item.path for item in discover([str(tmp_path)], recursive=False)] == [a]
+
+    def test_extensions(self, tmp_path):
+        _touch(tmp_path / "a.mov")
+        b = _touch(tmp_path / "b.webm")
+
+        found = list(discover([str(tmp_path)], extensions=[".webm"]))
+
+        assert [item.path for item in found] == [b]
+
+    def test_explicit_file_and_dedupe(self, tmp_path):
+        # 明示したファイルは拡張子を問わず対象にし、重複は除く
+        a = _touch(tmp_path / "a.avi")
+        b = _touch(tmp_path / "b.mov")
+
+        found = list(discover([a, b, str(tmp_path), a]))
+
+        assert [item.path for item in found] == [a, b]
+        assert found[0].root == str(tmp_path)
+
+    def test_glob(self, tmp_path):
+        a = _touch(tmp_path / "x" / "a.mov")
+        _touch(tmp_path / "x" / "a.txt")
+        b = _touch(tmp_path / "y" / "z" / "b.mov")
+
+        found = list(discover([str(tmp_path / "**" / "*")]))
+
+        assert sorted(item.path for item in found) == sorted([a, b])
+        assert all(item.root == str(tmp_path) for item in found)
+
+    def test_is_lazy(self, tmp_path):
+        for i in range(5):
+            _touch(tmp_path / f"d{i}" / "a.mov")
+
+        iterator = discover([str(tmp_path)])
+
+        assert next(iterator).path == str(tmp_path / "d0" / "a.mov")
+
+
+def test_glob_helpers():
+    assert is_glob_pattern("videos/*.mov")
+    assert not is_glob_pattern("videos/a.mov")
+    assert glob_root(os.path.join("videos", "**", "*.mov")) == "videos"
+    assert glob_root("*.mov") == os.curdir
+    assert glob_root("/data/in/*/x.mov") == "/data/in"
+
+
+def test_output_path_for():
+    item = DiscoveredFile(os.path.join("in", "sub", "a.mov"), "in")
+
+    assert output_path_for(item) == os.path.join("in", "sub", "a.gif")
+    assert output_path_for(item, "out") == os.path.join("out", "sub", "a.gif")
@@ -0,0 +1,57 @@
+"""
+fingerprint モジュールのテスト
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from mov2gif.fingerprint import file_fingerprint, options_key
+
+
+class TestFingerprint(unittest.TestCase):
+    """file_fingerprint・options_key関数のテスト"""
+
+    def setUp(self):
+        """テスト実行前の準備"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "movie.mov"
+        self.path.write_bytes(os.urandom(512 * 1024))
+
+    def tearDown(self):
+        """テスト実行後のクリーンアップ"""
+        self.temp_dir.cleanup()
+
+    def test_fingerprint_is_stable(self):
+        """正常系: 同じファイルからは同じ値が得られる"""
+        self.assertEqual(
+            file_fingerprint(str(self.path)), file_fingerprint(str(self.path))
+        )
+
+    def test_fingerprint_changes_with_content(self):
+        """正常系: サンプリング対象のブロックが変わると値も変わる"""
+        before = file_fingerprint(str(self.path))
+        stat = os.stat(self.path)
+        with open(self.path, "r+b") as f:
+            f.write(b"changed")
+        # 更新時刻を元に戻し、内容の差分だけで検出できることを確認する
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        self.assertNotEqual(before, file_fingerprint(str(self.path)))
+
+    def test_fingerprint_missing_file(self):
+        """異常系: ファイルが存在しない場合はOSError"""
+        with self.assertRaises(OSError):
+            file_fingerprint(str(Path(self.temp_dir.name) / "missing.mov"))
+
+    def test_options_key(self):
+        """正常系: オプションの順序に依存せず、値が変わればキーも変わる"""
+        key = options_key("abc", {"fps": 15, "colors": 256})
+        self.assertEqual(key, options_key("abc", {"colors": 256, "fps": 15}))
+        self.assertNotEqual(key, options_key("abc", {"colors": 128, "fps": 15}))
+        self.assertNotEqual(key, options_key("abd", {"colors": 256, "fps": 15}))
+
+
+if __name__ == "__main__":
+    unittest.main()
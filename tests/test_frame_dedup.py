@@ -0,0 +1,79 @@
+"""
+frame_dedup モジュールのテスト
+"""
+
+import unittest
+
+import numpy as np
+
+from mov2gif.frame_dedup import MergedFrame, is_duplicate, merge_duplicates
+
+
+def _frame(value: int, shape=(4, 6)) -> np.ndarray:
+    return np.full(shape + (3,), value, dtype=np.uint8)
+
+
+class TestMergeDuplicates(unittest.TestCase):
+    """merge_duplicates・is_duplicate関数のテスト"""
+
+    def test_merge_identical_runs(self):
+        """正常系: 連続する同一フレームをまとめ、まとめた数を返す"""
+        frames = [_frame(v) for v in (0, 0, 0, 50, 50, 0)]
+
+        merged = list(merge_duplicates(frames))
+
+        # 検証 - フレーム数の合計は変わらないこと
+        self.assertEqual([m.count for m in merged], [3, 2, 1])
+        self.assertEqual([int(m.frame[0, 0, 0]) for m in merged], [0, 50, 0])
+        self.assertEqual(sum(m.count for m in merged), len(frames))
+
+    def test_threshold_ignores_small_noise(self):
+        """正常系: 差がしきい値以下の揺れは同じフレームとみなす"""
+        frames = [_frame(100), _frame(103), _frame(97), _frame(120)]
+
+        # 検証
+        self.assertEqual(
+            [m.count for m in merge_duplicates(frames, threshold=4)], [3, 1]
+        )
+        self.assertEqual(
+            [m.count for m in merge_duplicates(frames, threshold=0)], [1, 1, 1, 1]
+        )
+
+    def test_drift_is_compared_with_kept_frame(self):
+        """正常系: 少しずつ変化する場合も、残したフレームとの差がしきい値を超えたら分ける"""
+        frames = [_frame(v) for v in (100, 102, 104, 106, 108)]
+
+        merged = list(merge_duplicates(frames, threshold=4))
+
+        # 検証
+        self.assertEqual([m.count for m in merged], [3, 2])
+
+    def test_large_change_in_small_area_is_kept(self):
+        """正常系: 小さな領域でも大きく変化した場合（カーソルの移動など）は残す"""
+        moved = _frame(100)
+        moved[1, 2] = (255, 0, 0)
+
+        # 検証
+        self.assertFalse(is_duplicate(moved, _frame(100), threshold=16))
+
+    def test_max_count(self):
+        """正常系: まとめる数の上限を超えたら新しいフレームとして返す"""
+        frames = [_frame(0)] * 5
+
+        merged = list(merge_duplicates(frames, max_count=2))
+
+        # 検証
+        self.assertEqual([m.count for m in merged], [2, 2, 1])
+
+    def test_shape_change(self):
+        """正常系: 解像度が異なるフレームは同じとみなさない"""
+        self.assertFalse(is_duplicate(_frame(0, (4, 6)), _frame(0, (6, 4))))
+
+    def test_empty(self):
+        """正常系: フレームがない場合は何も返さない"""
+        self.assertEqual(list(merge_duplicates([])), [])
+        self.assertIsInstance(next(merge_duplicates([_frame(0)])), MergedFrame)
+
+
+if __name__ == "__main__":
+    unittest.main()
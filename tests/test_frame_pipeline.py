@@ -0,0 +1,122 @@
+"""
+frame_pipeline モジュールのテスト
+"""
+
+import threading
+import unittest
+
+from mov2gif.frame_pipeline import fan_out, iter_buffered
+
+
+class TestIterBuffered(unittest.TestCase):
+    """iter_buffered関数のテスト"""
+
+    def test_yields_all_items_in_order(self):
+        """正常系: すべての要素が順番どおりに取り出せる"""
+        self.assertEqual(list(iter_buffered(range(100), 4)), list(range(100)))
+
+    def test_buffer_is_bounded(self):
+        """正常系: 生産者はバッファサイズを超えて先読みしない"""
+        produced = []
+
+        def generate():
+            for i in range(50):
+                produced.append(i)
+                yield i
+
+        iterator = iter_buffered(generate(), 3)
+        next(iterator)
+        # 生産者がバッファを埋めるまで待つ
+        threading.Event().wait(0.3)
+
+        # 検証 - 消費済み1件 + バッファ3件 + put待ちの1件まで
+        self.assertLessEqual(len(produced), 5)
+        iterator.close()
+
+    def test_producer_error_is_raised(self):
+        """異常系: 生産者側の例外が消費者側で再送出される"""
+
+        def generate():
+            yield 1
+            raise IOError("decode error")
+
+        iterator = iter_buffered(generate(), 2)
+        self.assertEqual(next(iterator), 1)
+        with self.assertRaises(IOError):
+            next(iterator)
+
+    def test_early_close_stops_producer(self):
+        """正常系: 消費者が途中で終了しても生産者スレッドが残らない"""
+        iterator = iter_buffered(iter(range(1000)), 2)
+        next(iterator)
+        iterator.close()
+
+        # 検証
+        names = [t.name for t in threading.enumerate()]
+        self.assertNotIn("frame-producer", names)
+
+
+class TestFanOut(unittest.TestCase):
+    """fan_out関数のテスト"""
+
+    def test_distributes_items(self):
+        """正常系: 各消費者に自分の分の要素だけが順番どおりに渡る（Noneは渡さない）"""
+        received = [[], []]
+        consumers = [
+            lambda items, index=index: received[index].extend(items)
+            for index in range(2)
+        ]
+        items = [(i, i * 10 if i % 2 == 0 else None) for i in range(10)]
+
+        # テスト対象メソッド呼び出し
+        errors = fan_out(items, consumers, 2)
+
+        # 検証
+        self.assertEqual(errors, [None, None])
+        self.assertEqual(received[0], list(range(10)))
+        self.assertEqual(received[1], [0, 20, 40, 60, 80])
+
+    def test_consumer_error_does_not_stop_others(self):
+        """異常系: 失敗した消費者の例外を返し、他の消費者には最後まで渡す"""
+        received = []
+
+        def failing(items):
+            next(items)
+            raise IOError("write error")
+
+        # テスト対象メソッド呼び出し（バッファより十分多い要素）
+        errors = fan_out([(i, i) for i in range(100)], [failing, received.extend], 1)
+
+        # 検証
+        self.assertIsInstance(errors[0], IOError)
+        self.assertIsNone(errors[1])
+        self.assertEqual(received, list(range(100)))
+
+    def test_producer_error_is_raised(self):
+        """異常系: 生産者側の例外を各消費者にも送出させ、終了を待ってから再送出する"""
+        seen = []
+
+        def consumer(items):
+            try:
+                for _ in items:
+                    pass
+            except IOError as e:
+                seen.append(e)
+                raise
+
+        def generate():
+            yield (1, 1)
+            raise IOError("decode error")
+
+        # テスト対象メソッド呼び出し
+        with self.assertRaises(IOError):
+            fan_out(generate(), [consumer, consumer], 2)
+
+        # 検証
+        self.assertEqual(len(seen), 2)
+        names = [t.name for t in threading.enumerate()]
+        self.assertFalse(any(name.startswith("frame-consumer") for name in names))
+
+
+if __name__ == "__main__":
+    unittest.main()
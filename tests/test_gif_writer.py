@@ -0,0 +1,143 @@
+"""
+gif_writer モジュールのテスト
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+from mov2gif.gif_writer import GifWriter, remove_temp_files
+
+
+class TestGifWriter(unittest.TestCase):
+    """GifWriterクラスのテスト"""
+
+    def setUp(self):
+        """テスト実行前の準備"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_path = str(Path(self.temp_dir.name) / "out.gif")
+        rng = np.random.default_rng(0)
+        self.palette = rng.integers(0, 256, (256, 3), dtype=np.uint8)
+        self.frames = [rng.integers(0, 256, (40, 50), dtype=np.uint8) for _ in range(3)]
+
+    def tearDown(self):
+        """テスト実行後のクリーンアップ"""
+        self.temp_dir.cleanup()
+
+    def test_write_frames_local_palette(self):
+        """正常系: ローカルカラーテーブルのフレームが正しく復元できる"""
+        with GifWriter(self.output_path, (50, 40)) as writer:
+            for frame in self.frames:
+                writer.write_frame(frame, self.palette, 1000.0 / 15)
+
+        # 検証
+        with Image.open(self.output_path) as gif:
+            self.assertEqual(gif.n_frames, 3)
+            for frame, decoded in zip(self.frames, ImageSequence.Iterator(gif)):
+                rgb = np.asarray(decoded.convert("RGB"))
+                np.testing.assert_array_equal(rgb, self.palette[frame])
+
+    def test_write_frames_global_palette(self):
+        """正常系: グローバルカラーテーブルのみでも書き出せる"""
+        with GifWriter(self.output_path, (50, 40), global_palette=self.palette) as w:
+            w.write_frame(self.frames[0], duration_ms=100)
+
+        # 検証
+        with Image.open(self.output_path) as gif:
+            rgb = np.asarray(gif.convert("RGB"))
+            np.testing.assert_array_equal(rgb, self.palette[self.frames[0]])
+
+    def test_delay_rounding_is_carried_over(self):
+        """正常系: センチ秒への丸め誤差が累積しない"""
+        writer = GifWriter(self.output_path, (1, 1))
+        delays = [writer._delay_cs(1000.0 / 15) for _ in range(15)]
+
+        # 検証 - 15fpsで15フレームの合計がちょうど1秒になること
+        self.assertEqual(sum(delays), 100)
+        self.assertTrue(all(d in (6, 7) for d in delays))
+
+    def test_append_segments(self):
+        """正常系: 区間ごとに書き出したフレームを連結すると一括で書き出した場合と一致する"""
+        duration_ms = 1000.0 / 15
+        with GifWriter(self.output_path, (50, 40)) as writer:
+            for frame in self.frames:
+                writer.write_frame(frame, self.palette, duration_ms)
+        expected = Path(self.output_path).read_bytes()
+
+        segment_path = str(Path(self.temp_dir.name) / "segment.part")
+        with GifWriter(self.output_path, (50, 40)) as writer:
+            writer.write_frame(self.frames[0], self.palette, duration_ms)
+            with GifWriter(
+                segment_path, (50, 40), frames_only=True, start_ms=duration_ms
+            ) as segment:
+                for frame in self.frames[1:]:
+                    segment.write_frame(frame, self.palette, duration_ms)
+            writer.append_frames(segment_path, segment.frame_count)
+
+        # 検証 - 遅延時間の丸めも含めてバイト単位で一致すること
+        self.assertEqual(writer.frame_count, 3)
+        self.assertEqual(Path(self.output_path).read_bytes(), expected)
+
+    def test_atomic_write(self):
+        """正常系: 書き出し中は出力先を変更せず、途中で中断した場合は一時ファイルも残さない"""
+        Path(self.output_path).write_bytes(b"previous")
+
+        with self.assertRaises(RuntimeError):
+            with GifWriter(self.output_path, (50, 40)) as writer:
+                writer.write_frame(self.frames[0], self.palette)
+                raise RuntimeError("interrupted")
+
+        # 検証 - 前回の出力が残り、一時ファイルは削除されていること
+        self.assertEqual(Path(self.output_path).read_bytes(), b"previous")
+        self.assertEqual(os.listdir(self.temp_dir.name), ["out.gif"])
+
+        with GifWriter(self.output_path, (50, 40)) as writer:
+            writer.write_frame(self.frames[0], self.palette)
+            self.assertEqual(Path(self.output_path).read_bytes(), b"previous")
+        with Image.open(self.output_path) as gif:
+            self.assertEqual(gif.n_frames, 1)
+        self.assertEqual(os.listdir(self.temp_dir.name), ["out.gif"])
+
+    def test_remove_temp_files(self):
+        """正常系: 出力先への書きかけの一時ファイルだけを削除する"""
+        directory = Path(self.temp_dir.name)
+        (directory / ".out.gif.0123abcd.tmp").write_bytes(b"GIF89a")
+        (directory / ".other.gif.0123abcd.tmp").write_bytes(b"GIF89a")
+        Path(self.output_path).write_bytes(b"GIF89a")
+
+        self.assertEqual(remove_temp_files(self.output_path), 1)
+        self.assertEqual(
+            sorted(os.listdir(directory)), [".other.gif.0123abcd.tmp", "out.gif"]
+        )
+
+    def test_reserved_colors_fit_in_color_table(self):
+        """正常系: 予約したインデックス（透過色）もカラーテーブルに収まる大きさにする"""
+        palette = np.zeros((128, 3), dtype=np.uint8)
+        frame = np.full((4, 4), 128, dtype=np.uint8)
+
+        # テスト対象メソッド呼び出し
+        with GifWriter(
+            self.output_path, (4, 4), global_palette=palette, reserved_colors=1
+        ) as writer:
+            writer.write_frame(frame, duration_ms=100, transparency=128)
+            writer.write_frame(frame, palette, duration_ms=100, transparency=128)
+
+        # 検証 - グローバル・ローカルのカラーテーブルがともに256色分であること
+        data = Path(self.output_path).read_bytes()
+        self.assertEqual(data[10] & 0x87, 0x87)
+        local_flags = data.rindex(b",\x00\x00\x00\x00\x04\x00\x04\x00") + 9
+        self.assertEqual(data[local_flags], 0x87)
+
+    def test_write_frame_without_palette(self):
+        """異常系: カラーテーブルが存在しない場合はエラー"""
+        with GifWriter(self.output_path, (50, 40)) as writer:
+            with self.assertRaises(ValueError):
+                writer.write_frame(self.frames[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
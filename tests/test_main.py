@@ -2,14 +2,17 @@
 main モジュールのテスト
 """
 
+import tempfile
 import unittest
+from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 from mov2gif.main import main
 from mov2gif.app_logger import AppLogger
+from mov2gif.batch_journal import BatchJournal
 from mov2gif.config_reader import ConfigReader
 from mov2gif.file_selector import FileSelector
-from mov2gif.movie_converter import MovieConverter
+from mov2gif.movie_converter import ConversionResult, MovieConverter
 
 
 class TestMain(unittest.TestCase):
@@ -33,6 +36,8 @@ class TestMain(unittest.TestCase):
 
         mock_config_reader = MagicMock(spec=ConfigReader)
         mock_config_reader_cls.return_value = mock_config_reader
+        mock_config_reader.read_journal_path.return_value = None
+        mock_config_reader.read_manifest_path.return_value = None
         mock_config_reader.read_config.return_value = [
             "/path/to/movie1.mov",
             "/path/to/movie2.mov",
@@ -53,7 +58,7 @@ class TestMain(unittest.TestCase):
         mock_movie_converter.batch_convert.assert_called_once_with(
             ["/path/to/movie1.mov", "/path/to/movie2.mov"]
         )
-        mock_logger.info.assert_any_call("mov2gif - MOV動画をGIFに変換")
+        mock_logger.info.assert_any_call("mov2gif - MOV動画もしくはMP4をGIFに変換")
         mock_logger.info.assert_any_call(
             "設定ファイルから2個のファイルパスを読み込みました"
         )
@@ -78,6 +83,8 @@ class TestMain(unittest.TestCase):
 
         mock_config_reader = MagicMock(spec=ConfigReader)
         mock_config_reader_cls.return_value = mock_config_reader
+        mock_config_reader.read_journal_path.return_value = None
+        mock_config_reader.read_manifest_path.return_value = None
         mock_config_reader.read_config.return_value = []  # 空のリストを返す
 
         mock_file_selector = MagicMock(spec=FileSelector)
@@ -86,7 +93,7 @@ class TestMain(unittest.TestCase):
 
         mock_movie_converter = MagicMock(spec=MovieConverter)
         mock_movie_converter_cls.return_value = mock_movie_converter
-        mock_movie_converter.mov_to_gif.return_value = True
+        mock_movie_converter.convert_to_gif.return_value = True
 
         # テスト対象メソッド呼び出し
         main()
@@ -94,7 +101,7 @@ class TestMain(unittest.TestCase):
         # 検証
         mock_config_reader.read_config.assert_called_once()
         mock_file_selector.show_dialog.assert_called_once()
-        mock_movie_converter.mov_to_gif.assert_called_once_with(
+        mock_movie_converter.convert_to_gif.assert_called_once_with(
             "/path/to/selected/movie.mov"
         )
         mock_logger.info.assert_any_call(
@@ -122,6 +129,8 @@ class TestMain(unittest.TestCase):
 
         mock_config_reader = MagicMock(spec=ConfigReader)
         mock_config_reader_cls.return_value = mock_config_reader
+        mock_config_reader.read_journal_path.return_value = None
+        mock_config_reader.read_manifest_path.return_value = None
         mock_config_reader.read_config.return_value = []
 
         mock_file_selector = MagicMock(spec=FileSelector)
@@ -137,10 +146,113 @@ class TestMain(unittest.TestCase):
         # 検証 - 変換メソッドは呼ばれないこと
         mock_config_reader.read_config.assert_called_once()
         mock_file_selector.show_dialog.assert_called_once()
-        mock_movie_converter.mov_to_gif.assert_not_called()
+        mock_movie_converter.convert_to_gif.assert_not_called()
         mock_logger.info.assert_any_call("ファイル選択がキャンセルされました")
         mock_logger.info.assert_any_call("変換処理を完了しました")
 
+    @patch("mov2gif.main.AppLogger")
+    @patch("mov2gif.main.ConfigReader")
+    @patch("mov2gif.main.FileSelector")
+    @patch("mov2gif.main.MovieConverter")
+    def test_main_resumes_journal(
+        self,
+        mock_movie_converter_cls,
+        mock_file_selector_cls,
+        mock_config_reader_cls,
+        mock_app_logger_cls,
+    ):
+        """正常系: BATCH_JOURNALが設定されている場合は前回の記録から再開する"""
+        mock_logger = MagicMock(spec=AppLogger)
+        mock_app_logger_cls.return_value = mock_logger
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        journal_path = str(Path(temp_dir.name) / "journal.jsonl")
+        with BatchJournal(journal_path) as journal:
+            journal.start("/path/to/movie1.mov", "/path/to/movie1.gif", "key")
+
+        mock_config_reader = MagicMock(spec=ConfigReader)
+        mock_config_reader_cls.return_value = mock_config_reader
+        mock_config_reader.read_journal_path.return_value = journal_path
+        mock_config_reader.read_manifest_path.return_value = None
+        mock_config_reader.read_config.return_value = ["/path/to/movie1.mov"]
+
+        def fake_batch_convert(file_paths):
+            # 変換し直したジョブの結果をジャーナルに記録する
+            journal = mock_movie_converter_cls.call_args.kwargs["journal"]
+            journal.finish("/path/to/movie1.mov", "/path/to/movie1.gif", "key", False)
+            return {"/path/to/movie1.mov": False}
+
+        mock_movie_converter_cls.return_value.batch_convert.side_effect = (
+            fake_batch_convert
+        )
+
+        # テスト対象メソッド呼び出し
+        with patch.object(
+            BatchJournal, "close", autospec=True, side_effect=BatchJournal.close
+        ) as mock_close:
+            main()
+
+        # 検証 - 中断されたジョブが報告され、ジャーナルが変換に渡されて閉じられること
+        mock_logger.warning.assert_any_call(
+            "前回中断されたジョブが1件あります（変換し直します）"
+        )
+        journal = mock_movie_converter_cls.call_args.kwargs["journal"]
+        self.assertIsInstance(journal, BatchJournal)
+        self.assertEqual(journal.path, journal_path)
+        mock_close.assert_called_once_with(journal)
+        # 再開した記録に続けて書き込まれ、中断されたジョブが残っていないこと
+        with BatchJournal(journal_path, resume=True) as reopened:
+            self.assertEqual(reopened.interrupted(), [])
+
+    @patch("mov2gif.main.AppLogger")
+    @patch("mov2gif.main.ConfigReader")
+    @patch("mov2gif.main.FileSelector")
+    @patch("mov2gif.main.MovieConverter")
+    def test_main_with_manifest(
+        self,
+        mock_movie_converter_cls,
+        mock_file_selector_cls,
+        mock_config_reader_cls,
+        mock_app_logger_cls,
+    ):
+        """正常系: MANIFESTが設定されている場合はMOV_FILE_PATHSの代わりにマニフェストのジョブを逐次変換する"""
+        mock_logger = MagicMock(spec=AppLogger)
+        mock_app_logger_cls.return_value = mock_logger
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        manifest_path = Path(temp_dir.name) / "jobs.jsonl"
+        manifest_path.write_text(
+            '{"path": "movie1.mov", "width": 320}\n{"path": "movie2.mov", "fps": 0}\n',
+            encoding="utf-8",
+        )
+
+        mock_config_reader = MagicMock(spec=ConfigReader)
+        mock_config_reader_cls.return_value = mock_config_reader
+        mock_config_reader.read_journal_path.return_value = None
+        mock_config_reader.read_manifest_path.return_value = str(manifest_path)
+
+        def fake_convert_iter(jobs):
+            # 出力先が未指定のジョブは、MovieConverterと同じく入力ファイルと同じ場所に保存する
+            for input_path, output_path, options in jobs:
+                if output_path is None:
+                    output_path = str(Path(input_path).with_suffix(".gif"))
+                yield ConversionResult(input_path, output_path, True)
+
+        mock_movie_converter = mock_movie_converter_cls.return_value
+        mock_movie_converter.convert_iter.side_effect = fake_convert_iter
+
+        # テスト対象メソッド呼び出し
+        main()
+
+        # 検証 - MOV_FILE_PATHSは読まず、不正な2行目は読み飛ばすこと
+        mock_config_reader.read_config.assert_not_called()
+        mock_movie_converter.batch_convert.assert_not_called()
+        movie1 = str(Path(temp_dir.name) / "movie1.mov")
+        movie1_gif = str(Path(temp_dir.name) / "movie1.gif")
+        mock_logger.info.assert_any_call(f"✅ 変換成功: {movie1} -> {movie1_gif}")
+        mock_logger.info.assert_any_call("変換完了: 1/1 成功")
+        mock_logger.error.assert_any_call("マニフェストの不正な1行を読み飛ばしました")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,142 @@
+"""
+manifest モジュールのテスト
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from mov2gif.app_logger import AppLogger
+from mov2gif.manifest import ManifestJob, ManifestReader
+
+
+class TestManifestReader(unittest.TestCase):
+    """ManifestReaderクラスのテスト"""
+
+    def setUp(self):
+        """テスト実行前の準備"""
+        self.mock_logger = MagicMock(spec=AppLogger)
+        self.reader = ManifestReader(self.mock_logger)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        """テスト実行後のクリーンアップ"""
+        self.temp_dir.cleanup()
+
+    def test_read_json_lines(self):
+        """正常系: JSON Linesの各行を、マニフェストのディレクトリを基準にしたパスと変換オプションのジョブにする"""
+        manifest_path = self.root / "jobs.jsonl"
+        lines = [
+            {"path": "a.mov", "output": "out/a.gif", "fps": 10, "width": 320},
+            {"path": "/videos/b.mp4", "start": "0:05", "duration": 2, "colors": 64},
+        ]
+        manifest_path.write_text(
+            "\n".join(json.dumps(line) for line in lines) + "\n\n", encoding="utf-8"
+        )
+
+        # テスト対象メソッド呼び出し
+        jobs = list(self.reader.read_jobs(str(manifest_path)))
+
+        # 検証
+        self.assertEqual(
+            jobs,
+            [
+                ManifestJob(
+                    str(self.root / "a.mov"),
+                    str(self.root / "out" / "a.gif"),
+                    {"fps": 10, "width": 320},
+                ),
+                ManifestJob(
+                    "/videos/b.mp4",
+                    None,
+                    {"start": "0:05", "duration": 2, "colors": 64},
+                ),
+            ],
+        )
+        self.assertEqual(self.reader.errors, 0)
+
+    def test_read_csv(self):
+        """正常系: CSVのセルを変換オプションの型に変換し、空のセルは未指定とする"""
+        manifest_path = self.root / "jobs.csv"
+        manifest_path.write_text(
+            "path,output,fps,width,optimize,end\n"
+            "a.mov,,12.5,480,yes,3\n"
+            '"b, c.mov",b.gif,,,false,\n',
+            encoding="utf-8",
+        )
+
+        jobs = list(self.reader.read_jobs(str(manifest_path)))
+
+        self.assertEqual(
+            jobs,
+            [
+                ManifestJob(
+                    str(self.root / "a.mov"),
+                    None,
+                    {"fps": 12.5, "width": 480, "optimize": True, "end": "3"},
+                ),
+                ManifestJob(
+                    str(self.root / "b, c.mov"),
+                    str(self.root / "b.gif"),
+                    {"optimize": False},
+                ),
+            ],
+        )
+
+    def test_invalid_lines_are_skipped(self):
+        """異常系: 不正な行は行番号付きのエラーログを出して読み飛ばし、残りの行は読み込む"""
+        manifest_path = self.root / "jobs.jsonl"
+        manifest_path.write_text(
+            '{"path": "a.mov"}\n'
+            "not json\n"
+            '{"output": "b.gif"}\n'
+            '{"path": "c.mov", "colours": 16}\n'
+            '{"path": "d.mov", "end": 3, "duration": 2}\n'
+            '{"path": "e.mov", "quality": 50}\n'
+            '{"path": "f.mov"',
+            encoding="utf-8",
+        )
+
+        jobs = list(self.reader.read_jobs(str(manifest_path)))
+
+        self.assertEqual(
+            [job.input_path for job in jobs],
+            [str(self.root / "a.mov"), str(self.root / "e.mov")],
+        )
+        self.assertEqual(self.reader.errors, 5)
+        self.mock_logger.error.assert_any_call(
+            f"マニフェストの4行目が不正です: {manifest_path}: 未知の変換オプションです: colours"
+        )
+        self.mock_logger.error.assert_any_call(
+            f"マニフェストの7行目が不正です: {manifest_path}: JSONのオブジェクトとして解釈できません"
+        )
+
+    def test_reads_lazily(self):
+        """正常系: 読み進めた分だけ検証し、途中で閉じた場合もファイルを閉じる"""
+        manifest_path = self.root / "jobs.jsonl"
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            for index in range(10000):
+                f.write(json.dumps({"path": f"{index}.mov"}) + "\n")
+            f.write("not json\n")
+
+        jobs = self.reader.read_jobs(str(manifest_path))
+        first = next(jobs)
+        jobs.close()
+
+        self.assertEqual(first.input_path, str(self.root / "0.mov"))
+        # 最終行の不正まではまだ読んでいない
+        self.mock_logger.error.assert_not_called()
+
+    def test_unsupported_format(self):
+        """異常系: 対応していない拡張子や存在しないファイルは、読み始める前に例外を送出する"""
+        with self.assertRaises(ValueError):
+            self.reader.read_jobs(str(self.root / "jobs.toml"))
+        with self.assertRaises(OSError):
+            self.reader.read_jobs(str(self.root / "missing.csv"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+media_probe モジュールのテスト
+"""
+
+import os
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import imageio_ffmpeg
+import numpy as np
+
+from mov2gif.media_probe import clear_probe_cache, parse_mp4, probe_media
+from tests.test_decoder import write_test_video
+
+
+def _remux(source: str, path: str, *args: str):
+    """ffmpegで再エンコードせずに別の形式・メタデータで書き出す"""
+    subprocess.run(
+        [imageio_ffmpeg.get_ffmpeg_exe(), "-v", "error", "-y", *args]
+        + ["-i", source, "-c", "copy", path],
+        check=True,
+    )
+
+
+class TestMediaProbe(unittest.TestCase):
+    """parse_mp4・probe_mediaのテスト"""
+
+    @classmethod
+    def setUpClass(cls):
+        """テスト用の動画を作成"""
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.root = Path(cls.temp_dir.name)
+        cls.video_path = str(cls.root / "test.mp4")
+        write_test_video(cls.video_path, size=(64, 48), fps=30, frame_count=45)
+
+    @classmethod
+    def tearDownClass(cls):
+        """テスト実行後のクリーンアップ"""
+        cls.temp_dir.cleanup()
+
+    def setUp(self):
+        clear_probe_cache()
+
+    def test_parse_mp4(self):
+        """正常系: moovアトムから解像度・フレームレート・長さ・コーデックを取得できる"""
+        info = parse_mp4(self.video_path)
+
+        # 検証
+        self.assertIsNotNone(info)
+        self.assertEqual(info.size, (64, 48))
+        self.assertAlmostEqual(info.fps, 30.0)
+        self.assertAlmostEqual(info.duration, 1.5)
+        self.assertEqual(info.codec, "h264")
+        self.assertEqual(info.frame_count, 45)
+
+    def test_parse_mov_and_faststart(self):
+        """正常系: MOV形式やmoovが先頭にあるファイルも同じ結果になる"""
+        mov_path = str(self.root / "test.mov")
+        faststart_path = str(self.root / "faststart.mp4")
+        _remux(self.video_path, mov_path)
+        subprocess.run(
+            [imageio_ffmpeg.get_ffmpeg_exe(), "-v", "error", "-y", "-i"]
+            + [self.video_path, "-c", "copy", "-movflags", "+faststart"]
+            + [faststart_path],
+            check=True,
+        )
+
+        expected = parse_mp4(self.video_path)
+        self.assertEqual(parse_mp4(mov_path), expected)
+        self.assertEqual(parse_mp4(faststart_path), expected)
+
+    def test_parse_rotated(self):
+        """正常系: 90度回転して表示する動画は縦横を入れ替える（ffmpegのデコード結果と同じ）"""
+        path = str(self.root / "rotated.mp4")
+        _remux(self.video_path, path, "-display_rotation", "90")
+
+        self.assertEqual(parse_mp4(path).size, (48, 64))
+
+    def test_unsupported_files(self):
+        """正常系: MOV/MP4以外や、フラグメント化されたファイルはNone（ffmpegで取得する）"""
+        fragmented = str(self.root / "fragmented.mp4")
+        subprocess.run(
+            [imageio_ffmpeg.get_ffmpeg_exe(), "-v", "error", "-y", "-i"]
+            + [self.video_path, "-c", "copy"]
+            + ["-movflags", "frag_keyframe+empty_moov", fragmented],
+            check=True,
+        )
+        dummy = self.root / "dummy.mov"
+        dummy.write_bytes(b"dummy content")
+
+        self.assertIsNone(parse_mp4(fragmented))
+        self.assertIsNone(parse_mp4(str(dummy)))
+
+    def test_probe_media_falls_back_to_ffmpeg(self):
+        """正常系: 解析できない形式はffmpegで取得する"""
+        path = str(self.root / "test.avi")
+        writer = imageio_ffmpeg.write_frames(
+            path, (64, 48), fps=25, codec="mpeg4", macro_block_size=1
+        )
+        writer.send(None)
+        for _ in range(25):
+            writer.send(np.zeros((48, 64, 3), dtype=np.uint8))
+        writer.close()
+
+        info = probe_media(path)
+
+        self.assertEqual(info.size, (64, 48))
+        self.assertAlmostEqual(info.fps, 25.0)
+        self.assertEqual(info.codec, "mpeg4")
+
+    def test_probe_media_cache(self):
+        """正常系: 同じファイルはキャッシュから返し、更新されたら取得し直す"""
+        path = str(self.root / "cached.mp4")
+        write_test_video(path, frame_count=30)
+
+        first = probe_media(path)
+        with patch("mov2gif.media_probe.parse_mp4") as mock_parse:
+            self.assertIs(probe_media(path), first)
+            mock_parse.assert_not_called()
+
+        write_test_video(path, frame_count=60)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertEqual(probe_media(path).frame_count, 60)
+
+    def test_probe_media_invalid_file(self):
+        """異常系: 動画ではないファイルはエラー"""
+        path = self.root / "invalid.mov"
+        path.write_bytes(b"dummy content")
+
+        with self.assertRaises(Exception):
+            probe_media(str(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
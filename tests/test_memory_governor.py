@@ -0,0 +1,70 @@
+"""
+memory_governor モジュールのテスト
+"""
+
+import unittest
+
+from mov2gif.conversion_options import resolve_options
+from mov2gif.memory_governor import (
+    FRAME_BYTES_PER_PIXEL,
+    WORKING_SET_BASE_BYTES,
+    MemoryGovernor,
+    estimate_working_set,
+)
+
+UHD = (3840, 2160)
+
+
+class TestEstimateWorkingSet(unittest.TestCase):
+    """estimate_working_setのテスト"""
+
+    def test_scales_with_resolution(self):
+        """正常系: 入力・出力の解像度が大きいほど見積もりが大きくなる"""
+        small = estimate_working_set((640, 360), resolve_options(), 8)
+        large = estimate_working_set(UHD, resolve_options(), 8)
+        downscaled = estimate_working_set(UHD, resolve_options({"width": 480}), 8)
+
+        # 検証 - 縮小して出力すると作業用配列の分だけ小さくなる（デコーダーの分は残る）
+        self.assertGreater(small, WORKING_SET_BASE_BYTES)
+        self.assertGreater(large, downscaled)
+        self.assertGreater(downscaled, small)
+
+    def test_frame_buffer_and_processes(self):
+        """正常系: 先読み1フレームごとに出力1フレーム分増え、プロセス数倍になる"""
+        options = resolve_options()
+        single = estimate_working_set(UHD, options, 1)
+
+        self.assertEqual(
+            estimate_working_set(UHD, options, 8) - single,
+            7 * FRAME_BYTES_PER_PIXEL * UHD[0] * UHD[1],
+        )
+        self.assertEqual(estimate_working_set(UHD, options, 1, processes=3), single * 3)
+        self.assertEqual(estimate_working_set(UHD, options, 1, processes=0), single)
+
+
+class TestMemoryGovernor(unittest.TestCase):
+    """MemoryGovernorのテスト"""
+
+    def test_admits_within_budget(self):
+        """正常系: 実行中の見積もりとの合計が予算に収まる間だけ開始させる"""
+        governor = MemoryGovernor(100)
+        governor.acquire(60)
+
+        self.assertTrue(governor.admits(40))
+        self.assertFalse(governor.admits(41))
+
+        governor.release(60)
+        self.assertEqual((governor.jobs, governor.in_use), (0, 0))
+        self.assertTrue(governor.admits(100))
+
+    def test_oversized_job_runs_alone(self):
+        """正常系: 予算を超えるジョブは実行中のジョブがない場合だけ開始させ、その間は他を開始させない"""
+        governor = MemoryGovernor(100)
+
+        self.assertTrue(governor.admits(250))
+        governor.acquire(250)
+        self.assertFalse(governor.admits(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
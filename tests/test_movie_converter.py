@@ -2,22 +2,136 @@
 movie_converter モジュールのテスト
 """
 
+import json
+import os
+import signal
 import tempfile
+import time
 from pathlib import Path
+import imageio_ffmpeg
+import numpy as np
 import pytest
+from PIL import Image
 from unittest.mock import patch, MagicMock
 
-from mov2gif.movie_converter import MovieConverter
+from mov2gif.movie_converter import MovieConverter, _process_pool
 from mov2gif.app_logger import AppLogger
+from mov2gif.batch_journal import BatchJournal
+from mov2gif.conversion_cache import ConversionCache
+from mov2gif.decoder import FrameDecoder, VideoInfo, sample_frames
+from mov2gif.media_probe import probe_media
+from mov2gif.memory_governor import (
+    LOW_MEMORY_FRAME_BUFFER,
+    MemoryGovernor,
+    estimate_working_set,
+)
+from mov2gif.quantizer import build_palette, color_histogram
+from mov2gif.palette_cache import PaletteCache
+from mov2gif.profiler import profile_path
+from mov2gif.renditions import Rendition
+from mov2gif.segments import plan_segments
+from tests.test_decoder import write_test_video
+
+
+def _mock_decoder(frame_count=3):
+    """テスト用のFrameDecoderモック（8x6のフレームを返す）"""
+    mock_decoder = MagicMock()
+    mock_decoder.__enter__.return_value = [
+        np.full((6, 8, 3), i * 40, dtype=np.uint8) for i in range(frame_count)
+    ]
+    return mock_decoder
+
+
+def _write_noise_video(path, size=(96, 64), frame_count=30):
+    """縮小・減色でサイズが大きく変わる、ノイズの多いテスト用の動画を書き出す"""
+    rng = np.random.default_rng(0)
+    writer = imageio_ffmpeg.write_frames(path, size, fps=30, macro_block_size=1)
+    writer.send(None)
+    for _ in range(frame_count):
+        writer.send(rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8))
+    writer.close()
+
+
+def _patch_decoding(test):
+    """probe_video・FrameDecoder・sample_framesをモックに差し替えるデコレーター"""
+    test = patch(
+        "mov2gif.movie_converter.probe_video",
+        return_value=VideoInfo((8, 6), 30.0, 0.2),
+    )(test)
+    test = patch("mov2gif.movie_converter.FrameDecoder")(test)
+    test = patch(
+        "mov2gif.movie_converter.sample_frames",
+        return_value=[np.zeros((6, 8, 3), dtype=np.uint8)],
+    )(test)
+    return test
+
+
+def _fake_worker(input_path, *args):
+    """並列変換テスト用のワーカー関数（ファイル名にfailを含む場合は失敗）"""
+    return "fail" not in Path(input_path).name
+
+
+def _crashing_worker(input_path, *args):
+    """並列変換テスト用のワーカー関数（ファイル名にcrashを含む場合はプロセスごと終了）"""
+    if "crash" in Path(input_path).name:
+        os._exit(1)
+    return True
+
+
+def _slow_crashing_worker(input_path, *args):
+    """並列変換テスト用のワーカー関数（crashを含むファイルはすぐにプロセスごと終了し、それ以外は時間をかけて成功）"""
+    if "crash" in Path(input_path).name:
+        os._exit(1)
+    time.sleep(0.05)
+    return True
+
+
+def _crash_once_worker(input_path, options, *args):
+    """並列変換テスト用のワーカー関数（crashを含むファイルは初回だけプロセスごと終了し、
+    再実行では幅320・先読み3フレームで投入された場合だけ成功）"""
+    marker = Path(input_path).with_suffix(".crashed")
+    if "crash" in Path(input_path).name and not marker.exists():
+        marker.touch()
+        os._exit(1)
+    if options["width"] != 320 or args[4] != 3:
+        return False
+    marker.with_suffix(".gif").write_bytes(b"GIF89a")
+    return True
+
+
+def _exclusive_worker(input_path, *args):
+    """メモリ予算のテスト用のワーカー関数（他のワーカーと同時に実行された場合は失敗）"""
+    lock_path = os.path.join(os.path.dirname(input_path), "running")
+    try:
+        fd = os.open(lock_path, os.O_CREAT | os.O_EXCL)
+    except FileExistsError:
+        return False
+    os.close(fd)
+    time.sleep(0.1)
+    os.remove(lock_path)
+    return True
+
+
+def _interrupted_worker(input_path, *args):
+    """Ctrl+Cのテスト用のワーカー関数（変換中に自分のプロセスにSIGINTを送る）"""
+    os.kill(os.getpid(), signal.SIGINT)
+    time.sleep(0.05)
+    return True
+
+
+def _options_worker(input_path, options, *args):
+    """ジョブごとの変換オプションのテスト用のワーカー関数（幅が320の場合だけ成功）"""
+    return options["width"] == 320
 
 
 class TestMovieConverter:
     @pytest.fixture
-    def setup_converter():
+    def setup_converter(self):
         """テスト実行前の準備"""
         mock_logger = MagicMock(spec=AppLogger)
-        converter = MovieConverter(mock_logger)
         temp_dir = tempfile.TemporaryDirectory()
+        palette_cache = PaletteCache(str(Path(temp_dir.name) / "palettes"))
+        converter = MovieConverter(mock_logger, palette_cache=palette_cache)
         test_mov_path = str(Path(temp_dir.name) / "test.mov")
         test_gif_path = str(Path(temp_dir.name) / "test.gif")
 
@@ -30,23 +144,28 @@ class TestMovieConverter:
         # テスト実行後のクリーンアップ
         temp_dir.cleanup()
 
-    @patch("moviepy.VideoFileClip")
-    def test_mov_to_gif_success(mock_video_file_clip, setup_converter):
+    @_patch_decoding
+    def test_convert_to_gif_success(
+        self, mock_probe, mock_decoder_cls, mock_sample_frames, setup_converter
+    ):
         """正常系: 変換が成功する場合"""
         converter, mock_logger, _, test_mov_path, test_gif_path = setup_converter
 
         # モックの設定
-        mock_clip = MagicMock()
-        mock_video_file_clip.return_value = mock_clip
+        mock_decoder = _mock_decoder()
+        mock_decoder_cls.return_value = mock_decoder
 
         # テスト対象メソッド呼び出し
-        result = converter.mov_to_gif(test_mov_path, test_gif_path)
+        result = converter.convert_to_gif(test_mov_path, test_gif_path)
 
-        # 検証
+        # 検証 - デコードしたフレームがすべてGIFに書き出されること
         assert result is True
-        mock_video_file_clip.assert_called_once_with(test_mov_path)
-        mock_clip.write_gif.assert_called_once()
-        mock_clip.close.assert_called_once()
+        mock_probe.assert_called_once_with(test_mov_path)
+        mock_decoder_cls.assert_called_once_with(test_mov_path, (8, 6), 15.0)
+        mock_decoder.__exit__.assert_called_once()
+        with Image.open(test_gif_path) as gif:
+            assert gif.size == (8, 6)
+            assert gif.n_frames == 3
 
         # ロガーの確認
         mock_logger.info.assert_any_call(
@@ -54,44 +173,77 @@ class TestMovieConverter:
         )
         mock_logger.info.assert_any_call(f"変換完了: {test_gif_path}")
 
-    @patch("moviepy.VideoFileClip")
-    def test_mov_to_gif_default_output_path(mock_video_file_clip, setup_converter):
+    @pytest.mark.parametrize("optimize", [False, True])
+    @_patch_decoding
+    def test_convert_to_gif_merges_duplicate_frames(
+        self,
+        mock_probe,
+        mock_decoder_cls,
+        mock_sample_frames,
+        optimize,
+        setup_converter,
+    ):
+        """正常系: 連続する同一フレームは1フレームにまとめ、表示時間を合計する"""
+        _, mock_logger, temp_dir, test_mov_path, test_gif_path = setup_converter
+        palette_cache = PaletteCache(str(Path(temp_dir.name) / "palettes"))
+        converter = MovieConverter(
+            mock_logger,
+            palette_cache=palette_cache,
+            options={"fps": 10, "optimize": optimize},
+        )
+        mock_decoder = MagicMock()
+        mock_decoder.__enter__.return_value = [
+            np.full((6, 8, 3), value, dtype=np.uint8) for value in (0, 0, 0, 80, 0)
+        ]
+        mock_decoder_cls.return_value = mock_decoder
+
+        # テスト対象メソッド呼び出し
+        result = converter.convert_to_gif(test_mov_path, test_gif_path)
+
+        # 検証 - 3フレーム分の表示時間を持つ1フレームと、残りの2フレームになること
+        assert result is True
+        with Image.open(test_gif_path) as gif:
+            durations = []
+            for index in range(gif.n_frames):
+                gif.seek(index)
+                durations.append(gif.info["duration"])
+        assert durations == [300, 100, 100]
+
+    @_patch_decoding
+    def test_convert_to_gif_default_output_path(
+        self, mock_probe, mock_decoder_cls, mock_sample_frames, setup_converter
+    ):
         """正常系: 出力パスが指定されない場合、デフォルト値が使用される"""
         converter, _, _, test_mov_path, _ = setup_converter
 
         # モックの設定
-        mock_clip = MagicMock()
-        mock_video_file_clip.return_value = mock_clip
+        mock_decoder_cls.return_value = _mock_decoder()
 
         # テスト対象メソッド呼び出し（出力パス省略）
-        result = converter.mov_to_gif(test_mov_path)
+        result = converter.convert_to_gif(test_mov_path)
 
-        # 検証 - 拡張子がgifに変更されたパスが使用されること
-        expected_output = str(Path(test_mov_path).with_suffix(".gif"))
+        # 検証 - 拡張子がgifに変更されたパスに出力されること
+        expected_output = Path(test_mov_path).with_suffix(".gif")
         assert result is True
-        mock_clip.write_gif.assert_called_once()
+        assert expected_output.exists()
 
-        # write_gifの引数を確認
-        args, kwargs = mock_clip.write_gif.call_args
-        assert args[0] == expected_output
-
-    @patch("moviepy.VideoFileClip", side_effect=Exception("Test error"))
-    def test_mov_to_gif_failure(mock_video_file_clip, setup_converter):
+    @patch("mov2gif.movie_converter.probe_video", side_effect=IOError("Test error"))
+    def test_convert_to_gif_failure(self, mock_probe, setup_converter):
         """異常系: 変換中にエラーが発生する場合"""
         converter, mock_logger, _, test_mov_path, test_gif_path = setup_converter
 
         # テスト対象メソッド呼び出し
-        result = converter.mov_to_gif(test_mov_path, test_gif_path)
+        result = converter.convert_to_gif(test_mov_path, test_gif_path)
 
         # 検証 - 失敗時はFalseが返されること
         assert result is False
-        mock_video_file_clip.assert_called_once_with(test_mov_path)
+        mock_probe.assert_called_once_with(test_mov_path)
 
         # エラーログが出力されていることを確認
         mock_logger.error.assert_called_once()
 
-    @patch("mov2gif.movie_converter.MovieConverter.mov_to_gif")
-    def test_batch_convert_all_success(mock_convert, setup_converter):
+    @patch("mov2gif.movie_converter.MovieConverter.convert_to_gif")
+    def test_batch_convert_all_success(self, mock_convert, setup_converter):
         """正常系: すべてのファイルが正常に変換される場合"""
         converter, mock_logger, temp_dir, test_mov_path, _ = setup_converter
 
@@ -119,8 +271,8 @@ class TestMovieConverter:
             f"{len(file_paths)}個のファイルの変換を開始します"
         )
 
-    @patch("mov2gif.movie_converter.MovieConverter.mov_to_gif")
-    def test_batch_convert_partial_failure(mock_convert, setup_converter):
+    @patch("mov2gif.movie_converter.MovieConverter.convert_to_gif")
+    def test_batch_convert_partial_failure(self, mock_convert, setup_converter):
         """異常系: 一部のファイルの変換が失敗する場合"""
         converter, mock_logger, temp_dir, test_mov_path, _ = setup_converter
 
@@ -150,7 +302,7 @@ class TestMovieConverter:
             f"変換完了: {success_count}/{len(file_paths)} 成功"
         )
 
-    def test_batch_convert_empty_list(setup_converter):
+    def test_batch_convert_empty_list(self, setup_converter):
         """正常系: 空のリストが渡された場合"""
         converter, mock_logger, _, _, _ = setup_converter
 
@@ -164,3 +316,1034 @@ class TestMovieConverter:
         mock_logger.warning.assert_called_once_with(
             "変換対象ファイルが指定されていません"
         )
+
+    @patch("mov2gif.movie_converter._convert_in_worker", _fake_worker)
+    def test_batch_convert_parallel(self, setup_converter):
+        """正常系: 並列変換でも入力順の結果辞書が返される"""
+        converter, mock_logger, temp_dir, _, _ = setup_converter
+
+        file_paths = [
+            str(Path(temp_dir.name) / "a.mov"),
+            str(Path(temp_dir.name) / "b_fail.mov"),
+            str(Path(temp_dir.name) / "c.mov"),
+        ]
+
+        # テスト対象メソッド呼び出し
+        results = converter.batch_convert(file_paths, max_workers=2)
+
+        # 検証
+        assert list(results.keys()) == file_paths
+        assert results == {
+            file_paths[0]: True,
+            file_paths[1]: False,
+            file_paths[2]: True,
+        }
+        mock_logger.info.assert_any_call("変換完了: 2/3 成功")
+
+    @patch("mov2gif.movie_converter._convert_in_worker", _crashing_worker)
+    def test_batch_convert_parallel_worker_crash(self, setup_converter):
+        """異常系: ワーカープロセスが異常終了しても他のファイルは変換される"""
+        converter, mock_logger, temp_dir, _, _ = setup_converter
+
+        file_paths = [
+            str(Path(temp_dir.name) / "a.mov"),
+            str(Path(temp_dir.name) / "crash.mov"),
+            str(Path(temp_dir.name) / "c.mov"),
+            str(Path(temp_dir.name) / "d.mov"),
+        ]
+
+        # テスト対象メソッド呼び出し
+        results = converter.batch_convert(file_paths, max_workers=2)
+
+        # 検証 - 異常終了したファイルのみ失敗扱い
+        assert results[file_paths[1]] is False
+        for path in (file_paths[0], file_paths[2], file_paths[3]):
+            assert results[path] is True
+
+    @patch("mov2gif.movie_converter._convert_in_worker", _slow_crashing_worker)
+    def test_batch_convert_parallel_rebuilds_pool_after_crash(self, setup_converter):
+        """異常系: ワーカープロセスが異常終了した後の残りのファイルは、作り直したプールで変換される"""
+        converter, _, temp_dir, _, _ = setup_converter
+        crash_path = Path(temp_dir.name) / "crash.mov"
+        # 最初に投入されるよう、異常終了するファイルを最も大きくする
+        crash_path.write_bytes(b"0" * 1000)
+        file_paths = [str(crash_path)]
+        for index in range(9):
+            path = Path(temp_dir.name) / f"{index}.mov"
+            path.write_bytes(b"0")
+            file_paths.append(str(path))
+
+        # テスト対象メソッド呼び出し
+        with patch.object(
+            MovieConverter,
+            "_convert_isolated",
+            autospec=True,
+            side_effect=MovieConverter._convert_isolated,
+        ) as mock_isolated:
+            results = converter.batch_convert(file_paths, max_workers=2)
+
+        # 検証 - 個別に再実行するのは壊れたプールで失敗したファイル（未完了の上限の4個まで）だけ
+        assert results == {path: "crash" not in path for path in file_paths}
+        assert 1 <= mock_isolated.call_count <= 4
+        isolated = [call.args[1][0] for call in mock_isolated.call_args_list]
+        assert str(crash_path) in isolated
+
+    @pytest.mark.parametrize("batch", [False, True])
+    @patch("mov2gif.movie_converter._convert_in_worker", _crash_once_worker)
+    def test_parallel_crash_rerun_keeps_job_arguments(self, batch, setup_converter):
+        """異常系: 異常終了で再実行するジョブは、投入したときと同じ変換オプション・先読みフレーム数で変換し、再開をジャーナルに記録する"""
+        _, mock_logger, temp_dir, _, _ = setup_converter
+        journal_path = str(Path(temp_dir.name) / "journal.jsonl")
+        paths = []
+        for name in ["crash.mov", "a.mov"]:
+            path = Path(temp_dir.name) / name
+            path.write_bytes(name.encode())
+            paths.append(str(path))
+
+        # テスト対象メソッド呼び出し
+        with BatchJournal(journal_path) as journal:
+            if batch:
+                converter = MovieConverter(
+                    mock_logger,
+                    options={"width": 320},
+                    frame_buffer=3,
+                    journal=journal,
+                )
+                results = converter.batch_convert(paths, max_workers=2)
+            else:
+                converter = MovieConverter(mock_logger, frame_buffer=3, journal=journal)
+                jobs = [(path, None, {"width": 320}) for path in paths]
+                results = {
+                    r.input_path: r.success
+                    for r in converter.convert_iter(iter(jobs), max_workers=2)
+                }
+
+        # 検証
+        assert results == {path: True for path in paths}
+        with open(journal_path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        states = [r["state"] for r in records if r["input_path"] == paths[0]]
+        assert states == ["started", "started", "done"]
+
+    def test_order_by_cost(self, setup_converter):
+        """正常系: ファイルサイズの大きい順に並べ替えられる"""
+        converter, _, temp_dir, _, _ = setup_converter
+
+        small = Path(temp_dir.name) / "small.mov"
+        large = Path(temp_dir.name) / "large.mov"
+        small.write_bytes(b"0" * 10)
+        large.write_bytes(b"0" * 1000)
+        missing = str(Path(temp_dir.name) / "missing.mov")
+
+        # テスト対象メソッド呼び出し
+        ordered = converter._order_by_cost([str(small), missing, str(large)])
+
+        # 検証
+        assert ordered == [str(large), str(small), missing]
+
+    def test_plan(self, setup_converter):
+        """正常系: 変換せずに所要時間と出力サイズを見積もり、読み込めないファイルはエラーとして残す"""
+        converter, _, temp_dir, test_mov_path, _ = setup_converter
+        video_path = str(Path(temp_dir.name) / "video.mp4")
+        write_test_video(video_path, frame_count=60)
+
+        # テスト対象メソッド呼び出し
+        plan = converter.plan([(test_mov_path, None), (video_path, None)])
+
+        # 検証 - 2秒を15fpsで30フレーム。動画は見積もれた方が先になる
+        assert [job.input_path for job in plan.jobs] == [video_path, test_mov_path]
+        video, dummy = plan.jobs
+        assert video.frames == 30
+        assert video.seconds > 0
+        assert video.bytes > 0
+        assert video.output_path == str(Path(video_path).with_suffix(".gif"))
+        assert video.error is None
+        assert dummy.error is not None
+        assert dummy.seconds == 0
+        assert plan.seconds == video.seconds
+        assert not os.path.exists(video.output_path)
+
+    @patch("mov2gif.movie_converter.MovieConverter.convert_to_gif")
+    def test_batch_convert_uses_conversion_cache(self, mock_convert, setup_converter):
+        """正常系: 2回目の一括変換では未変更のファイルを再変換しない"""
+        _, mock_logger, temp_dir, test_mov_path, _ = setup_converter
+        cache = ConversionCache(str(Path(temp_dir.name) / "gifs"))
+        converter = MovieConverter(
+            mock_logger,
+            palette_cache=PaletteCache(str(Path(temp_dir.name) / "palettes")),
+            conversion_cache=cache,
+        )
+
+        def fake_convert(input_path, output_path=None):
+            Path(input_path).with_suffix(".gif").write_bytes(b"GIF89a")
+            return True
+
+        mock_convert.side_effect = fake_convert
+
+        # 1回目はキャッシュミスで変換される
+        assert converter.batch_convert([test_mov_path]) == {test_mov_path: True}
+        assert mock_convert.call_count == 1
+        mock_logger.info.assert_any_call("キャッシュ: ヒット 0件 / ミス 1件")
+
+        # 2回目はキャッシュヒットで変換されない
+        Path(test_mov_path).with_suffix(".gif").unlink()
+        assert converter.batch_convert([test_mov_path]) == {test_mov_path: True}
+        assert mock_convert.call_count == 1
+        mock_logger.info.assert_any_call("キャッシュ: ヒット 1件 / ミス 0件")
+        assert Path(test_mov_path).with_suffix(".gif").read_bytes() == b"GIF89a"
+
+    @_patch_decoding
+    def test_convert_to_gif_options(
+        self, mock_probe, mock_decoder_cls, mock_sample_frames, setup_converter
+    ):
+        """正常系: 変換オプションの縮小・フレームレートがデコーダーに渡される"""
+        _, mock_logger, temp_dir, test_mov_path, test_gif_path = setup_converter
+        converter = MovieConverter(
+            mock_logger,
+            palette_cache=PaletteCache(str(Path(temp_dir.name) / "palettes")),
+            options={"fps": 10, "width": 4, "colors": 16},
+        )
+        mock_decoder_cls.return_value = _mock_decoder()
+
+        # テスト対象メソッド呼び出し
+        result = converter.convert_to_gif(test_mov_path, test_gif_path)
+
+        # 検証
+        assert result is True
+        mock_decoder_cls.assert_called_once_with(test_mov_path, (4, 3), 10.0)
+
+    @_patch_decoding
+    def test_batch_convert_writes_profiles(
+        self, mock_probe, mock_decoder_cls, mock_sample_frames, setup_converter
+    ):
+        """正常系: profile_dir指定時はファイルごとのプロファイルとサマリーを保存する"""
+        _, mock_logger, temp_dir, test_mov_path, _ = setup_converter
+        profile_dir = str(Path(temp_dir.name) / "profiles")
+        converter = MovieConverter(
+            mock_logger,
+            palette_cache=PaletteCache(str(Path(temp_dir.name) / "palettes")),
+            options={"optimize": True},
+            profile_dir=profile_dir,
+            profile_stage="quantize",
+        )
+        mock_decoder_cls.return_value = _mock_decoder()
+
+        # テスト対象メソッド呼び出し
+        assert converter.batch_convert([test_mov_path]) == {test_mov_path: True}
+
+        # 検証 - 各段階の計測結果とカウンターが記録されること
+        path = profile_path(profile_dir, test_mov_path)
+        with open(path, encoding="utf-8") as f:
+            profile = json.load(f)
+        assert profile["success"] is True
+        for stage in ("open", "palette", "decode", "quantize", "delta", "lzw", "write"):
+            assert stage in profile["stages"]
+        assert profile["stages"]["decode"]["calls"] == 4
+        assert profile["stages"]["quantize"]["calls"] == 3
+        assert profile["counters"]["frames"] == 3
+        assert os.path.exists(path[: -len(".json")] + ".quantize.prof")
+
+        with open(
+            os.path.join(profile_dir, "batch_summary.json"), encoding="utf-8"
+        ) as f:
+            summary = json.load(f)
+        assert summary["files"] == 1
+        assert summary["counters"]["frames"] == 3
+
+    @_patch_decoding
+    def test_convert_iter_streams_jobs(
+        self, mock_probe, mock_decoder_cls, mock_sample_frames, setup_converter
+    ):
+        """正常系: ジョブを逐次読み進め、指定した出力パスに変換する"""
+        converter, _, temp_dir, test_mov_path, _ = setup_converter
+        mock_decoder_cls.side_effect = lambda *args: _mock_decoder()
+        output_paths = [str(Path(temp_dir.name) / f"out{i}.gif") for i in range(3)]
+        consumed = []
+
+        def jobs():
+            for output_path in output_paths:
+                consumed.append(output_path)
+                yield test_mov_path, output_path
+
+        # テスト対象メソッド呼び出し
+        results = converter.convert_iter(jobs())
+
+        # 検証 - 最初の結果はジョブの列挙が終わる前に返ること
+        first = next(results)
+        assert first.success is True
+        assert first.output_path == output_paths[0]
+        assert consumed == output_paths[:1]
+        assert [result.output_path for result in results] == output_paths[1:]
+        assert all(os.path.exists(path) for path in output_paths)
+
+    @patch("mov2gif.movie_converter._convert_in_worker", _fake_worker)
+    def test_convert_iter_parallel(self, setup_converter):
+        """正常系: 並列変換でも全ジョブの結果を返す"""
+        converter, _, temp_dir, _, _ = setup_converter
+        jobs = [
+            (str(Path(temp_dir.name) / name), None)
+            for name in ["a.mov", "fail.mov", "c.mov", "d.mov", "e.mov"]
+        ]
+
+        # テスト対象メソッド呼び出し
+        results = list(converter.convert_iter(iter(jobs), max_workers=2))
+
+        # 検証
+        assert sorted((r.input_path, r.success) for r in results) == sorted(
+            (path, "fail" not in path) for path, _ in jobs
+        )
+        assert all(r.output_path.endswith(".gif") for r in results)
+
+    @_patch_decoding
+    def test_convert_iter_job_options(
+        self, mock_probe, mock_decoder_cls, mock_sample_frames, setup_converter
+    ):
+        """正常系: (入力パス, 出力パス, 変換オプション) のジョブはそのジョブだけにオプションを重ね、不正な場合は失敗とする"""
+        converter, mock_logger, temp_dir, test_mov_path, test_gif_path = setup_converter
+        mock_decoder_cls.side_effect = lambda *args, **kwargs: _mock_decoder()
+        jobs = [
+            (test_mov_path, test_gif_path, {"start": 0.05, "end": 0.15}),
+            (test_mov_path, test_gif_path, {"colors": 1}),
+            (test_mov_path, test_gif_path),
+        ]
+
+        # テスト対象メソッド呼び出し
+        results = list(converter.convert_iter(iter(jobs)))
+
+        # 検証
+        assert [result.success for result in results] == [True, False, True]
+        starts = [
+            call.kwargs.get("start", 0) for call in mock_decoder_cls.call_args_list
+        ]
+        assert starts == [pytest.approx(0.05), 0]
+        assert "変換オプションが不正です" in mock_logger.error.call_args[0][0]
+
+    @patch("mov2gif.movie_converter._convert_in_worker", _options_worker)
+    def test_convert_iter_parallel_job_options(self, setup_converter):
+        """正常系: 並列変換でもジョブごとの変換オプションをワーカーに渡す"""
+        converter, _, temp_dir, _, _ = setup_converter
+        jobs = [
+            (str(Path(temp_dir.name) / "a.mov"), None, {"width": 320}),
+            (str(Path(temp_dir.name) / "b.mov"), None, {"width": 640}),
+            (str(Path(temp_dir.name) / "c.mov"), None),
+        ]
+
+        # テスト対象メソッド呼び出し
+        results = {
+            Path(r.input_path).name: r.success
+            for r in converter.convert_iter(iter(jobs), max_workers=2)
+        }
+
+        # 検証
+        assert results == {"a.mov": True, "b.mov": False, "c.mov": False}
+
+    @patch("mov2gif.movie_converter._convert_in_worker", _interrupted_worker)
+    def test_convert_iter_workers_ignore_sigint(self, setup_converter):
+        """正常系: ワーカーはCtrl+C（SIGINT）で中断されず、実行中のジョブを最後まで変換する"""
+        converter, _, temp_dir, _, _ = setup_converter
+        jobs = [(str(Path(temp_dir.name) / f"{i}.mov"), None) for i in range(3)]
+
+        # テスト対象メソッド呼び出し
+        results = list(converter.convert_iter(iter(jobs), max_workers=2))
+
+        # 検証
+        assert [r.success for r in results] == [True, True, True]
+
+    @patch("mov2gif.movie_converter._convert_in_worker", _fake_worker)
+    def test_convert_iter_recycles_workers(self, setup_converter):
+        """正常系: worker_max_jobsごとにプールを作り直しても、全ジョブの結果を返す"""
+        _, mock_logger, temp_dir, _, _ = setup_converter
+        converter = MovieConverter(mock_logger, worker_max_jobs=1)
+        jobs = [
+            (str(Path(temp_dir.name) / name), None)
+            for name in ["a.mov", "fail.mov", "c.mov", "d.mov", "e.mov"]
+        ]
+
+        # テスト対象メソッド呼び出し
+        results = list(converter.convert_iter(iter(jobs), max_workers=2))
+
+        # 検証
+        assert sorted((r.input_path, r.success) for r in results) == sorted(
+            (path, "fail" not in path) for path, _ in jobs
+        )
+
+    @patch("mov2gif.movie_converter._convert_in_worker", _crashing_worker)
+    def test_convert_iter_recovers_from_crash(self, setup_converter):
+        """異常系: ワーカープロセスが異常終了しても残りのジョブを変換する"""
+        converter, _, temp_dir, _, _ = setup_converter
+        jobs = [
+            (str(Path(temp_dir.name) / name), None)
+            for name in ["a.mov", "crash.mov", "c.mov", "d.mov"]
+        ]
+
+        # テスト対象メソッド呼び出し
+        results = {
+            r.input_path: r.success
+            for r in converter.convert_iter(iter(jobs), max_workers=2)
+        }
+
+        # 検証
+        assert results == {path: "crash" not in path for path, _ in jobs}
+
+    @patch("mov2gif.movie_converter._convert_in_worker", _fake_worker)
+    def test_convert_iter_reports_results_while_idle(self, setup_converter):
+        """正常系: ジョブがNone（新しいジョブなし）の間も完了した結果を返す"""
+        converter, _, temp_dir, _, _ = setup_converter
+        path = str(Path(temp_dir.name) / "a.mov")
+
+        def jobs():
+            yield path, None
+            while True:
+                yield None
+
+        # テスト対象メソッド呼び出し
+        result = next(converter.convert_iter(jobs(), max_workers=2))
+
+        # 検証
+        assert result.input_path == path
+        assert result.success is True
+
+    @pytest.mark.parametrize("batch", [False, True])
+    @patch("mov2gif.movie_converter._convert_in_worker", _exclusive_worker)
+    def test_memory_budget_serializes_jobs(self, batch, setup_converter):
+        """正常系: メモリ予算に2つ分の見積もりが収まらない場合は、ワーカーが空いていても1つずつ変換する"""
+        converter, mock_logger, temp_dir, _, _ = setup_converter
+        converter = MovieConverter(
+            mock_logger, palette_cache=converter.palette_cache, memory_budget=1000
+        )
+        paths = [str(Path(temp_dir.name) / f"{name}.mov") for name in "abc"]
+
+        # テスト対象メソッド呼び出し
+        with patch.object(MovieConverter, "_job_memory", return_value=(600, 8, 1)):
+            if batch:
+                results = converter.batch_convert(paths, max_workers=3)
+            else:
+                results = {
+                    result.input_path: result.success
+                    for result in converter.convert_iter(
+                        ((path, None) for path in paths), max_workers=3
+                    )
+                }
+
+        # 検証 - 同時に実行されたワーカーがないこと
+        assert results == {path: True for path in paths}
+
+    def test_memory_budget_limits(self, setup_converter):
+        """正常系: 分割エンコードは予算に収まるプロセス数にし、1つで予算を超える動画は先読みを減らして変換する"""
+        converter, mock_logger, temp_dir, _, _ = setup_converter
+        video_path = str(Path(temp_dir.name) / "video.mp4")
+        write_test_video(video_path, frame_count=30)
+        size = probe_media(video_path).size
+        cost = estimate_working_set(size, converter.options, 8)
+
+        # テスト対象メソッド呼び出し
+        segmented = MovieConverter(
+            mock_logger, segment_workers=3, memory_budget=cost * 2 + 1
+        )
+        assert segmented._memory_limits(video_path, size) == (2, 8)
+        assert segmented._job_memory(video_path) == (cost, 8, 2)
+        mock_logger.warning.assert_not_called()
+
+        low_memory = MovieConverter(
+            mock_logger, palette_cache=converter.palette_cache, memory_budget=cost - 1
+        )
+        assert low_memory._job_memory(video_path) == (
+            cost,
+            LOW_MEMORY_FRAME_BUFFER,
+            1,
+        )
+        mock_logger.warning.assert_called_once()
+        assert low_memory.convert_to_gif(video_path) is True
+
+    def test_job_memory_counts_segment_processes(self, setup_converter):
+        """正常系: 分割エンコードするジョブは、予算に収まる区間数分のプロセスを見積もりに含める"""
+        _, mock_logger, temp_dir, _, _ = setup_converter
+        video_path = str(Path(temp_dir.name) / "video.mp4")
+        write_test_video(video_path, frame_count=60)
+        size = probe_media(video_path).size
+        cost = estimate_working_set(size, MovieConverter(mock_logger).options, 8)
+
+        # テスト対象メソッド呼び出し（0.5秒ごとに区間を分ける）
+        with patch(
+            "mov2gif.movie_converter.plan_segments",
+            lambda duration, fps, workers: plan_segments(
+                duration, fps, workers, min_seconds=0.5
+            ),
+        ):
+            unlimited = MovieConverter(
+                mock_logger, segment_workers=3, memory_budget=cost * 10
+            )._job_memory(video_path)
+            limited = MovieConverter(
+                mock_logger, segment_workers=3, memory_budget=cost * 2 + 1
+            )._job_memory(video_path)
+
+        # 検証 - 予算に2プロセス分しか収まらない場合は区間数を2にし、2つ分と見積もる
+        assert unlimited == (cost * 3, 8, 3)
+        assert limited == (cost * 2, 8, 2)
+        governor = MemoryGovernor(cost * 2 + 1)
+        governor.acquire(limited[0])
+        # 2プロセス分を使用中のため、1プロセス分のジョブも並行して開始させない
+        assert not governor.admits(cost)
+
+    @pytest.mark.parametrize("optimize", [False, True])
+    def test_convert_to_gif_segments(self, optimize, setup_converter):
+        """正常系: 区間に分割して並列にエンコードしても一括変換と同じフレームになる"""
+        _, mock_logger, temp_dir, _, _ = setup_converter
+        video_path = str(Path(temp_dir.name) / "video.mp4")
+        write_test_video(video_path, frame_count=60)
+        options = {"fps": 10, "optimize": optimize}
+        sequential_path = str(Path(temp_dir.name) / "sequential.gif")
+        segmented_path = str(Path(temp_dir.name) / "segmented.gif")
+        MovieConverter(mock_logger, options=options).convert_to_gif(
+            video_path, sequential_path
+        )
+
+        # テスト対象メソッド呼び出し（0.5秒ごとに区間を分ける）
+        converter = MovieConverter(mock_logger, options=options, segment_workers=3)
+        with patch(
+            "mov2gif.movie_converter.plan_segments",
+            lambda duration, fps, workers: plan_segments(
+                duration, fps, workers, min_seconds=0.5
+            ),
+        ):
+            result = converter.convert_to_gif(video_path, segmented_path)
+
+        # 検証 - フレーム数・表示時間・画素が一致すること
+        assert result is True
+        mock_logger.info.assert_any_call(
+            f"3個の区間に分割して並列にエンコードします: {video_path}"
+        )
+        with Image.open(sequential_path) as expected, Image.open(
+            segmented_path
+        ) as actual:
+            assert actual.n_frames == expected.n_frames == 20
+            for index in range(expected.n_frames):
+                expected.seek(index)
+                actual.seek(index)
+                assert actual.info["duration"] == expected.info["duration"]
+                assert np.array_equal(
+                    np.asarray(actual.convert("RGB")),
+                    np.asarray(expected.convert("RGB")),
+                )
+
+    def test_convert_to_gif_segments_frame_buffer(self, setup_converter):
+        """正常系: 区間ごとのプロセスにも、メモリ予算で決めた先読みフレーム数を渡す"""
+        _, mock_logger, temp_dir, _, _ = setup_converter
+        video_path = str(Path(temp_dir.name) / "video.mp4")
+        write_test_video(video_path, frame_count=60)
+        converter = MovieConverter(
+            mock_logger, options={"fps": 10}, segment_workers=3, frame_buffer=2
+        )
+        submitted = []
+
+        def recording_pool(max_workers, *args):
+            # 区間ごとのプロセスに投入した引数を記録する
+            pool = _process_pool(max_workers, *args)
+            submit = pool.submit
+
+            def record(fn, *fn_args):
+                submitted.append(fn_args)
+                return submit(fn, *fn_args)
+
+            pool.submit = record
+            return pool
+
+        # テスト対象メソッド呼び出し
+        with patch(
+            "mov2gif.movie_converter.plan_segments",
+            lambda duration, fps, workers: plan_segments(
+                duration, fps, workers, min_seconds=0.5
+            ),
+        ), patch("mov2gif.movie_converter._process_pool", recording_pool):
+            result = converter.convert_to_gif(video_path)
+
+        # 検証
+        assert result is True
+        assert len(submitted) == 3
+        assert {args[-1] for args in submitted} == {2}
+
+    @pytest.mark.parametrize("segment_workers", [1, 3])
+    def test_convert_to_gif_progress(self, segment_workers, setup_converter):
+        """正常系: 開始・完了のイベントと、書き出したフレーム数・バイト数が通知される"""
+        _, mock_logger, temp_dir, _, _ = setup_converter
+        video_path = str(Path(temp_dir.name) / "video.mp4")
+        write_test_video(video_path, frame_count=60)
+        gif_path = str(Path(temp_dir.name) / "video.gif")
+        events = []
+
+        # テスト対象メソッド呼び出し（2秒を10fpsで、分割する場合は0.5秒ごと）
+        converter = MovieConverter(
+            mock_logger,
+            options={"fps": 10},
+            segment_workers=segment_workers,
+            progress=events.append,
+            progress_interval=0,
+        )
+        with patch(
+            "mov2gif.movie_converter.plan_segments",
+            lambda duration, fps, workers: plan_segments(
+                duration, fps, workers, min_seconds=0.5
+            ),
+        ):
+            result = converter.convert_to_gif(video_path, gif_path)
+
+        # 検証
+        assert result is True
+        assert events[0]["event"] == "file_start"
+        assert events[0]["frames_total"] == 20
+        assert {event["event"] for event in events[1:-1]} == {"file_progress"}
+        frames_done = [event["frames_done"] for event in events]
+        assert frames_done == sorted(frames_done)
+        done = events[-1]
+        assert done["event"] == "file_done"
+        assert done["success"] is True
+        assert done["cached"] is False
+        assert done["input_path"] == video_path
+        assert done["frames_done"] == 20
+        assert done["bytes_written"] == os.path.getsize(gif_path)
+        assert done["eta"] == 0
+        # 分割エンコードでも、区間ごとのプロセスでデコードしたフレーム数から速度を求める
+        assert done["decode_fps"] > 0
+
+    @patch("mov2gif.movie_converter._convert_in_worker", _fake_worker)
+    def test_convert_iter_batch_progress(self, setup_converter):
+        """正常系: 並列変換でも完了したファイル数が通知される"""
+        _, mock_logger, temp_dir, _, _ = setup_converter
+        events = []
+        converter = MovieConverter(mock_logger, progress=events.append)
+        jobs = [
+            (str(Path(temp_dir.name) / name), None)
+            for name in ["a.mov", "fail.mov", "c.mov"]
+        ]
+
+        # テスト対象メソッド呼び出し
+        results = list(converter.convert_iter(iter(jobs), max_workers=2))
+
+        # 検証
+        assert len(results) == 3
+        assert events[0]["event"] == "batch_progress"
+        assert events[-1]["event"] == "batch_done"
+        assert events[-1]["files_done"] == 3
+        assert events[-1]["succeeded"] == 2
+        assert events[-1]["failed"] == 1
+        assert events[-1]["files_total"] is None
+
+    @patch("mov2gif.movie_converter.MovieConverter.convert_to_gif")
+    def test_batch_convert_progress_cached(self, mock_convert, setup_converter):
+        """正常系: キャッシュから復元したファイルはcachedとして通知される"""
+        _, mock_logger, temp_dir, test_mov_path, _ = setup_converter
+        events = []
+        converter = MovieConverter(
+            mock_logger,
+            palette_cache=PaletteCache(str(Path(temp_dir.name) / "palettes")),
+            conversion_cache=ConversionCache(str(Path(temp_dir.name) / "gifs")),
+            progress=events.append,
+            progress_interval=0,
+        )
+
+        def fake_convert(input_path, output_path=None):
+            Path(input_path).with_suffix(".gif").write_bytes(b"GIF89a")
+            return True
+
+        mock_convert.side_effect = fake_convert
+        converter.batch_convert([test_mov_path])
+        events.clear()
+
+        # テスト対象メソッド呼び出し（2回目はキャッシュから復元）
+        converter.batch_convert([test_mov_path])
+
+        # 検証
+        assert mock_convert.call_count == 1
+        assert [event["event"] for event in events] == [
+            "file_done",
+            "batch_progress",
+            "batch_done",
+        ]
+        assert events[0]["cached"] is True
+        assert events[-1]["cached"] == 1
+        assert events[-1]["files_total"] == 1
+        assert events[-1]["eta"] == 0
+
+    @pytest.mark.parametrize("batch", [False, True])
+    @patch("mov2gif.movie_converter.MovieConverter.convert_to_gif")
+    def test_resume_from_journal(self, mock_convert, batch, setup_converter):
+        """正常系: 中断した変換を再開すると、完了済みのジョブだけをスキップする"""
+        _, mock_logger, temp_dir, _, _ = setup_converter
+        journal_path = str(Path(temp_dir.name) / "journal.jsonl")
+        paths = []
+        for name in ["a.mov", "b.mov"]:
+            path = Path(temp_dir.name) / name
+            path.write_bytes(name.encode())
+            paths.append(str(path))
+
+        def crash_on_b(input_path, output_path=None):
+            if input_path == paths[1]:
+                raise KeyboardInterrupt
+            Path(input_path).with_suffix(".gif").write_bytes(b"GIF89a")
+            return True
+
+        def run(resume):
+            with BatchJournal(journal_path, resume=resume) as journal:
+                converter = MovieConverter(mock_logger, journal=journal)
+                if batch:
+                    return converter.batch_convert(paths)
+                return {
+                    result.input_path: result.resumed
+                    for result in converter.convert_iter((path, None) for path in paths)
+                }
+
+        # 1回目はbの変換中に中断される
+        mock_convert.side_effect = crash_on_b
+        with pytest.raises(KeyboardInterrupt):
+            run(resume=False)
+        mock_convert.reset_mock()
+        mock_convert.side_effect = None
+        mock_convert.return_value = True
+
+        # テスト対象メソッド呼び出し
+        results = run(resume=True)
+
+        # 検証 - bだけを変換し直すこと
+        assert mock_convert.call_count == 1
+        assert mock_convert.call_args.args[0] == paths[1]
+        if batch:
+            assert results == {paths[0]: True, paths[1]: True}
+        else:
+            assert results == {paths[0]: True, paths[1]: False}
+        mock_logger.info.assert_any_call(
+            f"前回の変換で完了済みのためスキップします: {paths[0]}"
+        )
+
+    @patch("mov2gif.movie_converter._convert_in_worker", _fake_worker)
+    def test_batch_convert_parallel_journal(self, setup_converter):
+        """正常系: 並列変換でも各ファイルの開始と終了をジャーナルに記録する"""
+        converter, mock_logger, temp_dir, _, _ = setup_converter
+        journal_path = Path(temp_dir.name) / "journal.jsonl"
+        paths = [str(Path(temp_dir.name) / name) for name in ["a.mov", "fail.mov"]]
+        for path in paths:
+            Path(path).write_bytes(b"dummy")
+            Path(path).with_suffix(".gif").write_bytes(b"GIF89a")
+
+        # テスト対象メソッド呼び出し
+        with BatchJournal(str(journal_path)) as journal:
+            MovieConverter(
+                mock_logger, palette_cache=converter.palette_cache, journal=journal
+            ).batch_convert(paths, max_workers=2)
+
+        # 検証
+        records = [
+            json.loads(line)
+            for line in journal_path.read_text(encoding="utf-8").splitlines()
+        ]
+        states = {}
+        for record in records:
+            states.setdefault(record["input_path"], []).append(record["state"])
+        assert states == {
+            paths[0]: ["started", "done"],
+            paths[1]: ["started", "failed"],
+        }
+        assert all(record["key"] for record in records)
+
+    @pytest.mark.parametrize("segment_workers", [1, 3])
+    def test_convert_to_gif_clip(self, segment_workers, setup_converter):
+        """正常系: startからdurationの区間だけを変換する（分割エンコードでも同じ）"""
+        _, mock_logger, temp_dir, _, _ = setup_converter
+        video_path = str(Path(temp_dir.name) / "video.mp4")
+        write_test_video(video_path, frame_count=60)
+        gif_path = str(Path(temp_dir.name) / "clip.gif")
+
+        # テスト対象メソッド呼び出し（0.5秒から0.5秒分を10fpsで）
+        converter = MovieConverter(
+            mock_logger,
+            options={"fps": 10, "start": 0.5, "duration": 0.5},
+            segment_workers=segment_workers,
+        )
+        with patch(
+            "mov2gif.movie_converter.plan_segments",
+            lambda duration, fps, workers: plan_segments(
+                duration, fps, workers, min_seconds=0.2
+            ),
+        ):
+            result = converter.convert_to_gif(video_path, gif_path)
+
+        # 検証 - 5フレームで、明るさは0.5秒（元の15フレーム目の120）から順に増える
+        assert result is True
+        with Image.open(gif_path) as gif:
+            means = []
+            for index in range(gif.n_frames):
+                gif.seek(index)
+                means.append(float(np.asarray(gif.convert("L")).mean()))
+        assert len(means) == 5
+        assert means == sorted(means)
+        assert means[0] == pytest.approx(120, abs=16)
+
+    def test_convert_to_gif_clip_out_of_range(self, setup_converter):
+        """異常系: 開始時刻が動画の長さ以降の場合はFalse"""
+        _, mock_logger, temp_dir, _, _ = setup_converter
+        video_path = str(Path(temp_dir.name) / "video.mp4")
+        write_test_video(video_path)
+        converter = MovieConverter(mock_logger, options={"start": 5})
+
+        # テスト対象メソッド呼び出し
+        result = converter.convert_to_gif(video_path)
+
+        # 検証
+        assert result is False
+        assert "動画の長さ" in mock_logger.error.call_args[0][0]
+
+    @_patch_decoding
+    def test_convert_to_gif_file_options(
+        self, mock_probe, mock_decoder_cls, mock_sample_frames, setup_converter
+    ):
+        """正常系: ファイルごとの変換オプションをそのファイルだけに重ねる"""
+        _, mock_logger, temp_dir, test_mov_path, test_gif_path = setup_converter
+        mock_decoder_cls.return_value = _mock_decoder()
+        converter = MovieConverter(
+            mock_logger,
+            palette_cache=PaletteCache(str(Path(temp_dir.name) / "palettes")),
+            options={"fps": 10, "duration": 1},
+            file_options={test_mov_path: {"start": 0.05, "end": 0.15}},
+        )
+
+        # テスト対象メソッド呼び出し
+        result = converter.convert_to_gif(test_mov_path, test_gif_path)
+
+        # 検証 - 入力側でシークし、endの指定がdurationより優先されること
+        assert result is True
+        _, kwargs = mock_decoder_cls.call_args
+        assert kwargs["start"] == pytest.approx(0.05)
+        assert kwargs["duration"] == pytest.approx(0.1)
+        assert converter.conversion_options(test_mov_path)["end"] == 0.15
+        assert converter.conversion_options()["end"] is None
+
+    def test_convert_to_gif_max_bytes(self, setup_converter):
+        """正常系: 出力が上限以下になるまで設定を下げて変換する"""
+        _, mock_logger, temp_dir, _, _ = setup_converter
+        video_path = str(Path(temp_dir.name) / "noise.mp4")
+        _write_noise_video(video_path)
+        unlimited_path = str(Path(temp_dir.name) / "unlimited.gif")
+        limited_path = str(Path(temp_dir.name) / "limited.gif")
+        MovieConverter(mock_logger, options={"fps": 10}).convert_to_gif(
+            video_path, unlimited_path
+        )
+        max_bytes = os.path.getsize(unlimited_path) // 3
+
+        events = []
+
+        # テスト対象メソッド呼び出し
+        converter = MovieConverter(
+            mock_logger,
+            options={"fps": 10, "max_bytes": max_bytes},
+            progress=events.append,
+            progress_interval=0,
+        )
+        result = converter.convert_to_gif(video_path, limited_path)
+
+        # 検証
+        assert result is True
+        assert os.path.getsize(limited_path) <= max_bytes
+        done = [event for event in events if event["event"] == "file_done"]
+        assert len(done) == 1
+        assert done[0]["success"] is True
+        assert done[0]["bytes_written"] == os.path.getsize(limited_path)
+        mock_logger.error.assert_not_called()
+        with Image.open(limited_path) as gif:
+            assert gif.size[0] < 96
+
+    def test_convert_to_gif_max_bytes_original_fits(self, setup_converter):
+        """正常系: 元の設定で収まる場合は上限を指定しない場合と同じGIFになる"""
+        _, mock_logger, temp_dir, _, _ = setup_converter
+        video_path = str(Path(temp_dir.name) / "noise.mp4")
+        _write_noise_video(video_path)
+        unlimited_path = str(Path(temp_dir.name) / "unlimited.gif")
+        limited_path = str(Path(temp_dir.name) / "limited.gif")
+        MovieConverter(mock_logger, options={"fps": 10}).convert_to_gif(
+            video_path, unlimited_path
+        )
+
+        # テスト対象メソッド呼び出し
+        converter = MovieConverter(mock_logger, options={"fps": 10, "max_bytes": 10**8})
+        result = converter.convert_to_gif(video_path, limited_path)
+
+        # 検証
+        assert result is True
+        with open(unlimited_path, "rb") as expected, open(limited_path, "rb") as actual:
+            assert actual.read() == expected.read()
+
+    def test_convert_to_gif_max_bytes_unreachable(self, setup_converter):
+        """異常系: 最も小さい設定でも収まらない場合はFalseを返し、GIFを残さず失敗を1回だけ通知する"""
+        _, mock_logger, temp_dir, _, _ = setup_converter
+        video_path = str(Path(temp_dir.name) / "noise.mp4")
+        _write_noise_video(video_path)
+        gif_path = str(Path(temp_dir.name) / "limited.gif")
+        events = []
+
+        # テスト対象メソッド呼び出し
+        converter = MovieConverter(
+            mock_logger,
+            options={"fps": 10, "max_bytes": 100},
+            progress=events.append,
+            progress_interval=0,
+        )
+        result = converter.convert_to_gif(video_path, gif_path)
+
+        # 検証
+        assert result is False
+        assert "収まりませんでした" in mock_logger.error.call_args[0][0]
+        assert not os.path.exists(gif_path)
+        done = [event for event in events if event["event"] == "file_done"]
+        assert len(done) == 1
+        assert done[0]["success"] is False
+        assert events[-1] is done[0]
+
+    def test_convert_to_gif_max_bytes_shares_histogram(self, setup_converter):
+        """正常系: 色数の異なる候補のパレットは、1回だけ作る色ヒストグラムから生成する"""
+        _, mock_logger, temp_dir, _, _ = setup_converter
+        video_path = str(Path(temp_dir.name) / "noise.mp4")
+        _write_noise_video(video_path)
+        converter = MovieConverter(
+            mock_logger,
+            palette_cache=PaletteCache(str(Path(temp_dir.name) / "palettes")),
+            options={"fps": 10, "max_bytes": 100},
+        )
+
+        # テスト対象メソッド呼び出し
+        with patch(
+            "mov2gif.movie_converter.color_histogram", side_effect=color_histogram
+        ) as mock_histogram, patch(
+            "mov2gif.movie_converter.build_palette", side_effect=build_palette
+        ) as mock_palette:
+            converter.convert_to_gif(video_path)
+
+        # 検証
+        colors = {call.args[1] for call in mock_palette.call_args_list}
+        assert len(colors) > 1
+        assert mock_histogram.call_count == 1
+
+    def test_convert_renditions(self, setup_converter):
+        """正常系: 1回のデコードから、個別に変換した場合と同じ解像度・フレーム数のGIFを複数作る"""
+        converter, mock_logger, temp_dir, _, _ = setup_converter
+        video_path = str(Path(temp_dir.name) / "video.mp4")
+        write_test_video(video_path, frame_count=60)
+        overrides = [{"width": 16, "fps": 5, "colors": 16}, {"width": 32}, {}]
+        expected_paths = []
+        for index, options in enumerate(overrides):
+            expected_paths.append(str(Path(temp_dir.name) / f"expected{index}.gif"))
+            MovieConverter(
+                mock_logger, options={"fps": 10, "dedup": False, **options}
+            ).convert_to_gif(video_path, expected_paths[-1])
+        renditions = [
+            Rendition(str(Path(temp_dir.name) / f"rendition{index}.gif"), options)
+            for index, options in enumerate(overrides)
+        ]
+        # パレットのキャッシュがない状態から変換する
+        converter = MovieConverter(
+            mock_logger,
+            palette_cache=converter.palette_cache,
+            options={"fps": 10, "dedup": False},
+        )
+
+        # テスト対象メソッド呼び出し
+        with patch(
+            "mov2gif.movie_converter.FrameDecoder", wraps=FrameDecoder
+        ) as mock_decoder_cls, patch(
+            "mov2gif.movie_converter.sample_frames", wraps=sample_frames
+        ) as mock_sample_frames:
+            results = converter.convert_renditions(video_path, renditions)
+
+        # 検証 - 最大の解像度・フレームレートで1回だけデコードし、パレット用の標本も共有すること
+        assert [result.success for result in results] == [True, True, True]
+        assert [result.output_path for result in results] == [
+            rendition.output_path for rendition in renditions
+        ]
+        mock_decoder_cls.assert_called_once_with(video_path, (64, 48), 10.0)
+        mock_sample_frames.assert_called_once()
+        mock_logger.error.assert_not_called()
+        for expected_path, rendition in zip(expected_paths, renditions):
+            with Image.open(expected_path) as expected, Image.open(
+                rendition.output_path
+            ) as actual:
+                assert actual.size == expected.size
+                assert actual.n_frames == expected.n_frames
+                assert actual.info["duration"] == expected.info["duration"]
+        # デコードと同じ解像度・フレームレートのレンディションは個別の変換と同じ画素になること
+        with Image.open(expected_paths[2]) as expected, Image.open(
+            renditions[2].output_path
+        ) as actual:
+            for index in range(expected.n_frames):
+                expected.seek(index)
+                actual.seek(index)
+                assert np.array_equal(
+                    np.asarray(actual.convert("RGB")),
+                    np.asarray(expected.convert("RGB")),
+                )
+
+    def test_convert_renditions_partial_failure(self, setup_converter):
+        """異常系: 書き出せないレンディションだけが失敗し、他のレンディションは変換を続ける"""
+        _, mock_logger, temp_dir, _, _ = setup_converter
+        video_path = str(Path(temp_dir.name) / "video.mp4")
+        write_test_video(video_path)
+        renditions = [
+            Rendition(str(Path(temp_dir.name) / "missing" / "a.gif")),
+            Rendition(str(Path(temp_dir.name) / "b.gif"), {"width": 32}),
+        ]
+        events = []
+        converter = MovieConverter(
+            mock_logger, progress=events.append, progress_interval=0
+        )
+
+        # テスト対象メソッド呼び出し
+        results = converter.convert_renditions(video_path, renditions)
+
+        # 検証
+        assert [result.success for result in results] == [False, True]
+        assert os.path.exists(renditions[1].output_path)
+        assert renditions[0].output_path in mock_logger.error.call_args[0][0]
+        done = {
+            event["output_path"]: event["success"]
+            for event in events
+            if event["event"] == "file_done"
+        }
+        assert done == {
+            renditions[0].output_path: False,
+            renditions[1].output_path: True,
+        }
+
+    def test_convert_renditions_clip_must_match(self, setup_converter):
+        """異常系: レンディションごとに切り出し区間を変える場合はValueError"""
+        converter, _, _, test_mov_path, test_gif_path = setup_converter
+
+        with pytest.raises(ValueError):
+            converter.convert_renditions(
+                test_mov_path, [Rendition(test_gif_path, {"start": 1})]
+            )
+
+    def test_convert_to_gif_transparency_in_color_table(self, setup_converter):
+        """正常系: 差分エンコードで2のべき乗の色数を使う場合も、透過色のインデックスがカラーテーブルに収まる"""
+        converter, mock_logger, temp_dir, _, _ = setup_converter
+        video_path = str(Path(temp_dir.name) / "noise.mp4")
+        _write_noise_video(video_path, frame_count=5)
+        gif_path = str(Path(temp_dir.name) / "noise.gif")
+        converter = MovieConverter(
+            mock_logger,
+            palette_cache=converter.palette_cache,
+            options={"colors": 128, "optimize": True, "fps": 10},
+        )
+
+        # テスト対象メソッド呼び出し
+        result = converter.convert_to_gif(video_path, gif_path)
+
+        # 検証 - 128色のパレットの後ろの透過色（128）を含む256色分のグローバルカラーテーブルであること
+        assert result is True
+        header = Path(gif_path).read_bytes()[:13]
+        assert header[10] & 0x80
+        assert 2 << (header[10] & 0x07) == 256
+
+    def test_invalid_options(self, setup_converter):
+        """異常系: 不正な変換オプションはValueError"""
+        _, mock_logger, _, _, _ = setup_converter
+
+        with pytest.raises(ValueError):
+            MovieConverter(mock_logger, options={"fps": 0})
+        with pytest.raises(ValueError):
+            MovieConverter(mock_logger, options={"unknown": 1})
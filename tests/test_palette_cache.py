@@ -0,0 +1,49 @@
+"""
+palette_cache モジュールのテスト
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from mov2gif.palette_cache import PaletteCache
+
+
+class TestPaletteCache(unittest.TestCase):
+    """PaletteCacheクラスのテスト"""
+
+    def setUp(self):
+        """テスト実行前の準備"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = PaletteCache(os.path.join(self.temp_dir.name, "palettes"))
+
+    def tearDown(self):
+        """テスト実行後のクリーンアップ"""
+        self.temp_dir.cleanup()
+
+    def test_store_and_load(self):
+        """正常系: 保存したパレットを読み込める"""
+        palette = np.arange(30, dtype=np.uint8).reshape(10, 3)
+        self.cache.store("key", palette)
+
+        # 検証
+        np.testing.assert_array_equal(self.cache.load("key"), palette)
+        self.assertEqual(os.listdir(self.cache.cache_dir), ["key.npy"])
+
+    def test_load_missing(self):
+        """正常系: キャッシュがない場合はNone"""
+        self.assertIsNone(self.cache.load("missing"))
+
+    def test_load_corrupted(self):
+        """異常系: 壊れたキャッシュファイルはNone扱い"""
+        os.makedirs(self.cache.cache_dir)
+        with open(os.path.join(self.cache.cache_dir, "bad.npy"), "wb") as f:
+            f.write(b"not a numpy file")
+
+        self.assertIsNone(self.cache.load("bad"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+planner モジュールのテスト
+"""
+
+import unittest
+
+from mov2gif.conversion_options import resolve_options
+from mov2gif.media_probe import MediaInfo
+from mov2gif.planner import (
+    COST_SECONDS_PER_FILE,
+    COST_SIZE_SEARCH_FACTOR,
+    JobEstimate,
+    clip_duration,
+    estimate_job,
+    order_by_cost,
+    plan_batch,
+)
+
+INFO = MediaInfo((1280, 720), 30.0, 10.0, "h264", 300)
+
+
+class TestPlanner(unittest.TestCase):
+    """estimate_job・plan_batchのテスト"""
+
+    def test_estimate_job(self):
+        """正常系: 出力フレーム数と、縮小すると小さくなる所要時間・サイズを見積もる"""
+        full = estimate_job("a.mov", "a.gif", INFO, 10**7, resolve_options())
+        small = estimate_job(
+            "a.mov", "a.gif", INFO, 10**7, resolve_options({"width": 320})
+        )
+
+        # 検証 - 10秒を15fpsで150フレーム
+        self.assertEqual(full.frames, 150)
+        self.assertEqual(small.frames, 150)
+        self.assertGreater(full.seconds, small.seconds)
+        self.assertGreater(small.seconds, COST_SECONDS_PER_FILE)
+        self.assertGreater(full.bytes, small.bytes)
+        self.assertGreater(small.bytes, 0)
+        self.assertIs(full.info, INFO)
+
+    def test_estimate_job_clip(self):
+        """正常系: 切り出す区間の分だけを見積もる"""
+        whole = estimate_job("a.mov", "a.gif", INFO, 10**7, resolve_options())
+        clip = estimate_job(
+            "a.mov", "a.gif", INFO, 10**7, resolve_options({"start": 8, "end": 20})
+        )
+
+        self.assertEqual(clip.frames, 30)
+        self.assertLess(clip.seconds, whole.seconds)
+        self.assertAlmostEqual(clip.bytes / whole.bytes, 0.2, places=2)
+
+    def test_estimate_job_max_bytes(self):
+        """正常系: max_bytesを指定した場合はサイズを上限までとし、探索の分だけ時間を増やす"""
+        whole = estimate_job("a.mov", "a.gif", INFO, 10**7, resolve_options())
+        limited = estimate_job(
+            "a.mov", "a.gif", INFO, 10**7, resolve_options({"max_bytes": 1000})
+        )
+
+        self.assertEqual(limited.bytes, 1000)
+        self.assertAlmostEqual(limited.seconds, whole.seconds * COST_SIZE_SEARCH_FACTOR)
+
+    def test_estimate_job_segments(self):
+        """正常系: 分割エンコードする長い動画は所要時間を区間数で割る"""
+        info = INFO._replace(duration=60.0)
+        single = estimate_job("a.mov", "a.gif", info, 10**7, resolve_options())
+        split = estimate_job(
+            "a.mov", "a.gif", info, 10**7, resolve_options(), segment_workers=4
+        )
+
+        self.assertAlmostEqual(
+            split.seconds - COST_SECONDS_PER_FILE,
+            (single.seconds - COST_SECONDS_PER_FILE) / 4,
+        )
+
+    def test_clip_duration_out_of_range(self):
+        """異常系: 開始時刻が動画の長さ以降の場合はエラー"""
+        with self.assertRaises(ValueError):
+            clip_duration(10.0, resolve_options({"start": 10}))
+
+    def test_plan_batch(self):
+        """正常系: 長いジョブから空いたワーカーに割り当てた場合の所要時間を求める"""
+        jobs = [
+            JobEstimate(name, name, seconds=seconds, bytes=10)
+            for name, seconds in [("a", 2.0), ("b", 5.0), ("c", 3.0), ("d", 4.0)]
+        ]
+
+        plan = plan_batch(jobs, workers=2)
+
+        # 検証 - 5+2と4+3で7秒
+        self.assertEqual([job.input_path for job in plan.jobs], ["b", "d", "c", "a"])
+        self.assertEqual(plan.seconds, 7.0)
+        self.assertEqual(plan.cpu_seconds, 14.0)
+        self.assertEqual(plan.bytes, 40)
+        self.assertEqual(plan.to_dict()["total"], 4)
+
+    def test_plan_batch_limited_by_cpu_count(self):
+        """正常系: ワーカーがCPUコア数より多い場合は、コア数分だけ並列に進むとみなす"""
+        jobs = [JobEstimate(str(i), str(i), seconds=1.0) for i in range(4)]
+
+        self.assertEqual(plan_batch(jobs, workers=4).seconds, 1.0)
+        self.assertEqual(plan_batch(jobs, workers=4, cpu_count=1).seconds, 4.0)
+        self.assertEqual(plan_batch([], workers=2).seconds, 0.0)
+
+    def test_order_by_cost(self):
+        """正常系: 見積もれなかったジョブは最後になる"""
+        jobs = [
+            JobEstimate("error", "error", error="broken"),
+            JobEstimate("short", "short", seconds=1.0),
+            JobEstimate("long", "long", seconds=2.0),
+        ]
+
+        self.assertEqual(
+            [job.input_path for job in order_by_cost(jobs)],
+            ["long", "short", "error"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import threading
+
+from mov2gif.profiler import (
+    NULL_PROFILER,
+    StageProfiler,
+    profile_path,
+    summarize,
+    write_json,
+)
+
+
+class TestNullProfiler:
+    def test_does_nothing(self):
+        items = [1, 2, 3]
+        with NULL_PROFILER.span("decode"):
+            NULL_PROFILER.count("frames")
+        assert NULL_PROFILER.iter_span("decode", items) is items
+        assert NULL_PROFILER.enabled is False
+
+
+class TestStageProfiler:
+    def test_span_and_count(self):
+        profiler = StageProfiler()
+        for _ in range(3):
+            with profiler.span("quantize"):
+                pass
+        profiler.count("frames")
+        profiler.count("lzw_bytes", 100)
+
+        report = profiler.report()
+        assert report["stages"]["quantize"]["calls"] == 3
+        assert report["stages"]["quantize"]["total_s"] >= 0
+        assert report["counters"] == {"frames": 1, "lzw_bytes": 100}
+        assert report["wall_time_s"] >= report["stages"]["quantize"]["total_s"]
+
+    def test_span_records_on_exception(self):
+        profiler = StageProfiler()
+        try:
+            with profiler.span("open"):
+                raise IOError("broken")
+        except IOError:
+            pass
+        assert profiler.report()["stages"]["open"]["calls"] == 1
+
+    def test_iter_span(self):
+        profiler = StageProfiler()
+        assert list(profiler.iter_span("decode", [1, 2, 3])) == [1, 2, 3]
+        # 終端の検出（StopIteration）も1回として計測する
+        assert profiler.report()["stages"]["decode"]["calls"] == 4
+
+    def test_thread_safe(self):
+        profiler = StageProfiler()
+
+        def work():
+            for _ in range(1000):
+                with profiler.span("decode"):
+                    profiler.count("frames")
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        report = profiler.report()
+        assert report["stages"]["decode"]["calls"] == 4000
+        assert report["counters"]["frames"] == 4000
+
+    def test_cprofile_stage(self):
+        profiler = StageProfiler(cprofile_stage="lzw")
+        with profiler.span("quantize"):
+            pass
+        assert profiler.cprofile is None
+        with profiler.span("lzw"):
+            sum(range(100))
+        assert profiler.cprofile is not None
+
+
+def test_profile_path_is_unique_per_directory(tmp_path):
+    first = profile_path(str(tmp_path), "/videos/a/clip.mov")
+    second = profile_path(str(tmp_path), "/videos/b/clip.mov")
+    assert first != second
+    assert first.endswith(".profile.json")
+
+
+def test_write_json_creates_directory(tmp_path):
+    path = str(tmp_path / "profiles" / "a.json")
+    write_json(path, {"a": 1})
+    assert (tmp_path / "profiles" / "a.json").exists()
+
+
+def test_summarize():
+    profiles = [
+        {
+            "input": "a.mov",
+            "success": True,
+            "wall_time_s": 3.0,
+            "stages": {
+                "decode": {
+                    "calls": 10,
+                    "total_s": 1.0,
+                    "mean_ms": 100.0,
+                    "max_ms": 200.0,
+                }
+            },
+            "counters": {"frames": 10},
+        },
+        {
+            "input": "b.mov",
+            "success": False,
+            "wall_time_s": 1.0,
+            "stages": {
+                "decode": {
+                    "calls": 5,
+                    "total_s": 1.0,
+                    "mean_ms": 200.0,
+                    "max_ms": 300.0,
+                }
+            },
+            "counters": {"frames": 5},
+        },
+    ]
+
+    summary = summarize(profiles)
+
+    assert summary["files"] == 2
+    assert summary["succeeded"] == 1
+    assert summary["wall_time_s"] == 4.0
+    assert summary["stages"]["decode"]["calls"] == 15
+    assert summary["stages"]["decode"]["total_s"] == 2.0
+    assert summary["stages"]["decode"]["max_ms"] == 300.0
+    assert summary["stages"]["decode"]["share"] == 0.5
+    assert summary["counters"] == {"frames": 15}
+    assert [item["input"] for item in summary["slowest"]] == ["a.mov", "b.mov"]
@@ -0,0 +1,191 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from mov2gif.progress import (
+    NULL_PROGRESS,
+    BatchProgress,
+    FileProgress,
+    JsonLinesSink,
+    ProgressRelay,
+    init_worker_progress,
+    serialized,
+    worker_callback,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _emit_in_worker(path: str) -> bool:
+    """ワーカープロセスで1ファイル分の進捗イベントを送る"""
+    progress = FileProgress(worker_callback(), path, path + ".gif", interval=0)
+    progress.start(2)
+    progress.advance(2, 10)
+    progress.finish(True, 10)
+    return True
+
+
+class TestNullProgress:
+    def test_does_nothing(self):
+        items = [1, 2, 3]
+        NULL_PROGRESS.start(3)
+        NULL_PROGRESS.advance(1, 100)
+        NULL_PROGRESS.add_decoded(3)
+        NULL_PROGRESS.finish(True, 100)
+        assert NULL_PROGRESS.iter_decoded(items) is items
+        assert NULL_PROGRESS.enabled is False
+
+
+class TestFileProgress:
+    def test_rate_limited_progress(self):
+        events = []
+        clock = FakeClock()
+        progress = FileProgress(events.append, "a.mov", "a.gif", 1.0, clock)
+        progress.start(100)
+
+        # 間隔内のadvanceは通知しない
+        for _ in range(10):
+            clock.now += 0.05
+            progress.advance(1, 50)
+        clock.now += 0.6
+        progress.advance(10, 400)
+
+        assert [event["event"] for event in events] == ["file_start", "file_progress"]
+        event = events[-1]
+        assert event["frames_done"] == 20
+        assert event["frames_total"] == 100
+        assert event["bytes_written"] == 400
+        assert event["elapsed"] == pytest.approx(1.1)
+        assert event["encode_fps"] == pytest.approx(20 / 1.1)
+        assert event["eta"] == pytest.approx(4.4)
+
+    def test_decode_fps_and_finish(self):
+        events = []
+        clock = FakeClock()
+        progress = FileProgress(events.append, "a.mov", "a.gif", 1.0, clock)
+        progress.start(4)
+        clock.now += 2.0
+        assert list(progress.iter_decoded("abcd")) == list("abcd")
+        progress.finish(True, 1234)
+
+        done = events[-1]
+        assert done["event"] == "file_done"
+        assert done["success"] is True
+        assert done["cached"] is False
+        assert done["decode_fps"] == 2.0
+        assert done["bytes_written"] == 1234
+        assert done["input_path"] == "a.mov"
+        assert done["output_path"] == "a.gif"
+        assert isinstance(done["time"], float)
+
+    def test_decode_fps_from_other_processes(self):
+        events = []
+        clock = FakeClock()
+        progress = FileProgress(events.append, "a.mov", "a.gif", 1.0, clock)
+        progress.start(6)
+        clock.now += 2.0
+
+        # 分割エンコードの区間ごとにデコードしたフレーム数を加算する
+        progress.add_decoded(4)
+        progress.add_decoded(2)
+        progress.finish(True, 100)
+
+        assert events[-1]["decode_fps"] == 3.0
+
+    def test_eta_unknown_before_progress(self):
+        events = []
+        progress = FileProgress(events.append, "a.mov", "a.gif", clock=FakeClock())
+        progress.start(0)
+        assert events[0]["eta"] is None
+        assert events[0]["encode_fps"] == 0.0
+
+
+class TestBatchProgress:
+    def test_counts_and_eta(self):
+        events = []
+        clock = FakeClock()
+        batch = BatchProgress(events.append, 4, 1.0, clock)
+
+        clock.now += 1.0
+        batch.file_done("a.mov", "a.gif", True, cached=True)
+        clock.now += 0.5
+        batch.file_done("b.mov", "b.gif", False)
+        clock.now += 0.5
+        batch.file_done("c.mov", "c.gif", True)
+        batch.finish()
+
+        # キャッシュからの復元はfile_doneも通知し、batch_progressは間隔を空ける
+        assert [event["event"] for event in events] == [
+            "file_done",
+            "batch_progress",
+            "batch_progress",
+            "batch_done",
+        ]
+        assert events[0]["cached"] is True
+        done = events[-1]
+        assert done["files_done"] == 3
+        assert done["succeeded"] == 2
+        assert done["failed"] == 1
+        assert done["cached"] == 1
+        assert done["files_per_second"] == 1.5
+        assert done["eta"] == pytest.approx(2.0 / 3)
+
+    def test_unknown_total(self):
+        events = []
+        batch = BatchProgress(events.append, clock=FakeClock())
+        batch.file_done("a.mov", "a.gif", True)
+        assert events[-1]["files_total"] is None
+        assert events[-1]["eta"] is None
+
+
+class TestJsonLinesSink:
+    def test_appends_lines(self, tmp_path):
+        path = tmp_path / "progress.jsonl"
+        path.write_text('{"event": "old"}\n', encoding="utf-8")
+
+        with JsonLinesSink(str(path)) as sink:
+            sink({"event": "file_start", "input_path": "動画.mov"})
+            sink({"event": "file_done", "success": True})
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["event"] for line in lines] == [
+            "old",
+            "file_start",
+            "file_done",
+        ]
+        assert "動画.mov" in lines[1]
+
+
+class TestProgressRelay:
+    def test_relays_worker_events(self):
+        events = []
+        with ProgressRelay(serialized(events.append)) as relay:
+            with ProcessPoolExecutor(
+                max_workers=1,
+                initializer=init_worker_progress,
+                initargs=(relay.queue, 0),
+            ) as executor:
+                assert executor.submit(_emit_in_worker, "a.mov").result() is True
+
+        # 終了時に届いたイベントはすべて渡されていること
+        assert [event["event"] for event in events] == [
+            "file_start",
+            "file_progress",
+            "file_done",
+        ]
+        assert events[-1]["bytes_written"] == 10
+
+    def test_worker_callback_without_queue(self):
+        init_worker_progress(None)
+        assert worker_callback() is None
+
+    def test_serialized_is_idempotent(self):
+        callback = serialized(print)
+        assert serialized(callback) is callback
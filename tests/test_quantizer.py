@@ -0,0 +1,152 @@
+"""
+quantizer モジュールのテスト
+"""
+
+import unittest
+
+import numpy as np
+
+from mov2gif.quantizer import (
+    PaletteMapper,
+    _bin_index,
+    build_palette,
+    color_histogram,
+)
+
+
+def _gradient_frame(height=24, width=64):
+    """横方向に明るさが変わるグレーのグラデーション"""
+    row = np.linspace(0, 255, width).astype(np.uint8)
+    return np.repeat(np.tile(row, (height, 1))[..., None], 3, axis=2)
+
+
+def _floyd_steinberg(mapper: PaletteMapper, frame: np.ndarray) -> np.ndarray:
+    """1画素ずつ走査するFloyd–Steinbergの参照実装"""
+    height, width = frame.shape[:2]
+    work = frame.astype(np.float32)
+    palette = mapper.palette.astype(np.float32)
+    indices = np.empty((height, width), dtype=np.uint8)
+    for y in range(height):
+        for x in range(width):
+            value = np.clip(work[y, x], 0, 255)
+            index = mapper.lut[_bin_index(value.astype(np.uint8))]
+            indices[y, x] = index
+            if mapper._palette_bins[_bin_index(frame[y, x])]:
+                continue
+            error = value - palette[index]
+            if x + 1 < width:
+                work[y, x + 1] += error * (7 / 16)
+            if y + 1 < height:
+                if x > 0:
+                    work[y + 1, x - 1] += error * (3 / 16)
+                work[y + 1, x] += error * (5 / 16)
+                if x + 1 < width:
+                    work[y + 1, x + 1] += error * (1 / 16)
+    return indices
+
+
+class TestBuildPalette(unittest.TestCase):
+    """color_histogram・build_palette関数のテスト"""
+
+    def test_few_colors_are_preserved(self):
+        """正常系: 色数がパレット上限以下なら各色がそのまま残る"""
+        frame = np.zeros((4, 4, 3), dtype=np.uint8)
+        frame[:2] = (255, 0, 0)
+        frame[2:, :2] = (0, 0, 248)
+
+        palette = build_palette(color_histogram([frame]), colors=256)
+
+        # 検証
+        self.assertEqual(
+            {tuple(c) for c in palette}, {(255, 0, 0), (0, 0, 248), (0, 0, 0)}
+        )
+
+    def test_palette_size_is_limited(self):
+        """正常系: 指定した色数を超えない"""
+        rng = np.random.default_rng(0)
+        frames = [rng.integers(0, 256, (32, 32, 3), dtype=np.uint8) for _ in range(4)]
+
+        palette = build_palette(color_histogram(frames), colors=16)
+
+        # 検証
+        self.assertEqual(palette.shape, (16, 3))
+        self.assertEqual(palette.dtype, np.uint8)
+
+    def test_empty_histogram(self):
+        """異常系: 画素がない場合は1色のパレットを返す"""
+        palette = build_palette(color_histogram([]), colors=256)
+        self.assertEqual(palette.shape, (1, 3))
+
+
+class TestPaletteMapper(unittest.TestCase):
+    """PaletteMapperクラスのテスト"""
+
+    def test_map_to_nearest_color(self):
+        """正常系: 各画素が最も近いパレット色に割り当てられる"""
+        palette = np.array([[0, 0, 0], [255, 255, 255], [255, 0, 0]], dtype=np.uint8)
+        frame = np.array(
+            [[[10, 10, 10], [250, 240, 245], [200, 30, 20]]], dtype=np.uint8
+        )
+
+        indices = PaletteMapper(palette).map(frame)
+
+        # 検証
+        self.assertEqual(indices.dtype, np.uint8)
+        np.testing.assert_array_equal(indices, [[0, 1, 2]])
+
+    def test_bayer_dither(self):
+        """正常系: 組織的ディザはグラデーションを混色で表し、同じ入力には同じ結果を返す"""
+        palette = np.array([[0, 0, 0], [128, 128, 128], [255, 255, 255]], np.uint8)
+        frame = _gradient_frame()
+        mapper = PaletteMapper(palette, dither="bayer")
+
+        indices = mapper.map(frame)
+
+        # 検証 - 黒と灰色の中間（明るさ約64）の列では両方の色がほぼ半々に混ざること
+        column = indices[:, 16]
+        self.assertEqual(set(column.tolist()), {0, 1})
+        self.assertAlmostEqual(float(column.mean()), 0.5, delta=0.15)
+        # 結果は画素位置だけで決まること
+        np.testing.assert_array_equal(mapper.map(frame), indices)
+
+    def test_dither_keeps_flat_palette_colors(self):
+        """正常系: パレットにある色の平坦な領域には模様を出さない"""
+        palette = np.array([[0, 0, 0], [128, 128, 128], [255, 255, 255]], np.uint8)
+        frame = np.full((16, 16, 3), 128, dtype=np.uint8)
+
+        for dither in ("bayer", "floyd_steinberg"):
+            with self.subTest(dither=dither):
+                indices = PaletteMapper(palette, dither=dither).map(frame)
+                self.assertTrue((indices == 1).all())
+
+    def test_floyd_steinberg_matches_reference(self):
+        """正常系: 行をずらして並列に処理しても1画素ずつ走査した結果と一致する"""
+        rng = np.random.default_rng(0)
+        for shape in ((12, 20), (15, 3), (2, 30)):
+            frame = rng.integers(0, 256, shape + (3,), dtype=np.uint8)
+            mapper = PaletteMapper(
+                build_palette(color_histogram([frame]), 8), dither="floyd_steinberg"
+            )
+            with self.subTest(shape=shape):
+                np.testing.assert_array_equal(
+                    mapper.map(frame), _floyd_steinberg(mapper, frame)
+                )
+
+    def test_floyd_steinberg_preserves_mean(self):
+        """正常系: 誤差拡散で局所的な平均の明るさが保たれる"""
+        palette = np.array([[0, 0, 0], [255, 255, 255]], dtype=np.uint8)
+        frame = np.full((32, 32, 3), 64, dtype=np.uint8)
+
+        indices = PaletteMapper(palette, dither="floyd_steinberg").map(frame)
+
+        # 検証 - 約1/4の画素が白になること
+        self.assertAlmostEqual(float(indices.mean()), 64 / 255, delta=0.02)
+
+    def test_unknown_dither(self):
+        """異常系: 未知のディザリングの方式はValueError"""
+        with self.assertRaises(ValueError):
+            PaletteMapper(np.zeros((2, 3), dtype=np.uint8), dither="random")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+renditions モジュールのテスト
+"""
+
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+from PIL import Image
+
+from mov2gif.renditions import resample_renditions
+
+
+class TestResampleRenditions(unittest.TestCase):
+    """resample_renditions関数のテスト"""
+
+    def setUp(self):
+        # フレーム番号を明るさにした64x32のフレーム
+        self.frames = [np.full((32, 64, 3), i, dtype=np.uint8) for i in range(30)]
+
+    def test_selects_frames_per_fps(self):
+        """正常系: レンディションごとのフレームレートに合わせて最も近いフレームを選ぶ"""
+        branches = [((64, 32), 1.0), ((64, 32), 2.0), ((64, 32), 3.0)]
+
+        # テスト対象メソッド呼び出し
+        resampled = list(resample_renditions(self.frames, branches))
+
+        # 検証
+        self.assertEqual(len(resampled), 30)
+        for branch, step in enumerate([1, 2, 3]):
+            selected = [
+                int(frames[branch][0, 0, 0])
+                for frames in resampled
+                if frames[branch] is not None
+            ]
+            self.assertEqual(selected, list(range(0, 30, step)))
+
+    def test_shares_same_size_frames(self):
+        """正常系: デコードと同じ解像度のレンディションには縮小せずにそのまま渡す"""
+        resampled = next(resample_renditions(self.frames, [((64, 32), 1.0)] * 2))
+
+        self.assertIs(resampled[0], self.frames[0])
+        self.assertIs(resampled[1], self.frames[0])
+
+    def test_downscales_from_intermediate_size(self):
+        """正常系: 小さいレンディションは1つ大きいレンディションの縮小結果から縮小する"""
+        branches = [((8, 4), 1.0), ((64, 32), 1.0), ((32, 16), 1.0)]
+        sources = []
+        resize = Image.Image.resize
+
+        def recording_resize(image, size, *args, **kwargs):
+            sources.append((image.size, tuple(size)))
+            return resize(image, size, *args, **kwargs)
+
+        # テスト対象メソッド呼び出し
+        with patch.object(Image.Image, "resize", recording_resize):
+            resampled = next(resample_renditions(self.frames, branches))
+
+        # 検証
+        self.assertEqual(sources, [((64, 32), (32, 16)), ((32, 16), (8, 4))])
+        self.assertEqual(
+            [frame.shape for frame in resampled], [(4, 8, 3), (32, 64, 3), (16, 32, 3)]
+        )
+
+    def test_skipped_intermediate_size(self):
+        """正常系: 1つ大きいレンディションがそのフレームを使わない場合はデコードしたフレームから縮小する"""
+        branches = [((64, 32), 1.0), ((32, 16), 2.0), ((16, 8), 1.0)]
+
+        resampled = list(resample_renditions(self.frames, branches))
+
+        # 検証 - 2フレーム目は中間の解像度を作らずに縮小すること
+        self.assertIsNone(resampled[1][1])
+        self.assertEqual(resampled[1][2].shape, (8, 16, 3))
+        self.assertEqual(int(resampled[1][2][0, 0, 0]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
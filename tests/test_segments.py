@@ -0,0 +1,49 @@
+"""
+segments モジュールのテスト
+"""
+
+import unittest
+
+from mov2gif.segments import Segment, plan_segments
+
+
+class TestPlanSegments(unittest.TestCase):
+    """plan_segments関数のテスト"""
+
+    def test_short_clip_is_not_split(self):
+        """正常系: 最短の長さに満たない動画は分割しない"""
+        segments = plan_segments(15.0, 15, workers=4, min_seconds=10.0)
+
+        # 検証
+        self.assertEqual(segments, [Segment(0, 0, None)])
+
+    def test_single_worker_is_not_split(self):
+        """正常系: ワーカーが1つの場合は分割しない"""
+        segments = plan_segments(600.0, 15, workers=1)
+
+        # 検証
+        self.assertEqual(segments, [Segment(0, 0, None)])
+
+    def test_segments_are_contiguous(self):
+        """正常系: 区間が出力フレームの境界で隙間なく連続する"""
+        segments = plan_segments(100.0, 15, workers=3, min_seconds=10.0)
+
+        # 検証 - 1500フレームを3等分し、最後の区間は最後までデコードする
+        self.assertEqual(
+            segments,
+            [Segment(0, 0, 500), Segment(1, 500, 500), Segment(2, 1000, None)],
+        )
+        self.assertAlmostEqual(segments[1].start_time(15), 500 / 15)
+
+    def test_segment_count_is_limited_by_duration(self):
+        """正常系: 区間数は最短の長さで割った数を超えない"""
+        segments = plan_segments(25.0, 10, workers=8, min_seconds=10.0)
+
+        # 検証
+        self.assertEqual(len(segments), 2)
+        self.assertEqual(segments[0], Segment(0, 0, 125))
+        self.assertEqual(segments[1], Segment(1, 125, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
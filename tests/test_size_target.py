@@ -0,0 +1,131 @@
+"""
+size_target モジュールのテスト
+"""
+
+import unittest
+
+import numpy as np
+
+from mov2gif.conversion_options import resolve_options
+from mov2gif.segments import Segment
+from mov2gif.size_target import (
+    SizeCandidate,
+    find_fitting,
+    resample_burst,
+    sample_bursts,
+    size_ladder,
+)
+
+
+class TestSizeLadder(unittest.TestCase):
+    """size_ladder関数とSizeCandidateのテスト"""
+
+    def test_ladder_starts_with_original_settings(self):
+        """正常系: 先頭は元の設定で、後ろほど縮小率・フレームレート・色数が下がる"""
+        ladder = size_ladder(15, 256)
+
+        # 検証
+        self.assertEqual(ladder[0], SizeCandidate(1.0, 15, 256))
+        for larger, smaller in zip(ladder, ladder[1:]):
+            self.assertNotEqual(larger, smaller)
+            self.assertLessEqual(smaller.scale, larger.scale)
+            self.assertLessEqual(smaller.fps, larger.fps)
+            self.assertLessEqual(smaller.colors, larger.colors)
+
+    def test_ladder_skips_steps_above_original_colors(self):
+        """正常系: 元の色数より多い色数の段は含めない"""
+        ladder = size_ladder(10, 48)
+
+        # 検証
+        self.assertEqual(ladder[0].colors, 48)
+        self.assertEqual(sorted({c.colors for c in ladder}), [16, 32, 48])
+
+    def test_candidate_options(self):
+        """正常系: 候補の設定を幅・フレームレート・色数の変換オプションにする"""
+        base = resolve_options({"max_side": 640, "quality": 50, "max_bytes": 1000})
+        options = SizeCandidate(0.5, 7.5, 64).options(base, (1920, 1080))
+
+        # 検証 - 元の出力幅（640）の半分で、色数はqualityに左右されない
+        self.assertEqual(options["width"], 320)
+        self.assertIsNone(options["max_side"])
+        self.assertEqual(options["fps"], 7.5)
+        self.assertEqual(options["colors"], 64)
+        self.assertEqual(options["quality"], 100)
+        self.assertIsNone(options["max_bytes"])
+        self.assertEqual(resolve_options(options), options)
+
+
+class TestFindFitting(unittest.TestCase):
+    """find_fitting関数のテスト"""
+
+    def setUp(self):
+        """推定サイズが後ろほど小さくなる候補を用意"""
+        self.ladder = size_ladder(15, 256)
+        self.sizes = {
+            candidate: 1000 * (len(self.ladder) - index)
+            for index, candidate in enumerate(self.ladder)
+        }
+        self.calls = []
+
+    def estimate(self, candidate):
+        """呼び出された候補を記録して推定サイズを返す"""
+        self.calls.append(candidate)
+        return self.sizes[candidate]
+
+    def test_first_fitting_candidate(self):
+        """正常系: 推定サイズが上限以下になる最初の候補を少ない推定回数で求める"""
+        index = find_fitting(self.ladder, self.estimate, 5500)
+
+        # 検証
+        self.assertEqual(self.sizes[self.ladder[index]], 5000)
+        self.assertEqual(self.sizes[self.ladder[index - 1]], 6000)
+        self.assertLessEqual(len(self.calls), 5)
+
+    def test_original_settings_fit(self):
+        """正常系: 元の設定で収まる場合は先頭の候補"""
+        index = find_fitting(self.ladder, self.estimate, 10**9)
+
+        # 検証
+        self.assertEqual(index, 0)
+
+    def test_nothing_fits(self):
+        """正常系: どの候補も収まらない場合は最後の候補"""
+        index = find_fitting(self.ladder, self.estimate, 10)
+
+        # 検証
+        self.assertEqual(index, len(self.ladder) - 1)
+
+
+class TestSampleBursts(unittest.TestCase):
+    """sample_bursts関数・resample_burst関数のテスト"""
+
+    def test_short_clip_uses_whole_clip(self):
+        """正常系: 標本のフレーム数に満たない動画は全体を1区間にする"""
+        bursts = sample_bursts(30, strata=6, burst=6)
+
+        # 検証
+        self.assertEqual(bursts, [Segment(0, 0, None)])
+
+    def test_bursts_are_stratified(self):
+        """正常系: 等分した各区間の中央から連続するフレームを取り出す"""
+        bursts = sample_bursts(600, strata=6, burst=6)
+
+        # 検証
+        self.assertEqual([b.start_frame for b in bursts], [47, 147, 247, 347, 447, 547])
+        self.assertTrue(all(b.frame_count == 6 for b in bursts))
+
+    def test_resample_burst(self):
+        """正常系: フレームレートの比で間引き、面積平均で縮小する"""
+        frames = [np.full((4, 8, 3), i, dtype=np.uint8) for i in range(6)]
+        frames[0][:, ::2] = 100
+
+        resampled = resample_burst(frames, 2.0, (4, 2))
+
+        # 検証
+        self.assertEqual([int(f[0, 0, 0]) for f in resampled[1:]], [2, 4])
+        self.assertEqual(resampled[0].shape, (2, 4, 3))
+        self.assertEqual(int(resampled[0][0, 0, 0]), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+パッケージ読み込み時間（起動時間）のテスト
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# mov2gif.mainの読み込みにかけてよい時間（秒）
+IMPORT_BUDGET_S = 0.3
+
+# 起動時に読み込んではいけない重いモジュール
+LAZY_MODULES = ["moviepy", "tkinter", "imageio", "proglog"]
+
+_MEASURE = """
+import json, sys, time
+start = time.perf_counter()
+import mov2gif.main
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def _measure_import(root: str = PROJECT_ROOT) -> dict:
+    """新しいインタープリターでmov2gif.mainを読み込み、所要時間と読み込まれたモジュールを返す"""
+    result = subprocess.run(
+        [sys.executable, "-c", _MEASURE],
+        cwd=root,
+        env=dict(os.environ, PYTHONPATH=root),
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return json.loads(result.stdout)
+
+
+class TestStartup(unittest.TestCase):
+    """起動時の読み込みのテスト"""
+
+    def test_heavy_modules_are_lazy(self):
+        """正常系: moviepy・tkinterは読み込み時にはインポートされない"""
+        measured = _measure_import()
+
+        loaded = {name.split(".")[0] for name in measured["modules"]}
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, loaded)
+
+    def test_import_has_no_side_effects(self):
+        """正常系: 読み込みだけではログディレクトリなどを作成しない"""
+        with tempfile.TemporaryDirectory() as root:
+            # 既存のlogsディレクトリに左右されないよう、パッケージを複製した場所で読み込む
+            shutil.copytree(
+                os.path.join(PROJECT_ROOT, "mov2gif"),
+                os.path.join(root, "mov2gif"),
+                ignore=shutil.ignore_patterns("__pycache__"),
+            )
+
+            _measure_import(root)
+
+            self.assertEqual(os.listdir(root), ["mov2gif"])
+
+    def test_import_budget(self):
+        """正常系: 読み込み時間が予算内に収まる（揺らぎを避けるため3回の最小値で判定）"""
+        elapsed = min(_measure_import()["elapsed"] for _ in range(3))
+
+        self.assertLess(elapsed, IMPORT_BUDGET_S)
+
+
+if __name__ == "__main__":
+    unittest.main()
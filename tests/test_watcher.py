@@ -0,0 +1,149 @@
+import os
+import sys
+import threading
+
+import pytest
+
+from mov2gif.watcher import FolderWatcher, InotifyBackend, PollingBackend
+
+SUFFIXES = (".mov", ".mp4")
+
+
+def _write(path, data=b"data"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return str(path)
+
+
+class TestFolderWatcher:
+    def test_debounce_until_stable(self, tmp_path):
+        watcher = FolderWatcher(str(tmp_path), settle_time=2.0)
+        path = _write(tmp_path / "a.mov")
+
+        watcher.notify(path, now=0.0)
+        assert watcher.ready(now=1.0) == []
+
+        # 書き込み中（サイズが変わった）は待ち時間をやり直す
+        _write(tmp_path / "a.mov", b"more data")
+        assert watcher.ready(now=1.5) == []
+        assert watcher.ready(now=3.0) == []
+        assert watcher.ready(now=3.5) == [path]
+        assert watcher.ready(now=10.0) == []
+
+    def test_unchanged_file_is_not_converted_again(self, tmp_path):
+        watcher = FolderWatcher(str(tmp_path), settle_time=0.0)
+        path = _write(tmp_path / "a.mov")
+        watcher.notify(path, now=0.0)
+        assert watcher.ready(now=0.0) == [path]
+
+        watcher.notify(path, now=1.0)
+        assert watcher.ready(now=1.0) == []
+
+        # 内容が変わった場合は再度変換する
+        _write(tmp_path / "a.mov", b"new content")
+        watcher.notify(path, now=2.0)
+        assert watcher.ready(now=2.0) == [path]
+
+    def test_ignores_other_extensions_and_deleted_files(self, tmp_path):
+        watcher = FolderWatcher(str(tmp_path), settle_time=0.0)
+        watcher.notify(_write(tmp_path / "a.gif"), now=0.0)
+        path = _write(tmp_path / "b.mp4")
+        watcher.notify(path, now=0.0)
+        os.remove(path)
+
+        assert watcher.ready(now=1.0) == []
+
+    def test_prune_forgets_deleted_files(self, tmp_path):
+        watcher = FolderWatcher(str(tmp_path), settle_time=0.0)
+        path = _write(tmp_path / "a.mov")
+        stat = os.stat(path)
+        watcher.notify(path, now=0.0)
+        assert watcher.ready(now=0.0) == [path]
+
+        # 削除されたファイルの記録は取り除かれ、同じ状態のファイルが置かれても変換し直す
+        os.remove(path)
+        watcher.prune(now=1.0)
+        _write(tmp_path / "a.mov")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        watcher.notify(path, now=2.0)
+        assert watcher.ready(now=2.0) == [path]
+
+    def test_prune_waits_for_interval(self, tmp_path):
+        watcher = FolderWatcher(str(tmp_path), settle_time=0.0)
+        watcher.prune(now=0.0)
+        path = _write(tmp_path / "a.mov")
+        stat = os.stat(path)
+        watcher.notify(path, now=0.0)
+        assert watcher.ready(now=0.0) == [path]
+
+        # 前回から間隔が経つまでは記録を確認しない
+        os.remove(path)
+        watcher.prune(now=1.0)
+        _write(tmp_path / "a.mov")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        watcher.notify(path, now=2.0)
+        assert watcher.ready(now=2.0) == []
+
+    def test_initial_scan_skips_up_to_date_outputs(self, tmp_path):
+        converted = _write(tmp_path / "in" / "done.mov")
+        output = tmp_path / "out" / "done.gif"
+        _write(output)
+        stat = os.stat(converted)
+        os.utime(output, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        pending = _write(tmp_path / "in" / "sub" / "new.mov")
+        watcher = FolderWatcher(
+            str(tmp_path / "in"), output_dir=str(tmp_path / "out"), settle_time=0.0
+        )
+
+        watcher._initial_scan()
+
+        assert watcher.ready() == [pending]
+        assert watcher.output_path(pending) == str(tmp_path / "out" / "sub" / "new.gif")
+        assert (tmp_path / "out" / "sub").is_dir()
+
+    def test_jobs_with_polling(self, tmp_path):
+        path = _write(tmp_path / "a.mov")
+        watcher = FolderWatcher(
+            str(tmp_path), settle_time=0.0, poll_interval=0.01, use_inotify=False
+        )
+        stop = threading.Event()
+
+        jobs = watcher.jobs(stop)
+
+        assert next(jobs) == (path, str(tmp_path / "a.gif"))
+        # 新しいジョブがない間はNoneを返す
+        assert next(jobs) is None
+        stop.set()
+        assert list(jobs) == []
+
+
+def test_polling_backend_reports_changes(tmp_path):
+    _write(tmp_path / "a.mov")
+    backend = PollingBackend(str(tmp_path), SUFFIXES)
+    assert backend.changes(0) == ([], False)
+
+    path = _write(tmp_path / "sub" / "b.mov")
+    _write(tmp_path / "notes.txt")
+
+    assert backend.changes(0) == ([path], False)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotifyはLinuxのみ")
+def test_inotify_backend_reports_changes(tmp_path):
+    (tmp_path / "sub").mkdir()
+    backend = InotifyBackend(str(tmp_path), SUFFIXES)
+    try:
+        path = _write(tmp_path / "sub" / "a.mov")
+        changed, rescan = backend.changes(1.0)
+        assert path in changed
+        assert rescan is False
+
+        # 監視開始後に作成したディレクトリ内のファイルも通知する
+        (tmp_path / "new").mkdir()
+        new_path = _write(tmp_path / "new" / "b.mov")
+        changed = []
+        for _ in range(5):
+            changed.extend(backend.changes(0.2)[0])
+        assert new_path in changed
+    finally:
+        backend.close()
@@ -0,0 +1,101 @@
+"""
+worker_pool モジュールのテスト
+"""
+
+import os
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock
+
+from mov2gif.worker_pool import RecyclingPool
+
+
+def _pid() -> int:
+    """ワーカーのプロセスIDを返す"""
+    return os.getpid()
+
+
+def _span():
+    """少し待ち、実行していた時間帯を返す"""
+    start = time.monotonic()
+    time.sleep(0.05)
+    return start, time.monotonic()
+
+
+def _crash():
+    """プロセスごと異常終了する"""
+    os._exit(1)
+
+
+class TestRecyclingPool(unittest.TestCase):
+    """RecyclingPoolクラスのテスト"""
+
+    def test_recycles_after_max_jobs(self):
+        """正常系: ワーカーをジョブをまたいで使い回し、ワーカー数×max_jobs件ごとに新しいプロセスへ切り替える"""
+        with RecyclingPool(lambda: ProcessPoolExecutor(1), 1, max_jobs=2) as pool:
+            # テスト対象メソッド呼び出し
+            pids = [pool.submit(_pid).result() for _ in range(5)]
+
+        # 検証
+        self.assertEqual(pids[0], pids[1])
+        self.assertEqual(pids[2], pids[3])
+        self.assertEqual(len({pids[0], pids[2], pids[4]}), 3)
+        self.assertNotIn(os.getpid(), pids)
+
+    def test_without_limit(self):
+        """正常系: max_jobsがNoneの場合は作り直さない"""
+        with RecyclingPool(lambda: ProcessPoolExecutor(1), 1, max_jobs=None) as pool:
+            pids = {pool.submit(_pid).result() for _ in range(5)}
+
+        self.assertEqual(len(pids), 1)
+
+    def test_replace_broken_pool(self):
+        """異常系: 壊れたプールを捨てた後は新しいプールで実行を続ける"""
+        with RecyclingPool(lambda: ProcessPoolExecutor(1), 1) as pool:
+            future = pool.submit(_crash)
+            broken = pool.executor
+            with self.assertRaises(BrokenProcessPool):
+                future.result()
+
+            # テスト対象メソッド呼び出し
+            pool.replace(broken)
+
+            self.assertIsInstance(pool.submit(_pid).result(), int)
+            self.assertIsNot(pool.executor, broken)
+
+    def test_recycle_keeps_worker_limit(self):
+        """正常系: まとめて投入しても、切り替えの前後で同時に動くジョブはワーカー数以下"""
+        with RecyclingPool(lambda: ProcessPoolExecutor(2), 2, max_jobs=2) as pool:
+            # テスト対象メソッド呼び出し（4件ごとに切り替える）
+            futures = [pool.submit(_span) for _ in range(12)]
+            spans = [future.result() for future in futures]
+
+        # 検証 - 各ジョブの開始時点で実行中のジョブ数
+        peak = max(
+            sum(1 for start, end in spans if start <= moment < end)
+            for moment, _ in spans
+        )
+        self.assertLessEqual(peak, 2)
+
+    def test_shutdown_reaches_retired_pool(self):
+        """異常系: 切り替えの待機中に中断された場合も、shutdownで前のプールのジョブを取り消す"""
+        retired = MagicMock()
+        retired.shutdown.side_effect = [KeyboardInterrupt, None]
+        pool = RecyclingPool(lambda: retired, 1, max_jobs=1)
+        pool.submit(_pid)
+
+        with self.assertRaises(KeyboardInterrupt):
+            pool.submit(_pid)
+
+        # テスト対象メソッド呼び出し
+        pool.shutdown(cancel_futures=True)
+
+        # 検証
+        retired.shutdown.assert_called_with(wait=True, cancel_futures=True)
+        self.assertIsNone(pool.executor)
+
+
+if __name__ == "__main__":
+    unittest.main()